@@ -1,3 +1,7 @@
+from .bucket import BucketBatchSampler, Buckets
 from .dataset import BaseDataset
+from .feature_cache import CachedFeatureDataset, FeatureCacheWriter, extract_features
 from .loader import create_dataloader
+from .sampler import ResumableSampler
+from .shm_transport import SharedMemoryTransport
 from .video_reader import VideoReader
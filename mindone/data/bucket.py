@@ -0,0 +1,105 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .sampler import ResumableSampler
+
+
+class Buckets:
+    """
+    Resolution and duration buckets for variable-shape video training. Each bucket is a (frames, height, width)
+    shape with its own batch size, usually chosen so that the number of tokens per batch stays roughly constant
+    across buckets.
+
+    A sample is assigned to the bucket it can be cropped or resized to without upsampling: among the buckets with at
+    most as many frames and pixels as the sample, the one with the closest aspect ratio, then the largest volume.
+
+    Args:
+        config: A mapping from the bucket shapes (frames, height, width) to their batch sizes. Buckets with a batch
+                size of 0 are disabled.
+
+    Examples:
+        >>> buckets = Buckets({(1, 512, 512): 64, (17, 512, 512): 8, (17, 480, 854): 4, (65, 480, 854): 1})
+        >>> buckets.get_bucket_id(frames=120, height=720, width=1280)
+        3
+        >>> buckets.shapes[3], buckets.batch_sizes[3]
+        ((65, 480, 854), 1)
+    """
+
+    def __init__(self, config: Dict[Tuple[int, int, int], int]):
+        config = {tuple(shape): batch_size for shape, batch_size in config.items() if batch_size > 0}
+        if not config:
+            raise ValueError("At least one bucket with a positive batch size is required.")
+        # sorted by volume, so that the ids are stable regardless of the config order
+        self.shapes: List[Tuple[int, int, int]] = sorted(config, key=lambda s: (s[0] * s[1] * s[2], s))
+        self.batch_sizes: List[int] = [config[shape] for shape in self.shapes]
+
+        shapes = np.array(self.shapes, dtype=np.int64)
+        self._frames, self._areas = shapes[:, 0], shapes[:, 1] * shapes[:, 2]
+        self._log_ratios = np.log(shapes[:, 1] / shapes[:, 2])
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def get_bucket_id(self, frames: int, height: int, width: int) -> Optional[int]:
+        """
+        Returns the id of the bucket of a sample, or `None` if the sample fits in no bucket.
+        """
+        fits = (self._frames <= frames) & (self._areas <= height * width)
+        if not fits.any():
+            return None
+        ratio_diff = np.abs(self._log_ratios - np.log(height / width))
+        ratio_diff = np.round(np.where(fits, ratio_diff, np.inf), 6)
+        candidates = np.flatnonzero(ratio_diff == ratio_diff.min())
+        # the candidates are sorted by volume
+        return int(candidates[-1])
+
+
+class BucketBatchSampler(ResumableSampler):
+    """
+    Samples batches of samples from the same bucket, with the batch size of the bucket.
+
+    Samples are shuffled within each bucket and split into steps of `batch_size * device_num` samples, then the steps
+    of all the buckets are drawn in random interleaved order. All the ranks share the same order, derived from the
+    seed and the epoch, and draw their batches from the same bucket at every step, so that the step time is balanced
+    across ranks. The sampler yields the indices of the samples of the current rank, the batch sizes are given by
+    `get_batch_size()`. Its position can be saved and restored like `ResumableSampler`.
+
+    Args:
+        bucket_ids: The bucket id of each sample of the dataset, `None` for the samples to skip.
+        batch_sizes: The batch size of each bucket.
+        shuffle: Whether to shuffle the samples and the order of the buckets. Default: True.
+        seed: The seed of the shuffling, must be the same on all the ranks. Default: 42.
+        drop_remainder: Whether to drop the last incomplete step of each bucket. Otherwise, it is split evenly
+                        between the ranks, as a smaller batch. Default: True.
+        device_num: The number of ranks. Default: 1.
+        rank_id: The rank of the current process. Default: 0.
+    """
+
+    def __init__(
+        self,
+        bucket_ids: Sequence[Optional[int]],
+        batch_sizes: Sequence[int],
+        shuffle: bool = True,
+        seed: int = 42,
+        drop_remainder: bool = True,
+        device_num: int = 1,
+        rank_id: int = 0,
+    ):
+        super().__init__(
+            len(bucket_ids),
+            batch_size=0,
+            shuffle=shuffle,
+            seed=seed,
+            drop_remainder=drop_remainder,
+            device_num=device_num,
+            rank_id=rank_id,
+        )
+        self.batch_size = None  # given by the bucket of each batch
+        self.bucket_ids = list(bucket_ids)
+        buckets = [[] for _ in batch_sizes]
+        for idx, bucket_id in enumerate(self.bucket_ids):
+            if bucket_id is not None:
+                buckets[bucket_id].append(idx)
+        self._buckets = [np.array(indices, dtype=np.int64) for indices in buckets]
+        self._batch_sizes = list(batch_sizes)
@@ -24,6 +24,13 @@ class BaseDataset(ABC):
     def __len__(self):
         ...
 
+    def get_sample_shape(self, idx: int) -> Tuple[int, int, int]:
+        """
+        Returns the (frames, height, width) shape of a sample, without loading it. Required by `create_dataloader`
+        to assign the samples to buckets.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support bucketing.")
+
     @staticmethod
     @abstractmethod
     def train_transforms(**kwargs) -> List[dict]:
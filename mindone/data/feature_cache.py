@@ -0,0 +1,227 @@
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .dataset import BaseDataset
+
+_INDEX_FILE = "index.jsonl"
+
+
+def _shard_dir(cache_dir: str, rank_id: int) -> str:
+    return os.path.join(cache_dir, f"rank_{rank_id:05d}")
+
+
+def _read_index(shard_dir: str) -> List[dict]:
+    entries = []
+    index_path = os.path.join(shard_dir, _INDEX_FILE)
+    if os.path.exists(index_path):
+        with open(index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:  # a line cut by an interruption, the sample is extracted again
+                    break
+    return entries
+
+
+class FeatureCacheWriter:
+    """
+    Writes precomputed features (e.g., VAE latents and text embeddings) of a dataset into a cache served by
+    `CachedFeatureDataset`.
+
+    Each rank writes its own shard: a directory with one flat binary file per column, where the arrays of all the
+    samples are appended, and an index with the offset, shape and dtype of each array. A sample is committed once
+    its index line is written, so an interrupted extraction can be resumed: the committed samples are skipped and
+    the partially written data are truncated.
+
+    Must be used with a context manager.
+
+    Args:
+        cache_dir: The directory of the cache.
+        rank_id: The rank writing the shard. Default: 0.
+
+    Examples:
+        >>> with FeatureCacheWriter("cache/", rank_id=0) as writer:
+        ...     if "video_0001" not in writer:
+        ...         writer.write("video_0001", {"latent": latent, "text_emb": text_emb}, meta={"frames": 17})
+    """
+
+    def __init__(self, cache_dir: str, rank_id: int = 0):
+        self._shard_dir = _shard_dir(cache_dir, rank_id)
+        self._files = {}
+        self._index_file = None
+        self._keys = set()
+        self._sizes = {}  # committed size of each column file
+
+    def __enter__(self) -> "FeatureCacheWriter":
+        os.makedirs(self._shard_dir, exist_ok=True)
+        entries = _read_index(self._shard_dir)
+        for entry in entries:
+            self._keys.add(entry["key"])
+            for column, info in entry["columns"].items():
+                self._sizes[column] = max(self._sizes.get(column, 0), info["offset"] + info["nbytes"])
+
+        # rewrite the index without a possibly truncated last line, drop the data of uncommitted samples
+        with open(os.path.join(self._shard_dir, _INDEX_FILE), "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+        for name in os.listdir(self._shard_dir):
+            if name.endswith(".bin"):
+                column = name[: -len(".bin")]
+                with open(os.path.join(self._shard_dir, name), "r+b") as f:
+                    f.truncate(self._sizes.get(column, 0))
+
+        self._index_file = open(os.path.join(self._shard_dir, _INDEX_FILE), "a", encoding="utf-8")
+        return self
+
+    def __exit__(self, *args):
+        for f in self._files.values():
+            f.close()
+        self._index_file.close()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def write(self, key: str, features: Dict[str, np.ndarray], meta: Optional[Dict[str, Any]] = None):
+        """
+        Appends the features of a sample to the shard.
+
+        Args:
+            key: A unique identifier of the sample (e.g., its path).
+            features: The arrays of the sample, one per column.
+            meta: Optional JSON-serializable metadata of the sample (e.g., its number of frames and resolution),
+                  available to samplers through `CachedFeatureDataset.meta`.
+        """
+        columns = {}
+        for column, array in features.items():
+            array = np.ascontiguousarray(array)
+            if column not in self._files:
+                self._files[column] = open(os.path.join(self._shard_dir, f"{column}.bin"), "ab")
+            offset = self._sizes.get(column, 0)
+            self._files[column].write(array.tobytes())
+            self._files[column].flush()
+            self._sizes[column] = offset + array.nbytes
+            columns[column] = {
+                "offset": offset,
+                "nbytes": array.nbytes,
+                "shape": list(array.shape),
+                "dtype": array.dtype.str,
+            }
+
+        self._index_file.write(json.dumps({"key": key, "columns": columns, "meta": meta or {}}) + "\n")
+        self._index_file.flush()
+        self._keys.add(key)
+
+
+def extract_features(
+    samples: Iterable[Tuple[str, Any]],
+    encode_fn: Callable[[Any], Dict[str, np.ndarray]],
+    cache_dir: str,
+    rank_id: int = 0,
+    device_num: int = 1,
+    meta_fn: Optional[Callable[[Any, Dict[str, np.ndarray]], Dict[str, Any]]] = None,
+) -> int:
+    """
+    Pre-extracts the features of a dataset into the cache, skipping the samples already cached. The samples are
+    distributed over the ranks in a round-robin fashion, so that every rank can run the extraction on its own devices.
+
+    Args:
+        samples: An iterable of (key, sample) pairs, e.g. `((path, dataset[i]) for i, path in enumerate(paths))`.
+        encode_fn: A function computing the features of a sample, e.g. running the VAE and text encoders.
+        cache_dir: The directory of the cache.
+        rank_id: The rank of the current process. Default: 0.
+        device_num: The number of ranks. Default: 1.
+        meta_fn: Optional function returning the metadata of a sample from the sample and its features. The shapes
+                 and dtypes of the features are always recorded.
+
+    Returns:
+        The number of samples extracted by this call.
+    """
+    num_extracted = 0
+    with FeatureCacheWriter(cache_dir, rank_id=rank_id) as writer:
+        for i, (key, sample) in enumerate(samples):
+            if i % device_num != rank_id or key in writer:
+                continue
+            features = encode_fn(sample)
+            meta = meta_fn(sample, features) if meta_fn is not None else None
+            writer.write(key, features, meta=meta)
+            num_extracted += 1
+    return num_extracted
+
+
+class CachedFeatureDataset(BaseDataset):
+    """
+    Serves the features written by `FeatureCacheWriter` / `extract_features` as zero-copy NumPy views of
+    memory-mapped files, to be used with `create_dataloader`.
+
+    Args:
+        cache_dir: The directory of the cache. The shards of all the ranks are read.
+        output_columns: The feature columns to output. Default: all the columns of the cache, sorted by name.
+
+    Attributes:
+        meta (List[Dict]): The metadata of each sample, including the `shape` and `dtype` of each column, e.g. for
+                           bucketing by resolution and duration.
+    """
+
+    pad_info = None
+
+    def __init__(self, cache_dir: str, output_columns: Optional[List[str]] = None):
+        self._cache_dir = cache_dir
+        self._entries = []
+        shard_dirs = sorted(name for name in os.listdir(cache_dir) if name.startswith("rank_"))
+        for shard_dir in shard_dirs:
+            self._entries.extend((shard_dir, entry) for entry in _read_index(os.path.join(cache_dir, shard_dir)))
+        if not self._entries:
+            raise ValueError(f"No cached features found in {cache_dir}.")
+
+        self.output_columns = output_columns or sorted(self._entries[0][1]["columns"])
+        self.keys = [entry["key"] for _, entry in self._entries]
+        self.meta = [
+            {
+                **entry["meta"],
+                **{
+                    column: {"shape": tuple(info["shape"]), "dtype": np.dtype(info["dtype"])}
+                    for column, info in entry["columns"].items()
+                },
+            }
+            for _, entry in self._entries
+        ]
+        self._memmaps = {}  # opened lazily, so that the dataset can be pickled to the workers
+
+    def _memmap(self, shard_dir: str, column: str) -> np.memmap:
+        if (shard_dir, column) not in self._memmaps:
+            path = os.path.join(self._cache_dir, shard_dir, f"{column}.bin")
+            self._memmaps[(shard_dir, column)] = np.memmap(path, dtype=np.uint8, mode="r")
+        return self._memmaps[(shard_dir, column)]
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_memmaps"] = {}
+        return state
+
+    def __getitem__(self, idx: int) -> Tuple[np.ndarray, ...]:
+        shard_dir, entry = self._entries[idx]
+        outputs = []
+        for column in self.output_columns:
+            info = entry["columns"][column]
+            buffer = self._memmap(shard_dir, column)[info["offset"] : info["offset"] + info["nbytes"]]
+            outputs.append(buffer.view(np.dtype(info["dtype"])).reshape(info["shape"]))
+        return tuple(outputs)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_sample_shape(self, idx: int) -> Tuple[int, int, int]:
+        meta = self.meta[idx]
+        try:
+            return meta["frames"], meta["height"], meta["width"]
+        except KeyError:
+            raise KeyError("Bucketing requires the `frames`, `height` and `width` metadata of the samples.")
+
+    @staticmethod
+    def train_transforms(**kwargs) -> List[dict]:
+        return []
@@ -1,10 +1,33 @@
 from typing import List, Optional, Union
 
+import numpy as np
+
 import mindspore as ms
 from mindspore.communication import get_local_rank, get_local_rank_size
 
 from ..utils.version_control import MS_VERSION
+from .bucket import BucketBatchSampler, Buckets
 from .dataset import BaseDataset
+from .sampler import ResumableSampler
+from .shm_transport import SharedMemoryTransport
+
+
+class _BucketedDataset:
+    """Appends the `bucket_id` column to the samples of a dataset."""
+
+    def __init__(self, dataset: BaseDataset, bucket_ids: List[Optional[int]]):
+        self._dataset = dataset
+        self._bucket_ids = bucket_ids
+        self.pad_info = getattr(dataset, "pad_info", None)
+
+    def __getitem__(self, idx: int):
+        data = self._dataset[idx]
+        if not isinstance(data, tuple):
+            data = (data,)
+        return data + (np.int32(self._bucket_ids[idx]),)
+
+    def __len__(self) -> int:
+        return len(self._dataset)
 
 
 def create_dataloader(
@@ -25,6 +48,10 @@ def create_dataloader(
     rank_id: int = 0,
     debug: bool = False,
     enable_modelarts: bool = False,
+    buckets: Optional[Buckets] = None,
+    seed: Optional[int] = None,
+    sampler: Optional[ResumableSampler] = None,
+    transport: Optional[SharedMemoryTransport] = None,
 ) -> ms.dataset.BatchDataset:
     """
     Builds and returns a DataLoader for the given dataset.
@@ -64,12 +91,28 @@ def create_dataloader(
         rank_id: The rank ID of the current device. Default is 0.
         debug: Whether to enable debug mode. Default is False.
         enable_modelarts: Whether to enable modelarts (OpenI) support. Default is False.
+        buckets: Optional resolution and duration buckets. If set, the samples are assigned to buckets by
+                 `dataset.get_sample_shape()`, a `bucket_id` column is appended to the dataset columns, and every batch
+                 holds samples of a single bucket, with the batch size of the bucket (`batch_size` is ignored).
+                 The buckets are drawn in random interleaved order, the same on all the ranks. Samples that fit in
+                 no bucket are skipped. Default is None.
+        seed: The seed of the bucket sampler, must be the same on all the ranks.
+              Default is the seed of `mindspore.dataset.config`.
+        sampler: Optional resumable sampler, e.g. to save and restore the position of the data iteration with
+                 `EvalSaveCallback(data_sampler=...)`. A `BucketBatchSampler` replaces `buckets`. The sampler shards
+                 and shuffles the samples itself, `shuffle`, `drop_remainder`, `device_num` and `rank_id` are
+                 ignored. Default is None.
+        transport: Optional shared-memory transport of the large arrays output by the transforms, collated into
+                   shared memory as well. The batches must then be read through `transport.iterate()`.
+                   Not compatible with `pad_info` and `batch_transforms`. Default is None.
 
     Returns:
         ms.dataset.BatchDataset: The DataLoader for the given dataset.
     """
     if not hasattr(dataset, "output_columns"):
         raise AttributeError(f"{type(dataset).__name__} must have `output_columns` attribute.")
+    if transport is not None and (getattr(dataset, "pad_info", None) or batch_transforms is not None):
+        raise ValueError("`transport` is not compatible with `pad_info` and `batch_transforms`.")
 
     ms.dataset.config.set_prefetch_size(prefetch_size)
     # ms.dataset.config.set_enable_shared_mem(True)   # shared memory is ON by default
@@ -79,15 +122,38 @@ def create_dataloader(
         device_num = get_local_rank_size()
         rank_id = get_local_rank() % 8
 
+    column_names, sharding = dataset.output_columns, {"num_shards": device_num, "shard_id": rank_id}
+    if buckets is not None and sampler is None:
+        bucket_ids = [buckets.get_bucket_id(*dataset.get_sample_shape(i)) for i in range(len(dataset))]
+        sampler = BucketBatchSampler(
+            bucket_ids,
+            buckets.batch_sizes,
+            shuffle=shuffle,
+            seed=ms.dataset.config.get_seed() if seed is None else seed,
+            drop_remainder=drop_remainder,
+            device_num=device_num,
+            rank_id=rank_id,
+        )
+
+    if sampler is not None:
+        if sampler.batch_size is not None and sampler.batch_size != batch_size:
+            raise ValueError(f"`batch_size` ({batch_size}) differs from the sampler's ({sampler.batch_size}).")
+        if isinstance(sampler, BucketBatchSampler):
+            dataset = _BucketedDataset(dataset, sampler.bucket_ids)
+            column_names = column_names + ["bucket_id"]
+        # the sampler shards and shuffles the samples itself
+        sharding, shuffle = {}, None
+        batch_size = sampler.get_batch_size
+
     dataloader = ms.dataset.GeneratorDataset(
         dataset,
-        column_names=dataset.output_columns,
+        column_names=column_names,
         num_parallel_workers=num_workers_dataset,
-        num_shards=device_num,
-        shard_id=rank_id,
+        sampler=sampler,
         # file reading is not CPU bounded => use multithreading for reading images and labels
         python_multiprocessing=False,
         shuffle=shuffle,
+        **sharding,
     )
 
     if max_rowsize is None:
@@ -99,6 +165,8 @@ def create_dataloader(
             transforms = [transforms]
 
         for transform in transforms:
+            if transport is not None:
+                transform = {**transform, "operations": transport.wrap(transform["operations"])}
             dataloader = dataloader.map(
                 **transform,
                 python_multiprocessing=python_multiprocessing,
@@ -109,8 +177,11 @@ def create_dataloader(
     if project_columns:
         dataloader = dataloader.project(project_columns)
 
+    if sampler is not None:
+        drop_remainder = False  # the sampler already dropped the incomplete batches
+
     if getattr(dataset, "pad_info", None):
-        if batch_size > 0:
+        if callable(batch_size) or batch_size > 0:
             dataloader = dataloader.padded_batch(
                 batch_size,
                 drop_remainder=drop_remainder,
@@ -118,7 +189,17 @@ def create_dataloader(
                 pad_info=dataset.pad_info,
             )
     else:
-        if batch_size > 0:
+        if transport is not None and (callable(batch_size) or batch_size > 0):
+            dataloader = dataloader.batch(
+                batch_size,
+                drop_remainder=drop_remainder,
+                num_parallel_workers=num_workers_batch,
+                input_columns=dataloader.get_col_names(),
+                per_batch_map=transport.collate_fn(len(dataloader.get_col_names())),
+                python_multiprocessing=python_multiprocessing,
+                max_rowsize=max_rowsize,
+            )
+        elif callable(batch_size) or batch_size > 0:
             dataloader = dataloader.batch(
                 batch_size, drop_remainder=drop_remainder, num_parallel_workers=num_workers_batch
             )
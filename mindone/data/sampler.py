@@ -0,0 +1,123 @@
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+
+class ResumableSampler:
+    """
+    Deterministic sharded sampler whose position can be saved and restored in the middle of an epoch.
+
+    The samples are shuffled with a seed derived from `seed` and the epoch, and split into steps of
+    `batch_size * device_num` samples shared by the ranks, so that the order only depends on the seed and the epoch.
+    `state_dict()` records the position after a number of consumed batches and `load_state_dict()` makes the next
+    iteration start directly from the next sample, without reading the skipped ones.
+
+    Args:
+        num_samples: The number of samples of the dataset.
+        batch_size: The number of samples per batch of each rank.
+        shuffle: Whether to shuffle the samples. Default: True.
+        seed: The seed of the shuffling, must be the same on all the ranks. Default: 42.
+        drop_remainder: Whether to drop the last incomplete step. Otherwise, it is split evenly between the ranks, as
+                        a smaller batch. Default: True.
+        device_num: The number of ranks. Default: 1.
+        rank_id: The rank of the current process. Default: 0.
+
+    Examples:
+        >>> sampler = ResumableSampler(len(dataset), batch_size=4, device_num=device_num, rank_id=rank_id)
+        >>> resume_data_sampler(sampler, "ckpt/train_resume.ckpt")  # from `mindone.trainers.checkpoint`
+        >>> dataloader = create_dataloader(dataset, batch_size=4, sampler=sampler, device_num=device_num, rank_id=rank_id)
+        >>> callback = EvalSaveCallback(network, data_sampler=sampler, ...)
+    """
+
+    def __init__(
+        self,
+        num_samples: int,
+        batch_size: int,
+        shuffle: bool = True,
+        seed: int = 42,
+        drop_remainder: bool = True,
+        device_num: int = 1,
+        rank_id: int = 0,
+    ):
+        self._buckets = [np.arange(num_samples, dtype=np.int64)]
+        self._batch_sizes = [batch_size]
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.seed = seed
+        self.drop_remainder = drop_remainder
+        self.device_num = device_num
+        self.rank_id = rank_id
+
+        self._start_epoch, self._start_batch = 0, 0  # position restored by `load_state_dict()`
+        self._num_epochs = 0  # number of epochs started by `__iter__`
+        self._plans = {}
+
+    def get_batches(self, epoch: int) -> List[np.ndarray]:
+        """Returns the sample indices of the batches of the current rank for an epoch, in drawing order."""
+        if epoch not in self._plans:
+            rng = np.random.default_rng([self.seed, epoch])
+            steps = []
+            for indices, batch_size in zip(self._buckets, self._batch_sizes):
+                if self.shuffle:
+                    indices = rng.permutation(indices)
+                step_size = batch_size * self.device_num
+                num_steps = len(indices) // step_size
+                if not self.drop_remainder and len(indices) - num_steps * step_size >= self.device_num:
+                    num_steps += 1
+                for i in range(num_steps):
+                    step = indices[i * step_size : (i + 1) * step_size]
+                    rank_size = len(step) // self.device_num
+                    steps.append(step[self.rank_id * rank_size : (self.rank_id + 1) * rank_size])
+            if self.shuffle and len(self._buckets) > 1:
+                steps = [steps[i] for i in rng.permutation(len(steps))]
+            # the sampler may run one epoch ahead of the batching
+            self._plans = {e: plan for e, plan in self._plans.items() if e >= epoch - 1}
+            self._plans[epoch] = steps
+        return self._plans[epoch]
+
+    def get_batch_size(self, batch_info) -> int:
+        """
+        Returns the size of the next batch. Meant to be passed as the `batch_size` of `Dataset.batch()`.
+
+        Args:
+            batch_info: A `mindspore.dataset.BatchInfo` with the current epoch and batch number.
+        """
+        epoch, batch = batch_info.get_epoch_num(), batch_info.get_batch_num()
+        if epoch == 0:
+            batch += self._start_batch
+        return len(self.get_batches(self._start_epoch + epoch)[batch])
+
+    @property
+    def num_batches(self) -> int:
+        """The number of batches per epoch of each rank."""
+        return len(self.get_batches(0))
+
+    def state_dict(self, consumed_batches: int) -> Dict[str, int]:
+        """
+        Returns the position of the sampler after `consumed_batches` batches since the start of the training.
+
+        The position is the same on all the ranks, except `consumed_index`, the number of samples of the epoch
+        consumed by the current rank.
+        """
+        epoch, batch = divmod(consumed_batches, self.num_batches)
+        consumed_index = sum(len(indices) for indices in self.get_batches(epoch)[:batch])
+        return {"seed": self.seed, "epoch": epoch, "consumed_batches": batch, "consumed_index": consumed_index}
+
+    def load_state_dict(self, state: Dict[str, int]):
+        """Restores a position saved by `state_dict()`, the next iteration starts from the next sample."""
+        self.seed = state["seed"]
+        self._start_epoch, self._start_batch = state["epoch"], state["consumed_batches"]
+        self._num_epochs = 0
+        self._plans = {}
+
+    def __iter__(self) -> Iterator[int]:
+        epoch = self._start_epoch + self._num_epochs
+        batches = self.get_batches(epoch)
+        if self._num_epochs == 0:
+            batches = batches[self._start_batch :]
+        self._num_epochs += 1
+        for batch in batches:
+            yield from batch.tolist()
+
+    # No `__len__`: `GeneratorDataset` would read that many samples at every epoch, while the first epoch after
+    # `load_state_dict()` is shorter. Without it, the samples are counted on a copy of the sampler.
@@ -0,0 +1,249 @@
+import inspect
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+# descriptor layout: [magic, slot, nbytes, dtype, ndim, *shape (padded to _MAX_NDIM)]
+_MAGIC = 0x5348_4D54_5250  # "SHMTRP"
+_MAX_NDIM = 8
+_DESCRIPTOR_SIZE = 5 + _MAX_NDIM
+_DTYPES = [
+    np.dtype(t)
+    for t in (np.bool_, np.uint8, np.int8, np.uint16, np.int16, np.int32, np.int64, np.float16, np.float32, np.float64)
+]
+_FREE, _BUSY = 0, 1
+
+
+def is_descriptor(x: Any) -> bool:
+    """Whether `x` is a descriptor of an array in shared memory, or a batch of descriptors."""
+    return (
+        isinstance(x, np.ndarray)
+        and x.dtype == np.int64
+        and x.ndim in (1, 2)
+        and x.shape[-1] == _DESCRIPTOR_SIZE
+        and bool(np.all(x[..., 0] == _MAGIC))
+    )
+
+
+class SharedMemoryTransport:
+    """
+    Zero-copy transport of large arrays from the Python-multiprocessing workers of a MindSpore pipeline to the main
+    process, through a ring of shared-memory slots.
+
+    Instead of returning arrays, which are pickled and copied through the shared-memory rows of the pipeline
+    (`max_rowsize`), the wrapped transforms write their large outputs into a free slot of the ring and return a small
+    descriptor. The batches are collated by `collate()` into a slot as well, and `iterate()` turns the descriptors
+    of the batches into NumPy views of the ring, without copying them, in the main process.
+
+    A slot is released once the next batch is requested from `iterate()`: the views of a batch are only valid until
+    then, copy them to keep them longer. When the ring is full, the workers wait for a free slot, so it must hold at
+    least the samples and batches in flight in the pipeline (prefetched and being batched).
+
+    The ring is shared with the workers by inheritance, so the workers must be forked (MindSpore's default on Linux).
+    Must be used with a context manager, or closed with `close()`.
+
+    Args:
+        num_slots: The number of slots of the ring.
+        slot_size: The size of a slot in bytes, at least the size of the largest batch.
+        min_nbytes: Arrays smaller than this are passed through the pipeline as usual. Default: 64 KiB.
+        timeout: The maximum time, in seconds, a worker waits for a free slot. Default: 60.
+
+    Examples:
+        >>> with SharedMemoryTransport(num_slots=64, slot_size=256 * 2**20) as transport:
+        ...     dataloader = create_dataloader(dataset, batch_size=8, transforms=transforms, transport=transport)
+        ...     for batch in transport.iterate(dataloader.create_tuple_iterator(output_numpy=True, num_epochs=1)):
+        ...         ...
+    """
+
+    def __init__(self, num_slots: int, slot_size: int, min_nbytes: int = 64 * 2**10, timeout: float = 60.0):
+        if num_slots < 2:
+            raise ValueError(f"`num_slots` must be at least 2, but got {num_slots}.")
+        self.num_slots = num_slots
+        self.slot_size = slot_size
+        self.min_nbytes = min_nbytes
+        self.timeout = timeout
+
+        # slot states, then the slots, aligned to 64 bytes
+        self._header_size = -(-num_slots // 64) * 64
+        self._shm = shared_memory.SharedMemory(create=True, size=self._header_size + num_slots * slot_size)
+        self._states = np.ndarray((num_slots,), dtype=np.uint8, buffer=self._shm.buf)
+        self._states[:] = _FREE
+        self._lock = multiprocessing.Lock()
+        self._cursor = multiprocessing.Value("q", 0, lock=False)
+        self._in_use = []  # slots of the batch last returned by `iterate()`
+
+    def __enter__(self) -> "SharedMemoryTransport":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._states = None
+        self._shm.close()
+        self._shm.unlink()
+
+    def _slot_view(self, slot: int, nbytes: int) -> np.ndarray:
+        offset = self._header_size + slot * self.slot_size
+        return np.ndarray((nbytes,), dtype=np.uint8, buffer=self._shm.buf, offset=offset)
+
+    def _acquire(self) -> int:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._lock:
+                free = np.flatnonzero(self._states == _FREE)
+                if len(free):
+                    # take the first free slot after the cursor, so that the slots are used in a round-robin fashion
+                    slot = int(free[np.searchsorted(free, self._cursor.value) % len(free)])
+                    self._states[slot] = _BUSY
+                    self._cursor.value = (slot + 1) % self.num_slots
+                    return slot
+            if time.monotonic() > deadline:
+                raise RuntimeError(
+                    f"No free shared-memory slot after {self.timeout}s, increase `num_slots` ({self.num_slots})."
+                )
+            time.sleep(0.001)
+
+    def allocate(self, shape: Sequence[int], dtype) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Reserves a slot for an array, so that a transform can write its output directly into shared memory.
+
+        Returns:
+            The descriptor of the array, to return from the transform, and a writable view of the array.
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in _DTYPES:
+            raise TypeError(f"Unsupported dtype {dtype}, must be one of {[str(d) for d in _DTYPES]}.")
+        if len(shape) > _MAX_NDIM:
+            raise ValueError(f"Arrays with more than {_MAX_NDIM} dimensions are not supported, got shape {shape}.")
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        if nbytes > self.slot_size:
+            raise ValueError(f"An array of {nbytes} bytes does not fit in a slot of {self.slot_size} bytes.")
+
+        slot = self._acquire()
+        descriptor = np.zeros(_DESCRIPTOR_SIZE, dtype=np.int64)
+        descriptor[:5] = _MAGIC, slot, nbytes, _DTYPES.index(dtype), len(shape)
+        descriptor[5 : 5 + len(shape)] = shape
+        return descriptor, self._slot_view(slot, nbytes).view(dtype).reshape(shape)
+
+    def write(self, array: np.ndarray) -> np.ndarray:
+        """Copies an array into a slot and returns its descriptor."""
+        descriptor, view = self.allocate(array.shape, array.dtype)
+        np.copyto(view, array)
+        return descriptor
+
+    def read(self, descriptor: np.ndarray) -> np.ndarray:
+        """Returns a read-only view of the array of a descriptor."""
+        _, slot, nbytes, dtype, ndim = descriptor[:5].tolist()
+        view = self._slot_view(slot, nbytes).view(_DTYPES[dtype]).reshape(descriptor[5 : 5 + ndim].tolist())
+        view.flags.writeable = False
+        return view
+
+    def release(self, descriptor: np.ndarray):
+        """Frees the slots of a descriptor or a batch of descriptors."""
+        self._states[descriptor.reshape(-1, _DESCRIPTOR_SIZE)[:, 1]] = _FREE
+
+    def _encode(self, x: Any) -> Any:
+        if isinstance(x, np.ndarray) and x.nbytes >= self.min_nbytes and x.dtype in _DTYPES:
+            return self.write(np.ascontiguousarray(x))
+        return x
+
+    def wrap(self, operations: Union[Callable, List[Callable]]) -> Callable:
+        """
+        Composes the operations of a transform and writes their large array outputs into shared memory.
+        The inputs written by a previous wrapped transform are read from shared memory and released.
+        """
+        operations = operations if isinstance(operations, (list, tuple)) else [operations]
+        return _WrappedOperations(self, operations)
+
+    def collate_fn(self, num_columns: int) -> Callable:
+        """
+        Returns `collate()` as the `per_batch_map` of `Dataset.batch()` for `num_columns` input columns, as
+        `Dataset.batch()` checks that it takes one argument per column and the batch info.
+        """
+        return _Collate(self, num_columns)
+
+    def collate(self, *columns):
+        """
+        Collates the samples of a batch, given the columns and the batch info. The columns of descriptors are
+        stacked into a slot, whose descriptor is returned, and the slots of the samples are released.
+        """
+        *columns, _ = columns  # batch info
+        outputs = []
+        for column in columns:
+            if all(is_descriptor(x) for x in column):
+                samples = [self.read(x) for x in column]
+                descriptor, batch = self.allocate((len(samples),) + samples[0].shape, samples[0].dtype)
+                np.stack(samples, out=batch)
+                for x in column:
+                    self.release(x)
+                outputs.append(descriptor)
+            else:
+                outputs.append(np.stack(column))
+        return tuple(outputs)
+
+    def iterate(self, iterator: Iterable) -> Iterator:
+        """
+        Wraps a dataset iterator with NumPy outputs (`create_tuple_iterator` or `create_dict_iterator`), replacing
+        the descriptors with zero-copy views of shared memory. The slots of a batch are released when the next batch
+        is requested.
+        """
+        for data in iterator:
+            self._release_in_use()
+            if isinstance(data, dict):
+                yield {k: self._decode(v) for k, v in data.items()}
+            else:
+                yield type(data)(self._decode(v) for v in data)
+        self._release_in_use()
+
+    def _decode(self, x: Any) -> Any:
+        if not is_descriptor(x):
+            return x
+        self._in_use.append(x)
+        if x.ndim == 1:
+            return self.read(x)
+        return [self.read(descriptor) for descriptor in x]
+
+    def _release_in_use(self):
+        for descriptor in self._in_use:
+            self.release(descriptor)
+        self._in_use = []
+
+
+class _WrappedOperations:
+    def __init__(self, transport: SharedMemoryTransport, operations: List[Callable]):
+        self._transport = transport
+        self._operations = operations
+
+    def __call__(self, *args):
+        inputs = []
+        for x in args:
+            if is_descriptor(x):
+                # the view is valid until the slot is released, after the operations
+                inputs.append(self._transport.read(x))
+            else:
+                inputs.append(x)
+        outputs = inputs
+        for op in self._operations:
+            outputs = op(*outputs)
+            outputs = outputs if isinstance(outputs, tuple) else (outputs,)
+        outputs = tuple(self._transport._encode(x) for x in outputs)
+        for x in args:
+            if is_descriptor(x):
+                self._transport.release(x)
+        return outputs if len(outputs) != 1 else outputs[0]
+
+
+class _Collate:
+    def __init__(self, transport: SharedMemoryTransport, num_columns: int):
+        self._transport = transport
+        parameters = [f"column_{i}" for i in range(num_columns)] + ["batch_info"]
+        self.__signature__ = inspect.Signature(
+            [inspect.Parameter(name, inspect.Parameter.POSITIONAL_ONLY) for name in parameters]
+        )
+
+    def __call__(self, *columns):
+        return self._transport.collate(*columns)
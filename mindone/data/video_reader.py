@@ -1,14 +1,208 @@
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
 import cv2
 import numpy as np
 
+# FFmpeg's default GOP size, used when the keyframe interval of a video is unknown
+_DEFAULT_KEYFRAME_INTERVAL = 250
+
+
+@dataclass
+class VideoMetadata:
+    """
+    Container metadata of a video file.
+
+    Args:
+        num_frames: The number of frames of the video.
+        fps: The frame rate of the video.
+        shape: The shape (width, height) of the video.
+        keyframe_interval: The largest distance between two consecutive keyframes, if known.
+    """
+
+    num_frames: int
+    fps: float
+    shape: Tuple[int, int]
+    keyframe_interval: Optional[int] = None
+
+
+class VideoMetadataCache:
+    """
+    LRU cache of the container metadata of video files, so that sampling several clips from the same file does not probe
+    the container again. The entries are keyed by the path, size and modification time of the files.
+
+    Args:
+        max_size: The maximum number of files in the cache. Default: 4096.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def _key(video_path: str, backend: str) -> tuple:
+        stat = os.stat(video_path)
+        return os.path.realpath(video_path), stat.st_size, stat.st_mtime_ns, backend
+
+    def get(self, video_path: str, backend: str) -> Optional[VideoMetadata]:
+        key = self._key(video_path, backend)
+        metadata = self._entries.get(key)
+        if metadata is not None:
+            self._entries.move_to_end(key)
+        return metadata
+
+    def put(self, video_path: str, backend: str, metadata: VideoMetadata):
+        self._entries[self._key(video_path, backend)] = metadata
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_metadata_cache = VideoMetadataCache()
+
+
+class _OpenCVBackend:
+    def __init__(self, video_path: str):
+        self._cap = cv2.VideoCapture(video_path, apiPreference=cv2.CAP_FFMPEG)
+        if not self._cap.isOpened():
+            raise IOError(f"Video {video_path} cannot be opened.")
+        self._pos = 0  # index of the frame returned by the next `read()`
+
+    def probe(self) -> VideoMetadata:
+        return VideoMetadata(
+            num_frames=int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+            fps=self._cap.get(cv2.CAP_PROP_FPS),
+            shape=(int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))),
+        )
+
+    def read(self, indices: List[int], keyframe_interval: int) -> List[np.ndarray]:
+        frames = []
+        for index in indices:
+            gap = index - self._pos
+            # seeking decodes from the previous keyframe, grabbing decodes every skipped frame but does not convert it
+            if gap < 0 or gap > keyframe_interval:
+                self._cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+            else:
+                for _ in range(gap):
+                    if not self._cap.grab():
+                        return frames
+            ret, frame = self._cap.read()
+            if not ret:
+                return frames
+            self._pos = index + 1
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        return frames
+
+    def close(self):
+        self._cap.release()
+
+
+class _PyAVBackend:
+    def __init__(self, video_path: str):
+        try:
+            import av
+        except ImportError:
+            raise ImportError("The `pyav` backend of VideoReader requires PyAV: `pip install av`.")
+
+        self._container = av.open(video_path)
+        self._stream = self._container.streams.video[0]
+        self._stream.thread_type = "AUTO"
+        self._frames = None  # frame iterator of the current decoding position
+        self._pos = 0
+
+    def probe(self) -> VideoMetadata:
+        # demux the packets, without decoding them, to count the frames and locate the keyframes
+        keyframes, num_frames = [], 0
+        for packet in self._container.demux(self._stream):
+            if packet.size == 0:
+                continue
+            if packet.is_keyframe:
+                keyframes.append(num_frames)
+            num_frames += 1
+        self._container.seek(0, stream=self._stream)
+
+        keyframes.append(num_frames)
+        return VideoMetadata(
+            num_frames=num_frames,
+            fps=float(self._stream.average_rate),
+            shape=(self._stream.codec_context.width, self._stream.codec_context.height),
+            keyframe_interval=int(np.diff(keyframes).max()) if len(keyframes) > 1 else None,
+        )
+
+    def read(self, indices: List[int], keyframe_interval: int) -> List[np.ndarray]:
+        time_base, fps = self._stream.time_base, self._stream.average_rate
+        start_time = self._stream.start_time or 0
+        frames = []
+        for index in indices:
+            gap = index - self._pos
+            if self._frames is None or gap < 0 or gap > keyframe_interval:
+                # seek to the keyframe before `index` and decode up to it
+                self._container.seek(int(index / fps / time_base) + start_time, stream=self._stream, backward=True)
+                self._frames = self._container.decode(self._stream)
+                self._pos = -1
+
+            for frame in self._frames:
+                self._pos = round((frame.pts - start_time) * time_base * fps)
+                if self._pos >= index:
+                    frames.append(frame.to_ndarray(format="rgb24"))
+                    self._pos += 1
+                    break
+            else:
+                return frames
+        return frames
+
+    def close(self):
+        self._container.close()
+
+
+class _DecordBackend:
+    def __init__(self, video_path: str):
+        try:
+            import decord
+        except ImportError:
+            raise ImportError("The `decord` backend of VideoReader requires decord: `pip install decord`.")
+
+        self._reader = decord.VideoReader(video_path, ctx=decord.cpu(0))
+
+    def probe(self) -> VideoMetadata:
+        height, width = self._reader[0].shape[:2]
+        return VideoMetadata(num_frames=len(self._reader), fps=self._reader.get_avg_fps(), shape=(width, height))
+
+    def read(self, indices: List[int], keyframe_interval: int) -> List[np.ndarray]:
+        # decord seeks and skips internally
+        return list(self._reader.get_batch(indices).asnumpy())
+
+    def close(self):
+        del self._reader
+
+
+_BACKENDS = {"opencv": _OpenCVBackend, "pyav": _PyAVBackend, "decord": _DecordBackend}
+
 
 class VideoReader:
     """
-    Extracts information about a video and reads frames in batches using OpenCV.
+    Extracts information about a video and reads frames in batches.
     Must be used with a context manager.
 
+    Frames are read in increasing order: to skip frames, the reader grabs them without conversion when the distance to
+    the next requested frame is at most the keyframe interval, and seeks otherwise, since seeking decodes all the
+    frames from the previous keyframe. The container metadata are kept in a per-file cache, so that sampling several
+    clips from the same video does not probe it again.
+
     Args:
         video_path (str): Path to the video file.
+        backend (str): The decoding backend, one of "opencv", "pyav" (requires PyAV) and "decord" (requires decord).
+            Default: "opencv".
+        keyframe_interval (int, optional): The keyframe interval of the video, used to choose between skipping and
+            seeking. Default: probed by the "pyav" backend, 250 (FFmpeg's default) otherwise.
+        use_metadata_cache (bool): Whether to reuse the cached container metadata of the video. Default: True.
 
     Attributes:
         shape (Tuple[int, int]): The shape (width, height) of the video.
@@ -23,27 +217,50 @@ class VideoReader:
         ...     fps = reader.fps
         ...     total_frames = len(reader)
         ...     frames = reader.fetch_frames(num=10, start_pos=10, step=2)
+        ...     frames = reader.get_batch([0, 16, 32, 48])
     """
 
-    def __init__(self, video_path: str):
+    def __init__(
+        self,
+        video_path: str,
+        backend: str = "opencv",
+        keyframe_interval: Optional[int] = None,
+        use_metadata_cache: bool = True,
+    ):
+        if backend not in _BACKENDS:
+            raise ValueError(f"Unknown backend `{backend}`, must be one of {list(_BACKENDS)}.")
         self._video_path = video_path
-        self._cap = None
+        self._backend_name = backend
+        self._backend = None
+        self._keyframe_interval = keyframe_interval
+        self._use_metadata_cache = use_metadata_cache
+        self._metadata = None
         self.shape = (0, 0)
         self.fps = 0
 
     def __enter__(self) -> "VideoReader":
-        self._cap = cv2.VideoCapture(self._video_path, apiPreference=cv2.CAP_FFMPEG)
-        if not self._cap.isOpened():
-            raise IOError(f"Video {self._video_path} cannot be opened.")
-        self.shape = int(self._cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        self.fps = self._cap.get(cv2.CAP_PROP_FPS)
+        self._backend = _BACKENDS[self._backend_name](self._video_path)
+        if self._use_metadata_cache:
+            self._metadata = _metadata_cache.get(self._video_path, self._backend_name)
+        if self._metadata is None:
+            self._metadata = self._backend.probe()
+            if self._use_metadata_cache:
+                _metadata_cache.put(self._video_path, self._backend_name, self._metadata)
+
+        self.shape = self._metadata.shape
+        self.fps = self._metadata.fps
         return self
 
     def __exit__(self, *args):
-        self._cap.release()
+        self._backend.close()
 
     def __len__(self) -> int:
-        return int(self._cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        return self._metadata.num_frames
+
+    @property
+    def keyframe_interval(self) -> int:
+        """The keyframe interval used to choose between skipping and seeking."""
+        return self._keyframe_interval or self._metadata.keyframe_interval or _DEFAULT_KEYFRAME_INTERVAL
 
     def fetch_frames(self, num: int = 0, start_pos: int = 0, step: int = 1) -> np.ndarray:
         """
@@ -66,21 +283,30 @@ class VideoReader:
         if len(self) < min_len:
             raise ValueError(f"Number of frames to fetch ({min_len}) must be less than video length ({len(self)}).")
 
-        if start_pos:
-            start_pos = min(start_pos, len(self) - min_len)
-            self._cap.set(cv2.CAP_PROP_POS_FRAMES, start_pos)
+        start_pos = min(start_pos, len(self) - min_len)
+        return self.get_batch(range(start_pos, start_pos + min_len, step))
 
-        frames = []
-        i = start_pos
-        ret, frame = self._cap.read()
-        while ret and len(frames) < num:
-            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-            if step > 1:
-                i += step
-                self._cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-            ret, frame = self._cap.read()
+    def get_batch(self, indices: Sequence[int]) -> np.ndarray:
+        """
+        Reads the frames at the given indices in one pass over the video.
+
+        Parameters:
+            indices: The indices of the frames to read, in any order and possibly repeated.
+
+        Returns:
+            np.ndarray: An array of shape (len(indices), height, width, 3) containing the RGB frames.
+
+        Raises:
+            ValueError: If an index is out of the video range.
+            RuntimeError: If the frames cannot be read.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise ValueError(f"Frame indices must be in [0, {len(self)}), but got {indices.min()}..{indices.max()}.")
 
-        if len(frames) != num:
-            raise RuntimeError(f"Failed to read {num} frames from {self._video_path}.")
+        unique_indices, inverse = np.unique(indices, return_inverse=True)
+        frames = self._backend.read(unique_indices.tolist(), self.keyframe_interval)
+        if len(frames) != len(unique_indices):
+            raise RuntimeError(f"Failed to read {len(indices)} frames from {self._video_path}.")
 
-        return np.stack(frames)
+        return np.stack(frames)[inverse]
@@ -13,6 +13,7 @@ from .utils import _LazyModule
 
 _import_structure = {
     "configuration_utils": ["ConfigMixin"],
+    "hooks": ["HookRegistry", "ModelHook", "apply_group_offloading", "apply_layerwise_casting"],
     "loaders": ["FromOriginalModelMixin"],
     "models": [
         "AllegroTransformer3DModel",
@@ -103,6 +104,7 @@ _import_structure = {
         "AutoPipelineForText2Image",
         "BlipDiffusionControlNetPipeline",
         "BlipDiffusionPipeline",
+        "ClassifierFreeGuidance",
         "CLIPImageProjection",
         "CogVideoXFunControlPipeline",
         "CogVideoXImageToVideoPipeline",
@@ -179,6 +181,7 @@ _import_structure = {
         "PixArtAlphaPipeline",
         "PixArtSigmaPAGPipeline",
         "PixArtSigmaPipeline",
+        "PromptEmbedsCache",
         "SanaPAGPipeline",
         "SanaPipeline",
         "SemanticStableDiffusionPipeline",
@@ -302,6 +305,7 @@ _import_structure = {
 
 if TYPE_CHECKING:
     from .configuration_utils import ConfigMixin
+    from .hooks import HookRegistry, ModelHook, apply_group_offloading, apply_layerwise_casting
     from .models import (
         AllegroTransformer3DModel,
         AsymmetricAutoencoderKL,
@@ -391,6 +395,7 @@ if TYPE_CHECKING:
         AutoPipelineForText2Image,
         BlipDiffusionControlNetPipeline,
         BlipDiffusionPipeline,
+        ClassifierFreeGuidance,
         CLIPImageProjection,
         CogVideoXFunControlPipeline,
         CogVideoXImageToVideoPipeline,
@@ -466,6 +471,7 @@ if TYPE_CHECKING:
         PixArtAlphaPipeline,
         PixArtSigmaPAGPipeline,
         PixArtSigmaPipeline,
+        PromptEmbedsCache,
         SanaPAGPipeline,
         SanaPipeline,
         SemanticStableDiffusionPipeline,
@@ -0,0 +1,3 @@
+from .group_offloading import apply_group_offloading
+from .hooks import HookRegistry, ModelHook
+from .layerwise_casting import apply_layerwise_casting, apply_layerwise_casting_hook
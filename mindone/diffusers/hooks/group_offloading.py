@@ -0,0 +1,427 @@
+# Copyright 2024 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Optional, Set
+
+import mindspore as ms
+from mindspore import nn
+
+from mindone.utils.version_control import get_runtime
+
+from ..utils.logging import get_logger
+from .hooks import HookRegistry, ModelHook
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+_GROUP_OFFLOADING = "group_offloading"
+_LAYER_EXECUTION_TRACKER = "layer_execution_tracker"
+_LAZY_PREFETCH_GROUP_OFFLOADING = "lazy_prefetch_group_offloading"
+
+_SUPPORTED_BLOCK_TYPES = (nn.CellList, nn.SequentialCell)
+
+
+def _get_cell_nbytes(module: nn.Cell) -> int:
+    return sum(param.nbytes for param in module.get_parameters())
+
+
+class ModuleGroup:
+    r"""
+    A group of cells whose parameters are moved between the host and the device together.
+
+    Host copies of the parameters are made once when the group is created. Offloading only re-points the parameters
+    to these host copies, so no device-to-host copy happens during inference.
+    """
+
+    def __init__(
+        self,
+        modules: List[nn.Cell],
+        offload_device: str,
+        onload_device: str,
+        offload_leader: nn.Cell,
+        onload_leader: Optional[nn.Cell] = None,
+        parameters: Optional[List[ms.Parameter]] = None,
+        stream=None,
+        non_blocking: bool = False,
+        onload_self: bool = True,
+    ) -> None:
+        self.modules = modules
+        self.offload_device = offload_device
+        self.onload_device = onload_device
+        self.offload_leader = offload_leader
+        self.onload_leader = onload_leader
+        self.parameters = list(parameters) if parameters is not None else []
+        for module in modules:
+            self.parameters.extend(module.get_parameters())
+        self.stream = stream
+        self.non_blocking = non_blocking or stream is not None
+        self.onload_self = onload_self
+        self.next_group: Optional["ModuleGroup"] = None
+
+        self.cpu_param_dict = {
+            id(param): param.move_to(self.offload_device, blocking=True) for param in self.parameters
+        }
+
+    @property
+    def nbytes(self) -> int:
+        return sum(param.nbytes for param in self.parameters)
+
+    def onload_(self) -> None:
+        r"""Copies the parameters of the group from the host copies to the onload device."""
+        if self.stream is not None:
+            # wait for the previously prefetched group before launching the next copy on the side stream
+            self.stream.synchronize()
+            runtime = get_runtime()
+            with runtime.StreamCtx(self.stream):
+                self._onload_parameters()
+        else:
+            self._onload_parameters()
+
+    def _onload_parameters(self) -> None:
+        for param in self.parameters:
+            param.set_data(self.cpu_param_dict[id(param)].move_to(self.onload_device, blocking=not self.non_blocking))
+
+    def offload_(self) -> None:
+        r"""Releases the device copies of the parameters of the group."""
+        if self.stream is not None:
+            # the compute stream may still read the weights, so make sure it is done before releasing them
+            get_runtime().current_stream().synchronize()
+        for param in self.parameters:
+            param.set_data(self.cpu_param_dict[id(param)])
+
+
+class GroupOffloadingHook(ModelHook):
+    r"""
+    A hook that offloads groups of cells to the host and onloads them to the device just before they run. Only the
+    onload leader of a group triggers onloading (and, when prefetching is enabled, the copy of the next group) and
+    only the offload leader of a group triggers offloading.
+    """
+
+    _is_stateful = False
+
+    def __init__(self, group: ModuleGroup) -> None:
+        super().__init__()
+        self.group = group
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        if self.group.offload_leader is module:
+            self.group.offload_()
+        return module
+
+    def pre_forward(self, module: nn.Cell, *args, **kwargs):
+        if self.group.onload_leader is module:
+            if self.group.onload_self:
+                self.group.onload_()
+
+            next_group = self.group.next_group
+            if next_group is not None and not next_group.onload_self:
+                next_group.onload_()
+            elif not self.group.onload_self and self.group.stream is not None:
+                # this group was prefetched and there is nothing left to prefetch; wait for its copy to finish
+                self.group.stream.synchronize()
+
+        return args, kwargs
+
+    def post_forward(self, module: nn.Cell, output):
+        if self.group.offload_leader is module:
+            self.group.offload_()
+        return output
+
+
+class LayerExecutionTrackerHook(ModelHook):
+    r"""
+    A hook that records the order in which the onload leaders of the offloaded groups are executed.
+    """
+
+    _is_stateful = False
+
+    def __init__(self, group: ModuleGroup, execution_order: List[ModuleGroup]) -> None:
+        super().__init__()
+        self.group = group
+        self.execution_order = execution_order
+
+    def pre_forward(self, module: nn.Cell, *args, **kwargs):
+        if self.group not in self.execution_order:
+            self.execution_order.append(self.group)
+        return args, kwargs
+
+
+class LazyPrefetchGroupOffloadingHook(ModelHook):
+    r"""
+    A hook, registered on the top-level cell, that records the execution order of the offloaded groups during the
+    first forward pass. Once the order is known, every group prefetches the group that runs after it on the side
+    stream, so that the host-to-device copy of group `i + 1` overlaps with the compute of group `i`.
+    """
+
+    _is_stateful = False
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.execution_order: List[ModuleGroup] = []
+        self._tracked_modules: List[nn.Cell] = []
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        for _, submodule in module.cells_and_names():
+            if submodule is module or not hasattr(submodule, "_diffusers_hook"):
+                continue
+            group_offloading_hook = submodule._diffusers_hook.get_hook(_GROUP_OFFLOADING)
+            if group_offloading_hook is None or group_offloading_hook.group.onload_leader is not submodule:
+                continue
+            submodule._diffusers_hook.register_hook(
+                LayerExecutionTrackerHook(group_offloading_hook.group, self.execution_order),
+                _LAYER_EXECUTION_TRACKER,
+            )
+            self._tracked_modules.append(submodule)
+        return module
+
+    def post_forward(self, module: nn.Cell, output):
+        for submodule in self._tracked_modules:
+            submodule._diffusers_hook.remove_hook(_LAYER_EXECUTION_TRACKER, recurse=False)
+        self._tracked_modules = []
+
+        root_hook = module._diffusers_hook.get_hook(_GROUP_OFFLOADING)
+        groups = ([root_hook.group] if root_hook is not None else []) + self.execution_order
+        if len(groups) > 1:
+            logger.debug(f"Prefetching is set up for {len(groups)} offloaded groups in execution order.")
+        for current_group, next_group in zip(groups[:-1], groups[1:]):
+            current_group.next_group = next_group
+            next_group.onload_self = False
+
+        module._diffusers_hook.remove_hook(_LAZY_PREFETCH_GROUP_OFFLOADING, recurse=False)
+        return output
+
+
+def apply_group_offloading(
+    module: nn.Cell,
+    offload_type: str = "block_level",
+    num_blocks_per_group: Optional[int] = None,
+    max_group_bytes: Optional[int] = None,
+    onload_device: Optional[str] = None,
+    offload_device: str = "CPU",
+    non_blocking: bool = False,
+    use_stream: bool = False,
+) -> None:
+    r"""
+    Applies group offloading to the internal layers of a cell. Group offloading keeps the weights of groups of
+    layers in host memory and copies a group to the device only right before it is executed. Compared to offloading
+    the whole model, only one (or, with prefetching, two) groups live on the device at a time, which lets models
+    that do not fit in device memory run at all.
+
+    Group offloading relies on hooks that wrap `construct`, so it only works in PyNative mode and is meant for
+    inference: the host copies of the weights are not updated if the weights are changed on the device.
+
+    Args:
+        module (`nn.Cell`):
+            The cell to which group offloading is applied.
+        offload_type (`str`, defaults to `"block_level"`):
+            The type of offloading to be applied. Can be one of `"block_level"` or `"leaf_level"`. With
+            `"block_level"`, the children of every `nn.CellList` or `nn.SequentialCell` of `module` (i.e. the
+            transformer blocks) are grouped, either by count or by a byte budget. With `"leaf_level"`, every leaf
+            cell that owns parameters forms its own group.
+        num_blocks_per_group (`int`, *optional*):
+            The number of blocks per group when using `offload_type="block_level"`. Mutually exclusive with
+            `max_group_bytes`.
+        max_group_bytes (`int`, *optional*):
+            The byte budget of a group when using `offload_type="block_level"`. Consecutive blocks are added to a
+            group until the budget would be exceeded. A block larger than the budget forms a group on its own.
+        onload_device (`str`, *optional*):
+            The device to which the groups are onloaded. Defaults to the `device_target` of the context.
+        offload_device (`str`, defaults to `"CPU"`):
+            The device to which the groups are offloaded.
+        non_blocking (`bool`, defaults to `False`):
+            If `True`, host-to-device copies are launched asynchronously.
+        use_stream (`bool`, defaults to `False`):
+            If `True`, copies are issued on a side stream and the group executed next is prefetched while the
+            current group computes. The execution order is recorded during the first forward pass, so prefetching
+            only starts from the second call.
+
+    Example:
+        ```python
+        >>> import mindspore as ms
+        >>> from mindone.diffusers import CogVideoXTransformer3DModel
+        >>> from mindone.diffusers.hooks import apply_group_offloading
+
+        >>> transformer = CogVideoXTransformer3DModel.from_pretrained(
+        ...     "THUDM/CogVideoX-5b", subfolder="transformer", mindspore_dtype=ms.bfloat16
+        ... )
+
+        >>> apply_group_offloading(transformer, offload_type="block_level", num_blocks_per_group=2, use_stream=True)
+        ```
+    """
+    if onload_device is None:
+        onload_device = ms.get_context("device_target")
+
+    stream = None
+    if use_stream:
+        if ms.get_context("mode") != ms.PYNATIVE_MODE:
+            raise ValueError("Group offloading with streams is only supported in PyNative mode.")
+        stream = get_runtime().Stream()
+
+    if offload_type == "block_level":
+        if (num_blocks_per_group is None) == (max_group_bytes is None):
+            raise ValueError(
+                "Exactly one of `num_blocks_per_group` and `max_group_bytes` must be provided when using "
+                "`offload_type='block_level'`."
+            )
+        if num_blocks_per_group is not None and num_blocks_per_group < 1:
+            raise ValueError(f"`num_blocks_per_group` must be a positive integer, but got {num_blocks_per_group}.")
+        if max_group_bytes is not None and max_group_bytes < 1:
+            raise ValueError(f"`max_group_bytes` must be a positive integer, but got {max_group_bytes}.")
+        _apply_group_offloading_block_level(
+            module, num_blocks_per_group, max_group_bytes, offload_device, onload_device, non_blocking, stream
+        )
+    elif offload_type == "leaf_level":
+        _apply_group_offloading_leaf_level(module, offload_device, onload_device, non_blocking, stream)
+    else:
+        raise ValueError(f"Unsupported offload_type: {offload_type}")
+
+
+def _split_blocks_into_groups(
+    blocks: List[nn.Cell], num_blocks_per_group: Optional[int], max_group_bytes: Optional[int]
+) -> List[List[nn.Cell]]:
+    if num_blocks_per_group is not None:
+        return [blocks[i : i + num_blocks_per_group] for i in range(0, len(blocks), num_blocks_per_group)]
+
+    groups, current_group, current_bytes = [], [], 0
+    for block in blocks:
+        block_bytes = _get_cell_nbytes(block)
+        if block_bytes > max_group_bytes:
+            logger.warning(
+                f"A block of {block_bytes} bytes exceeds `max_group_bytes={max_group_bytes}` and is offloaded as a "
+                f"group of its own."
+            )
+        if current_group and current_bytes + block_bytes > max_group_bytes:
+            groups.append(current_group)
+            current_group, current_bytes = [], 0
+        current_group.append(block)
+        current_bytes += block_bytes
+    if current_group:
+        groups.append(current_group)
+    return groups
+
+
+def _apply_group_offloading_block_level(
+    module: nn.Cell,
+    num_blocks_per_group: Optional[int],
+    max_group_bytes: Optional[int],
+    offload_device: str,
+    onload_device: str,
+    non_blocking: bool,
+    stream=None,
+) -> None:
+    matched_module_groups = []
+    for submodule in module.name_cells().values():
+        if not isinstance(submodule, _SUPPORTED_BLOCK_TYPES):
+            continue
+        blocks = [block for block in submodule if _get_cell_nbytes(block) > 0]
+        for current_modules in _split_blocks_into_groups(blocks, num_blocks_per_group, max_group_bytes):
+            group = ModuleGroup(
+                modules=current_modules,
+                offload_device=offload_device,
+                onload_device=onload_device,
+                offload_leader=current_modules[-1],
+                onload_leader=current_modules[0],
+                stream=stream,
+                non_blocking=non_blocking,
+            )
+            matched_module_groups.append(group)
+
+    # Parameters that do not belong to any block (embeddings, final norms and projections, ...) form a group that
+    # is onloaded when the top-level cell is entered and offloaded when it returns.
+    matched_parameters: Set[int] = {id(param) for group in matched_module_groups for param in group.parameters}
+    unmatched_parameters = [param for param in module.get_parameters() if id(param) not in matched_parameters]
+    unmatched_group = ModuleGroup(
+        modules=[],
+        offload_device=offload_device,
+        onload_device=onload_device,
+        offload_leader=module,
+        onload_leader=module,
+        parameters=unmatched_parameters,
+        stream=stream,
+        non_blocking=non_blocking,
+    )
+
+    for group in matched_module_groups:
+        for group_module in group.modules:
+            _apply_group_offloading_hook(group_module, group)
+    _apply_group_offloading_hook(module, unmatched_group)
+
+    if stream is not None:
+        _apply_lazy_group_offloading_hook(module)
+
+
+def _apply_group_offloading_leaf_level(
+    module: nn.Cell,
+    offload_device: str,
+    onload_device: str,
+    non_blocking: bool,
+    stream=None,
+) -> None:
+    leaf_groups = []
+    for _, submodule in module.cells_and_names():
+        if submodule is module or submodule.name_cells() or not list(submodule.get_parameters(expand=False)):
+            continue
+        group = ModuleGroup(
+            modules=[submodule],
+            offload_device=offload_device,
+            onload_device=onload_device,
+            offload_leader=submodule,
+            onload_leader=submodule,
+            stream=stream,
+            non_blocking=non_blocking,
+        )
+        leaf_groups.append(group)
+
+    # Parameters owned directly by non-leaf cells (e.g. positional embeddings registered on a transformer) are
+    # handled by the top-level cell.
+    matched_parameters: Set[int] = {id(param) for group in leaf_groups for param in group.parameters}
+    unmatched_parameters = [param for param in module.get_parameters() if id(param) not in matched_parameters]
+    parent_group = ModuleGroup(
+        modules=[],
+        offload_device=offload_device,
+        onload_device=onload_device,
+        offload_leader=module,
+        onload_leader=module,
+        parameters=unmatched_parameters,
+        stream=stream,
+        non_blocking=non_blocking,
+    )
+
+    for group in leaf_groups:
+        _apply_group_offloading_hook(group.modules[0], group)
+    _apply_group_offloading_hook(module, parent_group)
+
+    if stream is not None:
+        _apply_lazy_group_offloading_hook(module)
+
+
+def _apply_group_offloading_hook(module: nn.Cell, group: ModuleGroup) -> None:
+    registry = HookRegistry.check_if_exists_or_initialize(module)
+
+    # A cell may already carry a hook of an enclosing group; do not override it
+    if registry.get_hook(_GROUP_OFFLOADING) is None:
+        hook = GroupOffloadingHook(group)
+        registry.register_hook(hook, _GROUP_OFFLOADING)
+
+
+def _apply_lazy_group_offloading_hook(module: nn.Cell) -> None:
+    registry = HookRegistry.check_if_exists_or_initialize(module)
+    registry.register_hook(LazyPrefetchGroupOffloadingHook(), _LAZY_PREFETCH_GROUP_OFFLOADING)
+
+
+def _is_group_offload_enabled(module: nn.Cell) -> bool:
+    for _, submodule in module.cells_and_names():
+        if hasattr(submodule, "_diffusers_hook") and submodule._diffusers_hook.get_hook(_GROUP_OFFLOADING) is not None:
+            return True
+    return False
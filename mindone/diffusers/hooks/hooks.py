@@ -0,0 +1,222 @@
+# Copyright 2024 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+from typing import Any, Dict, Optional, Tuple
+
+from mindspore import nn
+
+from ..utils.logging import get_logger
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+class ModelHook:
+    r"""
+    A hook that contains callbacks to be executed just before and after the `construct` method of a cell.
+
+    Hooks only take effect in PyNative mode, because they replace the bound `construct` of the cell instance.
+    """
+
+    _is_stateful = False
+
+    def __init__(self):
+        self.fn_ref: "HookFunctionReference" = None
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        r"""
+        Hook that is executed when a model is initialized.
+
+        Args:
+            module (`nn.Cell`):
+                The cell attached to this hook.
+        """
+        return module
+
+    def deinitalize_hook(self, module: nn.Cell) -> nn.Cell:
+        r"""
+        Hook that is executed when a model is deinitalized.
+
+        Args:
+            module (`nn.Cell`):
+                The cell attached to this hook.
+        """
+        return module
+
+    def pre_forward(self, module: nn.Cell, *args, **kwargs) -> Tuple[Tuple[Any], Dict[str, Any]]:
+        r"""
+        Hook that is executed just before the `construct` method of the cell.
+
+        Args:
+            module (`nn.Cell`):
+                The cell whose `construct` function will be executed just after this callback.
+            args (`Tuple[Any]`):
+                The positional arguments passed to the cell.
+            kwargs (`Dict[Str, Any]`):
+                The keyword arguments passed to the cell.
+        Returns:
+            `Tuple[Tuple[Any], Dict[Str, Any]]`:
+                A tuple with the treated `args` and `kwargs`.
+        """
+        return args, kwargs
+
+    def post_forward(self, module: nn.Cell, output: Any) -> Any:
+        r"""
+        Hook that is executed just after the `construct` method of the cell.
+
+        Args:
+            module (`nn.Cell`):
+                The cell whose `construct` function has been executed just before this callback.
+            output (`Any`):
+                The output of the cell.
+        Returns:
+            `Any`: The processed `output`.
+        """
+        return output
+
+    def detach_hook(self, module: nn.Cell) -> nn.Cell:
+        r"""
+        Hook that is executed when the hook is detached from a cell.
+
+        Args:
+            module (`nn.Cell`):
+                The cell detached from this hook.
+        """
+        return module
+
+    def reset_state(self, module: nn.Cell):
+        if self._is_stateful:
+            raise NotImplementedError("This hook is stateful and needs to implement the `reset_state` method.")
+        return module
+
+
+class HookFunctionReference:
+    def __init__(self) -> None:
+        """A container class that maintains mutable references to `construct` methods in a hook chain.
+
+        Each hook in the registry wraps the `construct` produced by the hook registered before it. Keeping both the
+        wrapped and the original functions in a mutable container lets a hook in the middle of the chain be removed
+        without breaking the hooks registered after it.
+
+        Attributes:
+            forward (`Callable`):
+                The forward function of the hook. This is wrapped by the next hook in the chain.
+            original_forward (`Callable`):
+                The `construct` that was in place before this hook was registered.
+        """
+        self.forward = None
+        self.original_forward = None
+
+
+class HookRegistry:
+    def __init__(self, module_ref: nn.Cell) -> None:
+        super().__init__()
+
+        self.hooks: Dict[str, ModelHook] = {}
+
+        self._module_ref = module_ref
+        self._hook_order = []
+        self._fn_refs = []
+
+    def register_hook(self, hook: ModelHook, name: str) -> None:
+        if name in self.hooks.keys():
+            raise ValueError(
+                f"Hook with name {name} already exists in the registry. Please use a different name or "
+                f"first remove the existing hook and then add a new one."
+            )
+
+        self._module_ref = hook.initialize_hook(self._module_ref)
+
+        def create_new_forward(function_reference: HookFunctionReference):
+            def new_forward(*args, **kwargs):
+                args, kwargs = hook.pre_forward(self._module_ref, *args, **kwargs)
+                output = function_reference.original_forward(*args, **kwargs)
+                return hook.post_forward(self._module_ref, output)
+
+            return new_forward
+
+        forward = self._module_ref.construct
+
+        fn_ref = HookFunctionReference()
+        fn_ref.original_forward = forward
+        fn_ref.forward = functools.update_wrapper(create_new_forward(fn_ref), forward)
+
+        hook.fn_ref = fn_ref
+        self.hooks[name] = hook
+        self._hook_order.append(name)
+        self._fn_refs.append(fn_ref)
+        self._module_ref.construct = fn_ref.forward
+
+    def get_hook(self, name: str) -> Optional[ModelHook]:
+        return self.hooks.get(name, None)
+
+    def remove_hook(self, name: str, recurse: bool = True) -> None:
+        if name in self.hooks.keys():
+            num_hooks = len(self._hook_order)
+            hook = self.hooks[name]
+            index = self._hook_order.index(name)
+            fn_ref = self._fn_refs[index]
+
+            old_forward = fn_ref.original_forward
+            if index == num_hooks - 1:
+                self._module_ref.construct = old_forward
+            else:
+                self._fn_refs[index + 1].original_forward = old_forward
+
+            self._module_ref = hook.deinitalize_hook(self._module_ref)
+            del self.hooks[name]
+            self._hook_order.pop(index)
+            self._fn_refs.pop(index)
+
+            if not self._hook_order:
+                # restore the class-level `construct` so that the cell can be compiled again
+                self._module_ref.__dict__.pop("construct", None)
+
+        if recurse:
+            for _, module in self._module_ref.cells_and_names():
+                if module is self._module_ref:
+                    continue
+                if hasattr(module, "_diffusers_hook"):
+                    module._diffusers_hook.remove_hook(name, recurse=False)
+
+    def reset_stateful_hooks(self, recurse: bool = True) -> None:
+        for hook_name in reversed(self._hook_order):
+            hook = self.hooks[hook_name]
+            if hook._is_stateful:
+                hook.reset_state(self._module_ref)
+
+        if recurse:
+            for _, module in self._module_ref.cells_and_names():
+                if module is self._module_ref:
+                    continue
+                if hasattr(module, "_diffusers_hook"):
+                    module._diffusers_hook.reset_stateful_hooks(recurse=False)
+
+    @classmethod
+    def check_if_exists_or_initialize(cls, module: nn.Cell) -> "HookRegistry":
+        if not hasattr(module, "_diffusers_hook"):
+            module._diffusers_hook = cls(module)
+        return module._diffusers_hook
+
+    def __repr__(self) -> str:
+        registry_repr = ""
+        for i, hook_name in enumerate(self._hook_order):
+            if self.hooks[hook_name].__class__.__repr__ is not object.__repr__:
+                hook_repr = self.hooks[hook_name].__repr__()
+            else:
+                hook_repr = self.hooks[hook_name].__class__.__name__
+            registry_repr += f"  ({i}) {hook_name} - {hook_repr}"
+            if i < len(self._hook_order) - 1:
+                registry_repr += "\n"
+        return f"HookRegistry(\n{registry_repr}\n)"
@@ -0,0 +1,196 @@
+# Copyright 2024 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+from typing import Optional, Tuple, Type, Union
+
+import mindspore as ms
+from mindspore import nn
+
+from ..utils.logging import get_logger
+from .hooks import HookRegistry, ModelHook
+
+logger = get_logger(__name__)  # pylint: disable=invalid-name
+
+
+_LAYERWISE_CASTING_HOOK = "layerwise_casting"
+SUPPORTED_MINDSPORE_LAYERS = (
+    nn.Conv1d,
+    nn.Conv2d,
+    nn.Conv3d,
+    nn.Conv1dTranspose,
+    nn.Conv2dTranspose,
+    nn.Conv3dTranspose,
+    nn.Dense,
+)
+
+DEFAULT_SKIP_MODULES_PATTERN = ("pos_embed", "patch_embed", "norm", "^proj_in$", "^proj_out$")
+
+
+def _cast_parameters(module: nn.Cell, dtype: ms.Type) -> None:
+    for param in module.get_parameters(expand=False):
+        if param.dtype != dtype:
+            # `set_dtype` casts the buffer of a parameter in place, which corrupts it once the parameter has been
+            # used, and `set_data` casts to the current dtype, so the data is replaced by the cast tensor
+            param._update_tensor_data(param.astype(dtype))
+
+
+class LayerwiseCastingHook(ModelHook):
+    r"""
+    A hook that casts the weights of a cell to a high precision dtype for computation, and to a low precision dtype
+    for storage. This process may lead to quality loss in the output, but can significantly reduce the memory
+    footprint.
+    """
+
+    _is_stateful = False
+
+    def __init__(self, storage_dtype: ms.Type, compute_dtype: ms.Type) -> None:
+        super().__init__()
+        self.storage_dtype = storage_dtype
+        self.compute_dtype = compute_dtype
+
+    def initialize_hook(self, module: nn.Cell) -> nn.Cell:
+        _cast_parameters(module, self.storage_dtype)
+        return module
+
+    def deinitalize_hook(self, module: nn.Cell) -> nn.Cell:
+        _cast_parameters(module, self.compute_dtype)
+        return module
+
+    def pre_forward(self, module: nn.Cell, *args, **kwargs):
+        _cast_parameters(module, self.compute_dtype)
+        return args, kwargs
+
+    def post_forward(self, module: nn.Cell, output):
+        _cast_parameters(module, self.storage_dtype)
+        return output
+
+
+def apply_layerwise_casting(
+    module: nn.Cell,
+    storage_dtype: ms.Type,
+    compute_dtype: ms.Type,
+    skip_modules_pattern: Union[str, Tuple[str, ...]] = "auto",
+    skip_modules_classes: Optional[Tuple[Type[nn.Cell], ...]] = None,
+) -> None:
+    r"""
+    Applies layerwise casting to a given cell. The cell expected here is a Diffusers ModelMixin but it can be any
+    `nn.Cell`.
+
+    The weights of the supported layers (`nn.Dense` and the convolution layers) are stored in `storage_dtype` and
+    upcast to `compute_dtype` just before the layer runs, one layer at a time, then cast back once it returns. Only
+    the layer being executed holds its weights in `compute_dtype`, so the weight memory is roughly halved when storing
+    `bfloat16`/`float16` weights in an 8-bit dtype. Layers are cast with hooks around `construct`, so this only takes
+    effect in PyNative mode.
+
+    Example:
+
+    ```python
+    >>> import mindspore as ms
+    >>> from mindone.diffusers import CogVideoXTransformer3DModel
+    >>> from mindone.diffusers.hooks import apply_layerwise_casting
+
+    >>> transformer = CogVideoXTransformer3DModel.from_pretrained(
+    ...     "THUDM/CogVideoX-5b", subfolder="transformer", mindspore_dtype=ms.bfloat16
+    ... )
+
+    >>> apply_layerwise_casting(
+    ...     transformer,
+    ...     storage_dtype=ms.float8_e4m3fn,
+    ...     compute_dtype=ms.bfloat16,
+    ...     skip_modules_pattern=["patch_embed", "norm", "proj_out"],
+    ... )
+    ```
+
+    Args:
+        module (`nn.Cell`):
+            The cell whose leaf layers will be cast to a high precision dtype for computation, and to a low precision
+            dtype for storage.
+        storage_dtype (`mindspore.Type`):
+            The dtype to cast the weights to for storage.
+        compute_dtype (`mindspore.Type`):
+            The dtype to cast the weights to during the forward pass.
+        skip_modules_pattern (`Tuple[str, ...]` or `str`, defaults to `"auto"`):
+            A list of patterns to match the names of the layers to skip during the layerwise casting process. If set
+            to `"auto"`, the default patterns are used. If set to `None`, no layers are skipped. If set to `None`
+            alongside `skip_modules_classes` being `None`, the layerwise casting is applied directly to the cell
+            instead of its internal layers.
+        skip_modules_classes (`Tuple[Type[nn.Cell], ...]`, *optional*):
+            A list of cell classes to skip during the layerwise casting process.
+    """
+    if skip_modules_pattern == "auto":
+        skip_modules_pattern = DEFAULT_SKIP_MODULES_PATTERN
+    if isinstance(skip_modules_pattern, str):
+        skip_modules_pattern = (skip_modules_pattern,)
+
+    if skip_modules_classes is None and skip_modules_pattern is None:
+        apply_layerwise_casting_hook(module, storage_dtype, compute_dtype)
+        return
+
+    _apply_layerwise_casting(
+        module,
+        storage_dtype,
+        compute_dtype,
+        skip_modules_pattern,
+        skip_modules_classes,
+    )
+
+
+def _apply_layerwise_casting(
+    module: nn.Cell,
+    storage_dtype: ms.Type,
+    compute_dtype: ms.Type,
+    skip_modules_pattern: Optional[Tuple[str, ...]] = None,
+    skip_modules_classes: Optional[Tuple[Type[nn.Cell], ...]] = None,
+    _prefix: str = "",
+) -> None:
+    should_skip = (skip_modules_classes is not None and isinstance(module, skip_modules_classes)) or (
+        skip_modules_pattern is not None and any(re.search(pattern, _prefix) for pattern in skip_modules_pattern)
+    )
+    if should_skip:
+        logger.debug(f'Skipping layerwise casting for layer "{_prefix}"')
+        return
+
+    if isinstance(module, SUPPORTED_MINDSPORE_LAYERS):
+        logger.debug(f'Applying layerwise casting to layer "{_prefix}"')
+        apply_layerwise_casting_hook(module, storage_dtype, compute_dtype)
+        return
+
+    for name, submodule in module.name_cells().items():
+        layer_name = f"{_prefix}.{name}" if _prefix else name
+        _apply_layerwise_casting(
+            submodule,
+            storage_dtype,
+            compute_dtype,
+            skip_modules_pattern,
+            skip_modules_classes,
+            _prefix=layer_name,
+        )
+
+
+def apply_layerwise_casting_hook(module: nn.Cell, storage_dtype: ms.Type, compute_dtype: ms.Type) -> None:
+    r"""
+    Applies a `LayerwiseCastingHook` to a given cell.
+
+    Args:
+        module (`nn.Cell`):
+            The cell to attach the hook to.
+        storage_dtype (`mindspore.Type`):
+            The dtype to cast the cell to before the forward pass.
+        compute_dtype (`mindspore.Type`):
+            The dtype to cast the cell to during the forward pass.
+    """
+    registry = HookRegistry.check_if_exists_or_initialize(module)
+    hook = LayerwiseCastingHook(storage_dtype, compute_dtype)
+    registry.register_hook(hook, _LAYERWISE_CASTING_HOOK)
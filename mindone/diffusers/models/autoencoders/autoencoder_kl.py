@@ -25,10 +25,10 @@ from ...utils import deprecate
 from ..attention_processor import CROSS_ATTENTION_PROCESSORS, AttentionProcessor, AttnProcessor
 from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
-from .vae import Decoder, DecoderOutput, DiagonalGaussianDistribution, Encoder
+from .vae import Decoder, DecoderOutput, DiagonalGaussianDistribution, Encoder, TileBatchingMixin, blend_tiles
 
 
-class AutoencoderKL(ModelMixin, ConfigMixin, FromOriginalModelMixin, PeftAdapterMixin):
+class AutoencoderKL(ModelMixin, ConfigMixin, FromOriginalModelMixin, PeftAdapterMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding images into latents and decoding latent representations into images.
 
@@ -323,16 +323,10 @@ class AutoencoderKL(ModelMixin, ConfigMixin, FromOriginalModelMixin, PeftAdapter
         return DecoderOutput(sample=decoded)
 
     def blend_v(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[2], b.shape[2], blend_extent)
-        for y in range(blend_extent):
-            b[:, :, y, :] = a[:, :, -blend_extent + y, :] * (1 - y / blend_extent) + b[:, :, y, :] * (y / blend_extent)
-        return b
+        return blend_tiles(a, b, blend_extent, axis=2)
 
     def blend_h(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[3], b.shape[3], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, :, x] = a[:, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, x] * (x / blend_extent)
-        return b
+        return blend_tiles(a, b, blend_extent, axis=3)
 
     def _tiled_encode(self, x: ms.Tensor) -> ms.Tensor:
         r"""Encode a batch of images using a tiled encoder.
@@ -443,6 +437,11 @@ class AutoencoderKL(ModelMixin, ConfigMixin, FromOriginalModelMixin, PeftAdapter
 
         return AutoencoderKLOutput(latent=moments)
 
+    def _decode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        if self.config["use_post_quant_conv"]:
+            tile = self.post_quant_conv(tile)
+        return self.decoder(tile)
+
     def tiled_decode(self, z: ms.Tensor, return_dict: bool = False) -> Union[DecoderOutput, ms.Tensor]:
         r"""
         Decode a batch of images using a tiled decoder.
@@ -467,12 +466,9 @@ class AutoencoderKL(ModelMixin, ConfigMixin, FromOriginalModelMixin, PeftAdapter
         for i in range(0, z.shape[2], overlap_size):
             row = []
             for j in range(0, z.shape[3], overlap_size):
-                tile = z[:, :, i : i + self.tile_latent_min_size, j : j + self.tile_latent_min_size]
-                if self.config["use_post_quant_conv"]:
-                    tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
-                row.append(decoded)
+                row.append(z[:, :, i : i + self.tile_latent_min_size, j : j + self.tile_latent_min_size])
             rows.append(row)
+        rows = self._decode_tiles(self._decode_tile, rows)
         result_rows = []
         for i, row in enumerate(rows):
             result_row = []
@@ -23,7 +23,7 @@ from mindspore import nn, ops
 
 from ...configuration_utils import ConfigMixin, register_to_config
 from ..attention_processor import Attention, SpatialNorm
-from ..autoencoders.vae import DecoderOutput, DiagonalGaussianDistribution
+from ..autoencoders.vae import DecoderOutput, DiagonalGaussianDistribution, TileBatchingMixin
 from ..downsampling import Downsample2D
 from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
@@ -747,7 +747,7 @@ class AllegroDecoder3D(nn.Cell):
         return sample
 
 
-class AutoencoderKLAllegro(ModelMixin, ConfigMixin):
+class AutoencoderKLAllegro(ModelMixin, ConfigMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding videos into latents and decoding latent representations into videos. Used in
     [Allegro](https://github.com/rhymes-ai/Allegro).
@@ -1062,7 +1062,6 @@ class AutoencoderKLAllegro(ModelMixin, ConfigMixin):
         return latent
 
     def tiled_decode(self, z: ms.Tensor) -> ms.Tensor:
-        local_batch_size = 1
         rs = self.spatial_compression_ratio
         rt = self.config["temporal_compression_ratio"]
 
@@ -1080,54 +1079,16 @@ class AutoencoderKLAllegro(ModelMixin, ConfigMixin):
         output_height = math.floor((height - latent_kernel[1]) / latent_stride[1]) + 1
         output_width = math.floor((width - latent_kernel[2]) / latent_stride[2]) + 1
 
-        count = 0
-        decoded_videos = z.new_zeros(
-            (
-                output_num_frames * output_height * output_width,
-                self.config["out_channels"],
-                self.kernel[0],
-                self.kernel[1],
-                self.kernel[2],
-            ),
-            dtype=z.dtype,
-        )
-        vae_batch_input = z.new_zeros(
-            (local_batch_size, num_channels, latent_kernel[0], latent_kernel[1], latent_kernel[2]), dtype=z.dtype
-        )
-
+        # all the tiles have the shape of the kernel, `_decode_tiles` batches them within the memory budget
+        latents = []
         for i in range(output_num_frames):
             for j in range(output_height):
                 for k in range(output_width):
                     n_start, n_end = i * latent_stride[0], i * latent_stride[0] + latent_kernel[0]
                     h_start, h_end = j * latent_stride[1], j * latent_stride[1] + latent_kernel[1]
                     w_start, w_end = k * latent_stride[2], k * latent_stride[2] + latent_kernel[2]
-
-                    current_latent = z[:, :, n_start:n_end, h_start:h_end, w_start:w_end]
-                    # In MS, if x.shape == y.shape, x[0] = y will result in an error, so we add `squeeze`.
-                    vae_batch_input[count % local_batch_size] = current_latent.squeeze()
-
-                    if (
-                        count % local_batch_size == local_batch_size - 1
-                        or count == output_num_frames * output_height * output_width - 1
-                    ):
-                        current_video = self.decoder(vae_batch_input)
-
-                        if (
-                            count == output_num_frames * output_height * output_width - 1
-                            and count % local_batch_size != local_batch_size - 1
-                        ):
-                            decoded_videos[count - count % local_batch_size :] = current_video[
-                                : count % local_batch_size + 1
-                            ]
-                        else:
-                            decoded_videos[count - local_batch_size + 1 : count + 1] = current_video
-
-                        vae_batch_input = z.new_zeros(
-                            (local_batch_size, num_channels, latent_kernel[0], latent_kernel[1], latent_kernel[2]),
-                            dtype=z.dtype,
-                        )
-
-                    count += 1
+                    latents.append(z[:, :, n_start:n_end, h_start:h_end, w_start:w_end])
+        decoded_videos = ops.cat(self._decode_tiles(self.decoder, [latents])[0])
 
         video = z.new_zeros(
             (batch_size, self.config["out_channels"], num_frames * rt, height * rs, width * rs), dtype=z.dtype
@@ -13,7 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Dict, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 
@@ -30,7 +30,7 @@ from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
 from ..normalization import GroupNorm
 from ..upsampling import CogVideoXUpsample3D
-from .vae import DecoderOutput, DiagonalGaussianDistribution
+from .vae import DecoderOutput, DiagonalGaussianDistribution, TileBatchingMixin, blend_tiles
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
 
@@ -944,7 +944,7 @@ class CogVideoXDecoder3D(nn.Cell):
         return hidden_states, new_conv_cache
 
 
-class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
+class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding images into latents and decoding latent representations into images. Used in
     [CogVideoX](https://github.com/THUDM/CogVideo).
@@ -1202,6 +1202,16 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
         if self.use_tiling and (width > self.tile_latent_min_width or height > self.tile_latent_min_height):
             return self.tiled_decode(z, return_dict=return_dict)
 
+        dec = self._decode_frame_batches(z)
+
+        if not return_dict:
+            return (dec,)
+
+        return DecoderOutput(sample=dec)
+
+    def _decode_frame_batches(self, z: ms.Tensor) -> ms.Tensor:
+        # decode `num_latent_frames_batch_size` latent frames at a time, carrying the causal conv cache
+        num_frames = z.shape[2]
         frame_batch_size = self.num_latent_frames_batch_size
         num_batches = max(num_frames // frame_batch_size, 1)
         conv_cache = None
@@ -1217,12 +1227,7 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
             z_intermediate, conv_cache = self.decoder(z_intermediate, conv_cache=conv_cache)
             dec.append(z_intermediate)
 
-        dec = ops.cat(dec, axis=2)
-
-        if not return_dict:
-            return (dec,)
-
-        return DecoderOutput(sample=dec)
+        return ops.cat(dec, axis=2)
 
     def decode(self, z: ms.Tensor, return_dict: bool = False) -> Union[DecoderOutput, ms.Tensor]:
         """
@@ -1249,20 +1254,10 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
         return DecoderOutput(sample=decoded)
 
     def blend_v(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[3], b.shape[3], blend_extent)
-        for y in range(blend_extent):
-            b[:, :, :, y, :] = a[:, :, :, -blend_extent + y, :] * (1 - y / blend_extent) + b[:, :, :, y, :] * (
-                y / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-2)
 
     def blend_h(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[4], b.shape[4], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, :, :, x] = a[:, :, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, :, x] * (
-                x / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-1)
 
     def tiled_encode(self, x: ms.Tensor) -> ms.Tensor:
         r"""Encode a batch of images using a tiled encoder.
@@ -1370,7 +1365,6 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
         blend_extent_width = int(self.tile_sample_min_width * self.tile_overlap_factor_width)
         row_limit_height = self.tile_sample_min_height - blend_extent_height
         row_limit_width = self.tile_sample_min_width - blend_extent_width
-        frame_batch_size = self.num_latent_frames_batch_size
 
         # Split z into overlapping tiles and decode them separately.
         # The tiles have an overlap to avoid seams between tiles.
@@ -1378,29 +1372,19 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
         for i in range(0, height, overlap_height):
             row = []
             for j in range(0, width, overlap_width):
-                num_batches = max(num_frames // frame_batch_size, 1)
-                conv_cache = None
-                time = []
+                row.append(z[:, :, :, i : i + self.tile_latent_min_height, j : j + self.tile_latent_min_width])
+            rows.append(row)
+        rows = self._decode_tiles(self._decode_frame_batches, rows)
+        dec = self._merge_tiles(rows, (blend_extent_height, blend_extent_width), (row_limit_height, row_limit_width))
 
-                for k in range(num_batches):
-                    remaining_frames = num_frames % frame_batch_size
-                    start_frame = frame_batch_size * k + (0 if k == 0 else remaining_frames)
-                    end_frame = frame_batch_size * (k + 1) + remaining_frames
-                    tile = z[
-                        :,
-                        :,
-                        start_frame:end_frame,
-                        i : i + self.tile_latent_min_height,
-                        j : j + self.tile_latent_min_width,
-                    ]
-                    if self.post_quant_conv is not None:
-                        tile = self.post_quant_conv(tile)
-                    tile, conv_cache = self.decoder(tile, conv_cache=conv_cache)
-                    time.append(tile)
+        if not return_dict:
+            return (dec,)
 
-                row.append(ops.cat(time, axis=2))
-            rows.append(row)
+        return DecoderOutput(sample=dec)
 
+    def _merge_tiles(
+        self, rows: List[List[ms.Tensor]], blend_extent: Tuple[int, int], row_limit: Tuple[int, int]
+    ) -> ms.Tensor:
         result_rows = []
         for i, row in enumerate(rows):
             result_row = []
@@ -1408,18 +1392,70 @@ class AutoencoderKLCogVideoX(ModelMixin, ConfigMixin, FromOriginalModelMixin):
                 # blend the above tile and the left tile
                 # to the current tile and add the current tile to the result row
                 if i > 0:
-                    tile = self.blend_v(rows[i - 1][j], tile, blend_extent_height)
+                    tile = self.blend_v(rows[i - 1][j], tile, blend_extent[0])
                 if j > 0:
-                    tile = self.blend_h(row[j - 1], tile, blend_extent_width)
-                result_row.append(tile[:, :, :, :row_limit_height, :row_limit_width])
+                    tile = self.blend_h(row[j - 1], tile, blend_extent[1])
+                result_row.append(tile[:, :, :, : row_limit[0], : row_limit[1]])
             result_rows.append(ops.cat(result_row, axis=4))
 
-        dec = ops.cat(result_rows, axis=3)
+        return ops.cat(result_rows, axis=3)
 
-        if not return_dict:
-            return (dec,)
+    def iter_decode(self, z: ms.Tensor) -> Iterator[ms.Tensor]:
+        r"""
+        Decode a batch of videos chunk by chunk along the frame dimension.
 
-        return DecoderOutput(sample=dec)
+        The latent frames are decoded `num_latent_frames_batch_size` at a time, as in [`~AutoencoderKLCogVideoX.decode`],
+        but the decoded frames of every chunk are yielded as soon as they are ready instead of being concatenated. With
+        tiling enabled, all the spatial tiles of a chunk are decoded, each with its own causal conv cache, and blended
+        before the chunk is yielded. The concatenation of the chunks along the frame dimension is the output of
+        [`~AutoencoderKLCogVideoX.decode`].
+
+        Args:
+            z (`ms.Tensor`): Input batch of latent vectors.
+
+        Returns:
+            `Iterator[ms.Tensor]`: The decoded frames of each chunk, of shape `(batch_size, num_channels, num_frames,
+            height, width)`.
+        """
+        batch_size, num_channels, num_frames, height, width = z.shape
+        use_tiling = self.use_tiling and (width > self.tile_latent_min_width or height > self.tile_latent_min_height)
+
+        if use_tiling:
+            overlap_height = int(self.tile_latent_min_height * (1 - self.tile_overlap_factor_height))
+            overlap_width = int(self.tile_latent_min_width * (1 - self.tile_overlap_factor_width))
+            blend_extent_height = int(self.tile_sample_min_height * self.tile_overlap_factor_height)
+            blend_extent_width = int(self.tile_sample_min_width * self.tile_overlap_factor_width)
+            blend_extent = (blend_extent_height, blend_extent_width)
+            row_limit = (
+                self.tile_sample_min_height - blend_extent_height,
+                self.tile_sample_min_width - blend_extent_width,
+            )
+            tile_size = (self.tile_latent_min_height, self.tile_latent_min_width)
+            positions = [[(i, j) for j in range(0, width, overlap_width)] for i in range(0, height, overlap_height)]
+        else:
+            tile_size, positions = (height, width), [[(0, 0)]]
+
+        frame_batch_size = self.num_latent_frames_batch_size
+        num_batches = max(num_frames // frame_batch_size, 1)
+        conv_caches = {}
+
+        for k in range(num_batches):
+            remaining_frames = num_frames % frame_batch_size
+            start_frame = frame_batch_size * k + (0 if k == 0 else remaining_frames)
+            end_frame = frame_batch_size * (k + 1) + remaining_frames
+
+            rows = []
+            for row_positions in positions:
+                row = []
+                for i, j in row_positions:
+                    tile = z[:, :, start_frame:end_frame, i : i + tile_size[0], j : j + tile_size[1]]
+                    if self.post_quant_conv is not None:
+                        tile = self.post_quant_conv(tile)
+                    tile, conv_caches[(i, j)] = self.decoder(tile, conv_cache=conv_caches.get((i, j)))
+                    row.append(tile)
+                rows.append(row)
+
+            yield self._merge_tiles(rows, blend_extent, row_limit) if use_tiling else rows[0][0]
 
     def construct(
         self,
@@ -12,7 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from typing import Optional, Tuple, Union
+from typing import Iterator, Optional, Tuple, Union
 
 import numpy as np
 
@@ -26,7 +26,7 @@ from ..attention_processor import Attention
 from ..layers_compat import pad, unflatten
 from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
-from .vae import DecoderOutput, DiagonalGaussianDistribution
+from .vae import DecoderOutput, DiagonalGaussianDistribution, TileBatchingMixin, blend_tiles
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
 
@@ -597,7 +597,7 @@ class HunyuanVideoDecoder3D(nn.Cell):
         return hidden_states
 
 
-class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
+class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding videos into latents and decoding latent representations into videos.
     Introduced in [HunyuanVideo](https://huggingface.co/papers/2412.03603).
@@ -854,28 +854,13 @@ class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
         return DecoderOutput(sample=decoded)
 
     def blend_v(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[-2], b.shape[-2], blend_extent)
-        for y in range(blend_extent):
-            b[:, :, :, y, :] = a[:, :, :, -blend_extent + y, :] * (1 - y / blend_extent) + b[:, :, :, y, :] * (
-                y / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-2)
 
     def blend_h(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[-1], b.shape[-1], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, :, :, x] = a[:, :, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, :, x] * (
-                x / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-1)
 
     def blend_t(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[-3], b.shape[-3], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, x, :, :] = a[:, :, -blend_extent + x, :, :] * (1 - x / blend_extent) + b[:, :, x, :, :] * (
-                x / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-3)
 
     def tiled_encode(self, x: ms.Tensor) -> AutoencoderKLOutput:
         r"""Encode a batch of images using a tiled encoder.
@@ -927,6 +912,10 @@ class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
         enc = ops.cat(result_rows, axis=3)[:, :, :, :latent_height, :latent_width]
         return enc
 
+    def _decode_tile(self, tile: ms.Tensor) -> ms.Tensor:
+        tile = self.post_quant_conv(tile)
+        return self.decoder(tile)
+
     def tiled_decode(self, z: ms.Tensor, return_dict: bool = False) -> Union[DecoderOutput, ms.Tensor]:
         r"""
         Decode a batch of images using a tiled decoder.
@@ -960,11 +949,9 @@ class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
         for i in range(0, height, tile_latent_stride_height):
             row = []
             for j in range(0, width, tile_latent_stride_width):
-                tile = z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width]
-                tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
-                row.append(decoded)
+                row.append(z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width])
             rows.append(row)
+        rows = self._decode_tiles(self._decode_tile, rows)
 
         result_rows = []
         for i, row in enumerate(rows):
@@ -1028,15 +1015,13 @@ class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
 
         row = []
         for i in range(0, num_frames, tile_latent_stride_num_frames):
-            tile = z[:, :, i : i + tile_latent_min_num_frames + 1, :, :]
-            if self.use_tiling and (tile.shape[-1] > tile_latent_min_width or tile.shape[-2] > tile_latent_min_height):
-                decoded = self.tiled_decode(tile, return_dict=True)[0]
-            else:
-                tile = self.post_quant_conv(tile)
-                decoded = self.decoder(tile)
-            if i > 0:
-                decoded = decoded[:, :, 1:, :, :]
-            row.append(decoded)
+            row.append(z[:, :, i : i + tile_latent_min_num_frames + 1, :, :])
+        if self.use_tiling and (width > tile_latent_min_width or height > tile_latent_min_height):
+            row = [self.tiled_decode(tile, return_dict=True)[0] for tile in row]
+        else:
+            # the temporal tiles are decoded independently, those of the same length can be batched
+            row = self._decode_tiles(self._decode_tile, [row])[0]
+        row = [decoded if i == 0 else decoded[:, :, 1:, :, :] for i, decoded in enumerate(row)]
 
         result_row = []
         for i, tile in enumerate(row):
@@ -1052,6 +1037,53 @@ class AutoencoderKLHunyuanVideo(ModelMixin, ConfigMixin):
             return (dec,)
         return DecoderOutput(sample=dec)
 
+    def iter_decode(self, z: ms.Tensor) -> Iterator[ms.Tensor]:
+        r"""
+        Decode a batch of videos chunk by chunk along the frame dimension.
+
+        With framewise decoding, the temporal tiles are decoded one after the other and the new frames of every tile
+        are yielded as soon as it is blended with the previous one, so that only two decoded tiles are alive at a
+        time. Otherwise the whole video is yielded as a single chunk. The concatenation of the chunks along the frame
+        dimension is the output of [`~AutoencoderKLHunyuanVideo.decode`].
+
+        Args:
+            z (`ms.Tensor`): Input batch of latent vectors.
+
+        Returns:
+            `Iterator[ms.Tensor]`: The decoded frames of each chunk, of shape `(batch_size, num_channels, num_frames,
+            height, width)`.
+        """
+        batch_size, num_channels, num_frames, height, width = z.shape
+        tile_latent_min_num_frames = self.tile_sample_min_num_frames // self.temporal_compression_ratio
+
+        if not (self.use_framewise_decoding and num_frames > tile_latent_min_num_frames):
+            yield self._decode(z)[0]
+            return
+
+        num_sample_frames = (num_frames - 1) * self.temporal_compression_ratio + 1
+        tile_latent_min_height = self.tile_sample_min_height // self.spatial_compression_ratio
+        tile_latent_min_width = self.tile_sample_min_width // self.spatial_compression_ratio
+        tile_latent_stride_num_frames = self.tile_sample_stride_num_frames // self.temporal_compression_ratio
+        blend_num_frames = self.tile_sample_min_num_frames - self.tile_sample_stride_num_frames
+        use_tiling = self.use_tiling and (width > tile_latent_min_width or height > tile_latent_min_height)
+
+        previous, num_decoded_frames = None, 0
+        for i in range(0, num_frames, tile_latent_stride_num_frames):
+            tile = z[:, :, i : i + tile_latent_min_num_frames + 1, :, :]
+            decoded = self.tiled_decode(tile, return_dict=True)[0] if use_tiling else self._decode_tile(tile)
+            if previous is None:
+                chunk = decoded[:, :, : self.tile_sample_stride_num_frames + 1, :, :]
+            else:
+                decoded = self.blend_t(previous, decoded[:, :, 1:, :, :], blend_num_frames)
+                chunk = decoded[:, :, : self.tile_sample_stride_num_frames, :, :]
+            previous = decoded
+
+            chunk = chunk[:, :, : num_sample_frames - num_decoded_frames]
+            if chunk.shape[2] == 0:
+                break
+            num_decoded_frames += chunk.shape[2]
+            yield chunk
+
     def construct(
         self,
         sample: ms.Tensor,
@@ -29,7 +29,7 @@ from ..layers_compat import unflatten
 from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
 from ..normalization import LayerNorm, RMSNorm
-from .vae import DecoderOutput, DiagonalGaussianDistribution
+from .vae import DecoderOutput, DiagonalGaussianDistribution, TileBatchingMixin, blend_tiles
 
 
 class LTXVideoCausalConv3d(nn.Cell):
@@ -839,7 +839,7 @@ class LTXVideoDecoder3d(nn.Cell):
         return hidden_states
 
 
-class AutoencoderKLLTXVideo(ModelMixin, ConfigMixin, FromOriginalModelMixin):
+class AutoencoderKLLTXVideo(ModelMixin, ConfigMixin, FromOriginalModelMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding images into latents and decoding latent representations into images. Used in
     [LTX](https://huggingface.co/Lightricks/LTX-Video).
@@ -1126,20 +1126,10 @@ class AutoencoderKLLTXVideo(ModelMixin, ConfigMixin, FromOriginalModelMixin):
         return DecoderOutput(sample=decoded)
 
     def blend_v(self, a: ops.Tensor, b: ops.Tensor, blend_extent: int) -> ops.Tensor:
-        blend_extent = min(a.shape[3], b.shape[3], blend_extent)
-        for y in range(blend_extent):
-            b[:, :, :, y, :] = a[:, :, :, -blend_extent + y, :] * (1 - y / blend_extent) + b[:, :, :, y, :] * (
-                y / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-2)
 
     def blend_h(self, a: ops.Tensor, b: ops.Tensor, blend_extent: int) -> ops.Tensor:
-        blend_extent = min(a.shape[4], b.shape[4], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, :, :, x] = a[:, :, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, :, x] * (
-                x / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-1)
 
     def tiled_encode(self, x: ops.Tensor) -> ops.Tensor:
         r"""Encode a batch of images using a tiled encoder.
@@ -1242,12 +1232,16 @@ class AutoencoderKLLTXVideo(ModelMixin, ConfigMixin, FromOriginalModelMixin):
                         "quality issues caused by splitting inference across frame dimension. If you believe this "
                         "should be possible, please submit a PR to https://github.com/huggingface/diffusers/pulls."
                     )
-                else:
-                    time = self.decoder(z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width], temb)
-
-                row.append(time)
+                row.append(z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width])
             rows.append(row)
 
+        def decode_fn(tiles: ms.Tensor) -> ms.Tensor:
+            # batched tiles are concatenated along the batch dimension, so is the timestep embedding
+            tiles_temb = temb if temb is None else ops.cat([temb] * (tiles.shape[0] // batch_size))
+            return self.decoder(tiles, tiles_temb)
+
+        rows = self._decode_tiles(decode_fn, rows)
+
         result_rows = []
         for i, row in enumerate(rows):
             result_row = []
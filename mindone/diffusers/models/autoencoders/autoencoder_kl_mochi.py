@@ -30,7 +30,7 @@ from ..modeling_outputs import AutoencoderKLOutput
 from ..modeling_utils import ModelMixin
 from ..normalization import GroupNorm
 from .autoencoder_kl_cogvideox import CogVideoXCausalConv3d
-from .vae import DecoderOutput, DiagonalGaussianDistribution
+from .vae import DecoderOutput, DiagonalGaussianDistribution, TileBatchingMixin, blend_tiles
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
 
@@ -693,7 +693,7 @@ class MochiDecoder3D(nn.Cell):
         return hidden_states, new_conv_cache
 
 
-class AutoencoderKLMochi(ModelMixin, ConfigMixin):
+class AutoencoderKLMochi(ModelMixin, ConfigMixin, TileBatchingMixin):
     r"""
     A VAE model with KL loss for encoding images into latents and decoding latent representations into images. Used in
     [Mochi 1 preview](https://github.com/genmoai/models).
@@ -957,11 +957,19 @@ class AutoencoderKLMochi(ModelMixin, ConfigMixin):
         if self.use_tiling and (width > tile_latent_min_width or height > tile_latent_min_height):
             return self.tiled_decode(z, return_dict=return_dict)
 
+        dec = self._decode_frames(z)
+
+        if not return_dict:
+            return (dec,)
+
+        return DecoderOutput(sample=dec)
+
+    def _decode_frames(self, z: ms.Tensor) -> ms.Tensor:
         if self.use_framewise_decoding:
             conv_cache = None
             dec = []
 
-            for i in range(0, num_frames, self.num_latent_frames_batch_size):
+            for i in range(0, z.shape[2], self.num_latent_frames_batch_size):
                 z_intermediate = z[:, :, i : i + self.num_latent_frames_batch_size]
                 z_intermediate, conv_cache = self.decoder(z_intermediate, conv_cache=conv_cache)
                 dec.append(z_intermediate)
@@ -972,11 +980,7 @@ class AutoencoderKLMochi(ModelMixin, ConfigMixin):
 
         if self.drop_last_temporal_frames and dec.shape[2] >= self.temporal_compression_ratio:
             dec = dec[:, :, self.temporal_compression_ratio - 1 :]
-
-        if not return_dict:
-            return (dec,)
-
-        return DecoderOutput(sample=dec)
+        return dec
 
     def decode(self, z: ms.Tensor, return_dict: bool = False) -> Union[DecoderOutput, ms.Tensor]:
         """
@@ -1004,20 +1008,10 @@ class AutoencoderKLMochi(ModelMixin, ConfigMixin):
         return DecoderOutput(sample=decoded)
 
     def blend_v(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[3], b.shape[3], blend_extent)
-        for y in range(blend_extent):
-            b[:, :, :, y, :] = a[:, :, :, -blend_extent + y, :] * (1 - y / blend_extent) + b[:, :, :, y, :] * (
-                y / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-2)
 
     def blend_h(self, a: ms.Tensor, b: ms.Tensor, blend_extent: int) -> ms.Tensor:
-        blend_extent = min(a.shape[4], b.shape[4], blend_extent)
-        for x in range(blend_extent):
-            b[:, :, :, :, x] = a[:, :, :, :, -blend_extent + x] * (1 - x / blend_extent) + b[:, :, :, :, x] * (
-                x / blend_extent
-            )
-        return b
+        return blend_tiles(a, b, blend_extent, axis=-1)
 
     def tiled_encode(self, x: ms.Tensor) -> ms.Tensor:
         r"""Encode a batch of images using a tiled encoder.
@@ -1109,30 +1103,9 @@ class AutoencoderKLMochi(ModelMixin, ConfigMixin):
         for i in range(0, height, tile_latent_stride_height):
             row = []
             for j in range(0, width, tile_latent_stride_width):
-                if self.use_framewise_decoding:
-                    time = []
-                    conv_cache = None
-
-                    for k in range(0, num_frames, self.num_latent_frames_batch_size):
-                        tile = z[
-                            :,
-                            :,
-                            k : k + self.num_latent_frames_batch_size,
-                            i : i + tile_latent_min_height,
-                            j : j + tile_latent_min_width,
-                        ]
-                        tile, conv_cache = self.decoder(tile, conv_cache=conv_cache)
-                        time.append(tile)
-
-                    time = ops.cat(time, axis=2)
-                else:
-                    time, _ = self.decoder(z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width])
-
-                if self.drop_last_temporal_frames and time.shape[2] >= self.temporal_compression_ratio:
-                    time = time[:, :, self.temporal_compression_ratio - 1 :]
-
-                row.append(time)
+                row.append(z[:, :, :, i : i + tile_latent_min_height, j : j + tile_latent_min_width])
             rows.append(row)
+        rows = self._decode_tiles(self._decode_frames, rows)
 
         result_rows = []
         for i, row in enumerate(rows):
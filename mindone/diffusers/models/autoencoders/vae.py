@@ -11,8 +11,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 
@@ -20,13 +22,17 @@ import mindspore as ms
 from mindspore import nn, ops
 from mindspore.common.initializer import Uniform
 
-from ...utils import BaseOutput
+from mindone.utils.version_control import get_runtime
+
+from ...utils import BaseOutput, logging
 from ...utils.mindspore_utils import randn_tensor
 from ..activations import get_activation
 from ..attention_processor import SpatialNorm
 from ..normalization import GroupNorm
 from ..unets.unet_2d_blocks import AutoencoderTinyBlock, UNetMidBlock2D, get_down_block, get_up_block
 
+logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
+
 
 @dataclass
 class EncoderOutput(BaseOutput):
@@ -911,3 +917,138 @@ class DecoderTinyUpsample(nn.Cell):
 
         out = ops.interpolate(x, size, None, self.mode, self.align_corners, self.recompute_scale_factor)
         return out
+
+
+@lru_cache(maxsize=64)
+def _get_blend_weights(blend_extent: int, ndim: int, axis: int, dtype: ms.Type) -> Tuple[ms.Tensor, ms.Tensor]:
+    # linear ramps `x / blend_extent` and `1 - x / blend_extent` along `axis`, broadcastable to the tiles
+    ramp = np.arange(blend_extent, dtype=np.float64) / blend_extent
+    shape = [1] * ndim
+    shape[axis] = blend_extent
+    weight = ms.Tensor(ramp.reshape(shape).astype(np.float32)).to(dtype)
+    inv_weight = ms.Tensor((1 - ramp).reshape(shape).astype(np.float32)).to(dtype)
+    return weight, inv_weight
+
+
+def blend_tiles(a: ms.Tensor, b: ms.Tensor, blend_extent: int, axis: int) -> ms.Tensor:
+    r"""
+    Blends the last `blend_extent` slices of tile `a` into the first ones of tile `b` along `axis` with a linear ramp,
+    in one vectorized update of `b` with precomputed weight masks. `b` is updated in place and returned.
+    """
+    axis = axis % b.ndim
+    blend_extent = min(a.shape[axis], b.shape[axis], blend_extent)
+    if blend_extent == 0:
+        return b
+    weight, inv_weight = _get_blend_weights(blend_extent, b.ndim, axis, b.dtype)
+    head = (slice(None),) * axis + (slice(0, blend_extent),)
+    tail = (slice(None),) * axis + (slice(a.shape[axis] - blend_extent, a.shape[axis]),)
+    b[head] = a[tail] * inv_weight + b[head] * weight
+    return b
+
+
+class TileBatchingMixin:
+    r"""
+    Mixin for the VAEs with a tiled decoder, decoding several tiles of the same shape in one call of the decoder.
+
+    Decoding the tiles one by one leaves the device mostly idle on small tiles. With tile batching enabled, the tiles
+    of a same shape are concatenated along the batch dimension and decoded together. The number of tiles per call is
+    chosen from a memory budget: the first tile of each shape is decoded alone to measure the peak memory of a decoder
+    call, then as many tiles as fit in the budget are batched.
+    """
+
+    _tile_memory_budget: Optional[int] = None
+    _max_tiles_per_batch: Optional[int] = None
+    _tiles_per_batch: Optional[dict] = None
+
+    def enable_tile_batching(self, memory_budget: int, max_tiles_per_batch: Optional[int] = None) -> None:
+        r"""
+        Enable the batching of the tiles of the tiled decoder, see [`~TileBatchingMixin`].
+
+        Args:
+            memory_budget (`int`):
+                The device memory, in bytes, that one call of the decoder may use.
+            max_tiles_per_batch (`int`, *optional*):
+                Upper bound on the number of tiles decoded in one call.
+        """
+        if memory_budget <= 0:
+            raise ValueError(f"`memory_budget` must be a positive number of bytes, but got {memory_budget}.")
+        if max_tiles_per_batch is not None and max_tiles_per_batch < 1:
+            raise ValueError(f"`max_tiles_per_batch` must be a positive integer, but got {max_tiles_per_batch}.")
+        self._tile_memory_budget = memory_budget
+        self._max_tiles_per_batch = max_tiles_per_batch
+        self._tiles_per_batch = {}
+
+    def disable_tile_batching(self) -> None:
+        r"""Disable the batching of tiles, the tiled decoder goes back to decoding the tiles one by one."""
+        self._tile_memory_budget = None
+        self._max_tiles_per_batch = None
+        self._tiles_per_batch = None
+
+    def _decode_tiles(
+        self, decode_fn: Callable[[ms.Tensor], ms.Tensor], rows: List[List[ms.Tensor]]
+    ) -> List[List[ms.Tensor]]:
+        r"""
+        Decodes the grid of latent tiles `rows` with `decode_fn`, batching the tiles of the same shape if tile
+        batching is enabled. Returns the grid of decoded tiles.
+        """
+        tiles = [tile for row in rows for tile in row]
+        decoded = [None] * len(tiles)
+
+        groups = OrderedDict()
+        for index, tile in enumerate(tiles):
+            groups.setdefault((tuple(tile.shape), tile.dtype), []).append(index)
+
+        for key, indices in groups.items():
+            start, tiles_per_batch = 0, 1
+            if self._tile_memory_budget is not None:
+                tiles_per_batch = self._tiles_per_batch.get(key)
+                if tiles_per_batch is None:
+                    decoded[indices[0]], tiles_per_batch = self._calibrate_tiles_per_batch(decode_fn, tiles[indices[0]])
+                    self._tiles_per_batch[key] = tiles_per_batch
+                    start = 1
+
+            for k in range(start, len(indices), tiles_per_batch):
+                chunk = indices[k : k + tiles_per_batch]
+                if len(chunk) == 1:
+                    outputs = [decode_fn(tiles[chunk[0]])]
+                else:
+                    outputs = decode_fn(ops.cat([tiles[index] for index in chunk])).split(tiles[chunk[0]].shape[0])
+                for index, output in zip(chunk, outputs):
+                    decoded[index] = output
+
+        decoded_rows, offset = [], 0
+        for row in rows:
+            decoded_rows.append(decoded[offset : offset + len(row)])
+            offset += len(row)
+        return decoded_rows
+
+    def _calibrate_tiles_per_batch(
+        self, decode_fn: Callable[[ms.Tensor], ms.Tensor], tile: ms.Tensor
+    ) -> Tuple[ms.Tensor, int]:
+        # decode one tile alone and measure the peak memory of the call
+        runtime = get_runtime()
+        try:
+            runtime.reset_peak_memory_stats()
+            memory_before = runtime.memory_allocated()
+        except (AttributeError, RuntimeError):
+            memory_before = None
+        decoded = decode_fn(tile)
+        tile_nbytes = 0
+        if memory_before is not None:
+            try:
+                runtime.synchronize()
+                tile_nbytes = runtime.max_memory_allocated() - memory_before
+            except (AttributeError, RuntimeError):
+                pass
+
+        if tile_nbytes <= 0:
+            # no memory statistics on this device, assume a decoder whose largest activations are two feature maps of
+            # the widest block at the output resolution
+            max_channels = max(self.config.get("block_out_channels", None) or (decoded.shape[1],))
+            tile_nbytes = 2 * decoded.nbytes // decoded.shape[1] * max_channels
+
+        tiles_per_batch = max(1, self._tile_memory_budget // tile_nbytes)
+        if self._max_tiles_per_batch is not None:
+            tiles_per_batch = min(tiles_per_batch, self._max_tiles_per_batch)
+        logger.debug(f"Decoding {tiles_per_batch} tiles of shape {tile.shape} per call, {tile_nbytes} bytes per tile.")
+        return decoded, tiles_per_batch
@@ -21,7 +21,7 @@ import re
 from collections import OrderedDict
 from functools import partial
 from pathlib import Path
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, List, Optional, Tuple, Type, Union
 
 from huggingface_hub import create_repo
 from huggingface_hub.utils import validate_hf_hub_args
@@ -138,6 +138,8 @@ class ModelMixin(nn.Cell, PushToHubMixin):
     _keys_to_ignore_on_load_unexpected = None
     _no_split_modules = None
     _keep_in_fp32_modules = None
+    _supports_group_offloading = True
+    _skip_layerwise_casting_patterns = None
 
     def __init__(self):
         super().__init__()
@@ -287,6 +289,136 @@ class ModelMixin(nn.Cell, PushToHubMixin):
         """
         self.set_use_memory_efficient_attention_xformers(False)
 
+    def enable_layerwise_casting(
+        self,
+        storage_dtype: Optional[ms.Type] = None,
+        compute_dtype: Optional[ms.Type] = None,
+        skip_modules_pattern: Optional[Tuple[str, ...]] = None,
+        skip_modules_classes: Optional[Tuple[Type[nn.Cell], ...]] = None,
+    ) -> None:
+        r"""
+        Activates layerwise casting for the current model.
+
+        Layerwise casting is a technique that casts the model weights to a lower precision dtype for storage but
+        upcasts them on-the-fly to a higher precision dtype for computation. This process can significantly reduce
+        the memory footprint from model weights, but may lead to some quality degradation in the outputs. Most
+        degradations are negligible, mostly stemming from weight casting in normalization and modulation layers.
+
+        By default, most models in diffusers set the `_skip_layerwise_casting_patterns` attribute to ignore patch
+        embedding, positional embedding and normalization layers. This is because these layers are most likely
+        precision-critical for quality. If you wish to change this behavior, you can set the
+        `_skip_layerwise_casting_patterns` attribute to `None`, or call
+        [`~hooks.layerwise_casting.apply_layerwise_casting`] with custom arguments.
+
+        Example:
+            Using [`~models.ModelMixin.enable_layerwise_casting`]:
+
+            ```python
+            >>> import mindspore as ms
+            >>> from mindone.diffusers import CogVideoXTransformer3DModel
+
+            >>> transformer = CogVideoXTransformer3DModel.from_pretrained(
+            ...     "THUDM/CogVideoX-5b", subfolder="transformer", mindspore_dtype=ms.bfloat16
+            ... )
+
+            >>> # Enable layerwise casting via the model, which ignores certain modules by default
+            >>> transformer.enable_layerwise_casting(storage_dtype=ms.float8_e4m3fn, compute_dtype=ms.bfloat16)
+            ```
+
+        Args:
+            storage_dtype (`mindspore.Type`, *optional*):
+                The dtype to which the model should be cast for storage. Defaults to `mindspore.float8_e4m3fn` when
+                the installed MindSpore provides it.
+            compute_dtype (`mindspore.Type`, *optional*):
+                The dtype to which the model weights should be cast during the forward pass. Defaults to the dtype
+                of the model.
+            skip_modules_pattern (`Tuple[str, ...]`, *optional*):
+                A list of patterns to match the names of the layers to skip during the layerwise casting process. If
+                set to `None`, default skip patterns are used to ignore certain internal layers of modules and PEFT
+                layers.
+            skip_modules_classes (`Tuple[Type[nn.Cell], ...]`, *optional*):
+                A list of cell classes to skip during the layerwise casting process.
+        """
+        from ..hooks import apply_layerwise_casting
+
+        if storage_dtype is None:
+            storage_dtype = getattr(ms, "float8_e4m3fn", None)
+            if storage_dtype is None:
+                raise ValueError(
+                    f"The installed MindSpore {ms.__version__} does not provide `float8_e4m3fn`, please pass "
+                    f"`storage_dtype` explicitly."
+                )
+
+        user_provided_patterns = True
+        if skip_modules_pattern is None:
+            from ..hooks.layerwise_casting import DEFAULT_SKIP_MODULES_PATTERN
+
+            skip_modules_pattern = DEFAULT_SKIP_MODULES_PATTERN
+            user_provided_patterns = False
+        if self._keep_in_fp32_modules is not None:
+            skip_modules_pattern += tuple(self._keep_in_fp32_modules)
+        if self._skip_layerwise_casting_patterns is not None:
+            skip_modules_pattern += tuple(self._skip_layerwise_casting_patterns)
+        skip_modules_pattern = tuple(set(skip_modules_pattern))
+
+        if not user_provided_patterns:
+            # LoRA layers are small and precision-sensitive, keep them in the compute dtype.
+            skip_modules_pattern += ("lora_A", "lora_B", "lora_dropout", "lora_embedding_A", "lora_embedding_B")
+
+        if compute_dtype is None:
+            logger.info("`compute_dtype` not provided when enabling layerwise casting. Using dtype of the model.")
+            compute_dtype = self.dtype
+
+        apply_layerwise_casting(self, storage_dtype, compute_dtype, skip_modules_pattern, skip_modules_classes)
+
+    def enable_group_offload(
+        self,
+        offload_type: str = "block_level",
+        num_blocks_per_group: Optional[int] = None,
+        max_group_bytes: Optional[int] = None,
+        onload_device: Optional[str] = None,
+        offload_device: str = "CPU",
+        non_blocking: bool = False,
+        use_stream: bool = False,
+    ) -> None:
+        r"""
+        Activates group offloading for the current model.
+
+        The weights of groups of blocks are kept in host memory and copied to the device right before the group
+        runs. With `use_stream=True`, the group executed next is prefetched on a side stream so that the copy
+        overlaps with compute. See [`~hooks.group_offloading.apply_group_offloading`] for more information.
+
+        Example:
+
+        ```python
+        >>> import mindspore as ms
+        >>> from mindone.diffusers import CogVideoXTransformer3DModel
+
+        >>> transformer = CogVideoXTransformer3DModel.from_pretrained(
+        ...     "THUDM/CogVideoX-5b", subfolder="transformer", mindspore_dtype=ms.bfloat16
+        ... )
+
+        >>> transformer.enable_group_offload(offload_type="block_level", num_blocks_per_group=2, use_stream=True)
+        ```
+        """
+        from ..hooks import apply_group_offloading
+
+        if not self._supports_group_offloading:
+            raise ValueError(
+                f"{self.__class__.__name__} does not support group offloading. Please make sure to set the boolean "
+                f"attribute `_supports_group_offloading` to `True` in the class definition."
+            )
+        apply_group_offloading(
+            self,
+            offload_type=offload_type,
+            num_blocks_per_group=num_blocks_per_group,
+            max_group_bytes=max_group_bytes,
+            onload_device=onload_device,
+            offload_device=offload_device,
+            non_blocking=non_blocking,
+            use_stream=use_stream,
+        )
+
     def save_pretrained(
         self,
         save_directory: Union[str, os.PathLike],
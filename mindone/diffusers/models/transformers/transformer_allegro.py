@@ -172,6 +172,7 @@ class AllegroTransformerBlock(nn.Cell):
 
 class AllegroTransformer3DModel(ModelMixin, ConfigMixin):
     _supports_gradient_checkpointing = True
+    _skip_layerwise_casting_patterns = ["pos_embed", "norm", "adaln_single"]
 
     """
     A 3D Transformer model for video-like data.
@@ -77,6 +77,7 @@ _import_structure = {
         "FluxPipeline",
         "FluxPriorReduxPipeline",
     ],
+    "guidance_utils": ["ClassifierFreeGuidance"],
     "hunyuandit": ["HunyuanDiTPipeline"],
     "hunyuan_video": ["HunyuanVideoPipeline"],
     "i2vgen_xl": ["I2VGenXLPipeline"],
@@ -224,6 +225,7 @@ _import_structure = {
         "ImagePipelineOutput",
         "StableDiffusionMixin",
     ],
+    "prompt_embeds_cache": ["PromptEmbedsCache"],
 }
 
 if TYPE_CHECKING:
@@ -289,6 +291,7 @@ if TYPE_CHECKING:
         FluxPipeline,
         FluxPriorReduxPipeline,
     )
+    from .guidance_utils import ClassifierFreeGuidance
     from .hunyuan_video import HunyuanVideoPipeline
     from .hunyuandit import HunyuanDiTPipeline
     from .i2vgen_xl import I2VGenXLPipeline
@@ -352,6 +355,7 @@ if TYPE_CHECKING:
     from .pia import PIAPipeline
     from .pipeline_utils import AudioPipelineOutput, DiffusionPipeline, ImagePipelineOutput, StableDiffusionMixin
     from .pixart_alpha import PixArtAlphaPipeline, PixArtSigmaPipeline
+    from .prompt_embeds_cache import PromptEmbedsCache
     from .sana import SanaPipeline
     from .semantic_stable_diffusion import SemanticStableDiffusionPipeline
     from .shap_e import ShapEImg2ImgPipeline, ShapEPipeline
@@ -15,7 +15,7 @@
 
 import inspect
 import math
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 from transformers import T5Tokenizer
@@ -29,6 +29,7 @@ from ...loaders import CogVideoXLoraLoaderMixin
 from ...models import AutoencoderKLCogVideoX, CogVideoXTransformer3DModel
 from ...models.embeddings import get_3d_rotary_pos_embed
 from ...pipelines.pipeline_utils import DiffusionPipeline
+from ...pipelines.prompt_embeds_cache import cache_prompt_embeds
 from ...schedulers import CogVideoXDDIMScheduler, CogVideoXDPMScheduler
 from ...utils import logging, scale_lora_layers, unscale_lora_layers
 from ...utils.mindspore_utils import pynative_context, randn_tensor
@@ -194,6 +195,7 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
 
         self.video_processor = VideoProcessor(vae_scale_factor=self.vae_scale_factor_spatial)
 
+    @cache_prompt_embeds("text_encoder")
     def _get_t5_prompt_embeds(
         self,
         prompt: Union[str, List[str]] = None,
@@ -342,6 +344,27 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
             frames = self.vae.decode(latents)[0]
         return frames
 
+    def iter_decode_latents(self, latents: ms.Tensor) -> Iterator[ms.Tensor]:
+        r"""
+        Streaming version of `decode_latents`: yields the decoded frames chunk by chunk, see
+        [`~AutoencoderKLCogVideoX.iter_decode`].
+
+        Examples:
+
+        ```py
+        >>> from mindone.diffusers.utils import export_to_video_stream
+
+        >>> latents = pipe(prompt, output_type="latent")[0]
+        >>> chunks = pipe.video_processor.postprocess_video_stream(pipe.iter_decode_latents(latents))
+        >>> export_to_video_stream(chunks, "output.mp4", fps=8)
+        ```
+        """
+        latents = latents.permute(0, 2, 1, 3, 4)  # [batch_size, num_channels, num_frames, height, width]
+        latents = 1 / self.vae_scaling_factor_image * latents
+        # vae decode only support pynative
+        with pynative_context():
+            yield from self.vae.iter_decode(latents)
+
     # Copied from diffusers.pipelines.stable_diffusion.pipeline_stable_diffusion.StableDiffusionPipeline.prepare_extra_step_kwargs
     def prepare_extra_step_kwargs(self, generator, eta):
         # prepare extra kwargs for the scheduler step, since not all schedulers have the same signature
@@ -683,6 +706,7 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
         # 8. Denoising loop
         num_warmup_steps = max(len(timesteps) - num_inference_steps * self.scheduler.order, 0)
 
+        guidance = self._prepare_guidance(timesteps)
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             # for DPM-solver++
             old_pred_original_sample = None
@@ -690,7 +714,8 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
                 if self.interrupt:
                     continue
 
-                latent_model_input = ops.cat([latents] * 2) if do_classifier_free_guidance else latents
+                guidance.run_uncond(i, do_classifier_free_guidance)
+                latent_model_input = guidance.expand(latents)
                 latent_model_input = self.scheduler.scale_model_input(latent_model_input, t)
 
                 # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
@@ -699,7 +724,7 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
                 # predict noise model_output
                 noise_pred = self.transformer(
                     hidden_states=latent_model_input,
-                    encoder_hidden_states=prompt_embeds,
+                    encoder_hidden_states=guidance.select(prompt_embeds),
                     timestep=timestep,
                     image_rotary_emb=image_rotary_emb,
                     attention_kwargs=attention_kwargs,
@@ -712,9 +737,7 @@ class CogVideoXPipeline(DiffusionPipeline, CogVideoXLoraLoaderMixin):
                     self._guidance_scale = 1 + guidance_scale * (
                         (1 - math.cos(math.pi * ((num_inference_steps - t.item()) / num_inference_steps) ** 5.0)) / 2
                     )
-                if do_classifier_free_guidance:
-                    noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
-                    noise_pred = noise_pred_uncond + self.guidance_scale * (noise_pred_text - noise_pred_uncond)
+                noise_pred, _ = guidance.guide(i, noise_pred, self.guidance_scale)
 
                 # compute the previous noisy sample x_t -> x_t-1
                 if not isinstance(self.scheduler, CogVideoXDPMScheduler):
@@ -31,6 +31,7 @@ from ...schedulers import FlowMatchEulerDiscreteScheduler
 from ...utils import logging, scale_lora_layers, unscale_lora_layers
 from ...utils.mindspore_utils import randn_tensor
 from ..pipeline_utils import DiffusionPipeline
+from ..prompt_embeds_cache import cache_prompt_embeds
 from .pipeline_output import FluxPipelineOutput
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
@@ -194,6 +195,7 @@ class FluxPipeline(
         )
         self.default_sample_size = 128
 
+    @cache_prompt_embeds("text_encoder_2")
     def _get_t5_prompt_embeds(
         self,
         prompt: Union[str, List[str]] = None,
@@ -243,6 +245,7 @@ class FluxPipeline(
 
         return prompt_embeds
 
+    @cache_prompt_embeds("text_encoder")
     def _get_clip_prompt_embeds(
         self,
         prompt: Union[str, List[str]],
@@ -832,43 +835,68 @@ class FluxPipeline(
             )
 
         # 6. Denoising loop
+        cfg = self._prepare_guidance(timesteps)
+        # the negative branch is batched with the positive one when both take inputs of the same shapes
+        batch_true_cfg = (
+            do_true_cfg
+            and image_embeds is None
+            and negative_image_embeds is None
+            and negative_prompt_embeds.shape == prompt_embeds.shape
+        )
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
-                if image_embeds is not None:
-                    self._joint_attention_kwargs["ip_adapter_image_embeds"] = image_embeds
-                # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
-                timestep = t.broadcast_to((latents.shape[0],)).to(latents.dtype)
-
-                noise_pred = self.transformer(
-                    hidden_states=latents,
-                    timestep=timestep / 1000,
-                    guidance=guidance,
-                    pooled_projections=pooled_prompt_embeds,
-                    encoder_hidden_states=prompt_embeds,
-                    txt_ids=text_ids,
-                    img_ids=latent_image_ids,
-                    joint_attention_kwargs=self.joint_attention_kwargs,
-                    return_dict=False,
-                )[0]
-
-                if do_true_cfg:
-                    if negative_image_embeds is not None:
-                        self._joint_attention_kwargs["ip_adapter_image_embeds"] = negative_image_embeds
-                    neg_noise_pred = self.transformer(
+                run_uncond = cfg.run_uncond(i, do_true_cfg)
+                if run_uncond and batch_true_cfg:
+                    timestep = t.broadcast_to((2 * latents.shape[0],)).to(latents.dtype)
+                    noise_pred = self.transformer(
+                        hidden_states=ops.cat([latents] * 2),
+                        timestep=timestep / 1000,
+                        guidance=ops.cat([guidance] * 2) if guidance is not None else None,
+                        pooled_projections=ops.cat([negative_pooled_prompt_embeds, pooled_prompt_embeds]),
+                        encoder_hidden_states=ops.cat([negative_prompt_embeds, prompt_embeds]),
+                        txt_ids=text_ids,
+                        img_ids=latent_image_ids,
+                        joint_attention_kwargs=self.joint_attention_kwargs,
+                        return_dict=False,
+                    )[0]
+                    noise_pred, _ = cfg.guide(i, noise_pred, true_cfg_scale)
+                else:
+                    if image_embeds is not None:
+                        self._joint_attention_kwargs["ip_adapter_image_embeds"] = image_embeds
+                    # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
+                    timestep = t.broadcast_to((latents.shape[0],)).to(latents.dtype)
+
+                    noise_pred = self.transformer(
                         hidden_states=latents,
                         timestep=timestep / 1000,
                         guidance=guidance,
-                        pooled_projections=negative_pooled_prompt_embeds,
-                        encoder_hidden_states=negative_prompt_embeds,
+                        pooled_projections=pooled_prompt_embeds,
+                        encoder_hidden_states=prompt_embeds,
                         txt_ids=text_ids,
                         img_ids=latent_image_ids,
                         joint_attention_kwargs=self.joint_attention_kwargs,
                         return_dict=False,
                     )[0]
-                    noise_pred = neg_noise_pred + true_cfg_scale * (noise_pred - neg_noise_pred)
+
+                    neg_noise_pred = None
+                    if run_uncond:
+                        if negative_image_embeds is not None:
+                            self._joint_attention_kwargs["ip_adapter_image_embeds"] = negative_image_embeds
+                        neg_noise_pred = self.transformer(
+                            hidden_states=latents,
+                            timestep=timestep / 1000,
+                            guidance=guidance,
+                            pooled_projections=negative_pooled_prompt_embeds,
+                            encoder_hidden_states=negative_prompt_embeds,
+                            txt_ids=text_ids,
+                            img_ids=latent_image_ids,
+                            joint_attention_kwargs=self.joint_attention_kwargs,
+                            return_dict=False,
+                        )[0]
+                    noise_pred, _ = cfg.guide(i, noise_pred, true_cfg_scale, noise_pred_uncond=neg_noise_pred)
 
                 # compute the previous noisy sample x_t -> x_t-1
                 latents_dtype = latents.dtype
@@ -0,0 +1,219 @@
+# Copyright 2024 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import ops
+
+from ..utils import logging
+
+logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
+
+
+class ClassifierFreeGuidance:
+    r"""
+    Shared classifier-free guidance (CFG) engine of the denoising loops.
+
+    By default the conditional and unconditional branches are evaluated in one batched call of the denoiser on every
+    step, which is the usual CFG. The engine can skip the unconditional half of the batch on some steps:
+
+    - guidance interval: CFG is only applied to the steps whose timestep lies in `[t0, t1]`; the other steps only
+      run the conditional branch. Guidance is mostly useful in the middle of the noise levels
+      ([Kynkäänniemi et al., 2024](https://arxiv.org/abs/2404.07724)).
+    - stale unconditional reuse: the unconditional branch is only evaluated every `uncond_reuse_interval` guided
+      steps, the steps in between reuse the last unconditional prediction.
+    - adaptive guidance truncation: once the cosine similarity between the conditional and unconditional predictions
+      exceeds `adaptive_guidance_threshold`, guidance is turned off for the remaining steps
+      ([Castillo et al., 2023](https://arxiv.org/abs/2312.12487)).
+
+    Each skipped unconditional branch halves the batch of the denoiser for that step.
+
+    The engine is stateful: pipelines call [`~ClassifierFreeGuidance.prepare`] before their denoising loop, then for
+    every step [`~ClassifierFreeGuidance.run_uncond`], [`~ClassifierFreeGuidance.expand`]/
+    [`~ClassifierFreeGuidance.select`] to build the inputs and [`~ClassifierFreeGuidance.guide`] to combine the
+    predictions.
+
+    Args:
+        guidance_interval (`Tuple[float, float]`, *optional*):
+            The interval of timesteps `(t0, t1)`, in the units of the scheduler timesteps (`[0, 1000]` for the
+            discrete and flow-matching schedulers), in which CFG is applied. CFG is applied on every step if `None`.
+        uncond_reuse_interval (`int`, defaults to 1):
+            The unconditional branch is evaluated every `uncond_reuse_interval` guided steps. `1` evaluates it on
+            every guided step.
+        adaptive_guidance_threshold (`float`, *optional*):
+            Cosine similarity between the conditional and unconditional predictions above which guidance is
+            truncated for the remaining steps. Checking the similarity needs one host synchronization per batched
+            step. Disabled if `None`.
+
+    Examples:
+
+    ```py
+    >>> import mindspore as ms
+    >>> from mindone.diffusers import ClassifierFreeGuidance, StableDiffusionXLPipeline
+
+    >>> pipe = StableDiffusionXLPipeline.from_pretrained(
+    ...     "stabilityai/stable-diffusion-xl-base-1.0", mindspore_dtype=ms.float16
+    ... )
+    >>> pipe.set_guidance(ClassifierFreeGuidance(guidance_interval=(200, 900), uncond_reuse_interval=2))
+    >>> image = pipe("An astronaut riding a green horse")[0][0]
+    ```
+    """
+
+    def __init__(
+        self,
+        guidance_interval: Optional[Tuple[float, float]] = None,
+        uncond_reuse_interval: int = 1,
+        adaptive_guidance_threshold: Optional[float] = None,
+    ):
+        if guidance_interval is not None and guidance_interval[0] > guidance_interval[1]:
+            raise ValueError(
+                f"`guidance_interval` must be an interval `(t0, t1)` with t0 <= t1, got {guidance_interval}."
+            )
+        if uncond_reuse_interval < 1:
+            raise ValueError(f"`uncond_reuse_interval` must be a positive integer, but got {uncond_reuse_interval}.")
+        if adaptive_guidance_threshold is not None and not -1.0 <= adaptive_guidance_threshold <= 1.0:
+            raise ValueError(
+                f"`adaptive_guidance_threshold` is a cosine similarity in [-1, 1], but got {adaptive_guidance_threshold}."
+            )
+        self.guidance_interval = guidance_interval
+        self.uncond_reuse_interval = uncond_reuse_interval
+        self.adaptive_guidance_threshold = adaptive_guidance_threshold
+        self.prepare([])
+
+    @property
+    def is_default(self) -> bool:
+        r"""Whether the engine runs plain CFG, i.e. both branches on every step."""
+        return (
+            self.guidance_interval is None
+            and self.uncond_reuse_interval == 1
+            and self.adaptive_guidance_threshold is None
+        )
+
+    def prepare(self, timesteps: Union[ms.Tensor, np.ndarray, List[float]]) -> None:
+        r"""
+        Resets the state of the engine for a new denoising loop over `timesteps`.
+
+        The timesteps are read once here, so that the per-step decisions do not need any host synchronization.
+        """
+        if self.guidance_interval is None:
+            self._in_interval = np.ones(len(timesteps), dtype=bool)
+        else:
+            if isinstance(timesteps, ms.Tensor):
+                timesteps = timesteps.float().asnumpy()
+            timesteps = np.asarray(timesteps, dtype=np.float64)
+            t0, t1 = self.guidance_interval
+            self._in_interval = (timesteps >= t0) & (timesteps <= t1)
+
+        self._enabled = True
+        self._run_uncond = False
+        self._truncated = False
+        self._num_guided_steps = 0
+        self._last_noise_pred_uncond = None
+        self.num_cond_evaluations = 0
+        self.num_uncond_evaluations = 0
+
+    def is_guided(self, step_index: int) -> bool:
+        r"""Whether guidance is applied on step `step_index`."""
+        if not self._enabled or self._truncated:
+            return False
+        return step_index >= len(self._in_interval) or bool(self._in_interval[step_index])
+
+    def run_uncond(self, step_index: int, enabled: bool = True) -> bool:
+        r"""
+        Decides whether the unconditional branch is evaluated on step `step_index`.
+
+        Args:
+            step_index (`int`):
+                The index of the denoising step.
+            enabled (`bool`, defaults to `True`):
+                Whether the pipeline does classifier-free guidance at this step at all, e.g.
+                `pipeline.do_classifier_free_guidance`. Callbacks may turn it off in the middle of the loop.
+        """
+        self._enabled = enabled
+        if not self.is_guided(step_index):
+            self._run_uncond = False
+        else:
+            self._run_uncond = (
+                self._last_noise_pred_uncond is None or self._num_guided_steps % self.uncond_reuse_interval == 0
+            )
+        return self._run_uncond
+
+    def expand(self, latents: ms.Tensor) -> ms.Tensor:
+        r"""Duplicates `latents` along the batch dimension if both branches are evaluated on the current step."""
+        return ops.cat([latents] * 2) if self._run_uncond else latents
+
+    def select(self, *tensors: Optional[ms.Tensor]):
+        r"""
+        Keeps the conditional half of batched `[uncond, cond]` inputs (prompt embeddings, added conditions, ...) when
+        only the conditional branch is evaluated on the current step. `None` inputs are passed through.
+        """
+        if self._enabled and not self._run_uncond:
+            tensors = tuple(tensor[tensor.shape[0] // 2 :] if tensor is not None else None for tensor in tensors)
+        return tensors if len(tensors) != 1 else tensors[0]
+
+    def guide(
+        self,
+        step_index: int,
+        noise_pred: ms.Tensor,
+        guidance_scale: float,
+        noise_pred_uncond: Optional[ms.Tensor] = None,
+    ) -> Tuple[ms.Tensor, ms.Tensor]:
+        r"""
+        Combines the predictions of the current step.
+
+        Args:
+            step_index (`int`):
+                The index of the denoising step.
+            noise_pred (`ms.Tensor`):
+                The output of the denoiser. It is the batched `[uncond, cond]` prediction if both branches were
+                evaluated in one call, otherwise the conditional prediction.
+            guidance_scale (`float`):
+                The guidance scale of the current step.
+            noise_pred_uncond (`ms.Tensor`, *optional*):
+                The unconditional prediction, for pipelines that evaluate the branches in separate calls.
+
+        Returns:
+            `Tuple[ms.Tensor, ms.Tensor]`: The guided prediction and the conditional prediction.
+        """
+        if self._run_uncond:
+            if noise_pred_uncond is None:
+                noise_pred_uncond, noise_pred = noise_pred.chunk(2)
+            self.num_cond_evaluations += 1
+            self.num_uncond_evaluations += 1
+            self._last_noise_pred_uncond = noise_pred_uncond
+            self._num_guided_steps += 1
+            guided = noise_pred_uncond + guidance_scale * (noise_pred - noise_pred_uncond)
+            self._maybe_truncate(step_index, noise_pred, noise_pred_uncond)
+            return guided, noise_pred
+
+        self.num_cond_evaluations += 1
+        if self.is_guided(step_index):
+            # reuse the stale unconditional prediction
+            self._num_guided_steps += 1
+            noise_pred_uncond = self._last_noise_pred_uncond
+            return noise_pred_uncond + guidance_scale * (noise_pred - noise_pred_uncond), noise_pred
+        return noise_pred, noise_pred
+
+    def _maybe_truncate(self, step_index: int, noise_pred_cond: ms.Tensor, noise_pred_uncond: ms.Tensor) -> None:
+        if self.adaptive_guidance_threshold is None:
+            return
+        cond = noise_pred_cond.float().reshape(noise_pred_cond.shape[0], -1)
+        uncond = noise_pred_uncond.float().reshape(noise_pred_uncond.shape[0], -1)
+        similarity = ops.cosine_similarity(cond, uncond, dim=-1).min().item()
+        if similarity > self.adaptive_guidance_threshold:
+            logger.debug(f"Guidance truncated at step {step_index}, cosine similarity {similarity:.4f}.")
+            self._truncated = True
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import inspect
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 from transformers import CLIPTokenizer, LlamaTokenizerFast
@@ -30,6 +30,7 @@ from ...utils import logging
 from ...utils.mindspore_utils import randn_tensor
 from ...video_processor import VideoProcessor
 from ..pipeline_utils import DiffusionPipeline
+from ..prompt_embeds_cache import cache_prompt_embeds
 from .pipeline_output import HunyuanVideoPipelineOutput
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
@@ -190,6 +191,7 @@ class HunyuanVideoPipeline(DiffusionPipeline, HunyuanVideoLoraLoaderMixin):
         )
         self.video_processor = VideoProcessor(vae_scale_factor=self.vae_scale_factor_spatial)
 
+    @cache_prompt_embeds("text_encoder")
     def _get_llama_prompt_embeds(
         self,
         prompt: Union[str, List[str]],
@@ -254,6 +256,7 @@ class HunyuanVideoPipeline(DiffusionPipeline, HunyuanVideoLoraLoaderMixin):
 
         return prompt_embeds, prompt_attention_mask
 
+    @cache_prompt_embeds("text_encoder_2")
     def _get_clip_prompt_embeds(
         self,
         prompt: Union[str, List[str]],
@@ -432,6 +435,24 @@ class HunyuanVideoPipeline(DiffusionPipeline, HunyuanVideoLoraLoaderMixin):
         """
         self.vae.disable_tiling()
 
+    def iter_decode_latents(self, latents: ms.Tensor) -> Iterator[ms.Tensor]:
+        r"""
+        Decodes the latents returned with `output_type="latent"` chunk by chunk, see
+        [`~AutoencoderKLHunyuanVideo.iter_decode`].
+
+        Examples:
+
+        ```py
+        >>> from mindone.diffusers.utils import export_to_video_stream
+
+        >>> latents = pipe(prompt, num_frames=129, output_type="latent")[0]
+        >>> chunks = pipe.video_processor.postprocess_video_stream(pipe.iter_decode_latents(latents))
+        >>> export_to_video_stream(chunks, "output.mp4", fps=15)
+        ```
+        """
+        latents = latents.to(self.vae.dtype) / self.vae.config.scaling_factor
+        yield from self.vae.iter_decode(latents)
+
     @property
     def guidance_scale(self):
         return self._guidance_scale
@@ -48,6 +48,7 @@ from ..utils import (
     numpy_to_pil,
 )
 from ..utils.hub_utils import _check_legacy_sharding_variant_format, load_or_create_model_card, populate_model_card
+from .guidance_utils import ClassifierFreeGuidance
 from .pipeline_loading_utils import (
     ALL_IMPORTABLE_CLASSES,
     CONNECTED_PIPES_KEYS,
@@ -67,6 +68,7 @@ from .pipeline_loading_utils import (
     variant_compatible_siblings,
     warn_deprecated_model_variant,
 )
+from .prompt_embeds_cache import PromptEmbedsCache
 
 logger = logging.get_logger(__name__)
 
@@ -122,6 +124,8 @@ class DiffusionPipeline(ConfigMixin, PushToHubMixin):
     _exclude_from_cpu_offload = []
     _load_connected_pipes = False
     _is_onnx = False
+    _prompt_embeds_cache = None
+    _guidance = None
 
     def register_modules(self, **kwargs):
         for name, module in kwargs.items():
@@ -733,6 +737,66 @@ class DiffusionPipeline(ConfigMixin, PushToHubMixin):
             "`enable_sequential_cpu_offload` is not implemented. If you want to utilize the offload function, you can try the [capabilities provided by the framework itself](https://www.mindspore.cn/docs/zh-CN/master/model_train/parallel/memory_offload.html)."  # noqa: E501
         )
 
+    def enable_prompt_embeds_cache(self, cache: Optional[PromptEmbedsCache] = None):
+        r"""
+        Caches the outputs of the text encoders per prompt, so that repeated prompts (including the empty negative
+        prompt) skip the text encoders on later calls. Only pipelines whose encoding methods are decorated with
+        `cache_prompt_embeds` make use of the cache.
+
+        Arguments:
+            cache ([`PromptEmbedsCache`], *optional*):
+                The cache to use. Pass the same instance to several pipelines to share it, or configure its in-memory
+                size and on-disk directory. Defaults to a process-wide cache shared by all pipelines.
+
+        Examples:
+
+        ```py
+        >>> import mindspore as ms
+        >>> from mindone.diffusers import FluxPipeline, PromptEmbedsCache
+
+        >>> pipe = FluxPipeline.from_pretrained("black-forest-labs/FLUX.1-dev", mindspore_dtype=ms.bfloat16)
+        >>> pipe.enable_prompt_embeds_cache(PromptEmbedsCache(max_size=1024, cache_dir="./prompt_embeds"))
+        ```
+        """
+        from .prompt_embeds_cache import get_default_prompt_embeds_cache
+
+        self._prompt_embeds_cache = cache if cache is not None else get_default_prompt_embeds_cache()
+
+    def disable_prompt_embeds_cache(self):
+        r"""
+        Disables the prompt embeddings cache enabled with [`~DiffusionPipeline.enable_prompt_embeds_cache`].
+        """
+        self._prompt_embeds_cache = None
+
+    def set_guidance(self, guidance: Optional[ClassifierFreeGuidance] = None):
+        r"""
+        Sets the classifier-free guidance schedule used by the denoising loop of the pipeline. Only pipelines whose
+        loops run through [`ClassifierFreeGuidance`] make use of it.
+
+        Arguments:
+            guidance ([`ClassifierFreeGuidance`], *optional*):
+                The guidance engine to use, e.g. with a guidance interval or stale unconditional reuse. `None` restores
+                the default, i.e. both branches on every step.
+
+        Examples:
+
+        ```py
+        >>> import mindspore as ms
+        >>> from mindone.diffusers import ClassifierFreeGuidance, StableDiffusion3Pipeline
+
+        >>> pipe = StableDiffusion3Pipeline.from_pretrained(
+        ...     "stabilityai/stable-diffusion-3-medium-diffusers", mindspore_dtype=ms.float16
+        ... )
+        >>> pipe.set_guidance(ClassifierFreeGuidance(guidance_interval=(100, 800), adaptive_guidance_threshold=0.995))
+        ```
+        """
+        self._guidance = guidance
+
+    def _prepare_guidance(self, timesteps) -> ClassifierFreeGuidance:
+        guidance = self._guidance if self._guidance is not None else ClassifierFreeGuidance()
+        guidance.prepare(timesteps)
+        return guidance
+
     def reset_device_map(self):
         r"""
         Resets the device maps (if any) to None.
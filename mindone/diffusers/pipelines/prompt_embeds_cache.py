@@ -0,0 +1,306 @@
+# Copyright 2024 The HuggingFace Team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Caching of text-encoder outputs for pipelines.
+
+Text encoders (T5, CLIP, LLMs) are run on every pipeline call, even for repeated prompts and for the constant empty
+negative prompt. A [`PromptEmbedsCache`] stores the encoder outputs of every single prompt, keyed by the identity of
+the encoder, the prompt and every other argument of the encoding function (`max_sequence_length`, `dtype`, ...), so
+that only unseen prompts of a batch go through the encoder.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import ops
+
+from ..utils import logging
+
+logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
+
+_PER_PROMPT_ARG_NAMES = ("num_images_per_prompt", "num_videos_per_prompt")
+
+
+def _resolve_dtype(name: str) -> ms.Type:
+    # `str(ms.bool_)` is "Bool", whose attribute in `mindspore` carries a trailing underscore
+    dtype = getattr(ms, name, None)
+    return dtype if isinstance(dtype, ms.Type) else getattr(ms, f"{name}_")
+
+
+class PromptEmbedsCache:
+    r"""
+    A two-tier cache for the per-prompt outputs of text encoders.
+
+    The first tier is an in-memory LRU of at most `max_size` entries holding the encoder outputs as tensors. The
+    optional second tier stores every entry as `.npy` files under `cache_dir`; they are read back memory-mapped, so
+    that large batch jobs with templated prompts can reuse embeddings across processes and runs. An entry holds the
+    rows of all the outputs of an encoding function (e.g. embeddings and attention mask) for a single prompt.
+
+    A single cache can be shared by several pipelines; entries of different encoders never collide because the key
+    includes the identity of the encoder (class, checkpoint path and dtype).
+
+    Args:
+        max_size (`int`, defaults to 256):
+            Maximum number of entries kept in memory. The least recently used entries are evicted first.
+        cache_dir (`str` or `os.PathLike`, *optional*):
+            Directory of the on-disk tier. Disabled if `None`. Only encoders loaded from a checkpoint (which have a
+            stable identity across processes) are written to disk.
+    """
+
+    def __init__(self, max_size: int = 256, cache_dir: Optional[Union[str, os.PathLike]] = None):
+        if max_size < 0:
+            raise ValueError(f"`max_size` must be a non-negative integer, but got {max_size}.")
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._memory: "OrderedDict[Hashable, Tuple[ms.Tensor, ...]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def clear(self, disk: bool = False) -> None:
+        r"""
+        Drops all in-memory entries, and also the on-disk entries if `disk=True`. Call this after changing the
+        weights of a text encoder (e.g. loading LoRA layers into it).
+        """
+        self._memory.clear()
+        self.hits = 0
+        self.misses = 0
+        if disk and self.cache_dir is not None:
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith((".npy", ".json")):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def get(self, key: Hashable, persistent: bool = True) -> Optional[Tuple[ms.Tensor, ...]]:
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        entry = self._load_from_disk(key) if persistent else None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._put_in_memory(key, entry)
+        return entry
+
+    def put(self, key: Hashable, entry: Tuple[ms.Tensor, ...], persistent: bool = True) -> None:
+        self._put_in_memory(key, entry)
+        if persistent:
+            self._save_to_disk(key, entry)
+
+    def _put_in_memory(self, key: Hashable, entry: Tuple[ms.Tensor, ...]) -> None:
+        if self.max_size == 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    @staticmethod
+    def _hash_key(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+
+    def _load_from_disk(self, key: Hashable) -> Optional[Tuple[ms.Tensor, ...]]:
+        if self.cache_dir is None:
+            return None
+        prefix = os.path.join(self.cache_dir, self._hash_key(key))
+        if not os.path.isfile(f"{prefix}.json"):
+            return None
+        with open(f"{prefix}.json", "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+        entry = []
+        for i, dtype in enumerate(metadata["dtypes"]):
+            array = np.load(f"{prefix}.{i}.npy", mmap_mode="r")
+            entry.append(ms.Tensor(np.ascontiguousarray(array)).to(_resolve_dtype(dtype)))
+        return tuple(entry)
+
+    def _save_to_disk(self, key: Hashable, entry: Tuple[ms.Tensor, ...]) -> None:
+        if self.cache_dir is None:
+            return
+        prefix = os.path.join(self.cache_dir, self._hash_key(key))
+        dtypes = []
+        for i, tensor in enumerate(entry):
+            dtypes.append(str(tensor.dtype).lower())
+            # numpy has no bfloat16, the entry is cast back to its dtype when it is loaded
+            array = tensor.float().asnumpy() if tensor.dtype == ms.bfloat16 else tensor.asnumpy()
+            with open(f"{prefix}.{i}.npy.tmp", "wb") as f:
+                np.save(f, array)
+            os.replace(f"{prefix}.{i}.npy.tmp", f"{prefix}.{i}.npy")
+        # the metadata file is written last and marks the entry as complete
+        with open(f"{prefix}.json.tmp", "w", encoding="utf-8") as f:
+            json.dump({"key": repr(key), "dtypes": dtypes}, f)
+        os.replace(f"{prefix}.json.tmp", f"{prefix}.json")
+
+    def get_or_compute(
+        self,
+        encoder_key: Hashable,
+        prompts: Sequence[str],
+        compute_fn: Callable[[List[str]], Union[ms.Tensor, Tuple[ms.Tensor, ...]]],
+        persistent: bool = True,
+    ) -> Union[ms.Tensor, Tuple[ms.Tensor, ...]]:
+        r"""
+        Returns the encoder outputs of `prompts`, running `compute_fn` only on the prompts that are not cached.
+
+        Args:
+            encoder_key (`Hashable`):
+                Identity of the encoder and of the encoding arguments.
+            prompts (`Sequence[str]`):
+                The prompts to encode.
+            compute_fn (`Callable`):
+                Encodes a list of prompts and returns a tensor, or a tuple of tensors, whose first dimension is the
+                number of prompts.
+            persistent (`bool`, defaults to `True`):
+                Whether entries may be read from and written to the on-disk tier.
+
+        Returns:
+            A tensor or a tuple of tensors, ordered like `prompts`.
+        """
+        entries: Dict[str, Tuple[ms.Tensor, ...]] = {}
+        missing: List[str] = []
+        for prompt in prompts:
+            if prompt in entries or prompt in missing:
+                continue
+            entry = self.get((encoder_key, prompt), persistent=persistent)
+            if entry is None:
+                missing.append(prompt)
+            else:
+                entries[prompt] = entry
+
+        is_tuple = None
+        if missing:
+            outputs = compute_fn(missing)
+            is_tuple = isinstance(outputs, tuple)
+            outputs = outputs if is_tuple else (outputs,)
+            for i, prompt in enumerate(missing):
+                entry = tuple(output[i : i + 1] for output in outputs)
+                entries[prompt] = entry
+                self.put((encoder_key, prompt), entry, persistent=persistent)
+
+        rows = [entries[prompt] for prompt in prompts]
+        outputs = tuple(ops.cat([row[i] for row in rows], axis=0) for i in range(len(rows[0])))
+        if is_tuple is None:
+            is_tuple = len(outputs) > 1
+        return outputs if is_tuple else outputs[0]
+
+
+_DEFAULT_PROMPT_EMBEDS_CACHE: Optional[PromptEmbedsCache] = None
+
+
+def get_default_prompt_embeds_cache() -> PromptEmbedsCache:
+    r"""Returns the process-wide cache shared by all pipelines that enable caching without passing a cache."""
+    global _DEFAULT_PROMPT_EMBEDS_CACHE
+    if _DEFAULT_PROMPT_EMBEDS_CACHE is None:
+        _DEFAULT_PROMPT_EMBEDS_CACHE = PromptEmbedsCache()
+    return _DEFAULT_PROMPT_EMBEDS_CACHE
+
+
+def _get_encoder_identity(pipeline, encoder_name: str) -> Tuple[Any, bool]:
+    encoder = getattr(pipeline, encoder_name, None)
+    if encoder is None:
+        return (encoder_name, None), True
+    config = getattr(encoder, "config", None)
+    name_or_path = getattr(config, "_name_or_path", "") if config is not None else ""
+    dtype = str(getattr(encoder, "dtype", ""))
+    if name_or_path:
+        return (encoder.__class__.__name__, name_or_path, dtype), True
+    # encoders built in-process have no stable identity across processes and are not persisted
+    return (encoder.__class__.__name__, id(encoder), dtype), False
+
+
+def cache_prompt_embeds(*encoder_names: str):
+    r"""
+    Decorator for the per-encoder `_get_*_prompt_embeds` methods of pipelines.
+
+    When the pipeline has a [`PromptEmbedsCache`] enabled (see
+    [`~DiffusionPipeline.enable_prompt_embeds_cache`]), the decorated method is only called with the prompts that
+    are not cached, always with a single output per prompt. The outputs of all prompts are then gathered and
+    repeated `num_images_per_prompt` (or `num_videos_per_prompt`) times, like the method itself does.
+
+    Args:
+        encoder_names (`str`):
+            The attribute names of the text encoders used by the method. They are part of the cache key.
+    """
+
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, "_prompt_embeds_cache", None)
+            if cache is None:
+                return fn(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self")
+            prompt = arguments.pop("prompt")
+            if prompt is None:
+                return fn(self, *args, **kwargs)
+            prompts = [prompt] if isinstance(prompt, str) else list(prompt)
+
+            num_per_prompt_name = next((name for name in _PER_PROMPT_ARG_NAMES if name in arguments), None)
+            num_per_prompt = arguments.pop(num_per_prompt_name) if num_per_prompt_name is not None else 1
+
+            identities, persistent = [], True
+            for encoder_name in encoder_names:
+                identity, is_persistent = _get_encoder_identity(self, encoder_name)
+                identities.append(identity)
+                persistent = persistent and is_persistent
+            # added tokens (e.g. textual inversion) change the encoding of the same prompt
+            tokenizer_sizes = tuple(
+                len(component)
+                for name, component in sorted(self.components.items())
+                if name.startswith("tokenizer") and component is not None
+            )
+            encoder_key = (
+                self.__class__.__name__,
+                fn.__name__,
+                tuple(identities),
+                tokenizer_sizes,
+                # the LoRA scale set by `encode_prompt` changes the outputs of text encoders with LoRA layers
+                getattr(self, "_lora_scale", None),
+                tuple(sorted((name, repr(value)) for name, value in arguments.items())),
+            )
+
+            def compute_fn(missing_prompts):
+                call_arguments = dict(arguments, prompt=missing_prompts)
+                if num_per_prompt_name is not None:
+                    call_arguments[num_per_prompt_name] = 1
+                return fn(self, **call_arguments)
+
+            outputs = cache.get_or_compute(encoder_key, prompts, compute_fn, persistent=persistent)
+            if num_per_prompt == 1:
+                return outputs
+            if isinstance(outputs, tuple):
+                return tuple(ops.repeat_interleave(output, num_per_prompt, axis=0) for output in outputs)
+            return ops.repeat_interleave(outputs, num_per_prompt, axis=0)
+
+        return wrapper
+
+    return decorator
@@ -1004,13 +1004,20 @@ class StableDiffusionPipeline(
         # 7. Denoising loop
         num_warmup_steps = len(timesteps) - num_inference_steps * self.scheduler.order
         self._num_timesteps = len(timesteps)
+        guidance = self._prepare_guidance(timesteps)
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
-                # expand the latents if we are doing classifier free guidance
-                latent_model_input = ops.cat([latents] * 2) if self.do_classifier_free_guidance else latents
+                # expand the latents if we are doing classifier free guidance on this step
+                guidance.run_uncond(i, self.do_classifier_free_guidance)
+                latent_model_input = guidance.expand(latents)
+                step_added_cond_kwargs = added_cond_kwargs
+                if added_cond_kwargs is not None:
+                    step_added_cond_kwargs = ms.mutable(
+                        {"image_embeds": [guidance.select(e) for e in added_cond_kwargs["image_embeds"]]}
+                    )
                 # TODO: method of scheduler should not change the dtype of input.
                 #  Remove the casting after cuiyushi confirm that.
                 tmp_dtype = latent_model_input.dtype
@@ -1021,19 +1028,18 @@ class StableDiffusionPipeline(
                 noise_pred = self.unet(
                     latent_model_input,
                     t,
-                    encoder_hidden_states=prompt_embeds,
+                    encoder_hidden_states=guidance.select(prompt_embeds),
                     timestep_cond=timestep_cond,
                     cross_attention_kwargs=self.cross_attention_kwargs,
-                    added_cond_kwargs=ms.mutable(added_cond_kwargs) if added_cond_kwargs else added_cond_kwargs,
+                    added_cond_kwargs=step_added_cond_kwargs,
                     return_dict=False,
                 )[0]
 
-                # perform guidance
-                if self.do_classifier_free_guidance:
-                    noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
-                    noise_pred = noise_pred_uncond + self.guidance_scale * (noise_pred_text - noise_pred_uncond)
+                # perform guidance, adaptive guidance may truncate it for the next steps from within `guide()`
+                guided = guidance.is_guided(i)
+                noise_pred, noise_pred_text = guidance.guide(i, noise_pred, self.guidance_scale)
 
-                if self.do_classifier_free_guidance and self.guidance_rescale > 0.0:
+                if guided and self.guidance_rescale > 0.0:
                     # Based on 3.4. in https://arxiv.org/pdf/2305.08891.pdf
                     noise_pred = rescale_noise_cfg(noise_pred, noise_pred_text, guidance_rescale=self.guidance_rescale)
 
@@ -31,6 +31,7 @@ from ...schedulers import FlowMatchEulerDiscreteScheduler
 from ...utils import logging, scale_lora_layers, unscale_lora_layers
 from ...utils.mindspore_utils import randn_tensor
 from ..pipeline_utils import DiffusionPipeline
+from ..prompt_embeds_cache import cache_prompt_embeds
 from .pipeline_output import StableDiffusion3PipelineOutput
 
 logger = logging.get_logger(__name__)  # pylint: disable=invalid-name
@@ -214,6 +215,7 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
             self.transformer.config.patch_size if hasattr(self, "transformer") and self.transformer is not None else 2
         )
 
+    @cache_prompt_embeds("text_encoder_3")
     def _get_t5_prompt_embeds(
         self,
         prompt: Union[str, List[str]] = None,
@@ -269,6 +271,7 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
 
         return prompt_embeds
 
+    @cache_prompt_embeds("text_encoder", "text_encoder_2")
     def _get_clip_prompt_embeds(
         self,
         prompt: Union[str, List[str]],
@@ -992,29 +995,38 @@ class StableDiffusion3Pipeline(DiffusionPipeline, SD3LoraLoaderMixin, FromSingle
                 self._joint_attention_kwargs.update(ip_adapter_image_embeds=ip_adapter_image_embeds)
 
         # 7. Denoising loop
+        guidance = self._prepare_guidance(timesteps)
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
-                # expand the latents if we are doing classifier free guidance
-                latent_model_input = ops.cat([latents] * 2) if self.do_classifier_free_guidance else latents
+                # expand the latents if we are doing classifier free guidance on this step
+                guidance.run_uncond(i, self.do_classifier_free_guidance)
+                latent_model_input = guidance.expand(latents)
                 # broadcast to batch dimension in a way that's compatible with ONNX/Core ML
                 timestep = t.broadcast_to((latent_model_input.shape[0],))
 
+                joint_attention_kwargs = self.joint_attention_kwargs
+                if joint_attention_kwargs is not None and "ip_adapter_image_embeds" in joint_attention_kwargs:
+                    joint_attention_kwargs = {
+                        **joint_attention_kwargs,
+                        "ip_adapter_image_embeds": guidance.select(joint_attention_kwargs["ip_adapter_image_embeds"]),
+                    }
+
+                step_prompt_embeds, step_pooled_prompt_embeds = guidance.select(prompt_embeds, pooled_prompt_embeds)
                 noise_pred = self.transformer(
                     hidden_states=latent_model_input,
                     timestep=timestep,
-                    encoder_hidden_states=prompt_embeds,
-                    pooled_projections=pooled_prompt_embeds,
-                    joint_attention_kwargs=self.joint_attention_kwargs,
+                    encoder_hidden_states=step_prompt_embeds,
+                    pooled_projections=step_pooled_prompt_embeds,
+                    joint_attention_kwargs=joint_attention_kwargs,
                     return_dict=False,
                 )[0]
 
                 # perform guidance
+                noise_pred, noise_pred_text = guidance.guide(i, noise_pred, self.guidance_scale)
                 if self.do_classifier_free_guidance:
-                    noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
-                    noise_pred = noise_pred_uncond + self.guidance_scale * (noise_pred_text - noise_pred_uncond)
                     should_skip_layers = (
                         True
                         if i > num_inference_steps * skip_layer_guidance_start
@@ -1124,13 +1124,15 @@ class StableDiffusionXLPipeline(
             scale_lora_layers(self.unet, lora_scale)
 
         self._num_timesteps = len(timesteps)
+        guidance = self._prepare_guidance(timesteps)
         with self.progress_bar(total=num_inference_steps) as progress_bar:
             for i, t in enumerate(timesteps):
                 if self.interrupt:
                     continue
 
-                # expand the latents if we are doing classifier free guidance
-                latent_model_input = ops.cat([latents] * 2) if self.do_classifier_free_guidance else latents
+                # expand the latents if we are doing classifier free guidance on this step
+                guidance.run_uncond(i, self.do_classifier_free_guidance)
+                latent_model_input = guidance.expand(latents)
 
                 # TODO: method of scheduler should not change the dtype of input.
                 #  Remove the casting after cuiyushi confirm that.
@@ -1139,25 +1141,25 @@ class StableDiffusionXLPipeline(
                 latent_model_input = latent_model_input.to(tmp_dtype)
 
                 # predict the noise residual
-                added_cond_kwargs = {"text_embeds": add_text_embeds, "time_ids": add_time_ids}
+                text_embeds, time_ids = guidance.select(add_text_embeds, add_time_ids)
+                added_cond_kwargs = {"text_embeds": text_embeds, "time_ids": time_ids}
                 if ip_adapter_image is not None or ip_adapter_image_embeds is not None:
-                    added_cond_kwargs["image_embeds"] = image_embeds
+                    added_cond_kwargs["image_embeds"] = [guidance.select(e) for e in image_embeds]
                 noise_pred = self.unet(
                     latent_model_input,
                     t,
-                    encoder_hidden_states=prompt_embeds,
+                    encoder_hidden_states=guidance.select(prompt_embeds),
                     timestep_cond=timestep_cond,
                     cross_attention_kwargs=self.cross_attention_kwargs,
                     added_cond_kwargs=ms.mutable(added_cond_kwargs),
                     return_dict=False,
                 )[0]
 
-                # perform guidance
-                if self.do_classifier_free_guidance:
-                    noise_pred_uncond, noise_pred_text = noise_pred.chunk(2)
-                    noise_pred = noise_pred_uncond + self.guidance_scale * (noise_pred_text - noise_pred_uncond)
+                # perform guidance, adaptive guidance may truncate it for the next steps from within `guide()`
+                guided = guidance.is_guided(i)
+                noise_pred, noise_pred_text = guidance.guide(i, noise_pred, self.guidance_scale)
 
-                if self.do_classifier_free_guidance and self.guidance_rescale > 0.0:
+                if guided and self.guidance_rescale > 0.0:
                     # Based on 3.4. in https://arxiv.org/pdf/2305.08891.pdf
                     noise_pred = rescale_noise_cfg(noise_pred, noise_pred_text, guidance_rescale=self.guidance_rescale)
 
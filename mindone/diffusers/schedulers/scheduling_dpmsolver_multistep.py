@@ -357,10 +357,8 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
         else:
             # Clipping the minimum of all lambda(t) for numerical stability.
             # This is critical for cosine (squaredcos_cap_v2) noise schedule.
-            clipped_idx = ms.tensor(
-                np.searchsorted(ops.flip(self.lambda_t, [0]).asnumpy(), self.config.lambda_min_clipped), dtype=ms.int64
-            )
-            last_timestep = ((self.config.num_train_timesteps - clipped_idx).asnumpy()).item()
+            clipped_idx = np.searchsorted(np.flip(self._host_table("lambda_t")), self.config.lambda_min_clipped)
+            last_timestep = int(self.config.num_train_timesteps - clipped_idx)
 
             # "linspace", "leading", "trailing" corresponds to annotation of Table 2. of https://arxiv.org/abs/2305.08891
             if self.config.timestep_spacing == "linspace":
@@ -389,26 +387,27 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                     f"{self.config.timestep_spacing} is not supported. Please make sure to choose one of 'linspace', 'leading' or 'trailing'."
                 )
 
-        sigmas = (((1 - self.alphas_cumprod) / self.alphas_cumprod) ** 0.5).asnumpy()
+        alphas_cumprod = self._host_table("alphas_cumprod")
+        sigmas = ((1 - alphas_cumprod) / alphas_cumprod) ** 0.5
         log_sigmas = np.log(sigmas)
 
         if self.config.use_karras_sigmas:
             sigmas = np.flip(sigmas).copy()
             sigmas = self._convert_to_karras(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
-            timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas]).round()
+            timesteps = self._sigma_to_t(sigmas, log_sigmas).round()
         elif self.config.use_lu_lambdas:
             lambdas = np.flip(log_sigmas.copy())
             lambdas = self._convert_to_lu(in_lambdas=lambdas, num_inference_steps=num_inference_steps)
             sigmas = np.exp(lambdas)
-            timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas]).round()
+            timesteps = self._sigma_to_t(sigmas, log_sigmas).round()
         elif self.config.use_exponential_sigmas:
             sigmas = np.flip(sigmas).copy()
             sigmas = self._convert_to_exponential(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
-            timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas])
+            timesteps = self._sigma_to_t(sigmas, log_sigmas)
         elif self.config.use_beta_sigmas:
             sigmas = np.flip(sigmas).copy()
             sigmas = self._convert_to_beta(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
-            timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas])
+            timesteps = self._sigma_to_t(sigmas, log_sigmas)
         elif self.config.use_flow_sigmas:
             alphas = np.linspace(1, 1 / self.config.num_train_timesteps, num_inference_steps + 1)
             sigmas = 1.0 - alphas
@@ -418,7 +417,7 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             sigmas = np.interp(timesteps, np.arange(0, len(sigmas)), sigmas)
 
         if self.config.final_sigmas_type == "sigma_min":
-            sigma_last = ((1 - self.alphas_cumprod[0]) / self.alphas_cumprod[0]) ** 0.5
+            sigma_last = ((1 - alphas_cumprod[0]) / alphas_cumprod[0]) ** 0.5
         elif self.config.final_sigmas_type == "zero":
             sigma_last = 0
         else:
@@ -510,6 +509,23 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
 
         return alpha_t, sigma_t
 
+    def _step_coefficients(self, index: int) -> Tuple[float, float, float]:
+        """
+        Returns `(alpha_t, sigma_t, lambda_t)` of the sigma at `index` as Python floats.
+
+        They are read from a host table computed once per schedule, so that the solver updates only launch kernels on
+        the samples and never synchronize with the device.
+        """
+        sigmas = self._host_table("sigmas")
+        table = self.__dict__.get("_coefficients_table")
+        if table is None or table[0] is not sigmas:
+            alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigmas.astype(np.float64))
+            with np.errstate(divide="ignore"):
+                lambda_t = np.log(alpha_t) - np.log(sigma_t)
+            table = (sigmas, np.stack([alpha_t, sigma_t, lambda_t], axis=1).tolist())
+            self._coefficients_table = table
+        return tuple(table[1][index])
+
     # Copied from diffusers.schedulers.scheduling_euler_discrete.EulerDiscreteScheduler._convert_to_karras
     def _convert_to_karras(self, in_sigmas: ms.Tensor, num_inference_steps) -> ms.Tensor:
         """Constructs the noise schedule of Karras et al. (2022)."""
@@ -633,7 +649,6 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 The converted model output.
         """
         timestep = args[0] if len(args) > 0 else kwargs.pop("timestep", None)
-        sigmas = self.sigmas.to(dtype=sample.dtype)
         if sample is None:
             if len(args) > 1:
                 sample = args[1]
@@ -652,17 +667,15 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 # DPM-Solver and DPM-Solver++ only need the "mean" output.
                 if self.config.variance_type in ["learned", "learned_range"]:
                     model_output = model_output[:, :3]
-                sigma = sigmas[self.step_index]
-                alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma)
+                alpha_t, sigma_t, _ = self._step_coefficients(self.step_index)
                 x0_pred = (sample - sigma_t * model_output) / alpha_t
             elif self.config.prediction_type == "sample":
                 x0_pred = model_output
             elif self.config.prediction_type == "v_prediction":
-                sigma = sigmas[self.step_index]
-                alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma)
+                alpha_t, sigma_t, _ = self._step_coefficients(self.step_index)
                 x0_pred = alpha_t * sample - sigma_t * model_output
             elif self.config.prediction_type == "flow_prediction":
-                sigma_t = self.sigmas[self.step_index]
+                _, sigma_t, _ = self._step_coefficients(self.step_index)
                 x0_pred = sample - sigma_t * model_output
             else:
                 raise ValueError(
@@ -684,12 +697,10 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 else:
                     epsilon = model_output
             elif self.config.prediction_type == "sample":
-                sigma = sigmas[self.step_index]
-                alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma)
+                alpha_t, sigma_t, _ = self._step_coefficients(self.step_index)
                 epsilon = (sample - alpha_t * model_output) / sigma_t
             elif self.config.prediction_type == "v_prediction":
-                sigma = sigmas[self.step_index]
-                alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma)
+                alpha_t, sigma_t, _ = self._step_coefficients(self.step_index)
                 epsilon = alpha_t * model_output + sigma_t * sample
             else:
                 raise ValueError(
@@ -698,8 +709,7 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 )
 
             if self.config.thresholding:
-                sigma = sigmas[self.step_index]
-                alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma)
+                alpha_t, sigma_t, _ = self._step_coefficients(self.step_index)
                 x0_pred = (sample - sigma_t * epsilon) / alpha_t
                 x0_pred = self._threshold_sample(x0_pred)
                 epsilon = (sample - alpha_t * x0_pred) / sigma_t
@@ -748,30 +758,27 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 "Passing `prev_timestep` is deprecated and has no effect as model output conversion is now handled via an internal counter `self.step_index`",
             )
 
-        sigma_t, sigma_s = self.sigmas[self.step_index + 1], self.sigmas[self.step_index]
-        alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma_t)
-        alpha_s, sigma_s = self._sigma_to_alpha_sigma_t(sigma_s)
-        lambda_t = ops.log(alpha_t) - ops.log(sigma_t)
-        lambda_s = ops.log(alpha_s) - ops.log(sigma_s)
+        alpha_t, sigma_t, lambda_t = self._step_coefficients(self.step_index + 1)
+        alpha_s, sigma_s, lambda_s = self._step_coefficients(self.step_index)
 
         h = lambda_t - lambda_s
         if self.config.algorithm_type == "dpmsolver++":
-            x_t = (sigma_t / sigma_s) * sample - (alpha_t * (ops.exp(-h) - 1.0)) * model_output
+            x_t = (sigma_t / sigma_s) * sample - (alpha_t * (math.exp(-h) - 1.0)) * model_output
         elif self.config.algorithm_type == "dpmsolver":
-            x_t = (alpha_t / alpha_s) * sample - (sigma_t * (ops.exp(h) - 1.0)) * model_output
+            x_t = (alpha_t / alpha_s) * sample - (sigma_t * (math.exp(h) - 1.0)) * model_output
         elif self.config.algorithm_type == "sde-dpmsolver++":
             assert noise is not None
             x_t = (
-                (sigma_t / sigma_s * ops.exp(-h)) * sample
-                + (alpha_t * (1 - ops.exp(-2.0 * h))) * model_output
-                + sigma_t * ops.sqrt(1.0 - ops.exp(-2 * h)) * noise
+                (sigma_t / sigma_s * math.exp(-h)) * sample
+                + (alpha_t * (1 - math.exp(-2.0 * h))) * model_output
+                + sigma_t * math.sqrt(1.0 - math.exp(-2 * h)) * noise
             )
         elif self.config.algorithm_type == "sde-dpmsolver":
             assert noise is not None
             x_t = (
                 (alpha_t / alpha_s) * sample
-                - 2.0 * (sigma_t * (ops.exp(h) - 1.0)) * model_output
-                + sigma_t * ops.sqrt(ops.exp(2 * h) - 1.0) * noise
+                - 2.0 * (sigma_t * (math.exp(h) - 1.0)) * model_output
+                + sigma_t * math.sqrt(math.exp(2 * h) - 1.0) * noise
             )
         return x_t
 
@@ -817,19 +824,9 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 "Passing `prev_timestep` is deprecated and has no effect as model output conversion is now handled via an internal counter `self.step_index`",
             )
 
-        sigma_t, sigma_s0, sigma_s1 = (
-            self.sigmas[self.step_index + 1],
-            self.sigmas[self.step_index],
-            self.sigmas[self.step_index - 1],
-        )
-
-        alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma_t)
-        alpha_s0, sigma_s0 = self._sigma_to_alpha_sigma_t(sigma_s0)
-        alpha_s1, sigma_s1 = self._sigma_to_alpha_sigma_t(sigma_s1)
-
-        lambda_t = ops.log(alpha_t) - ops.log(sigma_t)
-        lambda_s0 = ops.log(alpha_s0) - ops.log(sigma_s0)
-        lambda_s1 = ops.log(alpha_s1) - ops.log(sigma_s1)
+        alpha_t, sigma_t, lambda_t = self._step_coefficients(self.step_index + 1)
+        alpha_s0, sigma_s0, lambda_s0 = self._step_coefficients(self.step_index)
+        _, _, lambda_s1 = self._step_coefficients(self.step_index - 1)
 
         m0, m1 = model_output_list[-1], model_output_list[-2]
 
@@ -841,60 +838,60 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             if self.config.solver_type == "midpoint":
                 x_t = (
                     (sigma_t / sigma_s0) * sample
-                    - (alpha_t * (ops.exp(-h) - 1.0)) * D0
-                    - 0.5 * (alpha_t * (ops.exp(-h) - 1.0)) * D1
+                    - (alpha_t * (math.exp(-h) - 1.0)) * D0
+                    - 0.5 * (alpha_t * (math.exp(-h) - 1.0)) * D1
                 )
             elif self.config.solver_type == "heun":
                 x_t = (
                     (sigma_t / sigma_s0) * sample
-                    - (alpha_t * (ops.exp(-h) - 1.0)) * D0
-                    + (alpha_t * ((ops.exp(-h) - 1.0) / h + 1.0)) * D1
+                    - (alpha_t * (math.exp(-h) - 1.0)) * D0
+                    + (alpha_t * ((math.exp(-h) - 1.0) / h + 1.0)) * D1
                 )
         elif self.config.algorithm_type == "dpmsolver":
             # See https://arxiv.org/abs/2206.00927 for detailed derivations
             if self.config.solver_type == "midpoint":
                 x_t = (
                     (alpha_t / alpha_s0) * sample
-                    - (sigma_t * (ops.exp(h) - 1.0)) * D0
-                    - 0.5 * (sigma_t * (ops.exp(h) - 1.0)) * D1
+                    - (sigma_t * (math.exp(h) - 1.0)) * D0
+                    - 0.5 * (sigma_t * (math.exp(h) - 1.0)) * D1
                 )
             elif self.config.solver_type == "heun":
                 x_t = (
                     (alpha_t / alpha_s0) * sample
-                    - (sigma_t * (ops.exp(h) - 1.0)) * D0
-                    - (sigma_t * ((ops.exp(h) - 1.0) / h - 1.0)) * D1
+                    - (sigma_t * (math.exp(h) - 1.0)) * D0
+                    - (sigma_t * ((math.exp(h) - 1.0) / h - 1.0)) * D1
                 )
         elif self.config.algorithm_type == "sde-dpmsolver++":
             assert noise is not None
             if self.config.solver_type == "midpoint":
                 x_t = (
-                    (sigma_t / sigma_s0 * ops.exp(-h)) * sample
-                    + (alpha_t * (1 - ops.exp(-2.0 * h))) * D0
-                    + 0.5 * (alpha_t * (1 - ops.exp(-2.0 * h))) * D1
-                    + sigma_t * ops.sqrt(1.0 - ops.exp(-2 * h)) * noise
+                    (sigma_t / sigma_s0 * math.exp(-h)) * sample
+                    + (alpha_t * (1 - math.exp(-2.0 * h))) * D0
+                    + 0.5 * (alpha_t * (1 - math.exp(-2.0 * h))) * D1
+                    + sigma_t * math.sqrt(1.0 - math.exp(-2 * h)) * noise
                 )
             elif self.config.solver_type == "heun":
                 x_t = (
-                    (sigma_t / sigma_s0 * ops.exp(-h)) * sample
-                    + (alpha_t * (1 - ops.exp(-2.0 * h))) * D0
-                    + (alpha_t * ((1.0 - ops.exp(-2.0 * h)) / (-2.0 * h) + 1.0)) * D1
-                    + sigma_t * ops.sqrt(1.0 - ops.exp(-2 * h)) * noise
+                    (sigma_t / sigma_s0 * math.exp(-h)) * sample
+                    + (alpha_t * (1 - math.exp(-2.0 * h))) * D0
+                    + (alpha_t * ((1.0 - math.exp(-2.0 * h)) / (-2.0 * h) + 1.0)) * D1
+                    + sigma_t * math.sqrt(1.0 - math.exp(-2 * h)) * noise
                 )
         elif self.config.algorithm_type == "sde-dpmsolver":
             assert noise is not None
             if self.config.solver_type == "midpoint":
                 x_t = (
                     (alpha_t / alpha_s0) * sample
-                    - 2.0 * (sigma_t * (ops.exp(h) - 1.0)) * D0
-                    - (sigma_t * (ops.exp(h) - 1.0)) * D1
-                    + sigma_t * ops.sqrt(ops.exp(2 * h) - 1.0) * noise
+                    - 2.0 * (sigma_t * (math.exp(h) - 1.0)) * D0
+                    - (sigma_t * (math.exp(h) - 1.0)) * D1
+                    + sigma_t * math.sqrt(math.exp(2 * h) - 1.0) * noise
                 )
             elif self.config.solver_type == "heun":
                 x_t = (
                     (alpha_t / alpha_s0) * sample
-                    - 2.0 * (sigma_t * (ops.exp(h) - 1.0)) * D0
-                    - 2.0 * (sigma_t * ((ops.exp(h) - 1.0) / h - 1.0)) * D1
-                    + sigma_t * ops.sqrt(ops.exp(2 * h) - 1.0) * noise
+                    - 2.0 * (sigma_t * (math.exp(h) - 1.0)) * D0
+                    - 2.0 * (sigma_t * ((math.exp(h) - 1.0) / h - 1.0)) * D1
+                    + sigma_t * math.sqrt(math.exp(2 * h) - 1.0) * noise
                 )
         return x_t
 
@@ -941,22 +938,10 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
                 "Passing `prev_timestep` is deprecated and has no effect as model output conversion is now handled via an internal counter `self.step_index`",
             )
 
-        sigma_t, sigma_s0, sigma_s1, sigma_s2 = (
-            self.sigmas[self.step_index + 1],
-            self.sigmas[self.step_index],
-            self.sigmas[self.step_index - 1],
-            self.sigmas[self.step_index - 2],
-        )
-
-        alpha_t, sigma_t = self._sigma_to_alpha_sigma_t(sigma_t)
-        alpha_s0, sigma_s0 = self._sigma_to_alpha_sigma_t(sigma_s0)
-        alpha_s1, sigma_s1 = self._sigma_to_alpha_sigma_t(sigma_s1)
-        alpha_s2, sigma_s2 = self._sigma_to_alpha_sigma_t(sigma_s2)
-
-        lambda_t = ops.log(alpha_t) - ops.log(sigma_t)
-        lambda_s0 = ops.log(alpha_s0) - ops.log(sigma_s0)
-        lambda_s1 = ops.log(alpha_s1) - ops.log(sigma_s1)
-        lambda_s2 = ops.log(alpha_s2) - ops.log(sigma_s2)
+        alpha_t, sigma_t, lambda_t = self._step_coefficients(self.step_index + 1)
+        alpha_s0, sigma_s0, lambda_s0 = self._step_coefficients(self.step_index)
+        _, _, lambda_s1 = self._step_coefficients(self.step_index - 1)
+        _, _, lambda_s2 = self._step_coefficients(self.step_index - 2)
 
         m0, m1, m2 = model_output_list[-1], model_output_list[-2], model_output_list[-3]
 
@@ -970,32 +955,36 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             # See https://arxiv.org/abs/2206.00927 for detailed derivations
             x_t = (
                 (sigma_t / sigma_s0) * sample
-                - (alpha_t * (ops.exp(-h) - 1.0)) * D0
-                + (alpha_t * ((ops.exp(-h) - 1.0) / h + 1.0)) * D1
-                - (alpha_t * ((ops.exp(-h) - 1.0 + h) / h**2 - 0.5)) * D2
+                - (alpha_t * (math.exp(-h) - 1.0)) * D0
+                + (alpha_t * ((math.exp(-h) - 1.0) / h + 1.0)) * D1
+                - (alpha_t * ((math.exp(-h) - 1.0 + h) / h**2 - 0.5)) * D2
             )
         elif self.config.algorithm_type == "dpmsolver":
             # See https://arxiv.org/abs/2206.00927 for detailed derivations
             x_t = (
                 (alpha_t / alpha_s0) * sample
-                - (sigma_t * (ops.exp(h) - 1.0)) * D0
-                - (sigma_t * ((ops.exp(h) - 1.0) / h - 1.0)) * D1
-                - (sigma_t * ((ops.exp(h) - 1.0 - h) / h**2 - 0.5)) * D2
+                - (sigma_t * (math.exp(h) - 1.0)) * D0
+                - (sigma_t * ((math.exp(h) - 1.0) / h - 1.0)) * D1
+                - (sigma_t * ((math.exp(h) - 1.0 - h) / h**2 - 0.5)) * D2
             )
         elif self.config.algorithm_type == "sde-dpmsolver++":
             assert noise is not None
             x_t = (
-                (sigma_t / sigma_s0 * ops.exp(-h)) * sample
-                + (alpha_t * (1.0 - ops.exp(-2.0 * h))) * D0
-                + (alpha_t * ((1.0 - ops.exp(-2.0 * h)) / (-2.0 * h) + 1.0)) * D1
-                + (alpha_t * ((1.0 - ops.exp(-2.0 * h) - 2.0 * h) / (2.0 * h) ** 2 - 0.5)) * D2
-                + sigma_t * ops.sqrt(1.0 - ops.exp(-2 * h)) * noise
+                (sigma_t / sigma_s0 * math.exp(-h)) * sample
+                + (alpha_t * (1.0 - math.exp(-2.0 * h))) * D0
+                + (alpha_t * ((1.0 - math.exp(-2.0 * h)) / (-2.0 * h) + 1.0)) * D1
+                + (alpha_t * ((1.0 - math.exp(-2.0 * h) - 2.0 * h) / (2.0 * h) ** 2 - 0.5)) * D2
+                + sigma_t * math.sqrt(1.0 - math.exp(-2 * h)) * noise
             )
         return x_t
 
     def index_for_timestep(self, timestep, schedule_timesteps=None):
         if schedule_timesteps is None:
-            schedule_timesteps = self.timesteps
+            # look the timestep up in the host copy of the schedule, with a single read of `timestep`
+            index_candidates = np.flatnonzero(self._host_table("timesteps") == float(timestep))
+            if len(index_candidates) == 0:
+                return len(self.timesteps) - 1
+            return int(index_candidates[1] if len(index_candidates) > 1 else index_candidates[0])
 
         index_candidates_num = (schedule_timesteps == timestep).sum()
 
@@ -1076,13 +1065,17 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             (self.step_index == len(self.timesteps) - 2) and self.config.lower_order_final and len(self.timesteps) < 15
         )
 
-        model_output = self.convert_model_output(model_output, sample=sample)
+        # the solver coefficients are Python floats, which do not promote half precision tensors to float32
+        model_output = self.convert_model_output(model_output.to(ms.float32), sample=sample.to(ms.float32)).to(
+            model_output.dtype
+        )
         for i in range(self.config.solver_order - 1):
             self.model_outputs[i] = self.model_outputs[i + 1]
         self.model_outputs[-1] = model_output
 
         # Upcast to avoid precision issues when computing prev_sample
         sample = sample.to(ms.float32)
+        model_outputs = [output.to(ms.float32) if output is not None else None for output in self.model_outputs]
         if self.config.algorithm_type in ["sde-dpmsolver", "sde-dpmsolver++"] and variance_noise is None:
             noise = randn_tensor(model_output.shape, generator=generator, dtype=ms.float32)
         elif self.config.algorithm_type in ["sde-dpmsolver", "sde-dpmsolver++"]:
@@ -1091,11 +1084,11 @@ class DPMSolverMultistepScheduler(SchedulerMixin, ConfigMixin):
             noise = None
 
         if self.config.solver_order == 1 or self.lower_order_nums < 1 or lower_order_final:
-            prev_sample = self.dpm_solver_first_order_update(model_output, sample=sample, noise=noise)
+            prev_sample = self.dpm_solver_first_order_update(model_outputs[-1], sample=sample, noise=noise)
         elif self.config.solver_order == 2 or self.lower_order_nums < 2 or lower_order_second:
-            prev_sample = self.multistep_dpm_solver_second_order_update(self.model_outputs, sample=sample, noise=noise)
+            prev_sample = self.multistep_dpm_solver_second_order_update(model_outputs, sample=sample, noise=noise)
         else:
-            prev_sample = self.multistep_dpm_solver_third_order_update(self.model_outputs, sample=sample, noise=noise)
+            prev_sample = self.multistep_dpm_solver_third_order_update(model_outputs, sample=sample, noise=noise)
 
         if self.lower_order_nums < self.config.solver_order:
             self.lower_order_nums += 1
@@ -245,7 +245,7 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
 
         # TODO: Support the full EDM scalings for all prediction types and timestep types
         if timestep_type == "continuous" and prediction_type == "v_prediction":
-            self.timesteps = ms.Tensor([0.25 * sigma.log().item() for sigma in sigmas])
+            self.timesteps = ms.Tensor(0.25 * np.log(sigmas.asnumpy()))
         else:
             self.timesteps = timesteps
 
@@ -311,8 +311,9 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         if self.step_index is None:
             self._init_step_index(timestep)
 
-        sigma = self.sigmas[self.step_index]
-        sample = (sample / ((sigma**2 + 1) ** 0.5)).to(sample.dtype)
+        sigma = float(self._host_table("sigmas")[self.step_index])
+        # scaled in float32, as with the float32 sigmas, rather than in the dtype of a half precision `sample`
+        sample = (sample.to(ms.float32) / ((sigma**2 + 1) ** 0.5)).to(sample.dtype)
 
         self.is_scale_input_called = True
         return sample
@@ -366,9 +367,10 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         self.num_inference_steps = num_inference_steps
 
         if sigmas is not None:
-            log_sigmas = np.log(np.array(((1 - self.alphas_cumprod) / self.alphas_cumprod) ** 0.5))
+            alphas_cumprod = self._host_table("alphas_cumprod")
+            log_sigmas = np.log(((1 - alphas_cumprod) / alphas_cumprod) ** 0.5)
             sigmas = np.array(sigmas).astype(np.float32)
-            timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas[:-1]])
+            timesteps = self._sigma_to_t(sigmas[:-1], log_sigmas)
 
         else:
             if timesteps is not None:
@@ -398,7 +400,8 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
                         f"{self.config.timestep_spacing} is not supported. Please make sure to choose one of 'linspace', 'leading' or 'trailing'."
                     )
 
-            sigmas = (((1 - self.alphas_cumprod) / self.alphas_cumprod) ** 0.5).asnumpy()
+            alphas_cumprod = self._host_table("alphas_cumprod")
+            sigmas = ((1 - alphas_cumprod) / alphas_cumprod) ** 0.5
             log_sigmas = np.log(sigmas)
 
             if self.config.interpolation_type == "linear":
@@ -413,21 +416,18 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
 
             if self.config.use_karras_sigmas:
                 sigmas = self._convert_to_karras(in_sigmas=sigmas, num_inference_steps=self.num_inference_steps)
-                timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas])
+                timesteps = self._sigma_to_t(sigmas, log_sigmas)
 
             elif self.config.use_exponential_sigmas:
                 sigmas = self._convert_to_exponential(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
-                timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas])
+                timesteps = self._sigma_to_t(sigmas, log_sigmas)
 
             elif self.config.use_beta_sigmas:
                 sigmas = self._convert_to_beta(in_sigmas=sigmas, num_inference_steps=num_inference_steps)
-                timesteps = np.array([self._sigma_to_t(sigma, log_sigmas) for sigma in sigmas])
+                timesteps = self._sigma_to_t(sigmas, log_sigmas)
 
             if self.config.final_sigmas_type == "sigma_min":
-                sigma_last = ((1 - self.alphas_cumprod[0]) / self.alphas_cumprod[0]) ** 0.5
-                sigma_last = (
-                    sigma_last.asnumpy()
-                )  # Transform for numpy concatenate where Torch tensor could be concated with numpy array directly
+                sigma_last = ((1 - alphas_cumprod[0]) / alphas_cumprod[0]) ** 0.5
             elif self.config.final_sigmas_type == "zero":
                 sigma_last = 0
             else:
@@ -437,17 +437,17 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
 
             sigmas = np.concatenate([sigmas, [sigma_last]]).astype(np.float32)
 
-        sigmas = ms.Tensor(sigmas).to(dtype=ms.float32)
+        sigmas = sigmas.astype(np.float32)
 
         # TODO: Support the full EDM scalings for all prediction types and timestep types
         if self.config.timestep_type == "continuous" and self.config.prediction_type == "v_prediction":
-            self.timesteps = ms.Tensor([0.25 * sigma.log().item() for sigma in sigmas[:-1]])
+            self.timesteps = ms.Tensor(0.25 * np.log(sigmas[:-1]))
         else:
             self.timesteps = ms.Tensor(timesteps.astype(np.float32))
 
         self._step_index = None
         self._begin_index = None
-        self.sigmas = sigmas
+        self.sigmas = ms.Tensor(sigmas)
 
     def _sigma_to_t(self, sigma, log_sigmas):
         # get log sigma
@@ -553,7 +553,9 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
 
     def index_for_timestep(self, timestep, schedule_timesteps=None):
         if schedule_timesteps is None:
-            schedule_timesteps = self.timesteps
+            # look the timestep up in the host copy of the schedule, with a single read of `timestep`
+            indices = np.flatnonzero(self._host_table("timesteps") == float(timestep))
+            return int(indices[1] if len(indices) > 1 else indices[0])
 
         if (schedule_timesteps == timestep).sum() > 1:
             pos = 1
@@ -635,15 +637,17 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         # Upcast to avoid precision issues when computing prev_sample
         sample = sample.to(ms.float32)
 
-        sigma = self.sigmas[self.step_index]
+        # per-step scalars are read from the host table, so that `step` does not synchronize with the device
+        sigmas = self._host_table("sigmas")
+        sigma = float(sigmas[self.step_index])
 
-        gamma = min(s_churn / (len(self.sigmas) - 1), 2**0.5 - 1) if s_tmin <= sigma <= s_tmax else 0.0
+        gamma = min(s_churn / (len(sigmas) - 1), 2**0.5 - 1) if s_tmin <= sigma <= s_tmax else 0.0
 
         sigma_hat = sigma * (gamma + 1)
 
         if gamma > 0:
             noise = randn_tensor(model_output.shape, dtype=model_output.dtype, generator=generator)
-            eps = noise * s_noise
+            eps = noise.to(ms.float32) * s_noise
             sample = sample + eps * (sigma_hat**2 - sigma**2) ** 0.5
 
         # 1. compute predicted original sample (x_0) from sigma-scaled predicted noise
@@ -652,12 +656,12 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         if self.config.prediction_type == "original_sample" or self.config.prediction_type == "sample":
             pred_original_sample = model_output
         elif self.config.prediction_type == "epsilon":
-            pred_original_sample = sample - sigma_hat.to(model_output.dtype) * model_output
+            pred_original_sample = sample - sigma_hat * model_output
         elif self.config.prediction_type == "v_prediction":
             # denoised = model_output * c_out + input * c_skip
-            pred_original_sample = (model_output * (-sigma / (sigma**2 + 1) ** 0.5)).to(model_output.dtype) + (
-                sample / (sigma**2 + 1)
-            )
+            pred_original_sample = (model_output.to(ms.float32) * (-sigma / (sigma**2 + 1) ** 0.5)).to(
+                model_output.dtype
+            ) + (sample / (sigma**2 + 1))
         else:
             raise ValueError(
                 f"prediction_type given as {self.config.prediction_type} must be one of `epsilon`, or `v_prediction`"
@@ -666,7 +670,7 @@ class EulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         # 2. Convert to an ODE derivative
         derivative = (sample - pred_original_sample) / sigma_hat
 
-        dt = self.sigmas[self.step_index + 1] - sigma_hat
+        dt = float(sigmas[self.step_index + 1]) - sigma_hat
 
         prev_sample = sample + derivative * dt
 
@@ -320,7 +320,9 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
 
     def index_for_timestep(self, timestep, schedule_timesteps=None):
         if schedule_timesteps is None:
-            schedule_timesteps = self.timesteps
+            # look the timestep up in the host copy of the schedule, with a single read of `timestep`
+            indices = np.flatnonzero(self._host_table("timesteps") == float(timestep))
+            return int(indices[1] if len(indices) > 1 else indices[0])
 
         indices = (schedule_timesteps == timestep).nonzero()
 
@@ -395,8 +397,10 @@ class FlowMatchEulerDiscreteScheduler(SchedulerMixin, ConfigMixin):
         # Upcast to avoid precision issues when computing prev_sample
         sample = sample.to(ms.float32)
 
-        sigma = self.sigmas[self.step_index]
-        sigma_next = self.sigmas[self.step_index + 1]
+        # per-step scalars are read from the host table, so that `step` does not synchronize with the device
+        sigmas = self._host_table("sigmas")
+        sigma = float(sigmas[self.step_index])
+        sigma_next = float(sigmas[self.step_index + 1])
 
         prev_sample = sample + (sigma_next - sigma) * model_output
 
@@ -16,6 +16,7 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Optional, Union
 
+import numpy as np
 from huggingface_hub.utils import validate_hf_hub_args
 
 import mindspore as ms
@@ -191,3 +192,18 @@ class SchedulerMixin(PushToHubMixin):
             getattr(diffusers_library, c) for c in compatible_classes_str if hasattr(diffusers_library, c)
         ]
         return compatible_classes
+
+    def _host_table(self, name: str) -> np.ndarray:
+        """
+        Returns a NumPy copy of the tensor attribute `name` (e.g. `sigmas` or `timesteps`).
+
+        `step()` reads its per-step scalars from these host tables instead of indexing the device tensors, which would
+        launch a kernel and synchronize with the device for every scalar. The copy is made once and refreshed when the
+        attribute is reassigned, e.g. by `set_timesteps`.
+        """
+        tensor = getattr(self, name)
+        host_tables = self.__dict__.setdefault("_host_tables", {})
+        if name not in host_tables or host_tables[name][0] is not tensor:
+            table = tensor.asnumpy() if isinstance(tensor, ms.Tensor) else np.asarray(tensor)
+            host_tables[name] = (tensor, table)
+        return host_tables[name][1]
@@ -1,9 +1,11 @@
 import io
+import queue
 import random
 import struct
 import tempfile
+import threading
 from contextlib import contextmanager
-from typing import List, Union
+from typing import Iterable, List, Union
 
 import numpy as np
 import PIL.Image
@@ -180,3 +182,153 @@ def export_to_video(
             writer.append_data(frame)
 
     return output_video_path
+
+
+def _to_uint8_frames(chunk: Union[np.ndarray, List[np.ndarray], List[PIL.Image.Image]]) -> List[np.ndarray]:
+    if isinstance(chunk, np.ndarray):
+        if chunk.ndim == 5:
+            if chunk.shape[0] != 1:
+                raise ValueError(f"Only a single video can be exported, but got a batch of {chunk.shape[0]} videos.")
+            chunk = chunk[0]
+        elif chunk.ndim == 3:
+            chunk = chunk[None]
+        if chunk.dtype != np.uint8:
+            chunk = (chunk * 255).astype(np.uint8)
+        return list(chunk)
+
+    frames = []
+    for frame in chunk:
+        if isinstance(frame, PIL.Image.Image):
+            frame = np.array(frame)
+        elif frame.dtype != np.uint8:
+            frame = (frame * 255).astype(np.uint8)
+        frames.append(frame)
+    return frames
+
+
+class _ImageioVideoWriter:
+    def __init__(self, output_video_path: str, fps: int):
+        import imageio
+
+        self.writer = imageio.get_writer(output_video_path, fps=fps)
+
+    def write(self, frame: np.ndarray) -> None:
+        self.writer.append_data(frame)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _OpenCVVideoWriter:
+    def __init__(self, output_video_path: str, fps: int):
+        self.output_video_path = output_video_path
+        self.fps = fps
+        self.writer = None
+
+    def write(self, frame: np.ndarray) -> None:
+        import cv2
+
+        if self.writer is None:
+            h, w, c = frame.shape
+            fourcc = cv2.VideoWriter_fourcc(*"mp4v")
+            self.writer = cv2.VideoWriter(self.output_video_path, fourcc, fps=self.fps, frameSize=(w, h))
+        self.writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.release()
+
+
+class _VideoEncoderThread(threading.Thread):
+    r"""Encodes the chunks of frames put in `queue` until it receives `None`."""
+
+    def __init__(self, writer, max_queued_chunks: int):
+        super().__init__(daemon=True)
+        self.writer = writer
+        self.queue = queue.Queue(maxsize=max_queued_chunks)
+        self.error = None
+
+    def run(self):
+        try:
+            while True:
+                frames = self.queue.get()
+                if frames is None:
+                    return
+                for frame in frames:
+                    self.writer.write(frame)
+        except Exception as e:
+            self.error = e
+            # keep consuming so that the producer is never blocked on a full queue
+            while self.queue.get() is not None:
+                pass
+        finally:
+            self.writer.close()
+
+
+def export_to_video_stream(
+    frame_chunks: Iterable[Union[np.ndarray, List[np.ndarray], List[PIL.Image.Image]]],
+    output_video_path: str = None,
+    fps: int = 10,
+    max_queued_chunks: int = 2,
+) -> str:
+    r"""
+    Exports a video whose frames arrive in chunks, for instance the chunks yielded by
+    [`~VideoProcessor.postprocess_video_stream`], without collecting the whole clip in host memory.
+
+    The frames are encoded in a background thread while the next chunks are produced. At most `max_queued_chunks`
+    chunks wait for the encoder, so the host memory is bounded by the chunk size rather than the clip length.
+
+    Args:
+        frame_chunks (`Iterable`):
+            The chunks of frames: arrays of shape `(num_frames, height, width, num_channels)` (or `(1, num_frames,
+            height, width, num_channels)`), `uint8` or float in `[0, 1]`, or lists of frames as in
+            [`~utils.export_to_video`].
+        output_video_path (`str`, *optional*):
+            The path of the video. A temporary `.mp4` file is used if `None`.
+        fps (`int`, defaults to 10):
+            The frame rate of the video.
+        max_queued_chunks (`int`, defaults to 2):
+            The maximum number of chunks waiting to be encoded.
+
+    Returns:
+        `str`: The path of the video.
+    """
+    if is_imageio_available():
+        import imageio
+
+        try:
+            imageio.plugins.ffmpeg.get_exe()
+        except AttributeError:
+            raise AttributeError(
+                (
+                    "Found an existing imageio backend in your environment. Attempting to export video with imageio. \n"
+                    "Unable to find a compatible ffmpeg installation in your environment to use with imageio. Please install via `pip install imageio-ffmpeg"
+                )
+            )
+        writer_cls = _ImageioVideoWriter
+    elif is_opencv_available():
+        logger.warning(
+            "It is recommended to use `export_to_video_stream` with `imageio` and `imageio-ffmpeg` as a backend. "
+            "Falling back to the OpenCV backend."
+        )
+        writer_cls = _OpenCVVideoWriter
+    else:
+        raise ImportError(BACKENDS_MAPPING["imageio"][1].format("export_to_video_stream"))
+
+    if output_video_path is None:
+        output_video_path = tempfile.NamedTemporaryFile(suffix=".mp4").name
+
+    encoder = _VideoEncoderThread(writer_cls(output_video_path, fps), max_queued_chunks)
+    encoder.start()
+    try:
+        for chunk in frame_chunks:
+            if encoder.error is not None:
+                break
+            encoder.queue.put(_to_uint8_frames(chunk))
+    finally:
+        encoder.queue.put(None)
+        encoder.join()
+
+    if encoder.error is not None:
+        raise encoder.error
+    return output_video_path
@@ -13,7 +13,7 @@
 # limitations under the License.
 
 import warnings
-from typing import List, Optional, Union
+from typing import Iterable, Iterator, List, Optional, Union
 
 import numpy as np
 import PIL
@@ -113,3 +113,26 @@ class VideoProcessor(VaeImageProcessor):
             raise ValueError(f"{output_type} does not exist. Please choose one of ['np', 'pt', 'pil']")
 
         return outputs
+
+    def postprocess_video_stream(self, video_chunks: Iterable[ms.Tensor]) -> Iterator[np.ndarray]:
+        r"""
+        Converts chunks of a video tensor, such as the temporal chunks yielded by the `iter_decode` method of the video
+        VAEs, to frames for [`~utils.export_to_video_stream`].
+
+        Each chunk is denormalized and converted to `uint8` on the device, so that only `uint8` frames are copied to
+        the host. The values are truncated as in [`~utils.export_to_video`].
+
+        Args:
+            video_chunks (`Iterable[ms.Tensor]`):
+                Chunks of the video of shape `(batch_size, num_channels, num_frames, height, width)`.
+
+        Returns:
+            `Iterator[np.ndarray]`: The `uint8` frames of each chunk, of shape `(batch_size, num_frames, height, width,
+            num_channels)`.
+        """
+        for chunk in video_chunks:
+            batch_size, num_channels, num_frames, height, width = chunk.shape
+            frames = chunk.permute(0, 2, 1, 3, 4).reshape(batch_size * num_frames, num_channels, height, width)
+            frames = self._denormalize_conditionally(frames)
+            frames = (frames.float() * 255).floor().to(ms.uint8).permute(0, 2, 3, 1)
+            yield frames.asnumpy().reshape(batch_size, num_frames, height, width, num_channels)
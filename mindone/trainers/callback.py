@@ -70,6 +70,7 @@ class EvalSaveCallback(Callback):
         zero_stage: int = 0,
         optimizer_parallel_group: str = None,
         ckpt_combine_online: bool = False,
+        data_sampler=None,
     ):
         """
         Args:
@@ -84,6 +85,9 @@ class EvalSaveCallback(Callback):
                 using allgather ops to combile the checkpoint online if `ckpt_combine_online=True`, \
                 saving all device parameters if `ckpt_combine_online=False`, \
                 and need to use `convert_checkpoints` to combile the checkpoint offline. default is False.
+            data_sampler (`ResumableSampler`, *optional*): sampler of the training data (see `mindone.data.ResumableSampler`),
+                whose position is saved in the resume checkpoint and restored with `resume_data_sampler`, so that
+                training resumes from the next sample in the middle of an epoch. One batch per step is assumed.
         """
         self.rank_id = rank_id
         self.is_main_device = rank_id in [0, None]
@@ -162,12 +166,18 @@ class EvalSaveCallback(Callback):
         self.use_step_unit = use_step_unit
         self.train_steps = train_steps
         self.save_training_resume = save_training_resume
+        self.data_sampler = data_sampler
         self.choice_func = None
         if resume_prefix_blacklist:
             if isinstance(resume_prefix_blacklist, str):
                 resume_prefix_blacklist = (resume_prefix_blacklist,)
             self.choice_func = lambda x: not x.startswith(resume_prefix_blacklist)
 
+    def _get_data_state(self, cur_step: int) -> dict:
+        if self.data_sampler is None:
+            return {}
+        return {f"data_{k}": v for k, v in self.data_sampler.state_dict(cur_step).items()}
+
     def _do_ckpt_combine_online(self):
         new_net_to_save = []
         all_gather_op = ops.AllGather(self.optimizer_parallel_group)
@@ -208,6 +218,7 @@ class EvalSaveCallback(Callback):
                         "epoch_num": cur_epoch,
                         "cur_step": cur_step,
                         "loss_scale": self._get_scaling_value_from_cbp(cb_params),
+                        **self._get_data_state(cur_step),
                     },
                 )
                 if self.ema is not None:
@@ -319,6 +330,7 @@ class EvalSaveCallback(Callback):
                     append_dict={
                         "epoch_num": cur_epoch,
                         "loss_scale": self._get_scaling_value_from_cbp(cb_params),
+                        **self._get_data_state(cur_step),
                     },
                 )
                 if self.ema is not None:
@@ -138,3 +138,25 @@ def resume_train_network(network, optimizer, resume_ckpt):
     )
 
     return start_epoch, loss_scale, cur_iter, last_overflow_iter
+
+
+def resume_data_sampler(sampler, resume_ckpt):
+    """
+    Restores the position of a resumable data sampler (see `mindone.data.ResumableSampler`) saved in a resume
+    checkpoint by `EvalSaveCallback(data_sampler=...)`, so that the data iteration continues from the next sample.
+    Must be called before the first iteration over the dataloader.
+
+    Returns:
+        Whether a sampler position was found in the checkpoint.
+    """
+    resume_param = ms.load_checkpoint(resume_ckpt, choice_func=lambda x: x.startswith("data_"))
+    if not resume_param:
+        _logger.warning(f"No data sampler state in {resume_ckpt}, the data iteration restarts from the epoch start.")
+        return False
+    state = {k[len("data_") :]: int(v.asnumpy().item()) for k, v in resume_param.items()}
+    sampler.load_state_dict(state)
+    _logger.info(
+        f"Resume data iteration from epoch {state['epoch']}, batch {state['consumed_batches']} "
+        f"(sample {state['consumed_index']} of this shard)."
+    )
+    return True
@@ -193,7 +193,14 @@ from .models.whisper import (
     WhisperProcessor,
 )
 from .models.xlm_roberta import XLMRobertaModel, XLMRobertaPreTrainedModel
-from .pipelines import TextGenerationPipeline, pipeline
+from .pipelines import (
+    AutomaticSpeechRecognitionPipeline,
+    FeatureExtractionPipeline,
+    ImageFeatureExtractionPipeline,
+    TextGenerationPipeline,
+    ZeroShotImageClassificationPipeline,
+    pipeline,
+)
 from .processing_utils import ProcessorMixin
 
 
@@ -18,6 +18,7 @@ and remove unnecessary dependencies.
 """
 
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple, Union
 
 import numpy as np
@@ -375,6 +376,63 @@ def window_function(
     return padded_window
 
 
+# number of frames transformed at once, bounds the size of the intermediate buffers
+_STFT_CHUNK_FRAMES = 2048
+
+
+def _frame_view(waveform: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """
+    Returns a strided view of shape `(..., num_frames, frame_length)` of the frames of `waveform` along its last axis,
+    without copying it.
+    """
+    num_frames = int(1 + np.floor((waveform.shape[-1] - frame_length) / hop_length))
+    if num_frames <= 0:
+        return np.empty(waveform.shape[:-1] + (0, frame_length), dtype=waveform.dtype)
+    frames = np.lib.stride_tricks.sliding_window_view(waveform, frame_length, axis=-1)
+    return frames[..., : (num_frames - 1) * hop_length + 1 : hop_length, :]
+
+
+def _stft(
+    frames: np.ndarray,
+    window: np.ndarray,
+    fft_length: int,
+    onesided: bool = True,
+    preemphasis: Optional[float] = None,
+    remove_dc_offset: Optional[bool] = None,
+    compute_dtype: np.dtype = np.float64,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Windows the frames of shape `(..., num_frames, frame_length)` and computes their DFT with one batched FFT per
+    chunk of frames. Returns a `np.complex64` array of shape `(..., num_frames, num_frequency_bins)`.
+    """
+    num_frames = frames.shape[-2]
+    num_frequency_bins = (fft_length // 2) + 1 if onesided else fft_length
+    if out is None:
+        out = np.empty(frames.shape[:-1] + (num_frequency_bins,), dtype=np.complex64)
+
+    # rfft is faster than fft
+    fft_func = np.fft.rfft if onesided else np.fft.fft
+    window = window.astype(compute_dtype)
+
+    for start in range(0, num_frames, _STFT_CHUNK_FRAMES):
+        chunk = frames[..., start : start + _STFT_CHUNK_FRAMES, :].astype(compute_dtype)
+
+        if remove_dc_offset:
+            chunk -= chunk.mean(axis=-1, keepdims=True)
+
+        if preemphasis is not None:
+            chunk[..., 1:] -= preemphasis * chunk[..., :-1]
+            chunk[..., 0] *= 1 - preemphasis
+
+        chunk *= window
+
+        # the frames are zero-padded to fft_length
+        out[..., start : start + _STFT_CHUNK_FRAMES, :] = fft_func(chunk, n=fft_length, axis=-1)
+
+    return out
+
+
 # TODO This method does not support batching yet as we are mainly focused on inference.
 def spectrogram(
     waveform: np.ndarray,
@@ -395,6 +453,7 @@ def spectrogram(
     db_range: Optional[float] = None,
     remove_dc_offset: Optional[bool] = None,
     dtype: np.dtype = np.float32,
+    compute_dtype: np.dtype = np.float64,
 ) -> np.ndarray:
     """
     Calculates a spectrogram over one waveform using the Short-Time Fourier Transform.
@@ -426,9 +485,9 @@ def spectrogram(
     padded window can be obtained from `window_function()`. The FFT input buffer may be larger than the analysis frame,
     typically the next power of two.
 
-    Note: This function is not optimized for speed yet. It should be mostly compatible with `librosa.stft` and
-    `torchaudio.functional.transforms.Spectrogram`, although it is more flexible due to the different ways spectrograms
-    can be constructed.
+    The frames are strided views of the waveform, windowed and transformed by chunks with one batched FFT. It should be
+    mostly compatible with `librosa.stft` and `torchaudio.functional.transforms.Spectrogram`, although it is more
+    flexible due to the different ways spectrograms can be constructed.
 
     Args:
         waveform (`np.ndarray` of shape `(length,)`):
@@ -482,6 +541,9 @@ def spectrogram(
         dtype (`np.dtype`, *optional*, defaults to `np.float32`):
             Data type of the spectrogram tensor. If `power` is None, this argument is ignored and the dtype will be
             `np.complex64`.
+        compute_dtype (`np.dtype`, *optional*, defaults to `np.float64`):
+            Data type of the windowed frames fed to the FFT. `np.float32` is faster, NumPy 2 also runs the FFT in
+            single precision, at the cost of a small numerical difference.
 
     Returns:
         `nd.array` containing a spectrogram of shape `(num_frequency_bins, length)` for a regular spectrogram or shape
@@ -518,35 +580,10 @@ def spectrogram(
         padding = [(int(frame_length // 2), int(frame_length // 2))]
         waveform = np.pad(waveform, padding, mode=pad_mode)
 
-    # promote to float64, since np.fft uses float64 internally
-    waveform = waveform.astype(np.float64)
-    window = window.astype(np.float64)
-
-    # split waveform into frames of frame_length size
-    num_frames = int(1 + np.floor((waveform.size - frame_length) / hop_length))
-
-    num_frequency_bins = (fft_length // 2) + 1 if onesided else fft_length
-    spectrogram = np.empty((num_frames, num_frequency_bins), dtype=np.complex64)
-
-    # rfft is faster than fft
-    fft_func = np.fft.rfft if onesided else np.fft.fft
-    buffer = np.zeros(fft_length)
-
-    timestep = 0
-    for frame_idx in range(num_frames):
-        buffer[:frame_length] = waveform[timestep : timestep + frame_length]
-
-        if remove_dc_offset:
-            buffer[:frame_length] = buffer[:frame_length] - buffer[:frame_length].mean()
-
-        if preemphasis is not None:
-            buffer[1:frame_length] -= preemphasis * buffer[: frame_length - 1]
-            buffer[0] *= 1 - preemphasis
-
-        buffer[:frame_length] *= window
-
-        spectrogram[frame_idx] = fft_func(buffer)
-        timestep += hop_length
+    # split waveform into frames of frame_length size, promoted to float64 by chunks since np.fft uses float64
+    # internally
+    frames = _frame_view(waveform, frame_length, hop_length)
+    spectrogram = _stft(frames, window, fft_length, onesided, preemphasis, remove_dc_offset, compute_dtype)
 
     # note: ** is much faster than np.power
     if power is not None:
@@ -596,6 +633,8 @@ def spectrogram_batch(
     db_range: Optional[float] = None,
     remove_dc_offset: Optional[bool] = None,
     dtype: np.dtype = np.float32,
+    compute_dtype: np.dtype = np.float64,
+    num_workers: Optional[int] = None,
 ) -> List[np.ndarray]:
     """
     Calculates spectrograms for a list of waveforms using the Short-Time Fourier Transform, optimized for batch processing.
@@ -667,6 +706,11 @@ def spectrogram_batch(
             Whether to remove the DC offset from each frame.
         dtype (`np.dtype`, *optional*, defaults to `np.float32`):
             Data type of the output spectrogram.
+        compute_dtype (`np.dtype`, *optional*, defaults to `np.float64`):
+            Data type of the windowed frames fed to the FFT, `np.float32` is faster.
+        num_workers (`int`, *optional*):
+            If set, the waveforms are transformed in parallel by a pool of `num_workers` threads, NumPy releases the
+            GIL in the FFT.
 
     Returns:
         List[`np.ndarray`]: A list of spectrogram arrays, one for each input waveform.
@@ -720,37 +764,37 @@ def spectrogram_batch(
         dtype=dtype,
     )
 
-    # Promote to float64, since np.fft uses float64 internally
-    padded_waveform_batch = padded_waveform_batch.astype(np.float64)
-    window = window.astype(np.float64)
-
-    # Split waveform into frames of frame_length size
-    num_frames = int(1 + np.floor((padded_waveform_batch.shape[1] - frame_length) / hop_length))
+    # Split waveform into frames of frame_length size, promoted to float64 by chunks since np.fft uses float64
+    # internally
+    frames = _frame_view(padded_waveform_batch, frame_length, hop_length)
     # these lengths will be used to remove padding later
     true_num_frames = [int(1 + np.floor((length - frame_length) / hop_length)) for length in original_waveform_lengths]
-    num_batches = padded_waveform_batch.shape[0]
-
-    num_frequency_bins = (fft_length // 2) + 1 if onesided else fft_length
-    spectrogram = np.empty((num_batches, num_frames, num_frequency_bins), dtype=np.complex64)
 
-    # rfft is faster than fft
-    fft_func = np.fft.rfft if onesided else np.fft.fft
-    buffer = np.zeros((num_batches, fft_length))
-
-    for frame_idx in range(num_frames):
-        timestep = frame_idx * hop_length
-        buffer[:, :frame_length] = padded_waveform_batch[:, timestep : timestep + frame_length]
-
-        if remove_dc_offset:
-            buffer[:, :frame_length] -= buffer[:, :frame_length].mean(axis=1, keepdims=True)
-
-        if preemphasis is not None:
-            buffer[:, 1:frame_length] -= preemphasis * buffer[:, : frame_length - 1]
-            buffer[:, 0] *= 1 - preemphasis
-
-        buffer[:, :frame_length] *= window
-
-        spectrogram[:, frame_idx] = fft_func(buffer)
+    stft_kwargs = {
+        "onesided": onesided,
+        "preemphasis": preemphasis,
+        "remove_dc_offset": remove_dc_offset,
+        "compute_dtype": compute_dtype,
+    }
+    if num_workers is not None and num_workers > 1 and len(frames) > 1:
+        num_frequency_bins = (fft_length // 2) + 1 if onesided else fft_length
+        spectrogram = np.zeros(frames.shape[:-1] + (num_frequency_bins,), dtype=np.complex64)
+        with ThreadPoolExecutor(num_workers) as pool:
+            # only the frames of each waveform are transformed, not its batch padding
+            list(
+                pool.map(
+                    lambda i: _stft(
+                        frames[i, : true_num_frames[i]],
+                        window,
+                        fft_length,
+                        out=spectrogram[i, : true_num_frames[i]],
+                        **stft_kwargs,
+                    ),
+                    range(len(frames)),
+                )
+            )
+    else:
+        spectrogram = _stft(frames, window, fft_length, **stft_kwargs)
 
     # Note: ** is much faster than np.power
     if power is not None:
@@ -1030,10 +1074,10 @@ def fram_wave(waveform: np.array, hop_length: int = 160, fft_window_size: int =
         "The function `fram_wave` is deprecated and will be removed in version 4.31.0 of Transformers",
         FutureWarning,
     )
-    frames = []
-    for i in range(0, waveform.shape[0] + 1, hop_length):
+    half_window = (fft_window_size - 1) // 2 + 1
+
+    def frame_at(i):
         if center:
-            half_window = (fft_window_size - 1) // 2 + 1
             start = i - half_window if i > half_window else 0
             end = i + half_window if i < waveform.shape[0] - half_window else waveform.shape[0]
             frame = waveform[start:end]
@@ -1052,8 +1096,24 @@ def fram_wave(waveform: np.array, hop_length: int = 160, fft_window_size: int =
                 frame = np.lib.pad(
                     frame, pad_width=(0, fft_window_size - frame_width), mode="constant", constant_values=0
                 )
-        frames.append(frame)
-
+        return frame
+
+    num_frames = waveform.shape[0] // hop_length + 1
+    if center and waveform.shape[0] > 2 * half_window:
+        # the frames are windows of the waveform reflected on both sides, except the first and last ones, whose
+        # padding is as long as their content and is reflected twice
+        padded = np.pad(waveform, half_window, mode="reflect")
+        frames = _frame_view(padded, 2 * half_window, hop_length)[:num_frames].copy()
+        frames[0] = frame_at(0)
+        if waveform.shape[0] % hop_length == 0:
+            frames[-1] = frame_at(waveform.shape[0])
+        return frames
+    if not center and waveform.shape[0] > fft_window_size:
+        padded = np.pad(waveform, (0, fft_window_size), mode="constant", constant_values=0)
+        return _frame_view(padded, fft_window_size, hop_length)[:num_frames].copy()
+
+    # short waveforms, whose frames may be padded on both sides
+    frames = [frame_at(i) for i in range(0, waveform.shape[0] + 1, hop_length)]
     frames = np.stack(frames, 0)
     return frames
 
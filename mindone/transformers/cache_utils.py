@@ -4,7 +4,7 @@ Cache utils.
 import copy
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 from transformers.configuration_utils import PretrainedConfig
@@ -13,6 +13,8 @@ from transformers.utils import logging
 import mindspore as ms
 from mindspore import mint, nn, ops
 
+from mindone.utils.version_control import get_runtime
+
 logger = logging.get_logger(__name__)
 
 
@@ -28,7 +30,9 @@ def init_static_cache(config: PretrainedConfig, max_batch_size: int, max_cache_l
 
     dtype = dtype if dtype is not None else ms.float32
     num_key_value_heads = (
-        config.num_attention_heads if config.num_key_value_heads is None else config.num_key_value_heads
+        config.num_attention_heads
+        if getattr(config, "num_key_value_heads", None) is None
+        else config.num_key_value_heads
     )
 
     key_value_cache: Tuple[Tuple[ms.Tensor, ms.Tensor]] = []
@@ -416,15 +420,83 @@ class CacheConfig:
         return unused_kwargs
 
 
+class QuantizedCacheConfig(CacheConfig):
+    """
+    Configuration class for the `QuantizedCache`.
+
+    Attributes:
+        nbits (`Optional[int]`, *optional*, defaults to 4):
+            Number of bits of the quantized states, 4 or 8.
+        axis_key (`int`, *optional*, defaults to 0):
+            Axis of the scales of the keys. 0 for per-channel scales, computed for every channel over blocks of
+            `residual_length` tokens, 1 or -1 for per-token scales, computed for every token over groups of `q_group_size`
+            channels.
+        axis_value (`int`, *optional*, defaults to 0):
+            Axis of the scales of the values, see `axis_key`.
+        q_group_size (`Optional[int]`, *optional*, defaults to 64):
+            Number of channels sharing the same scale with per-token scales, must divide the head dimension.
+        residual_length (`Optional[int]`, *optional*, defaults to 128):
+            Number of most recent tokens kept in full precision. The older tokens are quantized by blocks of
+            `residual_length` tokens.
+    """
+
+    cache_implementation = "quantized"
+
+    def __init__(
+        self,
+        nbits: Optional[int] = 4,
+        axis_key: Optional[int] = 0,
+        axis_value: Optional[int] = 0,
+        q_group_size: Optional[int] = 64,
+        residual_length: Optional[int] = 128,
+        **kwargs,
+    ):
+        # other attributes of `transformers.QuantizedCacheConfig`, such as `backend`, are not used
+        self.nbits = nbits
+        self.axis_key = axis_key
+        self.axis_value = axis_value
+        self.q_group_size = q_group_size
+        self.residual_length = residual_length
+
+    def validate(self):
+        """Validates if the arguments passed are correct"""
+        if self.nbits not in (4, 8):
+            raise ValueError(f"`nbits` must be 4 or 8, but got {self.nbits}.")
+        if self.axis_key not in (0, 1, -1) or self.axis_value not in (0, 1, -1):
+            raise ValueError(
+                f"`axis_key` and `axis_value` must be 0, 1 or -1, but got {self.axis_key} and {self.axis_value}."
+            )
+        if self.q_group_size <= 0 or self.q_group_size % 2:
+            raise ValueError(f"`q_group_size` must be a positive even number, but got {self.q_group_size}.")
+        if self.residual_length <= 0:
+            raise ValueError(f"`residual_length` must be positive, but got {self.residual_length}.")
+
+
 class DynamicCache(Cache):
     """
     A cache that grows dynamically as more tokens are generated. This is the default for generative models.
 
     It stores the Key and Value states as a list of tensors, one for each layer. The expected shape for each tensor is
     `[batch_size, num_heads, seq_len, head_dim]`.
+
+    The states of each layer are written in place into preallocated buffers, and the tensors of `key_cache` and
+    `value_cache` are views of their valid part. When a buffer is full, it is reallocated with `growth_factor` times
+    its capacity, rounded up to a multiple of `chunk_size` tokens, so that decoding does not copy the whole history
+    at every token. Tensors assigned to `key_cache` and `value_cache` directly are copied into new buffers at the next
+    update.
+
+    Parameters:
+        num_hidden_layers (`int`, *optional*):
+            The number of layers of the model, to initialize the cache with empty layers.
+        chunk_size (`int`, *optional*, defaults to 256):
+            The granularity, in tokens, of the capacity of the buffers.
+        growth_factor (`float`, *optional*, defaults to 1.5):
+            The factor by which the capacity of a full buffer grows.
     """
 
-    def __init__(self, num_hidden_layers: Optional[int] = None) -> None:
+    def __init__(
+        self, num_hidden_layers: Optional[int] = None, chunk_size: int = 256, growth_factor: float = 1.5
+    ) -> None:
         # in hf transformers there is no `num_hidden_layers` but `_distributed_cache_data`
         # it was originally added for compatibility with `torch.distributed` (DDP). See #36121
         # in mindspore there is no DDP, so we keep `num_hidden_layers`
@@ -436,6 +508,34 @@ class DynamicCache(Cache):
             self.key_cache: List[ms.Tensor] = [[] for _ in range(num_hidden_layers)]
             self.value_cache: List[ms.Tensor] = [[] for _ in range(num_hidden_layers)]
         self._seen_tokens = 0  # Used in `generate` to keep tally of how many tokens the cache has seen
+        self.chunk_size = chunk_size
+        self.growth_factor = growth_factor
+        # layer index -> (key buffer, value buffer, key view), the view tells whether `key_cache` was replaced
+        self._kv_buffers: Dict[int, Tuple[ms.Tensor, ms.Tensor, ms.Tensor]] = {}
+
+    def _get_buffers(self, layer_idx: int) -> Optional[Tuple[ms.Tensor, ms.Tensor]]:
+        """Returns the buffers of a layer, or `None` if its cache is not a view of them."""
+        buffers = self._kv_buffers.get(layer_idx)
+        if buffers is None or buffers[2] is not self.key_cache[layer_idx]:
+            return None
+        return buffers[0], buffers[1]
+
+    def _set_buffers(self, layer_idx: int, key_buffer: ms.Tensor, value_buffer: ms.Tensor, seq_length: int):
+        """Sets the buffers of a layer and the views of their first `seq_length` tokens as its cache."""
+        self.key_cache[layer_idx] = key_buffer[..., :seq_length, :]
+        self.value_cache[layer_idx] = value_buffer[..., :seq_length, :]
+        self._kv_buffers[layer_idx] = (key_buffer, value_buffer, self.key_cache[layer_idx])
+
+    def _map_buffers(self, fn: Callable[[ms.Tensor], ms.Tensor]):
+        """Applies a function along the batch dimension to the buffers, or the cache, of every layer."""
+        for layer_idx in range(len(self)):
+            buffers = self._get_buffers(layer_idx)
+            if buffers is not None:
+                seq_length = self.key_cache[layer_idx].shape[-2]
+                self._set_buffers(layer_idx, fn(buffers[0]), fn(buffers[1]), seq_length)
+            elif not isinstance(self.key_cache[layer_idx], list):
+                self.key_cache[layer_idx] = fn(self.key_cache[layer_idx])
+                self.value_cache[layer_idx] = fn(self.value_cache[layer_idx])
 
     def __getitem__(self, layer_idx: int) -> List[Tuple[ms.Tensor]]:
         """
@@ -492,19 +592,33 @@ class DynamicCache(Cache):
         # Update the cache
         if len(self.key_cache) <= layer_idx:
             # There may be skipped layers, fill them with empty lists
-            for _ in range(len(self.key_cache), layer_idx):
+            for _ in range(len(self.key_cache), layer_idx + 1):
                 self.key_cache.append([])
                 self.value_cache.append([])
-            self.key_cache.append(key_states)
-            self.value_cache.append(value_states)
+
         # content on layer cache can be a tensor and checking not tensor causes errors
         # so we explicitly check for the empty list
-        elif len(self.key_cache[layer_idx]) == 0:
-            self.key_cache[layer_idx] = key_states
-            self.value_cache[layer_idx] = value_states
+        key_cache, value_cache = self.key_cache[layer_idx], self.value_cache[layer_idx]
+        seq_length = 0 if isinstance(key_cache, list) else key_cache.shape[-2]
+        new_seq_length = seq_length + key_states.shape[-2]
+        buffers = self._get_buffers(layer_idx)
+        if buffers is None or buffers[0].shape[-2] < new_seq_length:
+            # Reserve a larger capacity and copy the cached states once
+            capacity = 0 if buffers is None else buffers[0].shape[-2]
+            capacity = max(new_seq_length, int(capacity * self.growth_factor))
+            capacity = -(-capacity // self.chunk_size) * self.chunk_size
+            key_buffer = mint.zeros(key_states.shape[:-2] + (capacity, key_states.shape[-1]), dtype=key_states.dtype)
+            value_buffer = mint.zeros(
+                value_states.shape[:-2] + (capacity, value_states.shape[-1]), dtype=value_states.dtype
+            )
+            if seq_length > 0:
+                key_buffer[..., :seq_length, :] = key_cache
+                value_buffer[..., :seq_length, :] = value_cache
         else:
-            self.key_cache[layer_idx] = ops.cat([self.key_cache[layer_idx], key_states], axis=-2)
-            self.value_cache[layer_idx] = ops.cat([self.value_cache[layer_idx], value_states], axis=-2)
+            key_buffer, value_buffer = buffers
+        key_buffer[..., seq_length:new_seq_length, :] = key_states
+        value_buffer[..., seq_length:new_seq_length, :] = value_states
+        self._set_buffers(layer_idx, key_buffer, value_buffer, new_seq_length)
 
         return self.key_cache[layer_idx], self.value_cache[layer_idx]
 
@@ -550,18 +664,33 @@ class DynamicCache(Cache):
 
         self._seen_tokens = max_length
         for idx in range(len(self.key_cache)):
-            self.key_cache[idx] = self.key_cache[idx][..., :max_length, :]
-            self.value_cache[idx] = self.value_cache[idx][..., :max_length, :]
+            if isinstance(self.key_cache[idx], list):
+                continue
+            buffers = self._get_buffers(idx)
+            if buffers is not None:
+                # The cropped tokens are overwritten by the next update
+                self._set_buffers(idx, *buffers, min(max_length, self.key_cache[idx].shape[-2]))
+            else:
+                self.key_cache[idx] = self.key_cache[idx][..., :max_length, :]
+                self.value_cache[idx] = self.value_cache[idx][..., :max_length, :]
 
     def batch_split(self, full_batch_size: int, split_size: int) -> List["DynamicCache"]:
         """Split the current instance into a list of `DynamicCache` by the batch size. This will be used by
         `_split_model_inputs()` in `generation.utils`"""
         out = []
         for i in range(0, full_batch_size, split_size):
-            current_split = DynamicCache()
+            current_split = DynamicCache(chunk_size=self.chunk_size, growth_factor=self.growth_factor)
             current_split._seen_tokens = self._seen_tokens
-            current_split.key_cache = [tensor[i : i + split_size] for tensor in self.key_cache]
-            current_split.value_cache = [tensor[i : i + split_size] for tensor in self.value_cache]
+            current_split.key_cache = [[] for _ in range(len(self))]
+            current_split.value_cache = [[] for _ in range(len(self))]
+            for idx in range(len(self)):
+                buffers = self._get_buffers(idx)
+                if buffers is not None:
+                    key_buffer, value_buffer = (buffer[i : i + split_size] for buffer in buffers)
+                    current_split._set_buffers(idx, key_buffer, value_buffer, self.key_cache[idx].shape[-2])
+                else:
+                    current_split.key_cache[idx] = self.key_cache[idx][i : i + split_size]
+                    current_split.value_cache[idx] = self.value_cache[idx][i : i + split_size]
             out.append(current_split)
         return out
 
@@ -578,15 +707,194 @@ class DynamicCache(Cache):
 
     def batch_repeat_interleave(self, repeats: int):
         """Repeat the cache `repeats` times in the batch dimension. Used in contrastive search."""
-        for layer_idx in range(len(self)):
-            self.key_cache[layer_idx] = ops.repeat_interleave(self.key_cache[layer_idx], repeats, dim=0)
-            self.value_cache[layer_idx] = ops.repeat_interleave(self.value_cache[layer_idx], repeats, dim=0)
+        self._map_buffers(lambda x: ops.repeat_interleave(x, repeats, dim=0))
 
     def batch_select_indices(self, indices: ms.Tensor):
         """Only keep the `indices` in the batch dimension of the cache. Used in contrastive search."""
+        self._map_buffers(lambda x: x[indices, ...])
+
+    def reorder_cache(self, beam_idx: ms.Tensor):
+        """Reorders the cache for beam search, given the selected beam indices."""
+        self._map_buffers(lambda x: x.index_select(0, beam_idx))
+
+
+class QuantizedCache(DynamicCache):
+    """
+    A quantized KV cache, to fit longer contexts in memory, inspired by
+    [KIVI: A Tuning-Free Asymmetric 2bit Quantization for KV Cache](https://arxiv.org/abs/2402.02750).
+
+    At least the `residual_length` most recent tokens of each layer are kept in full precision in `key_cache` and
+    `value_cache`. The older tokens are quantized by blocks of `residual_length` to `nbits` integers, with asymmetric
+    min-max scales per channel or per token (see `QuantizedCacheConfig`), and stored in `_quantized_key_cache` and
+    `_quantized_value_cache`. 4-bit states are packed by pairs into bytes. The quantized states are dequantized when
+    they are read, so the attention gets the full history in the dtype of the model.
+
+    Parameters:
+        cache_config (`QuantizedCacheConfig`, *optional*):
+            The configuration of the quantization. A `transformers.QuantizedCacheConfig` or a dictionary is also
+            accepted.
+
+    Example:
+        >>> outputs = model.generate(**inputs, cache_implementation="quantized", cache_config={"nbits": 4})
+    """
+
+    def __init__(self, cache_config: Optional[QuantizedCacheConfig] = None) -> None:
+        super().__init__()
+        if cache_config is None:
+            cache_config = QuantizedCacheConfig()
+        elif not isinstance(cache_config, QuantizedCacheConfig):
+            cache_config = QuantizedCacheConfig(**dict(cache_config))
+        cache_config.validate()
+        self.nbits = cache_config.nbits
+        self.axis_key = cache_config.axis_key
+        self.axis_value = cache_config.axis_value
+        self.q_group_size = cache_config.q_group_size
+        self.residual_length = cache_config.residual_length
+        # quantized states, scales and zero points of each layer
+        self._quantized_key_cache: List[Optional[Tuple[ms.Tensor, ms.Tensor, ms.Tensor]]] = []
+        self._quantized_value_cache: List[Optional[Tuple[ms.Tensor, ms.Tensor, ms.Tensor]]] = []
+        self._quantized_seq_lengths: List[int] = []
+
+    def _quantize(self, states: ms.Tensor, axis: int) -> Tuple[ms.Tensor, ms.Tensor, ms.Tensor]:
+        batch_size, num_heads, seq_length, head_dim = states.shape
+        if axis == 0:
+            # a scale per channel for every block of `residual_length` tokens
+            groups = states.reshape(batch_size, num_heads, -1, self.residual_length, head_dim)
+            reduce_axis = 3
+        else:
+            if head_dim % self.q_group_size:
+                raise ValueError(f"`q_group_size` ({self.q_group_size}) must divide the head dimension ({head_dim}).")
+            # a scale per token for every group of `q_group_size` channels
+            groups = states.reshape(batch_size, num_heads, seq_length, -1, self.q_group_size)
+            reduce_axis = 4
+        groups = groups.float()
+        max_int = 2**self.nbits - 1
+        min_val = ops.amin(groups, axis=reduce_axis, keepdims=True)
+        scale = mint.clamp(ops.amax(groups, axis=reduce_axis, keepdims=True) - min_val, min=1e-6) / max_int
+        quantized = mint.clamp(mint.round((groups - min_val) / scale), 0, max_int).to(ms.int32)
+        if self.nbits == 4:
+            quantized = quantized[..., 0::2] + quantized[..., 1::2] * 16
+        return quantized.to(ms.uint8), scale.to(states.dtype), min_val.to(states.dtype)
+
+    def _dequantize(self, quantized: Tuple[ms.Tensor, ms.Tensor, ms.Tensor], axis: int) -> ms.Tensor:
+        states, scale, min_val = quantized
+        if self.nbits == 4:
+            states = states.to(ms.int32)
+            high = states // 16
+            states = mint.stack([states - high * 16, high], dim=-1).reshape(states.shape[:-1] + (-1,))
+        states = states.to(scale.dtype) * scale + min_val
+        batch_size, num_heads = states.shape[:2]
+        if axis == 0:
+            return states.reshape(batch_size, num_heads, -1, states.shape[-1])
+        return states.reshape(batch_size, num_heads, states.shape[2], -1)
+
+    def update(
+        self,
+        key_states: ms.Tensor,
+        value_states: ms.Tensor,
+        layer_idx: int,
+        cache_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[ms.Tensor, ms.Tensor]:
+        """
+        Updates the cache with the new `key_states` and `value_states` for the layer `layer_idx`.
+
+        Parameters:
+            key_states (`ms.Tensor`):
+                The new key states to cache.
+            value_states (`ms.Tensor`):
+                The new value states to cache.
+            layer_idx (`int`):
+                The index of the layer to cache the states for.
+            cache_kwargs (`Dict[str, Any]`, `optional`):
+                Additional arguments for the cache subclass. No additional arguments are used in `QuantizedCache`.
+
+        Return:
+            A tuple containing the dequantized key and value states of the whole history.
+        """
+        # Update the number of seen tokens
+        if layer_idx == 0:
+            self._seen_tokens += key_states.shape[-2]
+
+        if len(self.key_cache) <= layer_idx:
+            # There may be skipped layers, fill them with empty lists
+            for _ in range(len(self.key_cache), layer_idx + 1):
+                self.key_cache.append([])
+                self.value_cache.append([])
+                self._quantized_key_cache.append(None)
+                self._quantized_value_cache.append(None)
+                self._quantized_seq_lengths.append(0)
+
+        keys, values = key_states, value_states
+        if not isinstance(self.key_cache[layer_idx], list):
+            keys = ops.cat([self.key_cache[layer_idx], key_states], axis=-2)
+            values = ops.cat([self.value_cache[layer_idx], value_states], axis=-2)
+
+        # Quantize the full blocks of `residual_length` tokens older than the `residual_length` most recent ones
+        num_quantized = max(keys.shape[-2] - self.residual_length, 0) // self.residual_length * self.residual_length
+        if num_quantized > 0:
+            for quantized_cache, states, axis in (
+                (self._quantized_key_cache, keys, self.axis_key),
+                (self._quantized_value_cache, values, self.axis_value),
+            ):
+                quantized = self._quantize(states[..., :num_quantized, :], axis)
+                if quantized_cache[layer_idx] is not None:
+                    quantized = tuple(ops.cat([x, y], axis=2) for x, y in zip(quantized_cache[layer_idx], quantized))
+                quantized_cache[layer_idx] = quantized
+            self._quantized_seq_lengths[layer_idx] += num_quantized
+            keys, values = keys[..., num_quantized:, :], values[..., num_quantized:, :]
+        has_residual = keys.shape[-2] > 0
+        self.key_cache[layer_idx] = keys if has_residual else []
+        self.value_cache[layer_idx] = values if has_residual else []
+
+        return self[layer_idx]
+
+    def __getitem__(self, layer_idx: int) -> List[Tuple[ms.Tensor]]:
+        """Returns the dequantized key and value states of a layer, followed by its full precision ones."""
+        if layer_idx >= len(self):
+            raise KeyError(f"Cache only has {len(self)} layers, attempted to access layer with index {layer_idx}")
+        if self._quantized_key_cache[layer_idx] is None:
+            return (self.key_cache[layer_idx], self.value_cache[layer_idx])
+        keys = self._dequantize(self._quantized_key_cache[layer_idx], self.axis_key)
+        values = self._dequantize(self._quantized_value_cache[layer_idx], self.axis_value)
+        if not isinstance(self.key_cache[layer_idx], list):
+            keys = ops.cat([keys, self.key_cache[layer_idx]], axis=-2)
+            values = ops.cat([values, self.value_cache[layer_idx]], axis=-2)
+        return (keys, values)
+
+    def __iter__(self):
+        for layer_idx in range(len(self)):
+            yield self[layer_idx]
+
+    def get_seq_length(self, layer_idx: Optional[int] = 0) -> int:
+        """Returns the sequence length of the cached states. A layer index can be optionally passed."""
+        if len(self.key_cache) <= layer_idx:
+            return 0
+        residual_length = 0 if isinstance(self.key_cache[layer_idx], list) else self.key_cache[layer_idx].shape[-2]
+        return self._quantized_seq_lengths[layer_idx] + residual_length
+
+    def to_legacy_cache(self) -> Tuple[Tuple[ms.Tensor], Tuple[ms.Tensor]]:
+        """Converts the `QuantizedCache` into the legacy cache format, with dequantized states."""
+        return tuple(self)
+
+    def _map_buffers(self, fn: Callable[[ms.Tensor], ms.Tensor]):
+        """Applies a function along the batch dimension to the quantized and full precision states of every layer."""
         for layer_idx in range(len(self)):
-            self.key_cache[layer_idx] = self.key_cache[layer_idx][indices, ...]
-            self.value_cache[layer_idx] = self.value_cache[layer_idx][indices, ...]
+            for quantized_cache in (self._quantized_key_cache, self._quantized_value_cache):
+                if quantized_cache[layer_idx] is not None:
+                    quantized_cache[layer_idx] = tuple(fn(x) for x in quantized_cache[layer_idx])
+            if not isinstance(self.key_cache[layer_idx], list):
+                self.key_cache[layer_idx] = fn(self.key_cache[layer_idx])
+                self.value_cache[layer_idx] = fn(self.value_cache[layer_idx])
+
+    def crop(self, max_length: int):
+        raise NotImplementedError("`QuantizedCache` does not support cropping, used by assisted decoding.")
+
+    def batch_split(self, full_batch_size: int, split_size: int) -> List["DynamicCache"]:
+        raise NotImplementedError("`QuantizedCache` does not support splitting the batch.")
+
+    @classmethod
+    def from_batch_splits(cls, splits: List["DynamicCache"]) -> "DynamicCache":
+        raise NotImplementedError("`QuantizedCache` does not support splitting the batch.")
 
 
 class SlidingWindowCache(StaticCache):
@@ -1085,5 +1393,208 @@ class MambaCache:
 
 
 class OffloadedStaticCache(StaticCache):
-    def __init__(self):
-        raise NotImplementedError
+    """
+    Static cache whose key and value states are kept in host memory, for contexts that do not fit on the device.
+
+    Only three layers are held on the device: the first one, which always stays there, and two buffers alternately
+    holding the current layer and the next one. While layer `i` is computed, the states of layer `i + 1` are copied
+    to the device on a separate stream. The new states are written to the device buffer, and the blocks of
+    `block_size` tokens they touch are copied back to the host, so that a decoding step only moves one block per
+    layer to the host.
+
+    The returned states always have the full static shape `(max_batch_size, num_key_value_heads, max_cache_len,
+    head_dim)`, as with the `StaticCache`. The copies between the host and the device are issued from Python, so the
+    cache is only supported in PyNative mode.
+
+    Parameters:
+        config (`PretrainedConfig):
+            The configuration file defining the shape-related attributes required to initialize the static cache.
+        max_batch_size (`int`):
+            The maximum batch size with which the model will be used.
+        max_cache_len (`int`):
+            The maximum sequence length with which the model will be used.
+        dtype (*optional*, defaults to `ms.float32`):
+            The default `dtype` to use when initializing the cache.
+        offload_device (`str`, *optional*, defaults to `"CPU"`):
+            The device the states are offloaded to.
+        block_size (`int`, *optional*, defaults to 1024):
+            Number of tokens copied together between the host and the device.
+
+    Example:
+        >>> outputs = model.generate(**inputs, cache_implementation="offloaded_static", max_new_tokens=128)
+    """
+
+    def __init__(
+        self,
+        config: PretrainedConfig,
+        max_batch_size: int,
+        max_cache_len: int,
+        dtype=None,
+        offload_device: str = "CPU",
+        block_size: int = 1024,
+    ) -> None:
+        if ms.get_context("mode") == ms.GRAPH_MODE:
+            raise ValueError(
+                f"{self.__class__.__name__} moves the states with `Tensor.move_to` and streams, which are only "
+                "supported in PyNative mode. Use `StaticCache` in graph mode."
+            )
+        # the states are not allocated on the device by `StaticCache.__init__`
+        Cache.__init__(self)
+        self.max_batch_size = max_batch_size
+        self.max_cache_len = config.max_position_embeddings if max_cache_len is None else max_cache_len
+        self.head_dim = (
+            config.head_dim if hasattr(config, "head_dim") else config.hidden_size // config.num_attention_heads
+        )
+        self.dtype = dtype if dtype is not None else ms.float32
+        self.num_key_value_heads = (
+            config.num_attention_heads
+            if getattr(config, "num_key_value_heads", None) is None
+            else config.num_key_value_heads
+        )
+        self.num_hidden_layers = config.num_hidden_layers
+        self.offload_device = offload_device
+        self.block_size = block_size
+        self.device = ms.get_context("device_target")
+
+        # the first layer, then the two buffers alternately used by the other layers
+        key_cache: List[ms.Parameter] = []
+        value_cache: List[ms.Parameter] = []
+        cache_shape = (max_batch_size, self.num_key_value_heads, self.max_cache_len, self.head_dim)
+        for buffer_index in range(min(3, self.num_hidden_layers)):
+            key_cache.append(
+                ms.Parameter(
+                    ms.Tensor(np.zeros(cache_shape), dtype=self.dtype),
+                    name=f"key_cache_{buffer_index}",
+                    requires_grad=False,
+                )
+            )
+            value_cache.append(
+                ms.Parameter(
+                    ms.Tensor(np.zeros(cache_shape), dtype=self.dtype),
+                    name=f"value_cache_{buffer_index}",
+                    requires_grad=False,
+                )
+            )
+        self.device_key_cache = ms.ParameterTuple(key_cache)
+        self.device_value_cache = ms.ParameterTuple(value_cache)
+
+        # host copies of the blocks of the layers, `None` until a block is written
+        num_blocks = -(-self.max_cache_len // block_size)
+        self.key_cache: List[List[Optional[ms.Tensor]]] = [[None] * num_blocks for _ in range(self.num_hidden_layers)]
+        self.value_cache: List[List[Optional[ms.Tensor]]] = [[None] * num_blocks for _ in range(self.num_hidden_layers)]
+        self._seen_tokens = 0
+        self._write_start = 0
+
+        self._runtime = get_runtime()
+        self._prefetch_stream = self._runtime.Stream() if self.device != "CPU" else None
+
+    def _get_buffer_index(self, layer_idx: int) -> int:
+        return 0 if layer_idx == 0 else 1 + layer_idx % 2
+
+    def _prefetch_layer(self, layer_idx: int):
+        """Copies the states of a layer to its device buffer, on the prefetch stream."""
+        buffer_index = self._get_buffer_index(layer_idx)
+        key_buffer, value_buffer = self.device_key_cache[buffer_index], self.device_value_cache[buffer_index]
+        if self._prefetch_stream is None:
+            self._copy_blocks_to_device(layer_idx, key_buffer, value_buffer)
+            return
+        # the buffer may still be read by the attention of the previous layer
+        self._prefetch_stream.wait_stream(self._runtime.current_stream())
+        with self._runtime.StreamCtx(self._prefetch_stream):
+            self._copy_blocks_to_device(layer_idx, key_buffer, value_buffer)
+
+    def _copy_blocks_to_device(self, layer_idx: int, key_buffer: ms.Parameter, value_buffer: ms.Parameter):
+        # the positions which were never written are masked by the attention, so they are not cleared
+        for block_idx, (key_block, value_block) in enumerate(
+            zip(self.key_cache[layer_idx], self.value_cache[layer_idx])
+        ):
+            if key_block is None:
+                continue
+            start = block_idx * self.block_size
+            key_buffer[:, :, start : start + key_block.shape[2]] = key_block.move_to(self.device, blocking=False)
+            value_buffer[:, :, start : start + value_block.shape[2]] = value_block.move_to(self.device, blocking=False)
+
+    def _offload_blocks(self, layer_idx: int, key_buffer: ms.Parameter, value_buffer: ms.Parameter, end: int):
+        """Copies the blocks holding the positions written by the current step back to the host."""
+        for block_idx in range(self._write_start // self.block_size, -(-end // self.block_size)):
+            start = block_idx * self.block_size
+            block_end = min(start + self.block_size, self.max_cache_len)
+            self.key_cache[layer_idx][block_idx] = self._offload_block(key_buffer[:, :, start:block_end])
+            self.value_cache[layer_idx][block_idx] = self._offload_block(value_buffer[:, :, start:block_end])
+
+    def _offload_block(self, block: ms.Tensor) -> ms.Tensor:
+        block = block.move_to(self.offload_device, blocking=False)
+        # on the same device, the block is a view of the buffer, which is shared with other layers
+        if self.offload_device == self.device:
+            block = block.copy()
+        return block
+
+    def update(
+        self,
+        key_states: ms.Tensor,
+        value_states: ms.Tensor,
+        layer_idx: int,
+        cache_kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[ms.Tensor, ms.Tensor]:
+        """
+        Updates the cache with the new `key_states` and `value_states` for the layer `layer_idx`.
+
+        Parameters:
+            key_states (`ms.Tensor`):
+                The new key states to cache.
+            value_states (`ms.Tensor`):
+                The new value states to cache.
+            layer_idx (`int`):
+                The index of the layer to cache the states for.
+            cache_kwargs (`Dict[str, Any]`, `optional`):
+                Additional arguments for the cache subclass. The `OffloadedStaticCache` needs the `cache_position`
+                input to know how where to write in the cache.
+
+        Return:
+            A tuple containing the updated key and value states.
+        """
+        cache_position = cache_kwargs.get("cache_position") if cache_kwargs is not None else None
+        if layer_idx == 0:
+            # the positions are tracked on the host, to avoid reading `cache_position` back from the device
+            self._write_start = 0 if cache_position is None else self._seen_tokens
+            self._seen_tokens = self._write_start + key_states.shape[-2]
+        elif self._prefetch_stream is not None:
+            self._runtime.current_stream().wait_stream(self._prefetch_stream)
+
+        buffer_index = self._get_buffer_index(layer_idx)
+        k_out = self.device_key_cache[buffer_index]
+        v_out = self.device_value_cache[buffer_index]
+
+        if layer_idx + 1 < self.num_hidden_layers:
+            self._prefetch_layer(layer_idx + 1)
+
+        if cache_position is None:
+            k_out[:, :, : key_states.shape[-2]] = key_states
+            v_out[:, :, : value_states.shape[-2]] = value_states
+        else:
+            k_out[:, :, cache_position] = key_states
+            v_out[:, :, cache_position] = value_states
+
+        # the first layer stays on the device
+        if layer_idx > 0:
+            self._offload_blocks(layer_idx, k_out, v_out, self._seen_tokens)
+
+        return k_out, v_out
+
+    def get_seq_length(self, layer_idx: Optional[int] = 0) -> int:
+        """Returns the sequence length of the cached states that were seen by the model."""
+        return self._seen_tokens
+
+    def reset(self):
+        """Resets the cache values while preserving the objects"""
+        self._seen_tokens = 0
+        self._write_start = 0
+        for layer_idx in range(self.num_hidden_layers):
+            self.key_cache[layer_idx] = [None] * len(self.key_cache[layer_idx])
+            self.value_cache[layer_idx] = [None] * len(self.value_cache[layer_idx])
+        # the first layer is not restored from the host
+        ops.assign(self.device_key_cache[0], ops.zeros_like(self.device_key_cache[0]))
+        ops.assign(self.device_value_cache[0], ops.zeros_like(self.device_value_cache[0]))
+
+    def reorder_cache(self, beam_idx: ms.Tensor):
+        raise NotImplementedError("`OffloadedStaticCache` does not support beam search.")
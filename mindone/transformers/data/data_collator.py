@@ -164,3 +164,157 @@ class DataCollatorWithPadding:
             batch["labels"] = batch["label_ids"]
             del batch["label_ids"]
         return batch
+
+
+@dataclass
+class DataCollatorWithPacking:
+    """
+    Data collator that packs the samples of a batch into rows of `max_length` tokens instead of padding every sample
+    to the longest one.
+
+    Samples are placed into rows by first-fit decreasing length, samples longer than `max_length` are truncated. The
+    `position_ids` restart at 0 for every sample, and the first label of every sample is set to `-100`, so that the
+    loss never predicts a token from the previous sample. The attention is restricted to each sample by either:
+
+    - `"4d"`: a block-diagonal causal mask of shape `(num_rows, 1, max_length, max_length)` in inverted (additive)
+      form, as accepted by the models and `sdpa_attention_forward`.
+    - `"varlen"`: the cumulative sequence lengths `cu_seq_lens_q`/`cu_seq_lens_k` over the flattened batch and the
+      `max_length_q`/`max_length_k` of the samples (see [`~modeling_flash_attention_utils.FlashAttentionKwargs`]), as
+      accepted by `flash_attention_forward`. The padding at the end of each row is a sequence of its own.
+
+    The number of rows depends on the lengths of the samples in the batch.
+
+    Args:
+        max_length (`int`):
+            The length of the packed rows.
+        pad_token_id (`int`, *optional*, defaults to 0):
+            The id of the padding token at the end of the rows.
+        label_pad_token_id (`int`, *optional*, defaults to -100):
+            The label of the padding tokens and of the first token of every sample, ignored by the loss.
+        attention_mask_format (`str`, *optional*, defaults to `"4d"`):
+            The attention metadata to return, `"4d"`, `"varlen"` or `None`.
+        return_tensors (`str`, *optional*, defaults to `"np"`):
+            The type of Tensor to return. Only "np" is supported.
+    """
+
+    max_length: int
+    pad_token_id: int = 0
+    label_pad_token_id: int = -100
+    attention_mask_format: Optional[str] = "4d"
+    return_tensors: str = "np"
+
+    def __post_init__(self):
+        if self.attention_mask_format not in ("4d", "varlen", None):
+            raise ValueError(
+                f"`attention_mask_format` must be '4d', 'varlen' or None, but got {self.attention_mask_format}."
+            )
+        if self.return_tensors != "np":
+            raise NotImplementedError
+
+    def _pack(self, lengths: List[int]) -> List[List[int]]:
+        rows, free = [], []
+        for idx in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+            for row, space in enumerate(free):
+                if lengths[idx] <= space:
+                    rows[row].append(idx)
+                    free[row] -= lengths[idx]
+                    break
+            else:
+                rows.append([idx])
+                free.append(self.max_length - lengths[idx])
+        return rows
+
+    def __call__(self, features: List[Dict[str, Any]], batch_info=None) -> Dict[str, Any]:
+        input_ids = [np.asarray(f["input_ids"][: self.max_length], dtype=np.int64) for f in features]
+        labels = [
+            np.asarray(f["labels"][: self.max_length] if f.get("labels") is not None else ids, dtype=np.int64)
+            for f, ids in zip(features, input_ids)
+        ]
+        rows = self._pack([len(ids) for ids in input_ids])
+
+        batch_input_ids = np.full((len(rows), self.max_length), self.pad_token_id, dtype=np.int64)
+        batch_labels = np.full((len(rows), self.max_length), self.label_pad_token_id, dtype=np.int64)
+        position_ids = np.zeros((len(rows), self.max_length), dtype=np.int64)
+        # segment id of each token, the padding of a row is a segment of its own
+        segment_ids = np.full((len(rows), self.max_length), -1, dtype=np.int64)
+        seq_lens = []
+        for row, samples in enumerate(rows):
+            offset = 0
+            for segment, idx in enumerate(samples):
+                length = len(input_ids[idx])
+                batch_input_ids[row, offset : offset + length] = input_ids[idx]
+                batch_labels[row, offset + 1 : offset + length] = labels[idx][1:]
+                position_ids[row, offset : offset + length] = np.arange(length)
+                segment_ids[row, offset : offset + length] = segment
+                seq_lens.append(length)
+                offset += length
+            if offset < self.max_length:
+                seq_lens.append(self.max_length - offset)
+
+        batch = {"input_ids": batch_input_ids, "labels": batch_labels, "position_ids": position_ids}
+        if self.attention_mask_format == "4d":
+            causal = np.tril(np.ones((self.max_length, self.max_length), dtype=bool))
+            visible = (segment_ids[:, :, None] == segment_ids[:, None, :]) & causal
+            # masked with the float16 minimum, as the models do, so that it survives the casts to half precision
+            attention_mask = np.where(visible, 0.0, np.finfo(np.float16).min).astype(np.float32)
+            batch["attention_mask"] = attention_mask[:, None]
+        elif self.attention_mask_format == "varlen":
+            cu_seq_lens = np.concatenate([[0], np.cumsum(seq_lens)]).astype(np.int32)
+            batch["cu_seq_lens_q"] = batch["cu_seq_lens_k"] = cu_seq_lens
+            batch["max_length_q"] = batch["max_length_k"] = int(max(seq_lens))
+        return batch
+
+
+@dataclass
+class DataCollatorWithTextEncoding:
+    """
+    Data collator that encodes the raw texts of the samples as a batch, instead of tokenizing every sample in the
+    dataset map function, e.g. for the captions of a text-to-image dataset.
+
+    The texts under `text_key` are encoded at once by `encoder`, which is either a tokenizer or a
+    [`~tokenization_utils.MultiprocessBatchEncoder`] to encode large batches in worker processes. The other keys are
+    collated by [`default_data_collator`].
+
+    Args:
+        encoder ([`PreTrainedTokenizerBase`] or [`~tokenization_utils.MultiprocessBatchEncoder`]):
+            The tokenizer, or the batch encoder, used for encoding the texts.
+        text_key (`str`, *optional*, defaults to `"text"`):
+            The key of the texts in the samples.
+        padding (`bool`, `str` or [`~utils.PaddingStrategy`], *optional*, defaults to `True`):
+            The padding strategy of the encoded texts, as in [`DataCollatorWithPadding`].
+        max_length (`int`, *optional*):
+            Maximum length of the encoded texts, for the padding and the truncation.
+        truncation (`bool`, *optional*, defaults to `False`):
+            Whether to truncate the encoded texts to `max_length`.
+        pad_to_multiple_of (`int`, *optional*):
+            If set will pad the sequence to a multiple of the provided value.
+        return_tensors (`str`, *optional*, defaults to `"np"`):
+            The type of Tensor to return. Only "np" is supported.
+    """
+
+    encoder: Any
+    text_key: str = "text"
+    padding: Union[bool, str, PaddingStrategy] = True
+    max_length: Optional[int] = None
+    truncation: bool = False
+    pad_to_multiple_of: Optional[int] = None
+    return_tensors: str = "np"
+
+    def __post_init__(self):
+        if self.return_tensors != "np":
+            raise NotImplementedError
+
+    def __call__(self, features: List[Dict[str, Any]]) -> Dict[str, Any]:
+        texts = [f[self.text_key] for f in features]
+        encodings = self.encoder(
+            texts,
+            padding=self.padding,
+            max_length=self.max_length,
+            truncation=self.truncation,
+            pad_to_multiple_of=self.pad_to_multiple_of,
+            return_tensors="np",
+        )
+        other_features = [{k: v for k, v in f.items() if k != self.text_key} for f in features]
+        batch = numpy_default_data_collator(other_features) if other_features[0] else {}
+        batch.update(encodings)
+        return batch
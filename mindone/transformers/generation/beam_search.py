@@ -344,7 +344,7 @@ class BeamSearchScorer(BeamScorer):
                 beam_hyp.add(final_tokens, final_score, beam_indices=beam_index, generated_len=generated_len)
 
         # select the best hypotheses
-        sent_lengths = input_ids.new(batch_size * self.num_beam_hyps_to_keep)
+        sent_lengths = mint.zeros(batch_size * self.num_beam_hyps_to_keep, dtype=input_ids.dtype)
         best = []
         best_indices = []
         best_scores = mint.zeros(batch_size * self.num_beam_hyps_to_keep, dtype=ms.float32)
@@ -372,10 +372,12 @@ class BeamSearchScorer(BeamScorer):
         # prepare for adding eos
         sent_lengths_max = sent_lengths.max().item() + 1
         sent_max_len = min(sent_lengths_max, max_length) if max_length is not None else sent_lengths_max
-        decoded: ms.Tensor = input_ids.new(batch_size * self.num_beam_hyps_to_keep, sent_max_len)
+        decoded: ms.Tensor = mint.zeros((batch_size * self.num_beam_hyps_to_keep, sent_max_len), dtype=input_ids.dtype)
 
         if len(best_indices) > 0 and best_indices[0] is not None:
-            indices: ms.Tensor = input_ids.new(batch_size * self.num_beam_hyps_to_keep, sent_max_len)
+            indices: ms.Tensor = mint.zeros(
+                (batch_size * self.num_beam_hyps_to_keep, sent_max_len), dtype=input_ids.dtype
+            )
         else:
             indices = None
 
@@ -408,6 +410,345 @@ class BeamSearchScorer(BeamScorer):
         )
 
 
+class TensorizedBeamSearchScorer(BeamSearchScorer):
+    r"""
+    [`BeamSearchScorer`] whose bookkeeping is done for all the batches at once, in arrays of fixed shape.
+
+    Instead of one [`BeamHypotheses`] heap per batch, the finished hypotheses of each batch (and group of beams) are
+    kept in `group_size` slots: their scores, lengths and insertion order live in host arrays, and their token ids in
+    a `(batch_size * num_beam_groups * group_size, length)` device buffer, masked by their lengths. Each call to
+    [`~TensorizedBeamSearchScorer.process`] copies the candidates to the host once, selects the next beams of all the
+    batches with array operations and writes the newly finished hypotheses to the buffer with a single scatter. The
+    results, including the tie-breaking between equal scores, are the same as with [`BeamSearchScorer`].
+
+    Args:
+        batch_size (`int`):
+            Batch Size of `input_ids` for which standard beam search decoding is run in parallel.
+        num_beams (`int`):
+            Number of beams for beam search.
+        length_penalty (`float`, *optional*, defaults to 1.0):
+            Exponential penalty to the length, see [`BeamSearchScorer`].
+        do_early_stopping (`bool` or `str`, *optional*, defaults to `False`):
+            Controls the stopping condition for beam-based methods, see [`BeamSearchScorer`].
+        num_beam_hyps_to_keep (`int`, *optional*, defaults to 1):
+            The number of beam hypotheses that shall be returned upon calling
+            [`~TensorizedBeamSearchScorer.finalize`].
+        num_beam_groups (`int`, *optional*, defaults to 1):
+            Number of groups to divide `num_beams` into in order to ensure diversity among different groups of beams.
+        max_length (`int`, *optional*):
+            The maximum length of the sequence to be generated. If given, the buffer of the finished hypotheses is
+            allocated once with this length.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        num_beams: int,
+        length_penalty: Optional[float] = 1.0,
+        do_early_stopping: Optional[Union[bool, str]] = False,
+        num_beam_hyps_to_keep: Optional[int] = 1,
+        num_beam_groups: Optional[int] = 1,
+        max_length: Optional[int] = None,
+    ):
+        super().__init__(
+            batch_size,
+            num_beams,
+            length_penalty=length_penalty,
+            do_early_stopping=do_early_stopping,
+            num_beam_hyps_to_keep=num_beam_hyps_to_keep,
+            num_beam_groups=num_beam_groups,
+            max_length=max_length,
+        )
+        self.batch_size = batch_size
+        self.max_length = max_length
+        num_hyps = batch_size * num_beam_groups
+        self._beam_hyps = None
+        self._done = np.zeros(num_hyps, dtype=np.bool_)
+        # scores are kept in float64, as the python floats of `BeamHypotheses`
+        self._hyp_scores = np.zeros((num_hyps, self.group_size), dtype=np.float64)
+        self._hyp_lengths = np.zeros((num_hyps, self.group_size), dtype=np.int64)
+        # insertion order of the hypotheses, to break ties as the lists of `BeamHypotheses` do
+        self._hyp_order = np.zeros((num_hyps, self.group_size), dtype=np.int64)
+        self._hyp_beam_indices = np.full((num_hyps, self.group_size), None, dtype=object)
+        self._num_hyps = np.zeros(num_hyps, dtype=np.int64)
+        self._worst_scores = np.full(num_hyps, 1e9, dtype=np.float64)
+        self._num_added = 0
+        self._hyp_sequences: Optional[ms.Tensor] = None
+
+    @property
+    def is_done(self) -> bool:
+        return bool(self._done.all())
+
+    def _add_hypotheses(
+        self,
+        input_ids: ms.Tensor,
+        scores: np.ndarray,
+        is_added: np.ndarray,
+        source_indices: np.ndarray,
+        generated_len: int,
+        beam_indices: Optional[Tuple] = None,
+        append_source_index: bool = False,
+    ):
+        """
+        Adds the hypotheses of `input_ids[source_indices]`, of shape `(num_hyps, num_candidates)`, where `is_added`,
+        in the order of the candidates, as successive calls to `BeamHypotheses.add` would.
+        """
+        scores = scores / (generated_len**self.length_penalty)
+        rows = np.arange(len(self._num_hyps))
+        written_sources = np.full(self._hyp_scores.shape, -1, dtype=np.int64)
+        for candidate_idx in range(scores.shape[1]):
+            score = scores[:, candidate_idx]
+            is_full = self._num_hyps == self.group_size
+            is_added_now = is_added[:, candidate_idx] & (~is_full | (score > self._worst_scores))
+            if not is_added_now.any():
+                continue
+            # a full list drops its worst hypothesis, the oldest one in case of a tie
+            is_worst = self._hyp_scores == self._hyp_scores.min(axis=1, keepdims=True)
+            worst_slot = np.where(is_worst, self._hyp_order, np.iinfo(np.int64).max).argmin(axis=1)
+            slot = np.where(is_full, worst_slot, np.minimum(self._num_hyps, self.group_size - 1))
+            added_rows, added_slots = rows[is_added_now], slot[is_added_now]
+            self._hyp_scores[added_rows, added_slots] = score[is_added_now]
+            self._hyp_lengths[added_rows, added_slots] = input_ids.shape[-1]
+            self._hyp_order[added_rows, added_slots] = self._num_added
+            self._num_added += 1
+            written_sources[added_rows, added_slots] = source_indices[is_added_now, candidate_idx]
+            if beam_indices is not None:
+                for row, added_slot, source_idx in zip(
+                    added_rows, added_slots, source_indices[is_added_now, candidate_idx]
+                ):
+                    beam_index = beam_indices[source_idx]
+                    if append_source_index:
+                        beam_index = beam_index + (int(source_idx),)
+                    self._hyp_beam_indices[row, added_slot] = beam_index
+            self._num_hyps[added_rows] = np.minimum(self._num_hyps[added_rows] + 1, self.group_size)
+            # the worst score is the lowest score in the list
+            valid_scores = np.where(
+                np.arange(self.group_size) < self._num_hyps[added_rows, None], self._hyp_scores[added_rows], np.inf
+            )
+            self._worst_scores[added_rows] = valid_scores.min(axis=1)
+
+        # write the token ids of the hypotheses which are still in the lists
+        written_slots = np.flatnonzero(written_sources >= 0)
+        if len(written_slots) == 0:
+            return
+        seq_length = input_ids.shape[-1]
+        if self._hyp_sequences is None or self._hyp_sequences.shape[-1] < seq_length:
+            width = max(
+                seq_length,
+                self.max_length or 0,
+                2 * self._hyp_sequences.shape[-1] if self._hyp_sequences is not None else 0,
+            )
+            hyp_sequences = mint.zeros((self._hyp_scores.size, width), dtype=input_ids.dtype)
+            if self._hyp_sequences is not None:
+                hyp_sequences[:, : self._hyp_sequences.shape[-1]] = self._hyp_sequences
+            self._hyp_sequences = hyp_sequences
+        sequences = input_ids[ms.tensor(written_sources.reshape(-1)[written_slots])]
+        sequences = mint.nn.functional.pad(sequences, (0, self._hyp_sequences.shape[-1] - seq_length))
+        self._hyp_sequences[ms.tensor(written_slots)] = sequences
+
+    def _is_done(
+        self, hyp_slice: slice, best_sum_logprobs: np.ndarray, cur_len: int, decoder_prompt_len: int
+    ) -> np.ndarray:
+        """`BeamHypotheses.is_done` of the lists of `hyp_slice`."""
+        is_full = self._num_hyps[hyp_slice] >= self.group_size
+        worst_scores = self._worst_scores[hyp_slice]
+        if self.do_early_stopping is True:
+            return is_full
+        if self.do_early_stopping is False or self.length_penalty <= 0.0:
+            highest_attainable_score = best_sum_logprobs / (cur_len - decoder_prompt_len) ** self.length_penalty
+        else:
+            if self.max_length <= decoder_prompt_len:
+                raise ValueError("max_length is not larger than decoder prompt length")
+            highest_attainable_score = best_sum_logprobs / (self.max_length - decoder_prompt_len) ** self.length_penalty
+        return is_full & (worst_scores >= highest_attainable_score)
+
+    def process(
+        self,
+        input_ids: ms.Tensor,
+        next_scores: ms.Tensor,
+        next_tokens: ms.Tensor,
+        next_indices: ms.Tensor,
+        pad_token_id: Optional[Union[int, ms.Tensor]] = None,
+        eos_token_id: Optional[Union[int, List[int], ms.Tensor]] = None,
+        beam_indices: Optional[ms.Tensor] = None,
+        group_index: Optional[int] = 0,
+        decoder_prompt_len: Optional[int] = 0,
+    ) -> Dict[str, ms.Tensor]:
+        # add up to the length which the next_scores is calculated on (including decoder prompt)
+        cur_len = input_ids.shape[-1] + 1
+        batch_size = self.batch_size
+
+        if not (batch_size == (input_ids.shape[0] // self.group_size)):
+            if self.num_beam_groups > 1:
+                raise ValueError(
+                    f"A group beam size of {input_ids.shape[0]} is used as the input, but a group beam "
+                    f"size of {self.group_size} is expected by the beam scorer."
+                )
+            else:
+                raise ValueError(
+                    f"A beam size of {input_ids.shape[0]} is used as the input, but a beam size of "
+                    f"{self.group_size} is expected by the beam scorer."
+                )
+
+        # the lists of the hypotheses of this group of beams
+        hyp_slice = slice(group_index, None, self.num_beam_groups)
+        is_done = self._done[hyp_slice].copy()
+        if is_done.any() and (eos_token_id is None or pad_token_id is None):
+            raise ValueError("Generated beams >= num_beams -> eos_token_id and pad_token have to be defined")
+        if isinstance(pad_token_id, ms.Tensor):
+            pad_token_id = pad_token_id.item()
+
+        scores_np, tokens_np, indices_np = next_scores.asnumpy(), next_tokens.asnumpy(), next_indices.asnumpy()
+        num_candidates = tokens_np.shape[1]
+        if eos_token_id is None:
+            is_eos = np.zeros(tokens_np.shape, dtype=np.bool_)
+        else:
+            if isinstance(eos_token_id, ms.Tensor):
+                eos_token_id = eos_token_id.asnumpy()
+            is_eos = np.isin(tokens_np, np.array(eos_token_id).reshape(-1))
+        batch_beam_indices = np.arange(batch_size)[:, None] * self.group_size + indices_np
+
+        # the first `group_size` non-eos candidates continue, in the order of their ranks
+        has_next_beams = (~is_eos).sum(axis=1) >= self.group_size
+        if not (has_next_beams | is_done).all():
+            batch_idx = np.flatnonzero(~(has_next_beams | is_done))[0]
+            raise ValueError(
+                f"At most {self.group_size} tokens in {next_tokens[batch_idx]} can be equal to `eos_token_id:"
+                f" {eos_token_id}`. Make sure {next_tokens[batch_idx]} are corrected."
+            )
+        ranks = np.arange(num_candidates)
+        next_ranks = np.argsort(np.where(is_eos, ranks + num_candidates, ranks), axis=1, kind="stable")
+        next_ranks = next_ranks[:, : self.group_size]
+        next_beam_scores = np.take_along_axis(scores_np, next_ranks, axis=1)
+        next_beam_tokens = np.take_along_axis(tokens_np, next_ranks, axis=1)
+        next_beam_indices = np.take_along_axis(batch_beam_indices, next_ranks, axis=1)
+        # the finished batches are padded
+        next_beam_scores[is_done] = 0
+        next_beam_tokens[is_done] = pad_token_id if pad_token_id is not None else 0
+        next_beam_indices[is_done] = 0
+
+        # eos tokens are only added to the hypotheses if they belong to the top `group_size` candidates
+        is_added = is_eos & (ranks < self.group_size) & ~is_done[:, None]
+        if is_added.any():
+            num_hyps = len(self._done)
+            group_scores = np.zeros((num_hyps, num_candidates), dtype=np.float64)
+            group_is_added = np.zeros((num_hyps, num_candidates), dtype=np.bool_)
+            group_sources = np.zeros((num_hyps, num_candidates), dtype=np.int64)
+            group_scores[hyp_slice], group_is_added[hyp_slice], group_sources[hyp_slice] = (
+                scores_np,
+                is_added,
+                batch_beam_indices,
+            )
+            self._add_hypotheses(
+                input_ids,
+                group_scores,
+                group_is_added,
+                group_sources,
+                cur_len - decoder_prompt_len,
+                beam_indices=beam_indices,
+                append_source_index=True,
+            )
+
+        # Check if we are done so that we can save a pad step if all(done)
+        best_sum_logprobs = scores_np.max(axis=1).astype(np.float64)
+        self._done[hyp_slice] = is_done | self._is_done(hyp_slice, best_sum_logprobs, cur_len, decoder_prompt_len)
+
+        return UserDict(
+            {
+                "next_beam_scores": ms.tensor(next_beam_scores.reshape(-1), dtype=next_scores.dtype),
+                "next_beam_tokens": ms.tensor(next_beam_tokens.reshape(-1), dtype=next_tokens.dtype),
+                "next_beam_indices": ms.tensor(next_beam_indices.reshape(-1), dtype=next_indices.dtype),
+            }
+        )
+
+    def finalize(
+        self,
+        input_ids: ms.Tensor,
+        final_beam_scores: ms.Tensor,
+        final_beam_tokens: ms.Tensor,
+        final_beam_indices: ms.Tensor,
+        max_length: int,
+        pad_token_id: Optional[Union[int, ms.Tensor]] = None,
+        eos_token_id: Optional[Union[int, List[int], ms.Tensor]] = None,
+        beam_indices: Optional[ms.Tensor] = None,
+        decoder_prompt_len: Optional[int] = 0,
+    ) -> Tuple[ms.Tensor]:
+        batch_size = self.batch_size
+        num_hyps = len(self._done)
+
+        if eos_token_id is not None:
+            if isinstance(eos_token_id, ms.Tensor):
+                eos_token_id = eos_token_id.asnumpy()
+            eos_token_id = np.array(eos_token_id).reshape(-1)
+        if isinstance(pad_token_id, ms.Tensor):
+            pad_token_id = pad_token_id.item()
+
+        # finalize all open beam hypotheses and add to generated hypotheses
+        self._add_hypotheses(
+            input_ids,
+            final_beam_scores.asnumpy().astype(np.float64).reshape(num_hyps, self.group_size),
+            np.repeat(~self._done[:, None], self.group_size, axis=1),
+            np.arange(num_hyps * self.group_size).reshape(num_hyps, self.group_size),
+            input_ids.shape[-1] - decoder_prompt_len,
+            beam_indices=beam_indices,
+        )
+
+        # select the best hypotheses: by decreasing score, then, as the sorted lists of `BeamHypotheses`, the latest
+        # group and hypothesis first
+        candidates_shape = (batch_size, self.num_beam_groups * self.group_size)
+        is_valid = (np.arange(self.group_size) < self._num_hyps[:, None]).reshape(candidates_shape)
+        group_ids = np.broadcast_to(np.arange(num_hyps)[:, None], self._hyp_scores.shape).reshape(candidates_shape)
+        ranking = np.lexsort(
+            (
+                -self._hyp_order.reshape(candidates_shape),
+                -group_ids,
+                -self._hyp_scores.reshape(candidates_shape),
+                ~is_valid,
+            ),
+            axis=-1,
+        )[:, : self.num_beam_hyps_to_keep]
+        best_slots = (ranking + np.arange(batch_size)[:, None] * candidates_shape[1]).reshape(-1)
+        sent_lengths = self._hyp_lengths.reshape(-1)[best_slots]
+        best_scores = ms.tensor(self._hyp_scores.reshape(-1)[best_slots], dtype=ms.float32)
+
+        # prepare for adding eos
+        sent_lengths_max = sent_lengths.max().item() + 1
+        sent_max_len = min(sent_lengths_max, max_length) if max_length is not None else sent_lengths_max
+
+        # shorter batches are padded if needed
+        if sent_lengths.min() != sent_lengths.max() and pad_token_id is None:
+            raise ValueError("`pad_token_id` has to be defined")
+
+        # fill with hypotheses and eos_token_id if the latter fits in
+        best = self._hyp_sequences[ms.tensor(best_slots)]
+        best = mint.nn.functional.pad(best, (0, max(sent_max_len - best.shape[-1], 0)))[:, :sent_max_len]
+        positions = np.arange(sent_max_len)
+        fill_values = np.where(
+            positions == sent_lengths[:, None],
+            eos_token_id[0] if eos_token_id is not None else 0,
+            pad_token_id if pad_token_id is not None else 0,
+        )
+        decoded = mint.where(
+            ms.tensor(positions < sent_lengths[:, None]), best, ms.tensor(fill_values, dtype=input_ids.dtype)
+        )
+
+        indices = None
+        best_indices = self._hyp_beam_indices.reshape(-1)[best_slots]
+        if best_indices[0] is not None:
+            indices = np.full((len(best_slots), sent_max_len), -1, dtype=np.int64)
+            for i, best_idx in enumerate(best_indices):
+                indices[i, : len(best_idx)] = best_idx
+            indices = ms.tensor(indices, dtype=input_ids.dtype)
+
+        return UserDict(
+            {
+                "sequences": decoded,
+                "sequence_scores": best_scores,
+                "beam_indices": indices,
+            }
+        )
+
+
 class ConstrainedBeamSearchScorer(BeamScorer):
     r"""
     [`BeamScorer`] implementing constrained beam search decoding.
@@ -850,7 +1191,7 @@ class ConstrainedBeamSearchScorer(BeamScorer):
                         break
 
         # select the best hypotheses
-        sent_lengths = input_ids.new(batch_size * self.num_beam_hyps_to_keep)
+        sent_lengths = mint.zeros(batch_size * self.num_beam_hyps_to_keep, dtype=input_ids.dtype)
         best = []
         best_indices = []
         best_scores = mint.zeros(batch_size * self.num_beam_hyps_to_keep, dtype=ms.float32)
@@ -877,10 +1218,12 @@ class ConstrainedBeamSearchScorer(BeamScorer):
         sent_lengths_max = sent_lengths.max().item() + 1
 
         sent_max_len = min(sent_lengths_max, max_length) if max_length is not None else sent_lengths_max
-        decoded: ms.Tensor = input_ids.new(batch_size * self.num_beam_hyps_to_keep, sent_max_len)
+        decoded: ms.Tensor = mint.zeros((batch_size * self.num_beam_hyps_to_keep, sent_max_len), dtype=input_ids.dtype)
 
         if len(best_indices) > 0 and best_indices[0] is not None:
-            indices: ms.Tensor = input_ids.new(batch_size * self.num_beam_hyps_to_keep, sent_max_len)
+            indices: ms.Tensor = mint.zeros(
+                (batch_size * self.num_beam_hyps_to_keep, sent_max_len), dtype=input_ids.dtype
+            )
         else:
             indices = None
 
@@ -1,6 +1,6 @@
 import inspect
 import math
-from typing import Callable, Iterable, List, Optional, Union
+from typing import Callable, List, Optional, Union
 
 import numpy as np
 from transformers.utils import add_start_docstrings
@@ -768,71 +768,52 @@ class EtaLogitsWarper(LogitsProcessor):
         return scores_processed
 
 
-def _get_ngrams(ngram_size: int, prev_input_ids: ms.Tensor, num_hypos: int):
+def _get_ngram_windows(ngram_size: int, input_ids: ms.Tensor) -> List[ms.Tensor]:
     """
-    Assume ngram_size=2 and prev_input_ids=tensor([[40, 2883, 2712, 4346]]). The output of generated ngrams look like
-    this {(40,): [2883], (2883,): [2712], (2712,): [4346]}.
+    Assume ngram_size=2 and input_ids=tensor([[40, 2883, 2712, 4346]]). The n-grams are indexed by their tokens at each
+    position, which look like this [tensor([[40, 2883, 2712]]), tensor([[2883, 2712, 4346]])].
 
     Args:
         ngram_size (`int`):
             The number sequential tokens taken as a group which may only occur once before being banned.
-        prev_input_ids (`ms.Tensor`):
-           Generated token ids for the current hypothesis.
-        num_hypos (`int`):
-            The number of hypotheses for which n-grams need to be generated.
+        input_ids (`ms.Tensor` of shape `(num_hypos, sequence_length)`):
+            Token ids of the hypotheses.
 
     Returns:
-        generated_ngrams (`dict`):
-            Dictionary of generated ngrams.
+        `List[ms.Tensor]` of `ngram_size` tensors of shape `(num_hypos, sequence_length - ngram_size + 1)`.
     """
-    # Initialize an empty list of dictionaries, one for each hypothesis (index) in the range of num_hypos
-    generated_ngrams = [{} for _ in range(num_hypos)]
-    for idx in range(num_hypos):
-        gen_tokens = prev_input_ids[idx].tolist()
-        generated_ngram = generated_ngrams[idx]
-        # Loop through each n-gram of size ngram_size in the list of tokens (gen_tokens)
-        for ngram in zip(*[gen_tokens[i:] for i in range(ngram_size)]):
-            prev_ngram_tuple = tuple(ngram[:-1])
-            generated_ngram[prev_ngram_tuple] = generated_ngram.get(prev_ngram_tuple, []) + [ngram[-1]]
-    return generated_ngrams
-
-
-def _get_generated_ngrams(banned_ngrams, prev_input_ids, ngram_size, cur_len):
+    num_ngrams = input_ids.shape[-1] - ngram_size + 1
+    return [input_ids[:, i : i + num_ngrams] for i in range(ngram_size)]
+
+
+def _calc_banned_ngram_mask(ngram_windows: List[ms.Tensor], prev_input_ids: ms.Tensor, vocab_size: int) -> ms.Tensor:
     """
-    Determines the banned tokens for the current hypothesis based on previously generated n-grams.
+    Determines the banned tokens of each hypothesis, which would complete one of the n-grams of `ngram_windows` after
+    the last tokens of `prev_input_ids`. All the hypotheses are processed at once on the device, without copying the
+    token ids to the host.
 
     Args:
-        banned_ngrams (`dict`):
-            A dictionary containing previously generated n-grams for each hypothesis.
-        prev_input_ids (`ms.Tensor`):
-            Generated token ids for the current hypothesis.
-        ngram_size (`int`):
-            The number sequential tokens taken as a group which may only occur once before being banned.
-        cur_len (`int`):
-            The current length of the token sequences for which the n-grams are being checked.
+        ngram_windows (`List[ms.Tensor]`):
+            The n-grams of each hypothesis, from `_get_ngram_windows`.
+        prev_input_ids (`ms.Tensor` of shape `(num_hypos, sequence_length)`):
+            Generated token ids of the hypotheses.
+        vocab_size (`int`):
+            The size of the vocabulary.
 
     Returns:
-        List of tokens that are banned.
+        `ms.Tensor` of shape `(num_hypos, vocab_size)`, `True` for the banned tokens.
     """
-    # Before decoding the next token, prevent decoding of ngrams that have already appeared
-    start_idx = cur_len + 1 - ngram_size
-    ngram_idx = tuple(prev_input_ids[start_idx:cur_len].tolist())
-    return banned_ngrams.get(ngram_idx, [])
-
-
-def _calc_banned_ngram_tokens(
-    ngram_size: int, prev_input_ids: ms.Tensor, num_hypos: int, cur_len: int
-) -> List[Iterable[int]]:
-    """Copied from fairseq for no_repeat_ngram in beam_search"""
-    if cur_len + 1 < ngram_size:
-        # return no banned tokens if we haven't generated no_repeat_ngram_size tokens yet
-        return [[] for _ in range(num_hypos)]
-    generated_ngrams = _get_ngrams(ngram_size, prev_input_ids, num_hypos)
-    banned_tokens = [
-        _get_generated_ngrams(generated_ngrams[hypo_idx], prev_input_ids[hypo_idx], ngram_size, cur_len)
-        for hypo_idx in range(num_hypos)
-    ]
-    return banned_tokens
+    ngram_size = len(ngram_windows)
+    cur_len = prev_input_ids.shape[-1]
+    # the n-grams starting with the last `ngram_size - 1` tokens of the hypothesis
+    matches = mint.ones(ngram_windows[-1].shape, dtype=ms.bool_)
+    for i, window in enumerate(ngram_windows[:-1]):
+        matches = mint.logical_and(matches, window == prev_input_ids[:, cur_len - ngram_size + 1 + i, None])
+    num_hypos = prev_input_ids.shape[0]
+    banned_counts = mint.scatter_add(
+        mint.zeros((num_hypos, vocab_size), dtype=ms.int32), 1, ngram_windows[-1], matches.to(ms.int32)
+    )
+    return banned_counts > 0
 
 
 class NoRepeatNGramLogitsProcessor(LogitsProcessor):
@@ -884,13 +865,12 @@ class NoRepeatNGramLogitsProcessor(LogitsProcessor):
 
     @add_start_docstrings(LOGITS_PROCESSOR_INPUTS_DOCSTRING)
     def __call__(self, input_ids: ms.Tensor, scores: ms.Tensor) -> ms.Tensor:
-        num_batch_hypotheses = scores.shape[0]
-        cur_len = input_ids.shape[-1]
-        scores_processed = scores.clone()
-        banned_batch_tokens = _calc_banned_ngram_tokens(self.ngram_size, input_ids, num_batch_hypotheses, cur_len)
-        for i, banned_tokens in enumerate(banned_batch_tokens):
-            scores_processed[i, banned_tokens] = -float("inf")
-
+        if input_ids.shape[-1] < self.ngram_size:
+            # no banned tokens if we haven't generated no_repeat_ngram_size tokens yet
+            return scores
+        ngram_windows = _get_ngram_windows(self.ngram_size, input_ids)
+        banned_mask = _calc_banned_ngram_mask(ngram_windows, input_ids, scores.shape[-1])
+        scores_processed = scores.masked_fill(banned_mask, -float("inf"))
         return scores_processed
 
 
@@ -939,25 +919,23 @@ class EncoderNoRepeatNGramLogitsProcessor(LogitsProcessor):
         if len(encoder_input_ids.shape) == 1:
             encoder_input_ids = encoder_input_ids.unsqueeze(0)
         self.batch_size = encoder_input_ids.shape[0]
-        self.generated_ngrams = _get_ngrams(encoder_ngram_size, encoder_input_ids, self.batch_size)
+        # the n-grams of the prompt are indexed once, on the device
+        self.ngram_windows = (
+            _get_ngram_windows(encoder_ngram_size, encoder_input_ids)
+            if encoder_input_ids.shape[-1] >= encoder_ngram_size
+            else None
+        )
 
     @add_start_docstrings(LOGITS_PROCESSOR_INPUTS_DOCSTRING)
     def __call__(self, input_ids: ms.Tensor, scores: ms.Tensor) -> ms.Tensor:
+        if self.ngram_windows is None or input_ids.shape[-1] + 1 < self.ngram_size:
+            return scores
         # B x num_beams
         num_hypos = scores.shape[0]
         num_beams = num_hypos // self.batch_size
-        cur_len = input_ids.shape[-1]
-        scores_processed = scores.clone()
-        banned_batch_tokens = [
-            _get_generated_ngrams(
-                self.generated_ngrams[hypo_idx // num_beams], input_ids[hypo_idx], self.ngram_size, cur_len
-            )
-            for hypo_idx in range(num_hypos)
-        ]
-
-        for i, banned_tokens in enumerate(banned_batch_tokens):
-            scores_processed[i, banned_tokens] = -float("inf")
-
+        ngram_windows = [ops.repeat_interleave(window, num_beams, 0) for window in self.ngram_windows]
+        banned_mask = _calc_banned_ngram_mask(ngram_windows, input_ids, scores.shape[-1])
+        scores_processed = scores.masked_fill(banned_mask, -float("inf"))
         return scores_processed
 
 
@@ -10,7 +10,6 @@ from transformers import PreTrainedTokenizerBase
 from transformers.utils import add_start_docstrings, logging
 
 import mindspore as ms
-import mindspore.numpy as mnp
 from mindspore import mint, ops
 from mindspore.mint.nn import functional as F
 
@@ -34,7 +33,9 @@ STOPPING_CRITERIA_INPUTS_DOCSTRING = r"""
             or scores for each vocabulary token after SoftMax. If this stopping criteria depends on the `scores` input,
             make sure you pass `return_dict_in_generate=True, output_scores=True` to `generate`.
         kwargs (`dict[str, Any]`, *optional*):
-            Additional stopping criteria specific kwargs.
+            Additional stopping criteria specific kwargs. When decoding, `generate` passes `num_new_tokens`, the
+            number of tokens generated since the previous evaluation of the criteria, so that only these tokens need
+            to be checked.
 
     Return:
         `Union[ms.Tensor, numpy.ndarray]`. (`Union[ms.Tensor, numpy.ndarray]` of shape `(batch_size, 1)`), where `True` indicates we stop generation
@@ -54,6 +55,13 @@ class StoppingCriteria(ABC):
     def __call__(self, input_ids: ms.Tensor, scores: ms.Tensor, **kwargs) -> ms.Tensor:
         raise NotImplementedError("StoppingCriteria needs to be subclassed")
 
+    def reset(self):
+        """
+        Clears the state kept between the calls of the criteria, if any. `generate` calls it before decoding, so that
+        the state of a previous generation is not reused.
+        """
+        pass
+
 
 class MaxLengthCriteria(StoppingCriteria):
     """
@@ -220,6 +228,18 @@ class StopStringCriteria(StoppingCriteria):
     tracker. The position tracker is now 6, which is greater than the length of the stop string! Don't panic, though -
     this also counts as a match of the stop string. We have matched the entire stop string.
 
+    Walking backwards from the final token means re-reading the last tokens at every generation step, though. So we
+    actually run the same checks forwards, and keep a running match between the calls: for every stop string, the set
+    of positions (again, counting from the end of the stop string) that the text generated so far reaches, i.e. the
+    lengths of the remainders of the stop string that are still to be matched. A new token completes a stop string if
+    one of its end overlaps is such a remainder (or is the whole stop string), and it moves a running match to one of
+    its valid positions if the remainder before it is that position plus its length (or, if it runs off the start of
+    the stop string, if it can begin a match). In the ["s", "to", "pped"] example, "s" starts a match with a remainder
+    of 3, "to" moves it to 1, and "pped" completes the stop string since 1 is one of its end overlaps. Each generated
+    token is then checked once, in constant time, no matter how many tokens are generated. When `generate` passes
+    `num_new_tokens`, the running match is kept for the next call, and only the new tokens are checked. Otherwise, the
+    sequences may change between the calls (e.g. in beam search), and we walk backwards from the final token.
+
 
     Args:
         tokenizer (`PreTrainedTokenizer`):
@@ -267,6 +287,14 @@ class StopStringCriteria(StoppingCriteria):
         self.maximum_token_len = max([len(stop_string) for stop_string in self.stop_strings])
         self.num_stop_strings = len(self.stop_strings)
         self.target_lens = ms.tensor([len(stop_string) for stop_string in stop_strings], dtype=ms.int32)
+        self.remainder_lens = mint.arange(self.maximum_token_len + 1, dtype=ms.int32)
+        # Running match of the previous call, and the number of tokens it was computed from
+        self._running_match = None
+        self._num_checked_tokens = None
+
+    def reset(self):
+        self._running_match = None
+        self._num_checked_tokens = None
 
     def clean_and_embed_tokens_with_cache(self, token_list, token_indices, tokenizer):
         # We don't use the tokenizer in the cache key, because I don't trust it to have well-behaved equality
@@ -402,8 +430,8 @@ class StopStringCriteria(StoppingCriteria):
 
         return gather_vec, max_valid_positions, max_valid_end_lens
 
-    @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
-    def __call__(self, input_ids: ms.Tensor, scores: ms.Tensor, **kwargs) -> ms.Tensor:
+    def _match_last_token(self, input_ids: ms.Tensor) -> ms.Tensor:
+        """Returns whether a stop string ends in the last token of `input_ids`, walking backwards from it."""
         # The maximum length we need to consider is 1 token per character. Note that input_ids can also be
         # *shorter* than the global max, and the code below should be ready for that
         input_ids = input_ids[:, -self.maximum_token_len :]
@@ -412,7 +440,7 @@ class StopStringCriteria(StoppingCriteria):
         flipped_ids = mint.flip(input_ids, (1,))
 
         # Clip out-of-vocab values to the dummy value at the end of the embedding vector
-        flipped_ids = mint.clamp(flipped_ids, max=self.embedding_vec.size(0) - 1)
+        flipped_ids = mint.clamp(flipped_ids, max=self.embedding_vec.shape[0] - 1)
 
         # Size of the vector of positions a single token can match
         max_valid_positions = self.max_valid_positions
@@ -461,6 +489,67 @@ class StopStringCriteria(StoppingCriteria):
         # We return a per-sample vector that is True if any stop string is matched for that sample
         return mint.any(string_matches, dim=-1)
 
+    def _match_tokens(self, running_match: ms.Tensor, token_ids: ms.Tensor) -> tuple[ms.Tensor, ms.Tensor]:
+        """Appends `token_ids` to the text of `running_match`. Returns whether a stop string ends in any of these tokens,
+        and the running match after them."""
+        # Clip out-of-vocab values to the dummy value at the end of the embedding vector
+        token_ids = mint.clamp(token_ids, max=self.embedding_vec.shape[0] - 1)
+
+        # The embedding vec contains the valid positions, end_lengths and total lengths for each token
+        embedded = F.embedding(token_ids, self.embedding_vec)
+        num_positions = self.max_valid_positions * self.num_stop_strings
+        valid_positions = embedded[:, :, :num_positions].unflatten(-1, (self.num_stop_strings, -1))
+        end_lengths = embedded[:, :, num_positions:-1].unflatten(-1, (self.num_stop_strings, -1))
+        lengths = embedded[:, :, -1:, None]  # Insert a dummy dimension for stop_strings even though lengths are const
+        target_lens = self.target_lens[:, None]
+
+        is_done = mint.zeros((token_ids.shape[0],), dtype=ms.bool_)
+        for i in range(token_ids.shape[1]):
+            # The token completes a stop string if it overlaps with the whole string, or with the remainder of a
+            # running match. Padding values are -1, so they are clamped to the remainder 0, which is never running
+            ends = end_lengths[:, i]
+            remainder_is_running = mint.gather(running_match, -1, mint.clamp(ends, 0, self.maximum_token_len))
+            string_matches = (ends >= target_lens) | remainder_is_running
+            is_done = is_done | mint.any(string_matches.reshape(string_matches.shape[0], -1), dim=-1)
+
+            # The token continues a match at one of its valid positions if the remainder before it is that position
+            # plus its length, or if it runs off the start of the stop string
+            positions = valid_positions[:, i]
+            previous_remainders = positions + lengths[:, i]
+            remainder_is_running = mint.gather(
+                running_match, -1, mint.clamp(previous_remainders, 0, self.maximum_token_len)
+            )
+            continues = (positions > 0) & ((previous_remainders >= target_lens) | remainder_is_running)
+            running_match = mint.any((positions[..., None] == self.remainder_lens) & continues[..., None], dim=-2)
+        return is_done, running_match
+
+    @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
+    def __call__(self, input_ids: ms.Tensor, scores: ms.Tensor, **kwargs) -> ms.Tensor:
+        num_new_tokens = kwargs.get("num_new_tokens")
+        if num_new_tokens is None:
+            return self._match_last_token(input_ids)
+
+        batch_size, cur_len = input_ids.shape
+        running_match = self._running_match
+        if (
+            running_match is None
+            or running_match.shape[0] != batch_size
+            or self._num_checked_tokens != cur_len - num_new_tokens
+        ):
+            # Rebuild the running match from the tokens before the new ones. A running match is shorter than the
+            # stop string, so it spans less than `maximum_token_len` tokens
+            num_checked_tokens = cur_len - num_new_tokens
+            running_match = mint.zeros((batch_size, self.num_stop_strings, self.maximum_token_len + 1), dtype=ms.bool_)
+            if num_checked_tokens > 0:
+                start = max(num_checked_tokens - self.maximum_token_len, 0)
+                _, running_match = self._match_tokens(running_match, input_ids[:, start:num_checked_tokens])
+        else:
+            num_checked_tokens = self._num_checked_tokens
+
+        is_done, self._running_match = self._match_tokens(running_match, input_ids[:, num_checked_tokens:])
+        self._num_checked_tokens = cur_len
+        return is_done
+
 
 class EosTokenCriteria(StoppingCriteria):
     """
@@ -483,15 +572,18 @@ class EosTokenCriteria(StoppingCriteria):
             eos_token_id = eos_token_id.asnumpy().tolist()
 
         self.eos_token_id = eos_token_id
+        self._eos_token_tensor = ms.tensor(eos_token_id)
 
     @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
     def __call__(
         self, input_ids: Union[ms.Tensor, np.ndarray], scores: Union[ms.Tensor, np.ndarray], **kwargs
     ) -> Union[ms.Tensor, np.ndarray]:
+        # only the tokens generated since the last check can be new eos tokens
+        new_token_ids = input_ids[:, -kwargs.get("num_new_tokens", 1) :]
         if isinstance(input_ids, ms.Tensor):
-            is_done = mnp.isin(input_ids[:, -1], self.eos_token_id)
+            is_done = (new_token_ids[..., None] == self._eos_token_tensor).any(axis=(1, 2))
         elif isinstance(input_ids, np.ndarray):
-            is_done = np.isin(input_ids[:, -1], self.eos_token_id)
+            is_done = np.isin(new_token_ids, self.eos_token_id).any(axis=-1)
         else:
             raise NotImplementedError
 
@@ -521,6 +613,26 @@ class ConfidenceCriteria(StoppingCriteria):
 
 
 class StoppingCriteriaList(list):
+    """
+    A list of [`StoppingCriteria`], where a sequence is done as soon as one of them is met.
+
+    Args:
+        check_interval (`int`, *optional*, defaults to 1):
+            Number of tokens that `generate` decodes between two evaluations of the criteria. Checking every few
+            tokens saves the per-token cost of the criteria, and the synchronization with the device to know whether
+            all the sequences are done, at the cost of decoding up to `check_interval - 1` tokens past the end of the
+            sequences. The criteria are always evaluated when `max_length` is reached. The tokens decoded after the
+            end of a sequence are then replaced with padding, and passed to the streamer, as with `check_interval=1`.
+            To use it with the criteria built by `generate`, pass an empty list:
+            `stopping_criteria=StoppingCriteriaList(check_interval=8)`.
+    """
+
+    def __init__(self, *args, check_interval: int = 1):
+        super().__init__(*args)
+        if check_interval < 1:
+            raise ValueError(f"`check_interval` has to be a strictly positive integer, but is {check_interval}")
+        self.check_interval = check_interval
+
     @add_start_docstrings(STOPPING_CRITERIA_INPUTS_DOCSTRING)
     def __call__(
         self, input_ids: Union[ms.Tensor, np.ndarray], scores: Union[ms.Tensor, np.ndarray], **kwargs
@@ -538,6 +650,26 @@ class StoppingCriteriaList(list):
 
         return is_done
 
+    def reset(self):
+        for criteria in self:
+            criteria.reset()
+
+    def after_stop_mask(self, input_ids: ms.Tensor, scores: ms.Tensor, num_new_tokens: int) -> ms.Tensor:
+        """
+        Returns which of the last `num_new_tokens` tokens of `input_ids` come after the token meeting the criteria, as
+        a bool tensor of shape `(batch_size, num_new_tokens)`. The criteria are evaluated after each of these tokens,
+        as they would have been with `check_interval=1`.
+        """
+        cur_len = input_ids.shape[-1]
+        is_done = ops.stack(
+            [
+                self(input_ids[:, : cur_len - num_new_tokens + i + 1], scores, num_new_tokens=1).astype(ms.int32)
+                for i in range(num_new_tokens)
+            ],
+            axis=1,
+        )
+        return (ops.cumsum(is_done, axis=1) - is_done) > 0
+
     @property
     def max_length(self) -> Optional[int]:
         for stopping_criterium in self:
@@ -20,6 +20,9 @@ from mindone.transformers.cache_utils import (
     Cache,
     DynamicCache,
     EncoderDecoderCache,
+    OffloadedStaticCache,
+    QuantizedCache,
+    QuantizedCacheConfig,
     StaticCache,
     get_seq_length,
     init_static_cache,
@@ -82,7 +85,7 @@ if TYPE_CHECKING:
 logger = logging.get_logger(__name__)
 
 
-NEED_SETUP_CACHE_CLASSES_MAPPING = {}
+NEED_SETUP_CACHE_CLASSES_MAPPING = {"offloaded_static": OffloadedStaticCache}
 QUANT_BACKEND_CLASSES_MAPPING = {}
 
 # Variable names used to hold the cache at generation time
@@ -1247,6 +1250,8 @@ class GenerationMixin:
                 ConfidenceCriteria(assistant_confidence_threshold=generation_config.assistant_confidence_threshold)
             )
         criteria = self._merge_criteria_processor_list(criteria, stopping_criteria)
+        if stopping_criteria is not None:
+            criteria.check_interval = stopping_criteria.check_interval
         return criteria
 
     def _merge_criteria_processor_list(
@@ -1925,10 +1930,13 @@ class GenerationMixin:
 
         if generation_config.cache_implementation is not None:
             if generation_config.cache_implementation in NEED_SETUP_CACHE_CLASSES_MAPPING:
-                if generation_config.cache_implementation == "static" and not self._supports_static_cache:
+                if (
+                    generation_config.cache_implementation in ("static", "offloaded_static")
+                    and not self._supports_static_cache
+                ):
                     raise ValueError(
-                        "This model does not support `cache_implementation='static'`. Please check the following "
-                        "issue: https://github.com/huggingface/transformers/issues/28981"
+                        f"This model does not support `cache_implementation='{generation_config.cache_implementation}'`. "
+                        "Please check the following issue: https://github.com/huggingface/transformers/issues/28981"
                     )
                 model_kwargs[cache_name] = self._get_cache(
                     cache_implementation=generation_config.cache_implementation,
@@ -1942,7 +1950,13 @@ class GenerationMixin:
                         "This model does not support the quantized cache. If you want your model to support quantized "
                         "cache, please open an issue and tag @zucchini-nlp."
                     )
-                raise NotImplementedError
+
+                cache_config = (
+                    generation_config.cache_config
+                    if generation_config.cache_config is not None
+                    else QuantizedCacheConfig()
+                )
+                model_kwargs[cache_name] = QuantizedCache(cache_config)
             elif generation_config.cache_implementation == "offloaded":
                 raise NotImplementedError
             elif generation_config.cache_implementation == "dynamic":
@@ -2593,6 +2607,12 @@ class GenerationMixin:
         unfinished_sequences = ops.ones(batch_size, dtype=ms.int32)
         model_kwargs = self._get_initial_cache_position(input_ids, model_kwargs)
 
+        # the stopping criteria are evaluated every `check_interval` tokens, and when `max_length` is reached
+        stopping_criteria.reset()
+        check_interval = stopping_criteria.check_interval
+        max_length = stopping_criteria.max_length
+        num_unchecked_tokens = 0
+
         multinomial = get_multinomial_op()
         step = 0
         s_time = time.time()
@@ -2697,11 +2717,30 @@ class GenerationMixin:
 
             # update generated ids, model inputs, and length for next step
             input_ids = ops.cat([input_ids, next_tokens[:, None]], axis=-1)
-            if streamer is not None:
+            if streamer is not None and check_interval == 1:
                 streamer.put(next_tokens.asnumpy())
 
-            unfinished_sequences = unfinished_sequences & ~ms.Tensor(stopping_criteria(input_ids, scores), ms.bool_)
-            this_peer_finished = unfinished_sequences.max() == 0
+            num_unchecked_tokens += 1
+            if num_unchecked_tokens == check_interval or (max_length is not None and input_ids.shape[-1] >= max_length):
+                is_done = stopping_criteria(input_ids, scores, num_new_tokens=num_unchecked_tokens)
+                if (
+                    has_eos_stopping_criteria
+                    and num_unchecked_tokens > 1
+                    and (is_done & unfinished_sequences.astype(ms.bool_)).any()
+                ):
+                    # the sequences which stopped within the unchecked tokens are padded after their stop, as they
+                    # would have been with `check_interval=1`
+                    after_stop = stopping_criteria.after_stop_mask(input_ids, scores, num_unchecked_tokens)
+                    new_tokens = ops.where(
+                        after_stop, pad_token_id.to(input_ids.dtype), input_ids[:, -num_unchecked_tokens:]
+                    )
+                    input_ids = ops.cat([input_ids[:, :-num_unchecked_tokens], new_tokens], axis=-1)
+                if streamer is not None and check_interval > 1:
+                    for token_ids in input_ids[:, -num_unchecked_tokens:].asnumpy().T:
+                        streamer.put(token_ids)
+                unfinished_sequences = unfinished_sequences & ~is_done
+                this_peer_finished = unfinished_sequences.max() == 0
+                num_unchecked_tokens = 0
             cur_len += 1
 
             # This is needed to properly delete outputs.logits which may be very large for first iteration
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache, partial
 from typing import Any, Optional, TypedDict, Union
 
@@ -28,6 +29,7 @@ from .image_transforms import (
     get_size_with_aspect_ratio,
     group_images_by_shape,
     reorder_images,
+    resize_rescale_and_normalize,
 )
 from .image_utils import (
     ChannelDimension,
@@ -51,7 +53,6 @@ if is_vision_available():
 
 if is_mindspore_available():
     import mindspore as ms
-    from mindspore.dataset import vision
     from mindspore.dataset.vision import Inter as InterpolationMode
 
     from .image_utils import pil_mindspore_interpolation_mapping
@@ -155,6 +156,20 @@ def divide_to_patches(image: Union[np.array, "ms.Tensor"], patch_size: int) -> l
     return patches
 
 
+def get_pil_resampling(interpolation: Optional[Union["PILImageResampling", "InterpolationMode"]]) -> int:
+    """
+    Returns the PIL resampling filter matching an interpolation mode, as used by `resize_rescale_and_normalize`.
+    """
+    if interpolation is None:
+        return PILImageResampling.BILINEAR
+    if isinstance(interpolation, PILImageResampling):
+        return interpolation
+    for resample, mode in pil_mindspore_interpolation_mapping.items():
+        if interpolation == mode:
+            return resample
+    raise ValueError(f"Unsupported interpolation mode {interpolation}.")
+
+
 class DefaultFastImageProcessorKwargs(TypedDict, total=False):
     do_resize: Optional[bool]
     size: Optional[dict[str, int]]
@@ -171,6 +186,7 @@ class DefaultFastImageProcessorKwargs(TypedDict, total=False):
     return_tensors: Optional[Union[str, TensorType]]
     data_format: Optional[ChannelDimension]
     input_data_format: Optional[Union[str, ChannelDimension]]
+    num_workers: Optional[int]
 
 
 BASE_IMAGE_PROCESSOR_FAST_DOCSTRING = r"""
@@ -221,7 +237,10 @@ BASE_IMAGE_PROCESSOR_FAST_DOCSTRING = r"""
             from the input image. Can be one of:
             - `"channels_first"` or `ChannelDimension.FIRST`: image in (num_channels, height, width) format.
             - `"channels_last"` or `ChannelDimension.LAST`: image in (height, width, num_channels) format.
-            - `"none"` or `ChannelDimension.NONE`: image in (height, width) format."""
+            - `"none"` or `ChannelDimension.NONE`: image in (height, width) format.
+        num_workers (`int`, *optional*, defaults to `self.num_workers`):
+            The number of threads decoding and converting the input images. If unset, the images are converted
+            sequentially."""
 
 BASE_IMAGE_PROCESSOR_FAST_DOCSTRING_PREPROCESS = r"""
     Preprocess an image or batch of images.
@@ -263,7 +282,10 @@ BASE_IMAGE_PROCESSOR_FAST_DOCSTRING_PREPROCESS = r"""
             from the input image. Can be one of:
             - `"channels_first"` or `ChannelDimension.FIRST`: image in (num_channels, height, width) format.
             - `"channels_last"` or `ChannelDimension.LAST`: image in (height, width, num_channels) format.
-            - `"none"` or `ChannelDimension.NONE`: image in (height, width) format."""
+            - `"none"` or `ChannelDimension.NONE`: image in (height, width) format.
+        num_workers (`int`, *optional*, defaults to `self.num_workers`):
+            The number of threads decoding and converting the input images. If unset, the images are converted
+            sequentially."""
 
 
 @add_start_docstrings(
@@ -286,6 +308,7 @@ class BaseImageProcessorFast(BaseImageProcessor):
     return_tensors = None
     data_format = ChannelDimension.FIRST
     input_data_format = None
+    num_workers = None
     model_input_names = ["pixel_values"]
     valid_kwargs = DefaultFastImageProcessorKwargs
     unused_kwargs = None
@@ -320,25 +343,36 @@ class BaseImageProcessorFast(BaseImageProcessor):
         **kwargs,
     ) -> "ms.Tensor":
         """
-        Resize an image to `(size["height"], size["width"])`.
+        Resize an image or a batch of images to `(size["height"], size["width"])`.
 
         Args:
-            image (`torch.Tensor`):
-                Image to resize.
+            image (`ms.Tensor`):
+                Image or batch of images to resize, in channels first format.
             size (`SizeDict`):
                 Dictionary in the format `{"height": int, "width": int}` specifying the size of the output image.
             resample (`InterpolationMode`, *optional*, defaults to `InterpolationMode.BILINEAR`):
                 `InterpolationMode` filter to use when resizing the image e.g. `InterpolationMode.BICUBIC`.
 
         Returns:
-            `torch.Tensor`: The resized image.
+            `ms.Tensor`: The resized image.
+        """
+        resized_image = resize_rescale_and_normalize(
+            image.asnumpy(),
+            size=self._get_resize_output_size(image, size),
+            resample=get_pil_resampling(interpolation),
+            input_data_format=ChannelDimension.FIRST,
+        )
+        return ms.tensor(resized_image)
+
+    def _get_resize_output_size(self, image: "ms.Tensor", size: SizeDict) -> tuple[int, int]:
+        """
+        Returns the `(height, width)` to resize a channels first image or batch of images to.
         """
-        interpolation = interpolation if interpolation is not None else InterpolationMode.BILINEAR
         if size.shortest_edge and size.longest_edge:
             # Resize the image so that the shortest edge or the longest edge is of the given size
             # while maintaining the aspect ratio of the original image.
             new_size = get_size_with_aspect_ratio(
-                image.size()[-2:],
+                image.shape[-2:],
                 size.shortest_edge,
                 size.longest_edge,
             )
@@ -350,7 +384,7 @@ class BaseImageProcessorFast(BaseImageProcessor):
                 input_data_format=ChannelDimension.FIRST,
             )
         elif size.max_height and size.max_width:
-            new_size = get_image_size_for_max_height_width(image.size()[-2:], size.max_height, size.max_width)
+            new_size = get_image_size_for_max_height_width(image.shape[-2:], size.max_height, size.max_width)
         elif size.height and size.width:
             new_size = (size.height, size.width)
         else:
@@ -358,9 +392,7 @@ class BaseImageProcessorFast(BaseImageProcessor):
                 "Size must contain 'height' and 'width' keys, or 'max_height' and 'max_width', or 'shortest_edge' key. Got"
                 f" {size}."
             )
-        # Fixme different with torchvision resize, which has inout `antialias`
-        resize = vision.Resize(new_size, interpolation=interpolation)
-        return resize(image)
+        return new_size
 
     def rescale(
         self,
@@ -390,24 +422,23 @@ class BaseImageProcessorFast(BaseImageProcessor):
         **kwargs,
     ) -> "ms.Tensor":
         """
-        Normalize an image. image = (image - image_mean) / image_std.
+        Normalize an image or a batch of images. image = (image - image_mean) / image_std, computed as a single
+        multiply-add.
 
         Args:
-            image (`torch.Tensor`):
-                Image to normalize.
-            mean (`torch.Tensor`, `float` or `Iterable[float]`):
+            image (`ms.Tensor`):
+                Image or batch of images to normalize, in channels first format.
+            mean (`ms.Tensor`, `float` or `Iterable[float]`):
                 Image mean to use for normalization.
-            std (`torch.Tensor`, `float` or `Iterable[float]`):
+            std (`ms.Tensor`, `float` or `Iterable[float]`):
                 Image standard deviation to use for normalization.
 
         Returns:
-            `torch.Tensor`: The normalized image.
+            `ms.Tensor`: The normalized image.
         """
-        normalize = vision.Normalize(
-            mean=mean,
-            std=std,
-        )
-        return normalize(image)
+        mean = (mean if isinstance(mean, ms.Tensor) else ms.tensor(mean, dtype=ms.float32)).reshape(-1, 1, 1)
+        std = (std if isinstance(std, ms.Tensor) else ms.tensor(std, dtype=ms.float32)).reshape(-1, 1, 1)
+        return image * (1.0 / std) - mean / std
 
     @lru_cache(maxsize=10)
     def _fuse_mean_std_and_rescale_factor(
@@ -452,6 +483,40 @@ class BaseImageProcessorFast(BaseImageProcessor):
 
         return images
 
+    def resize_rescale_and_normalize(
+        self,
+        images: "ms.Tensor",
+        do_resize: bool,
+        size: SizeDict,
+        interpolation: Optional["InterpolationMode"],
+        do_center_crop: bool,
+        crop_size: SizeDict,
+        do_rescale: bool,
+        rescale_factor: float,
+        do_normalize: bool,
+        image_mean: Union[float, list[float]],
+        image_std: Union[float, list[float]],
+    ) -> "ms.Tensor":
+        """
+        Resize, center crop, rescale and normalize a batch of images of the same size in a single pass on the host,
+        with `resize_rescale_and_normalize`.
+        """
+        if do_center_crop and (crop_size.height is None or crop_size.width is None):
+            raise ValueError(f"The size dictionary must have keys 'height' and 'width'. Got {crop_size.keys()}")
+        if not (do_resize or do_center_crop or do_rescale or do_normalize):
+            return images
+        processed_images = resize_rescale_and_normalize(
+            images.asnumpy(),
+            size=self._get_resize_output_size(images, size) if do_resize else None,
+            resample=get_pil_resampling(interpolation),
+            crop_size=(crop_size.height, crop_size.width) if do_center_crop else None,
+            rescale_factor=rescale_factor if do_rescale else None,
+            mean=image_mean if do_normalize else None,
+            std=image_std if do_normalize else None,
+            input_data_format=ChannelDimension.FIRST,
+        )
+        return ms.tensor(processed_images)
+
     def center_crop(
         self,
         image: "ms.Tensor",
@@ -463,8 +528,8 @@ class BaseImageProcessorFast(BaseImageProcessor):
         any edge, the image is padded with 0's and then center cropped.
 
         Args:
-            image (`"torch.Tensor"`):
-                Image to center crop.
+            image (`ms.Tensor`):
+                Image or batch of images to center crop, in channels first format.
             size (`Dict[str, int]`):
                 Size of the output image.
 
@@ -473,8 +538,14 @@ class BaseImageProcessorFast(BaseImageProcessor):
         """
         if size.height is None or size.width is None:
             raise ValueError(f"The size dictionary must have keys 'height' and 'width'. Got {size.keys()}")
-        center_crop = vision.CenterCrop((size.height, size.width))
-        return center_crop(image, (size["height"], size["width"]))
+        height, width = image.shape[-2:]
+        top, left = (height - size.height) // 2, (width - size.width) // 2
+        if top < 0 or left < 0:
+            pad_top, pad_left = max(-top, 0), max(-left, 0)
+            pad_bottom, pad_right = max(size.height - height - pad_top, 0), max(size.width - width - pad_left, 0)
+            image = mint.nn.functional.pad(image, (pad_left, pad_right, pad_top, pad_bottom))
+            top, left = max(top, 0), max(left, 0)
+        return image[..., top : top + size.height, left : left + size.width]
 
     def convert_to_rgb(
         self,
@@ -556,9 +627,11 @@ class BaseImageProcessorFast(BaseImageProcessor):
         images: ImageInput,
         do_convert_rgb: bool = None,
         input_data_format: Optional[Union[str, ChannelDimension]] = None,
+        num_workers: Optional[int] = None,
     ) -> list["ms.Tensor"]:
         """
-        Prepare the input images for processing.
+        Prepare the input images for processing. The images are decoded and converted by a pool of `num_workers`
+        threads if it is set, PIL and NumPy releasing the GIL.
         """
         images = self._prepare_images_structure(images)
         process_image_fn = partial(
@@ -566,7 +639,10 @@ class BaseImageProcessorFast(BaseImageProcessor):
             do_convert_rgb=do_convert_rgb,
             input_data_format=input_data_format,
         )
-        # todo: yoni - check if we can parallelize this efficiently
+        if num_workers is not None and num_workers > 1 and len(images) > 1:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                return list(executor.map(process_image_fn, images))
+
         processed_images = []
         for image in images:
             processed_images.append(process_image_fn(image))
@@ -654,9 +730,10 @@ class BaseImageProcessorFast(BaseImageProcessor):
         # Extract parameters that are only used for preparing the input images
         do_convert_rgb = kwargs.pop("do_convert_rgb")
         input_data_format = kwargs.pop("input_data_format")
+        num_workers = kwargs.pop("num_workers", None)
         # Prepare input images
         images = self._prepare_input_images(
-            images=images, do_convert_rgb=do_convert_rgb, input_data_format=input_data_format
+            images=images, do_convert_rgb=do_convert_rgb, input_data_format=input_data_format, num_workers=num_workers
         )
 
         # Update kwargs that need further processing before being validated
@@ -695,27 +772,25 @@ class BaseImageProcessorFast(BaseImageProcessor):
         return_tensors: Optional[Union[str, TensorType]],
         **kwargs,
     ) -> BatchFeature:
-        # Group images by size for batched resizing
+        # Group images by size for batched processing
+        # All the images of a group are resized to the same size, so they are processed in a single pass
         grouped_images, grouped_images_index = group_images_by_shape(images)
-        resized_images_grouped = {}
-        for shape, stacked_images in grouped_images.items():
-            if do_resize:
-                stacked_images = self.resize(image=stacked_images, size=size, interpolation=interpolation)
-            resized_images_grouped[shape] = stacked_images
-        resized_images = reorder_images(resized_images_grouped, grouped_images_index)
-
-        # Group images by size for further processing
-        # Needed in case do_resize is False, or resize returns images with different sizes
-        grouped_images, grouped_images_index = group_images_by_shape(resized_images)
         processed_images_grouped = {}
         for shape, stacked_images in grouped_images.items():
-            if do_center_crop:
-                stacked_images = self.center_crop(stacked_images, crop_size)
-            # Fused rescale and normalize
-            stacked_images = self.rescale_and_normalize(
-                stacked_images, do_rescale, rescale_factor, do_normalize, image_mean, image_std
+            # Fused resize, center crop, rescale and normalize
+            processed_images_grouped[shape] = self.resize_rescale_and_normalize(
+                stacked_images,
+                do_resize,
+                size,
+                interpolation,
+                do_center_crop,
+                crop_size,
+                do_rescale,
+                rescale_factor,
+                do_normalize,
+                image_mean,
+                image_std,
             )
-            processed_images_grouped[shape] = stacked_images
 
         processed_images = reorder_images(processed_images_grouped, grouped_images_index)
         processed_images = mint.stack(processed_images, dim=0) if return_tensors else processed_images
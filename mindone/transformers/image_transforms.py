@@ -14,6 +14,7 @@
 
 import warnings
 from collections.abc import Collection, Iterable
+from functools import lru_cache
 from math import ceil
 from typing import Optional, Union
 
@@ -531,6 +532,208 @@ def center_crop(
     return new_image
 
 
+def _box_filter(x):
+    return ((x >= -0.5) & (x < 0.5)).astype(np.float64)
+
+
+def _bilinear_filter(x):
+    return np.maximum(1.0 - np.abs(x), 0.0)
+
+
+def _hamming_filter(x):
+    x = np.abs(x)
+    return np.where(x < 1.0, np.sinc(x) * (0.54 + 0.46 * np.cos(np.pi * x)), 0.0)
+
+
+def _bicubic_filter(x, a=-0.5):
+    x = np.abs(x)
+    return np.where(
+        x < 1.0,
+        ((a + 2.0) * x - (a + 3.0)) * x * x + 1.0,
+        np.where(x < 2.0, (((x - 5.0) * x + 8.0) * x - 4.0) * a, 0.0),
+    )
+
+
+def _lanczos_filter(x):
+    return np.where(np.abs(x) < 3.0, np.sinc(x) * np.sinc(x / 3.0), 0.0)
+
+
+# The resampling filters of PIL and their support, keyed by the value of `PILImageResampling`
+_RESAMPLING_FILTERS = {
+    1: (_lanczos_filter, 3.0),
+    2: (_bilinear_filter, 1.0),
+    3: (_bicubic_filter, 2.0),
+    4: (_box_filter, 0.5),
+    5: (_hamming_filter, 1.0),
+}
+
+
+@lru_cache(maxsize=64)
+def _resize_weights(
+    in_size: int, out_size: int, resample: int, crop_start: int = 0, crop_size: Optional[int] = None
+) -> np.ndarray:
+    """
+    Returns the `(out_size, in_size)` matrix of the resizing of an axis with the antialiased filters of PIL, optionally
+    restricted to the `crop_size` output rows from `crop_start`, the rows outside of the resized axis being zeros.
+    """
+    scale = in_size / out_size
+    centers = (np.arange(out_size) + 0.5) * scale
+    if resample == 0:  # nearest
+        weights = np.zeros((out_size, in_size))
+        weights[np.arange(out_size), np.minimum(centers.astype(np.int64), in_size - 1)] = 1.0
+    else:
+        if resample not in _RESAMPLING_FILTERS:
+            raise ValueError(f"Unsupported resampling filter {resample}.")
+        filter_fn, support = _RESAMPLING_FILTERS[resample]
+        filter_scale = max(scale, 1.0)
+        support = support * filter_scale
+        x = np.arange(in_size)
+        x_min = np.maximum(np.trunc(centers - support + 0.5), 0)[:, None]
+        x_max = np.minimum(np.trunc(centers + support + 0.5), in_size)[:, None]
+        weights = filter_fn((x[None, :] - centers[:, None] + 0.5) / filter_scale)
+        weights = np.where((x >= x_min) & (x < x_max), weights, 0.0)
+        total = weights.sum(axis=1, keepdims=True)
+        weights = np.divide(weights, total, out=np.zeros_like(weights), where=total != 0)
+
+    if crop_size is not None:
+        rows = np.arange(crop_start, crop_start + crop_size)
+        valid = (rows >= 0) & (rows < out_size)
+        cropped_weights = np.zeros((crop_size, in_size))
+        cropped_weights[valid] = weights[rows[valid]]
+        weights = cropped_weights
+    return weights.astype(np.float32)
+
+
+def _center_crop_batch(images: np.ndarray, crop_size: tuple[int, int]) -> np.ndarray:
+    """Center crops a batch of channels first images, padding them with zeros if they are too small."""
+    height, width = images.shape[-2:]
+    crop_height, crop_width = crop_size
+    top, left = (height - crop_height) // 2, (width - crop_width) // 2
+    if top >= 0 and left >= 0:
+        return images[..., top : top + crop_height, left : left + crop_width]
+
+    cropped_images = np.zeros(images.shape[:-2] + (crop_height, crop_width), dtype=images.dtype)
+    src_top, src_left = max(top, 0), max(left, 0)
+    src_bottom, src_right = min(top + crop_height, height), min(left + crop_width, width)
+    cropped_images[..., src_top - top : src_bottom - top, src_left - left : src_right - left] = images[
+        ..., src_top:src_bottom, src_left:src_right
+    ]
+    return cropped_images
+
+
+def _get_channel_values(values: Union[float, Collection[float]], num_channels: int, name: str) -> np.ndarray:
+    if isinstance(values, Collection):
+        if len(values) != num_channels:
+            raise ValueError(f"{name} must have {num_channels} elements if it is an iterable, got {len(values)}")
+        return np.array(values, dtype=np.float64)
+    return np.full(num_channels, values, dtype=np.float64)
+
+
+def resize_rescale_and_normalize(
+    images: np.ndarray,
+    size: Optional[tuple[int, int]] = None,
+    resample: "PILImageResampling" = None,
+    crop_size: Optional[tuple[int, int]] = None,
+    rescale_factor: Optional[float] = None,
+    mean: Optional[Union[float, Collection[float]]] = None,
+    std: Optional[Union[float, Collection[float]]] = None,
+    data_format: Optional[ChannelDimension] = None,
+    input_data_format: Optional[Union[str, ChannelDimension]] = None,
+) -> np.ndarray:
+    """
+    Resizes, center crops, rescales and normalizes a batch of images of the same size at once. This is the batched
+    equivalent of `resize`, `center_crop`, `rescale` and `normalize` applied one image at a time, each step being
+    skipped if its arguments are unset.
+
+    The resizing applies the antialiased filters of PIL to the whole batch as two matrix products, one per axis, and
+    the center crop selects the rows of these matrices. Images of integer dtype are rounded and clipped after the
+    resizing, as PIL does, so that the result matches the per-image path up to the rounding of PIL's intermediate
+    pass. The rescaling and the normalization are fused into a single multiply-add.
+
+    Args:
+        images (`np.ndarray`):
+            The batch of images, of shape `(batch_size, num_channels, height, width)` or
+            `(batch_size, height, width, num_channels)`, or a single image.
+        size (`Tuple[int, int]`, *optional*):
+            The size `(height, width)` to resize the images to.
+        resample (`PILImageResampling`, *optional*, defaults to `PILImageResampling.BILINEAR`):
+            The filter to use for resizing the images.
+        crop_size (`Tuple[int, int]`, *optional*):
+            The size `(height, width)` of the center crop, the images are padded with zeros if they are smaller.
+        rescale_factor (`float`, *optional*):
+            The scale to use for rescaling the images.
+        mean (`float` or `Collection[float]`, *optional*):
+            The mean to use for normalization, requires `std`.
+        std (`float` or `Collection[float]`, *optional*):
+            The standard deviation to use for normalization, requires `mean`.
+        data_format (`ChannelDimension`, *optional*):
+            The channel dimension format of the output images. If unset, will use the format of the input images.
+        input_data_format (`ChannelDimension`, *optional*):
+            The channel dimension format of the input images. If unset, will use the inferred format of the input.
+
+    Returns:
+        `np.ndarray`: The processed images, of dtype `np.float32` if they are rescaled or normalized, otherwise of the
+        input dtype.
+    """
+    if not isinstance(images, np.ndarray):
+        raise TypeError(f"Input images must be of type np.ndarray, got {type(images)}")
+    if (mean is None) != (std is None):
+        raise ValueError("mean and std must be both set to normalize the images")
+
+    input_ndim = images.ndim
+    if images.ndim == 2:
+        images, input_data_format = images[None, None], ChannelDimension.FIRST
+    elif images.ndim == 3:
+        images = images[None]
+    if input_data_format is None:
+        input_data_format = infer_channel_dimension_format(images[0])
+    input_data_format = ChannelDimension(input_data_format)
+    data_format = input_data_format if data_format is None else ChannelDimension(data_format)
+
+    # The processing is done in (batch_size, C, H, W) format
+    if input_data_format == ChannelDimension.LAST:
+        images = images.transpose(0, 3, 1, 2)
+    input_dtype = images.dtype
+
+    if size is not None:
+        resample = int(resample) if resample is not None else 2  # bilinear
+        (in_height, in_width), (out_height, out_width) = images.shape[-2:], size
+        if crop_size is not None:
+            crop_top, crop_left = (out_height - crop_size[0]) // 2, (out_width - crop_size[1]) // 2
+            height_weights = _resize_weights(in_height, out_height, resample, crop_top, crop_size[0])
+            width_weights = _resize_weights(in_width, out_width, resample, crop_left, crop_size[1])
+        else:
+            height_weights = _resize_weights(in_height, out_height, resample)
+            width_weights = _resize_weights(in_width, out_width, resample)
+        images = np.matmul(np.matmul(height_weights, images.astype(np.float32, copy=False)), width_weights.T)
+        if np.issubdtype(input_dtype, np.integer):
+            # PIL resizes integer images as uint8
+            np.clip(np.rint(images, out=images), 0, 255, out=images)
+    elif crop_size is not None:
+        images = _center_crop_batch(images, crop_size)
+
+    if rescale_factor is not None or mean is not None:
+        num_channels = images.shape[1]
+        scale = np.full(num_channels, 1.0 if rescale_factor is None else rescale_factor)
+        bias = np.zeros(num_channels)
+        if mean is not None:
+            std = _get_channel_values(std, num_channels, "std")
+            bias = -_get_channel_values(mean, num_channels, "mean") / std
+            scale = scale / std
+        # Unless they were resized, `images` may be a view of the input, which must not be modified in place
+        out = images if size is not None else None
+        images = np.multiply(images, scale.astype(np.float32)[:, None, None], out=out, dtype=np.float32)
+        images += bias.astype(np.float32)[:, None, None]
+    elif size is not None:
+        images = images.astype(input_dtype)
+
+    if data_format == ChannelDimension.LAST:
+        images = images.transpose(0, 2, 3, 1)
+    if input_ndim == 2:
+        return images[0, 0]
+    return images if input_ndim == 4 else images[0]
+
+
 def _center_to_corners_format_mindspore(bboxes_center: "ms.Tensor") -> "ms.Tensor":
     center_x, center_y, width, height = bboxes_center.unbind(-1)
     bbox_corners = mint.stack(
@@ -810,23 +1013,27 @@ def _cast_tensor_to_float(x):
 
 
 def group_images_by_shape(
-    images: list["ms.Tensor"],
-) -> tuple[dict[tuple[int, int], list["ms.Tensor"]], dict[int, tuple[tuple[int, int], int]]]:
+    images: list[Union[np.ndarray, "ms.Tensor"]],
+) -> tuple[dict[tuple[int, int], Union[np.ndarray, "ms.Tensor"]], dict[int, tuple[tuple[int, int], int]]]:
     """
     Groups images by shape.
     Returns a dictionary with the shape as key and a list of images with that shape as value,
     and a dictionary with the index of the image in the original list as key and the shape and index in the grouped list as value.
+    NumPy images are grouped by their full shape, whatever their channel dimension format, and stacked with NumPy.
     """
     grouped_images = {}
     grouped_images_index = {}
     for i, image in enumerate(images):
-        shape = image.shape[1:]
+        shape = image.shape if isinstance(image, np.ndarray) else image.shape[1:]
         if shape not in grouped_images:
             grouped_images[shape] = []
         grouped_images[shape].append(image)
         grouped_images_index[i] = (shape, len(grouped_images[shape]) - 1)
     # stack images with the same shape
-    grouped_images = {shape: mint.stack(images, dim=0) for shape, images in grouped_images.items()}
+    grouped_images = {
+        shape: np.stack(images) if isinstance(images[0], np.ndarray) else mint.stack(images, dim=0)
+        for shape, images in grouped_images.items()
+    }
     return grouped_images, grouped_images_index
 
 
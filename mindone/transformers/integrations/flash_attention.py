@@ -40,6 +40,10 @@ def flash_attention_forward(
             The sliding window size of self-attention. Default to `None`.
         softcap (`float`, *optional*):
             Softcap for the attention logits, used e.g. in gemma2. Default to `None`.
+        cu_seq_lens_q (`ms.Tensor`, *optional*):
+            The cumulative lengths of the sequences packed in the flattened batch of queries, e.g. built by
+            `DataCollatorWithPacking`. If set, the attention is causal within each sequence and `attention_mask`
+            is ignored. `cu_seq_lens_k` defaults to `cu_seq_lens_q`.
 
     """
 
@@ -51,6 +55,12 @@ def flash_attention_forward(
     # This is before the transpose
     num_head = query.shape[1]
 
+    cu_seq_lens_q = kwargs.get("cu_seq_lens_q", None)
+    if cu_seq_lens_q is not None:
+        return _flash_attention_varlen_forward(
+            query, key, value, cu_seq_lens_q, kwargs.get("cu_seq_lens_k", None), dropout, scaling
+        )
+
     # BNSD -> BSND
     query = query.swapaxes(1, 2)
     key = key.swapaxes(1, 2)
@@ -82,3 +92,47 @@ def flash_attention_forward(
     attn_output = attn_output.to(origin_dtype)
 
     return attn_output, None
+
+
+# compressed causal mask of the "TND" layout, see `sparse_mode` of `ops.flash_attention_score`
+_CAUSAL_MASK_SIZE = 2048
+
+
+def _flash_attention_varlen_forward(
+    query: ms.Tensor,
+    key: ms.Tensor,
+    value: ms.Tensor,
+    cu_seq_lens_q: ms.Tensor,
+    cu_seq_lens_k: Optional[ms.Tensor],
+    dropout: float,
+    scaling: Optional[float],
+) -> Tuple[ms.Tensor, None]:
+    batch_size, num_head, seq_length, _ = query.shape
+    cu_seq_lens_k = cu_seq_lens_q if cu_seq_lens_k is None else cu_seq_lens_k
+
+    # BNSD -> TND, the packed sequences are delimited by the cumulative lengths
+    query, key, value = (x.swapaxes(1, 2).reshape(-1, x.shape[1], x.shape[3]) for x in (query, key, value))
+
+    origin_dtype = query.dtype
+    if origin_dtype not in (ms.float16, ms.bfloat16):
+        query = query.to(ms.float16)
+        key = key.to(ms.float16)
+        value = value.to(ms.float16)
+
+    causal_mask = mint.triu(mint.ones((_CAUSAL_MASK_SIZE, _CAUSAL_MASK_SIZE), dtype=ms.bool_), diagonal=1)
+    attn_output = ops.flash_attention_score(
+        query,
+        key,
+        value,
+        head_num=num_head,
+        attn_mask=causal_mask,
+        actual_seq_qlen=cu_seq_lens_q[1:].to(ms.int64),
+        actual_seq_kvlen=cu_seq_lens_k[1:].to(ms.int64),
+        keep_prob=1.0 - dropout,
+        scalar_value=scaling,
+        input_layout="TND",
+        sparse_mode=3,
+    )
+    attn_output = attn_output.reshape(batch_size, seq_length, num_head, -1).to(origin_dtype)
+
+    return attn_output, None
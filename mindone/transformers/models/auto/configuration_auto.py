@@ -44,6 +44,8 @@ CONFIG_MAPPING_NAMES = OrderedDict(
         ("mt5", "MT5Config"),
         ("qwen2", "Qwen2Config"),
         ("t5", "T5Config"),
+        ("wav2vec2", "Wav2Vec2Config"),
+        ("whisper", "WhisperConfig"),
         ("xlm-roberta", "XLMRobertaConfig"),
         ("siglip", "SiglipConfig"),
         ("siglip2", "Siglip2Config"),
@@ -75,6 +77,8 @@ MODEL_NAMES_MAPPING = OrderedDict(
         ("qwen2", "Qwen2"),
         ("t5", "T5"),
         ("t5v1.1", "T5v1.1"),
+        ("wav2vec2", "Wav2Vec2"),
+        ("whisper", "Whisper"),
         ("xlm-roberta", "XLM-RoBERTa"),
         ("xlm-roberta-xl", "XLM-RoBERTa-XL"),
         ("siglip", "SigLIP"),
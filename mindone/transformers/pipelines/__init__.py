@@ -26,6 +26,7 @@ from ..image_processing_utils import BaseImageProcessor
 from ..models.auto.configuration_auto import AutoConfig
 from ..processing_utils import ProcessorMixin
 from ..utils import is_mindspore_available
+from .automatic_speech_recognition import AutomaticSpeechRecognitionPipeline
 from .base import (
     ArgumentHandler,
     CsvPipelineDataFormat,
@@ -38,12 +39,23 @@ from .base import (
     get_default_model_and_revision,
     infer_framework_load_model,
 )
+from .feature_extraction import FeatureExtractionPipeline
+from .image_feature_extraction import ImageFeatureExtractionPipeline
 from .text_generation import TextGenerationPipeline
+from .text_generation_serving import GenerationRequest, GenerationResponse, ServingMetrics, TextGenerationServer
+from .zero_shot_image_classification import ZeroShotImageClassificationPipeline
 
 if is_mindspore_available():
     import mindspore as ms
 
-    from ..models.auto.modeling_auto import AutoModelForCausalLM, AutoModelForTokenClassification
+    from ..models.auto.modeling_auto import (
+        AutoModel,
+        AutoModelForCausalLM,
+        AutoModelForCTC,
+        AutoModelForSpeechSeq2Seq,
+        AutoModelForTokenClassification,
+        AutoModelForZeroShotImageClassification,
+    )
 
 
 if TYPE_CHECKING:
@@ -63,12 +75,36 @@ TASK_ALIASES = {
     "text-to-speech": "text-to-audio",
 }
 SUPPORTED_TASKS = {
+    "automatic-speech-recognition": {
+        "impl": AutomaticSpeechRecognitionPipeline,
+        "ms": (AutoModelForCTC, AutoModelForSpeechSeq2Seq) if is_mindspore_available() else (),
+        "default": {"model": {"ms": ("facebook/wav2vec2-base-960h", "22aad52")}},
+        "type": "multimodal",
+    },
+    "feature-extraction": {
+        "impl": FeatureExtractionPipeline,
+        "ms": (AutoModel,) if is_mindspore_available() else (),
+        "default": {"model": {"ms": ("google-bert/bert-base-cased", "main")}},
+        "type": "multimodal",
+    },
     "text-generation": {
         "impl": TextGenerationPipeline,
         "ms": (AutoModelForCausalLM,) if is_mindspore_available() else (),
         "default": {"model": {"ms": ("openai-community/gpt2", "607a30d"), "tf": ("openai-community/gpt2", "607a30d")}},
         "type": "text",
     },
+    "zero-shot-image-classification": {
+        "impl": ZeroShotImageClassificationPipeline,
+        "ms": (AutoModelForZeroShotImageClassification,) if is_mindspore_available() else (),
+        "default": {"model": {"ms": ("openai/clip-vit-base-patch32", "3d74acf")}},
+        "type": "multimodal",
+    },
+    "image-feature-extraction": {
+        "impl": ImageFeatureExtractionPipeline,
+        "ms": (AutoModel,) if is_mindspore_available() else (),
+        "default": {"model": {"ms": ("google/bit-50", "main")}},
+        "type": "image",
+    },
 }
 
 NO_FEATURE_EXTRACTOR_TASKS = set()
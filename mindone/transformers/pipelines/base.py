@@ -30,7 +30,7 @@ GenericTensor = Union[List["GenericTensor"], "ms.Tensor"]
 if is_mindspore_available():
     import mindspore as ms
     from mindspore import ops
-    from mindspore.dataset import Dataset, GeneratorDataset
+    from mindspore.dataset import Dataset
 
     from ..models.auto.modeling_auto import AutoModel
 
@@ -743,7 +743,13 @@ PIPELINE_INIT_ARGS = build_pipeline_init_args(
 
 if is_mindspore_available():
     # fixme
-    from .ms_utils import PipelineChunkIterator, PipelineDataset, PipelineIterator, PipelinePackIterator
+    from .ms_utils import (
+        PipelineChunkIterator,
+        PipelineDataLoader,
+        PipelineDataset,
+        PipelineIterator,
+        PipelinePackIterator,
+    )
 
 
 @add_end_docstrings(
@@ -1167,7 +1173,7 @@ class Pipeline(_ScikitCompat, PushToHubMixin):
         # TODO hack by collating feature_extractor and image_processor
         feature_extractor = self.feature_extractor if self.feature_extractor is not None else self.image_processor
         collate_fn = no_collate_fn if batch_size == 1 else pad_collate_fn(self.tokenizer, feature_extractor)
-        dataloader = GeneratorDataset(dataset, num_workers=num_workers, batch_size=batch_size, collate_fn=collate_fn)
+        dataloader = PipelineDataLoader(dataset, num_workers=num_workers, batch_size=batch_size, collate_fn=collate_fn)
         model_iterator = PipelineIterator(dataloader, self._construct, forward_params, loader_batch_size=batch_size)
         final_iterator = PipelineIterator(model_iterator, self.postprocess, postprocess_params)
         return final_iterator
@@ -1285,7 +1291,7 @@ class ChunkPipeline(Pipeline):
         # TODO hack by collating feature_extractor and image_processor
         feature_extractor = self.feature_extractor if self.feature_extractor is not None else self.image_processor
         collate_fn = no_collate_fn if batch_size == 1 else pad_collate_fn(self.tokenizer, feature_extractor)
-        dataloader = GeneratorDataset(dataset, num_workers=num_workers, batch_size=batch_size, collate_fn=collate_fn)
+        dataloader = PipelineDataLoader(dataset, num_workers=num_workers, batch_size=batch_size, collate_fn=collate_fn)
         model_iterator = PipelinePackIterator(dataloader, self._construct, forward_params, loader_batch_size=batch_size)
         final_iterator = PipelineIterator(model_iterator, self.postprocess, postprocess_params)
         return final_iterator
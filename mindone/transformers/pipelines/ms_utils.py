@@ -1,3 +1,7 @@
+import collections
+import math
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from transformers.utils.generic import ModelOutput
 
@@ -5,9 +9,7 @@ import mindspore as ms
 from mindspore.dataset import Dataset
 
 
-# fixme
-# how to deal with different processing???
-class PipelineDataset(Dataset):
+class PipelineDataset:
     def __init__(self, dataset, process, params):
         self.dataset = dataset
         self.process = process
@@ -22,7 +24,60 @@ class PipelineDataset(Dataset):
         return processed
 
 
-# It is like dataloader --> batch --> create_dict_iterator
+class PipelineDataLoader:
+    """
+    Python counterpart of the `torch.utils.data.DataLoader` of the pipelines: yields the items of `dataset` merged by
+    `collate_fn` into batches of `batch_size`. The items are ms.Tensor dicts, which `GeneratorDataset` cannot carry
+    without converting them to numpy and back.
+
+    Arguments:
+        dataset (`PipelineDataset` or `Iterable`):
+            The preprocessed items to batch.
+        batch_size (`int`, *optional*, defaults to 1):
+            The number of items per batch, the last batch can be smaller.
+        collate_fn (any function):
+            The function merging a list of items into a batch.
+        num_workers (`int`, *optional*, defaults to 0):
+            If larger than 1 and `dataset` is a `PipelineDataset`, the items are preprocessed by a pool of `num_workers` threads,
+            ahead of the batch that is being run by the model.
+    """
+
+    def __init__(self, dataset, batch_size=1, collate_fn=None, num_workers=0):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.collate_fn = collate_fn
+        self.num_workers = num_workers
+
+    def __len__(self):
+        return math.ceil(len(self.dataset) / self.batch_size)
+
+    def __iter__(self):
+        if self.num_workers > 1 and isinstance(self.dataset, PipelineDataset):
+            items = self._prefetch()
+        else:
+            items = iter(self.dataset)
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == self.batch_size:
+                yield self.collate_fn(batch)
+                batch = []
+        if batch:
+            yield self.collate_fn(batch)
+
+    def _prefetch(self):
+        # keeps up to 2 batches per worker in flight, in order
+        max_pending = 2 * self.num_workers * self.batch_size
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            pending = collections.deque()
+            for i in range(len(self.dataset)):
+                pending.append(executor.submit(self.dataset.__getitem__, i))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+
 class PipelineIterator:
     def __init__(self, loader, infer, params, loader_batch_size=None):
         """
@@ -67,9 +122,7 @@ class PipelineIterator:
         return len(self.loader)
 
     def __iter__(self):
-        # modification
-        # self.iterator = iter(self.loader)
-        self.iterator = iter(self.loader.batch(batch_size=1).create_dict_iterator())
+        self.iterator = iter(self.loader)
         return self
 
     def loader_batch_item(self):
@@ -178,7 +231,7 @@ class PipelineChunkIterator(PipelineIterator):
         super().__init__(loader, infer, params)
 
     def __iter__(self):
-        self.iterator = iter(self.loader.batch(batch_size=1).create_dict_iterator())
+        self.iterator = iter(self.loader)
         self.subiterator = None
         return self
 
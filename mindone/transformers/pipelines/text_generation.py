@@ -2,6 +2,7 @@ import enum
 import warnings
 from typing import Dict
 
+import numpy as np
 from transformers.utils import add_end_docstrings
 
 import mindspore as ms
@@ -32,6 +33,14 @@ class Chat:
         self.messages = messages
 
 
+class _EncodedPrompt:
+    """A text prompt with its encoding by the `batch_encoder` of the pipeline, as a batch of one prompt."""
+
+    def __init__(self, text: str, encoding: Dict[str, np.ndarray]):
+        self.text = text
+        self.encoding = encoding
+
+
 @add_end_docstrings(build_pipeline_init_args(has_tokenizer=True))
 class TextGenerationPipeline(Pipeline):
     """
@@ -75,6 +84,10 @@ class TextGenerationPipeline(Pipeline):
     objective. See the list of available [text completion models](https://huggingface.co/models?filter=text-generation)
     and the list of [conversational models](https://huggingface.co/models?other=conversational)
     on [huggingface.co/models].
+
+    A [`~tokenization_utils.MultiprocessBatchEncoder`] of the tokenizer can be passed as `batch_encoder` to tokenize
+    the lists of text prompts all at once in its worker processes, instead of one prompt after the other, which is slow
+    with the Python tokenizers. The prompts are then batched by `batch_size` as usual.
     """
 
     # Prefix text to help Transformer-XL and XLNet with short prompts as proposed by Aman Rusia
@@ -91,8 +104,9 @@ class TextGenerationPipeline(Pipeline):
     begging for his blessing. <eod> </s> <eos>
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, batch_encoder=None, **kwargs):
         super().__init__(*args, **kwargs)
+        self.batch_encoder = batch_encoder
         self.check_model_type(MODEL_FOR_CAUSAL_LM_MAPPING_NAMES)
         if "prefix" not in self._preprocess_params:
             # This is very specific. The logic is quite complex and needs to be done
@@ -268,6 +282,50 @@ class TextGenerationPipeline(Pipeline):
         else:
             return super().__call__(text_inputs, **kwargs)
 
+    def get_iterator(
+        self, inputs, num_workers: int, batch_size: int, preprocess_params, forward_params, postprocess_params
+    ):
+        if (
+            self.batch_encoder is not None
+            and isinstance(inputs, (list, tuple))
+            and len(inputs) > 0
+            and all(isinstance(prompt_text, str) for prompt_text in inputs)
+        ):
+            inputs = self._encode_prompts(inputs, **preprocess_params)
+        return super().get_iterator(
+            inputs, num_workers, batch_size, preprocess_params, forward_params, postprocess_params
+        )
+
+    def _encode_prompts(
+        self,
+        prompt_texts,
+        prefix="",
+        add_special_tokens=None,
+        truncation=None,
+        padding=None,
+        max_length=None,
+        **kwargs,
+    ):
+        # Only set non-None tokenizer kwargs, so as to rely on the tokenizer's defaults
+        tokenizer_kwargs = {
+            "add_special_tokens": add_special_tokens,
+            "truncation": truncation,
+            "max_length": max_length,
+        }
+        tokenizer_kwargs = {key: value for key, value in tokenizer_kwargs.items() if value is not None}
+        # A prompt is encoded alone by `preprocess`, so it is only padded to `max_length`, the batches of the
+        # pipeline are padded by its collate function
+        encodings = self.batch_encoder(
+            [prefix + prompt_text for prompt_text in prompt_texts],
+            padding=padding if padding == "max_length" else False,
+            return_tensors=None,
+            **tokenizer_kwargs,
+        )
+        return [
+            _EncodedPrompt(prompt_text, {key: np.array([values[i]]) for key, values in encodings.items()})
+            for i, prompt_text in enumerate(prompt_texts)
+        ]
+
     def preprocess(
         self,
         prompt_text,
@@ -303,6 +361,10 @@ class TextGenerationPipeline(Pipeline):
                 return_tensors=self.framework,
                 **tokenizer_kwargs,
             )
+        elif isinstance(prompt_text, _EncodedPrompt):
+            # already encoded by `batch_encoder`, with the prefix
+            inputs = dict(prompt_text.encoding)
+            prompt_text = prompt_text.text
         else:
             inputs = self.tokenizer(prefix + prompt_text, return_tensors="np", **tokenizer_kwargs)
 
@@ -0,0 +1,475 @@
+import asyncio
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+from transformers.generation.streamers import BaseStreamer
+from transformers.utils import logging
+
+import mindspore as ms
+
+from .text_generation import TextGenerationPipeline
+
+logger = logging.get_logger(__name__)
+
+# the end of the requests, and of the responses
+_STOP = object()
+
+_request_ids = itertools.count()
+
+
+@dataclass
+class GenerationRequest:
+    """
+    A prompt to complete by a [`TextGenerationServer`].
+
+    Args:
+        prompt (`str`):
+            The prompt to complete.
+        generate_kwargs (`Dict[str, Any]`, *optional*):
+            The arguments of the call to the pipeline for this prompt, e.g. `max_new_tokens` or `return_full_text`.
+            Only the requests with the same arguments are batched together.
+        request_id (`Any`, *optional*):
+            The id of the request in the responses, a running number by default.
+        arrival_time (`float`, *optional*):
+            The time the request was made, from `time.perf_counter`, from which the queueing latency is measured.
+            Defaults to the creation of the request.
+    """
+
+    prompt: str
+    generate_kwargs: Dict[str, Any] = field(default_factory=dict)
+    request_id: Any = None
+    arrival_time: float = field(default_factory=time.perf_counter)
+
+    def __post_init__(self):
+        if self.request_id is None:
+            self.request_id = next(_request_ids)
+
+
+@dataclass
+class GenerationResponse:
+    """
+    A response of a [`TextGenerationServer`] to a [`GenerationRequest`]. When streaming, the new text of each request
+    is returned as it is generated, in responses with `finished=False`, followed by the final response.
+
+    Args:
+        request_id (`Any`):
+            The id of the request.
+        text (`str`, *optional*, defaults to `""`):
+            The new text of a streamed response.
+        outputs (`List[Dict[str, Any]]`, *optional*):
+            The outputs of the pipeline for the prompt, in the final response.
+        finished (`bool`, *optional*, defaults to `False`):
+            Whether this is the final response to the request.
+        queue_latency (`float`, *optional*, defaults to 0.0):
+            The time in seconds the request waited until the start of the generation of its batch.
+        batch_size (`int`, *optional*, defaults to 0):
+            The number of requests in the batch of the request.
+    """
+
+    request_id: Any
+    text: str = ""
+    outputs: Optional[List[Dict[str, Any]]] = None
+    finished: bool = False
+    queue_latency: float = 0.0
+    batch_size: int = 0
+
+
+@dataclass
+class ServingMetrics:
+    """
+    The metrics of the batches run by a [`TextGenerationServer`].
+
+    Args:
+        queue_latencies (`List[float]`):
+            The time in seconds every request waited until the start of the generation of its batch.
+        batch_sizes (`List[int]`):
+            The number of requests of every batch.
+        batch_occupancies (`List[float]`):
+            The number of requests of every batch over `max_batch_size`.
+        token_occupancies (`List[float]`):
+            The fraction of the tokens of the padded prompts of every batch which are not padding.
+    """
+
+    queue_latencies: List[float] = field(default_factory=list)
+    batch_sizes: List[int] = field(default_factory=list)
+    batch_occupancies: List[float] = field(default_factory=list)
+    token_occupancies: List[float] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        """Returns the number of requests and batches, and the mean (and percentiles of the latency) of the metrics."""
+        if not self.batch_sizes:
+            return {"num_requests": 0, "num_batches": 0}
+        latencies = np.array(self.queue_latencies)
+        return {
+            "num_requests": len(self.queue_latencies),
+            "num_batches": len(self.batch_sizes),
+            "queue_latency_mean": float(latencies.mean()),
+            "queue_latency_p50": float(np.percentile(latencies, 50)),
+            "queue_latency_p95": float(np.percentile(latencies, 95)),
+            "queue_latency_max": float(latencies.max()),
+            "batch_size_mean": float(np.mean(self.batch_sizes)),
+            "batch_occupancy_mean": float(np.mean(self.batch_occupancies)),
+            "token_occupancy_mean": float(np.mean(self.token_occupancies)),
+        }
+
+
+class _BatchStreamer(BaseStreamer):
+    """Dispatches the tokens generated for a batch to the responses of the requests, as text."""
+
+    def __init__(self, tokenizer, requests, queue_latency, output_queue, eos_token_ids):
+        self.tokenizer = tokenizer
+        self.requests = requests
+        self.queue_latency = queue_latency
+        self.output_queue = output_queue
+        self.eos_token_ids = eos_token_ids
+        self.token_ids = [[] for _ in requests]
+        self.texts = [""] * len(requests)
+        self.finished = [False] * len(requests)
+
+    def put(self, value):
+        if value.ndim > 1:
+            # the prompts
+            return
+        for i, token_id in enumerate(value.tolist()):
+            if self.finished[i]:
+                continue
+            if token_id in self.eos_token_ids:
+                self.finished[i] = True
+                continue
+            self.token_ids[i].append(token_id)
+            text = self.tokenizer.decode(self.token_ids[i], skip_special_tokens=True)
+            # wait for the end of the characters split over several tokens
+            if len(text) > len(self.texts[i]) and not text.endswith("�"):
+                self.output_queue.put(
+                    GenerationResponse(
+                        self.requests[i].request_id,
+                        text=text[len(self.texts[i]) :],
+                        queue_latency=self.queue_latency[i],
+                        batch_size=len(self.requests),
+                    )
+                )
+                self.texts[i] = text
+
+    def end(self):
+        pass
+
+
+class TextGenerationServer:
+    """
+    Serves the requests of a stream, or of an asyncio queue, with a [`TextGenerationPipeline`] by grouping them into
+    micro-batches, each of them completed by a single batched `generate`.
+
+    A batch starts with the oldest waiting request and is closed when it holds `max_batch_size` requests, when the
+    next request would take the batch over `max_batch_tokens`, or `max_wait_time` seconds after the arrival of its
+    first request. The tokens of a batch are counted as those of the padded sequences at the end of the generation,
+    i.e. the batch size times the longest prompt plus the maximum number of new tokens. Only the requests with the same
+    generation arguments are batched together, the others wait for the next batches in their order of arrival.
+
+    The prompts are tokenized when the requests are received, and padded on the left. The responses of a batch are
+    returned as soon as it is done, or as the tokens are generated with `stream=True`, along with the time each request
+    waited for its batch. The metrics of the batches are gathered in `metrics`.
+
+    Args:
+        pipeline ([`TextGenerationPipeline`]):
+            The pipeline completing the prompts. The tokenizer needs a padding token, or the generation config of the
+            pipeline a `pad_token_id`.
+        max_batch_size (`int`, *optional*, defaults to 8):
+            The maximum number of requests in a batch.
+        max_batch_tokens (`int`, *optional*):
+            The maximum number of tokens of the padded sequences of a batch. A request over it is run in a batch of
+            its own. Not limited by default.
+        max_wait_time (`float`, *optional*, defaults to 0.01):
+            The maximum time in seconds between the arrival of the first request of a batch and its start.
+
+    Example:
+
+    ```python
+    >>> from mindone.transformers import pipeline
+    >>> from mindone.transformers.pipelines import TextGenerationServer
+
+    >>> generator = pipeline("text-generation", model="openai-community/gpt2")
+    >>> generator.tokenizer.pad_token_id = generator.model.config.eos_token_id
+    >>> server = TextGenerationServer(generator, max_batch_size=16, max_wait_time=0.05)
+    >>> for response in server.serve(prompts, stream=True):
+    ...     print(response.request_id, response.outputs if response.finished else response.text)
+    >>> server.metrics.summary()
+    ```
+    """
+
+    def __init__(
+        self,
+        pipeline: TextGenerationPipeline,
+        max_batch_size: int = 8,
+        max_batch_tokens: Optional[int] = None,
+        max_wait_time: float = 0.01,
+    ):
+        if max_batch_size < 1:
+            raise ValueError(f"`max_batch_size` has to be a strictly positive integer, but is {max_batch_size}")
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_wait_time = max_wait_time
+        self.metrics = ServingMetrics()
+
+        pad_token_id = pipeline.tokenizer.pad_token_id
+        if pad_token_id is None:
+            pad_token_id = pipeline.generation_config.pad_token_id
+        if pad_token_id is None:
+            raise ValueError(
+                "Pipeline with tokenizer without pad_token cannot do batching. You can try to set it with "
+                "`pipe.tokenizer.pad_token_id = model.config.eos_token_id`."
+            )
+        self.pad_token_id = pad_token_id
+
+    def serve(
+        self, requests: Iterable[Union[str, GenerationRequest]], stream: bool = False
+    ) -> Iterator[GenerationResponse]:
+        """
+        Serves the requests of an iterable, which can be a generator blocking until the next request, and yields the
+        responses as they are ready. The requests are read and the batches are run in background threads.
+
+        Args:
+            requests (`Iterable[Union[str, GenerationRequest]]`):
+                The requests, or the prompts to complete with the arguments of the pipeline.
+            stream (`bool`, *optional*, defaults to `False`):
+                Whether to return the new text of the requests as it is generated.
+        """
+        input_queue, output_queue = queue.Queue(), queue.Queue()
+
+        def feed():
+            try:
+                for request in requests:
+                    input_queue.put(self._make_request(request))
+            except BaseException as e:
+                output_queue.put(e)
+            finally:
+                input_queue.put(_STOP)
+
+        threading.Thread(target=feed, daemon=True).start()
+        threading.Thread(target=self._run, args=(input_queue, output_queue, stream), daemon=True).start()
+        while True:
+            response = output_queue.get()
+            if response is _STOP:
+                return
+            if isinstance(response, BaseException):
+                raise response
+            yield response
+
+    async def serve_async(
+        self, requests: "asyncio.Queue[Union[str, GenerationRequest, None]]", stream: bool = False
+    ) -> AsyncIterator[GenerationResponse]:
+        """
+        Serves the requests of an asyncio queue until it gets `None`, and yields the responses as they are ready. The
+        batches are run in a background thread, so that the event loop keeps receiving the requests meanwhile.
+
+        Args:
+            requests (`asyncio.Queue`):
+                The queue of the requests, or of the prompts to complete with the arguments of the pipeline, ended by
+                `None`.
+            stream (`bool`, *optional*, defaults to `False`):
+                Whether to return the new text of the requests as it is generated.
+        """
+        loop = asyncio.get_running_loop()
+        input_queue, output_queue = queue.Queue(), queue.Queue()
+
+        async def feed():
+            try:
+                while True:
+                    request = await requests.get()
+                    if request is None:
+                        break
+                    input_queue.put(self._make_request(request))
+            except BaseException as e:
+                output_queue.put(e)
+            finally:
+                input_queue.put(_STOP)
+
+        feeder = asyncio.ensure_future(feed())
+        threading.Thread(target=self._run, args=(input_queue, output_queue, stream), daemon=True).start()
+        try:
+            while True:
+                response = await loop.run_in_executor(None, output_queue.get)
+                if response is _STOP:
+                    return
+                if isinstance(response, BaseException):
+                    raise response
+                yield response
+        finally:
+            feeder.cancel()
+
+    def _make_request(self, request: Union[str, GenerationRequest]) -> GenerationRequest:
+        if isinstance(request, str):
+            request = GenerationRequest(request)
+        elif not isinstance(request, GenerationRequest):
+            raise TypeError(f"The requests have to be strings or `GenerationRequest`, but got {type(request)}.")
+        preprocess_params, forward_params, postprocess_params = self.pipeline._sanitize_parameters(
+            **request.generate_kwargs
+        )
+        # fuse the pipeline params and the request params, as `Pipeline.__call__` does
+        preprocess_params = {**self.pipeline._preprocess_params, **preprocess_params}
+        forward_params = {**self.pipeline._forward_params, **forward_params}
+        postprocess_params = {**self.pipeline._postprocess_params, **postprocess_params}
+        unsupported = {"handle_long_generation", "padding"} & preprocess_params.keys()
+        if unsupported:
+            raise ValueError(f"{unsupported} are not supported by `TextGenerationServer`.")
+
+        tokenizer_kwargs = {
+            key: preprocess_params[key]
+            for key in ("add_special_tokens", "truncation", "max_length")
+            if key in preprocess_params
+        }
+        input_ids = self.pipeline.tokenizer(preprocess_params.get("prefix", "") + request.prompt, **tokenizer_kwargs)[
+            "input_ids"
+        ]
+        if len(input_ids) == 0:
+            raise ValueError(f"The prompt of the request {request.request_id} is empty.")
+        request._input_ids = input_ids
+        request._forward_params = forward_params
+        request._postprocess_params = postprocess_params
+        request._num_tokens = len(input_ids) + self._max_new_tokens(len(input_ids), forward_params)
+        return request
+
+    def _max_new_tokens(self, prompt_length, forward_params):
+        generation_config = forward_params.get("generation_config", self.pipeline.generation_config)
+        max_new_tokens = forward_params.get("max_new_tokens", generation_config.max_new_tokens)
+        if max_new_tokens is None:
+            max_length = forward_params.get("max_length", generation_config.max_length)
+            max_new_tokens = max(max_length + forward_params.get("prefix_length", 0) - prompt_length, 0)
+        return max_new_tokens
+
+    def _batch_tokens(self, batch):
+        return len(batch) * (
+            max(len(request._input_ids) for request in batch)
+            + max(request._num_tokens - len(request._input_ids) for request in batch)
+        )
+
+    def _next_batch(self, input_queue, pending, closed):
+        """
+        Gathers the next batch from the requests left out of the previous batches, then from the queue. Returns the
+        batch, `None` at the end of the requests, and whether the end of the requests has been read.
+        """
+        if not pending:
+            if closed:
+                return None, closed
+            request = input_queue.get()
+            if request is _STOP:
+                return None, True
+            pending.append(request)
+        head = pending.popleft()
+        batch, skipped = [head], deque()
+
+        def add(request):
+            # returns whether the batch is still open
+            if (request._forward_params, request._postprocess_params) != (
+                head._forward_params,
+                head._postprocess_params,
+            ):
+                skipped.append(request)
+                return True
+            if self.max_batch_tokens is not None and self._batch_tokens(batch + [request]) > self.max_batch_tokens:
+                skipped.append(request)
+                return False
+            batch.append(request)
+            return len(batch) < self.max_batch_size
+
+        is_open = len(batch) < self.max_batch_size
+        while is_open and pending:
+            is_open = add(pending.popleft())
+        deadline = head.arrival_time + self.max_wait_time
+        while is_open and not closed:
+            try:
+                request = input_queue.get(timeout=max(deadline - time.perf_counter(), 0))
+            except queue.Empty:
+                break
+            if request is _STOP:
+                closed = True
+            else:
+                is_open = add(request)
+        # the requests left out keep their order of arrival
+        skipped.extend(pending)
+        pending.clear()
+        pending.extend(skipped)
+        return batch, closed
+
+    def _run(self, input_queue, output_queue, stream):
+        pending, closed = deque(), False
+        try:
+            while True:
+                batch, closed = self._next_batch(input_queue, pending, closed)
+                if batch is None:
+                    break
+                for response in self._run_batch(batch, output_queue if stream else None):
+                    output_queue.put(response)
+        except BaseException as e:
+            output_queue.put(e)
+        finally:
+            output_queue.put(_STOP)
+
+    def _run_batch(self, batch, stream_queue=None):
+        start = time.perf_counter()
+        queue_latency = [start - request.arrival_time for request in batch]
+        lengths = [len(request._input_ids) for request in batch]
+        max_len = max(lengths)
+        # padded on the left, for the generation
+        input_ids = np.full((len(batch), max_len), self.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(batch), max_len), dtype=np.int64)
+        for i, request in enumerate(batch):
+            input_ids[i, max_len - lengths[i] :] = request._input_ids
+            attention_mask[i, max_len - lengths[i] :] = 1
+
+        self.metrics.queue_latencies.extend(queue_latency)
+        self.metrics.batch_sizes.append(len(batch))
+        self.metrics.batch_occupancies.append(len(batch) / self.max_batch_size)
+        self.metrics.token_occupancies.append(sum(lengths) / input_ids.size)
+
+        forward_params = dict(batch[0]._forward_params)
+        if stream_queue is not None:
+            if forward_params.get("num_return_sequences", 1) > 1:
+                raise ValueError("Streaming is not supported with `num_return_sequences > 1`.")
+            generation_config = forward_params.get("generation_config", self.pipeline.generation_config)
+            eos_token_ids = forward_params.get("eos_token_id", generation_config.eos_token_id)
+            if not isinstance(eos_token_ids, (list, tuple)):
+                eos_token_ids = [eos_token_ids]
+            forward_params["streamer"] = _BatchStreamer(
+                self.pipeline.tokenizer, batch, queue_latency, stream_queue, set(eos_token_ids)
+            )
+        model_inputs = {
+            "input_ids": ms.tensor(input_ids, dtype=ms.int32),
+            "attention_mask": ms.tensor(attention_mask),
+            "prompt_text": [request.prompt for request in batch],
+        }
+        model_outputs = self.pipeline._construct(model_inputs, **forward_params)
+        generated_sequence = model_outputs["generated_sequence"].asnumpy()
+
+        responses = []
+        for i, request in enumerate(batch):
+            pad_length = max_len - lengths[i]
+            outputs = self.pipeline.postprocess(
+                {
+                    # without the padding
+                    "generated_sequence": generated_sequence[i : i + 1, :, pad_length:],
+                    "input_ids": np.array([request._input_ids]),
+                    "prompt_text": request.prompt,
+                },
+                **request._postprocess_params,
+            )
+            responses.append(
+                GenerationResponse(
+                    request.request_id,
+                    outputs=outputs,
+                    finished=True,
+                    queue_latency=queue_latency[i],
+                    batch_size=len(batch),
+                )
+            )
+        logger.info(
+            f"Generated a batch of {len(batch)} requests in {time.perf_counter() - start:.3f}s, "
+            f"queueing latency {max(queue_latency):.3f}s at most."
+        )
+        return responses
@@ -19,11 +19,14 @@ tokenization_utils_fast.py
 
 import bisect
 import itertools
+import multiprocessing
+import os
 import re
 import unicodedata
-from collections import OrderedDict
 from typing import Any, Dict, List, Optional, Tuple, Union, overload
 
+from transformers.utils import add_end_docstrings
+
 from .tokenization_utils_base import (
     ENCODE_KWARGS_DOCSTRING,
     ENCODE_PLUS_ADDITIONAL_KWARGS_DOCSTRING,
@@ -39,7 +42,7 @@ from .tokenization_utils_base import (
     TextInputPair,
     TruncationStrategy,
 )
-from .utils import PaddingStrategy, TensorType, add_end_docstrings, logging
+from .utils import PaddingStrategy, TensorType, logging
 
 logger = logging.get_logger(__name__)
 
@@ -53,12 +56,17 @@ class Trie:
     """
     Trie in Python. Creates a Trie out of a list of words. The trie is used to split on `added_tokens` in one pass
     Loose reference https://en.wikipedia.org/wiki/Trie
+
+    The splitting itself is done by a regular expression compiled from the trie, so that it runs in the C regex engine
+    instead of a Python loop over the characters of the text. It is compiled again on the first split after new words
+    are added.
     """
 
     def __init__(self, *args):
         self.data = {}
         self._tokens = set()
         self._termination_char = ""
+        self._pattern = None
         self.update(*args)
 
     def update(self, *args):
@@ -95,6 +103,8 @@ class Trie:
             # Prevent empty string
             return
 
+        if word not in self._tokens:
+            self._pattern = None
         self._tokens.add(word)
         ref = self.data
         for char in word:
@@ -123,137 +133,50 @@ class Trie:
         ["[CLS]", " This is a ", "extra_id_100"]
         ```
         """
-        # indexes are counted left of the chars index.
-        # "hello", index 0, is left of h, index 1 is between h and e.
-        # index 5 is right of the "o".
-
-        # States are going to capture every possible start (indexes as above)
-        # as keys, and have as values, a pointer to the position in the trie
-        # where we're at. This is a partial match for now.
-        # This enables to keep track of multiple matches while we're iterating
-        # the string
-        # If the trie contains, "blowing", and "lower" and we encounter the
-        # string "blower", we need to split into ["b", "lower"].
-        # This is where we need to keep track of multiple possible starts.
-        states = OrderedDict()
-
-        # This will contain every indices where we need
-        # to cut.
-        # We force to cut at offset 0 and len(text) (added later)
+        if self._pattern is None:
+            self._pattern = self._compile_pattern()
+
+        # The pattern matches the longest word at the leftmost position where a word starts, then the search resumes
+        # after it. We force to cut at offset 0 and len(text) (added later)
         offsets = [0]
+        for match in self._pattern.finditer(text):
+            offsets.extend(match.span())
+        return self.cut_text(text, offsets)
 
-        # This is used by the lookahead which needs to skip over
-        # some text where the full match exceeded the place in the initial
-        # for loop
-        skip = 0
-        # Main loop, Giving this algorithm O(n) complexity
-        for current, current_char in enumerate(text):
-            if skip and current < skip:
-                # Prevents the lookahead for matching twice
-                # like extra_id_100 and id_100
+    def _compile_pattern(self) -> "re.Pattern":
+        """
+        Compiles the trie into a regular expression matching its longest word. Every node becomes a group of the
+        alternatives for its children, which is optional if a word ends at the node: since the alternatives begin with
+        different characters, at most one of them can match, and the greedy `?` tries the longer words first.
+        """
+        if not self.data:
+            # Matches nothing
+            return re.compile(r"(?!)")
+        return re.compile(self._node_pattern(self.data))
+
+    def _node_pattern(self, node: dict) -> str:
+        alternatives = []
+        chars = []
+        for char, child in node.items():
+            if char == self._termination_char:
                 continue
-
-            # This will track every state
-            # that stop matching, we need to stop tracking them.
-            # If we look at "lowball", we're going to match "l" (add it to states), "o", "w", then
-            # fail on "b", we need to remove 0 from the valid states.
-            to_remove = set()
-            # Whenever we found a match, we need to drop everything
-            # this is a greedy algorithm, it will match on the first found token
-            reset = False
-
-            # In this case, we already have partial matches (But unfinished)
-            for start, trie_pointer in states.items():
-                if "" in trie_pointer:
-                    # This is a final match, we need to reset and
-                    # store the results in `offsets`.
-
-                    # Lookahead to match longest first
-                    # Important in case of extra_id_1 vs extra_id_100
-                    # Here we are also actively looking for other earlier partial
-                    # matches
-                    # "[CLS]", "L", we need to match CLS even if L is special
-                    for lookstart, looktrie_pointer in states.items():
-                        if lookstart > start:
-                            # This partial match is later, we can stop looking
-                            break
-                        elif lookstart < start:
-                            # This partial match is earlier, the trie pointer
-                            # was already updated, so index is + 1
-                            lookahead_index = current + 1
-                            end = current + 1
-                        else:
-                            # Here lookstart == start and
-                            #      looktrie_pointer == trie_pointer
-                            # It wasn't updated yet so indices are current ones
-                            lookahead_index = current
-                            end = current
-                        next_char = text[lookahead_index] if lookahead_index < len(text) else None
-                        if "" in looktrie_pointer:
-                            start = lookstart
-                            end = lookahead_index
-                            skip = lookahead_index
-
-                        while next_char in looktrie_pointer:
-                            looktrie_pointer = looktrie_pointer[next_char]
-                            lookahead_index += 1
-                            if "" in looktrie_pointer:
-                                start = lookstart
-                                end = lookahead_index
-                                skip = lookahead_index
-
-                            if lookahead_index == len(text):
-                                # End of string
-                                break
-                            next_char = text[lookahead_index]
-                        # End lookahead
-
-                    # Storing and resetting
-                    offsets.append(start)
-                    offsets.append(end)
-                    reset = True
-                    break
-                elif current_char in trie_pointer:
-                    # The current character being looked at has a match within the trie
-                    # update the pointer (it will be stored back into states later).
-                    trie_pointer = trie_pointer[current_char]
-
-                    # Storing back the new pointer into the states.
-                    # Partial matches got longer by one.
-                    states[start] = trie_pointer
-                else:
-                    # The new character has not match in the trie, we need
-                    # to stop keeping track of this partial match.
-                    # We can't do it directly within the loop because of how
-                    # python iteration works
-                    to_remove.add(start)
-
-            # Either clearing the full start (we found a real match)
-            # Or clearing only the partial matches that didn't work.
-            if reset:
-                states = {}
+            # Chains of nodes with a single child are merged into a literal
+            prefix = char
+            while len(child) == 1 and self._termination_char not in child:
+                ((char, child),) = child.items()
+                prefix += char
+            if len(child) > 1:
+                alternatives.append(re.escape(prefix) + self._node_pattern(child))
+            elif len(prefix) > 1:
+                alternatives.append(re.escape(prefix))
             else:
-                for start in to_remove:
-                    del states[start]
-
-            # If this character is a starting character within the trie
-            # start keeping track of this partial match.
-            if current >= skip and current_char in self.data:
-                states[current] = self.data[current_char]
-
-        # We have a cut at the end with states.
-        for start, trie_pointer in states.items():
-            if "" in trie_pointer:
-                # This is a final match, we need to reset and
-                # store the results in `offsets`.
-                end = len(text)
-                offsets.append(start)
-                offsets.append(end)
-                # Longest cut is always the one with lower start so the first
-                # item so we need to break.
-                break
-
-        return self.cut_text(text, offsets)
+                chars.append(re.escape(prefix))
+        if len(chars) == 1:
+            alternatives.append(chars[0])
+        elif chars:
+            alternatives.append(f"[{''.join(chars)}]")
+        pattern = f"(?:{'|'.join(alternatives)})"
+        return pattern + "?" if self._termination_char in node else pattern
 
     def cut_text(self, text, offsets):
         # We have all the offsets now, we just need to do the actual splitting.
@@ -1109,3 +1032,138 @@ class PreTrainedTokenizer(PreTrainedTokenizerBase):
             return clean_text
         else:
             return text
+
+
+# The tokenizer of a worker process of `MultiprocessBatchEncoder`, set once when the worker starts
+_worker_tokenizer = None
+
+
+def _init_encoder_worker(tokenizer: PreTrainedTokenizerBase):
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+
+def _encode_chunk(text, text_pair, encode_kwargs: Dict[str, Any]) -> Dict[str, List]:
+    # the chunks are padded together afterward
+    return dict(_worker_tokenizer(text, text_pair, padding=False, return_tensors=None, **encode_kwargs))
+
+
+class MultiprocessBatchEncoder:
+    """
+    Encodes batches of texts with a tokenizer in a pool of worker processes, for large batches that the Python
+    tokenizers would encode one sample after the other, such as the captions of a text-to-image dataset.
+
+    The batches are split into chunks of `chunk_size` samples, which are encoded by the workers in parallel. The
+    encodings are gathered in the order of the inputs and padded together by the tokenizer in the main process, so the
+    outputs are the same as `tokenizer(text, ...)`, as NumPy arrays by default. The tokenizer is sent once to every
+    worker when the pool starts (with the `fork` start method, the workers share its vocabulary with the main process
+    instead), so the workers keep the tokenizer as it was at that time. The pool is started by the first batch of more
+    than one chunk, and is kept until [`~MultiprocessBatchEncoder.close`] is called, or the end of the `with` block
+    when the encoder is used as a context manager. Smaller batches are encoded in the main process.
+
+    Args:
+        tokenizer ([`PreTrainedTokenizerBase`]):
+            The tokenizer, which has to be picklable with the `spawn` and `forkserver` start methods.
+        num_workers (`int`, *optional*):
+            The number of worker processes. Defaults to the number of CPUs.
+        chunk_size (`int`, *optional*, defaults to 256):
+            The number of samples encoded by a worker at once.
+        mp_context (`str`, *optional*):
+            The start method of the worker processes, `"fork"`, `"spawn"` or `"forkserver"`. Defaults to the default
+            start method of `multiprocessing`.
+
+    Example:
+
+    ```python
+    >>> from transformers import AutoTokenizer
+    >>> from mindone.transformers.tokenization_utils import MultiprocessBatchEncoder
+
+    >>> tokenizer = AutoTokenizer.from_pretrained("google-t5/t5-small", use_fast=False)
+    >>> with MultiprocessBatchEncoder(tokenizer, num_workers=8) as encoder:
+    ...     batch = encoder(captions, padding="max_length", truncation=True, max_length=120)
+    >>> batch["input_ids"].shape
+    (10000, 120)
+    ```
+    """
+
+    def __init__(
+        self,
+        tokenizer: PreTrainedTokenizerBase,
+        num_workers: Optional[int] = None,
+        chunk_size: int = 256,
+        mp_context: Optional[str] = None,
+    ):
+        self._pool = None
+        if chunk_size < 1:
+            raise ValueError(f"`chunk_size` has to be a strictly positive integer, but is {chunk_size}")
+        self.tokenizer = tokenizer
+        self.num_workers = num_workers if num_workers is not None else os.cpu_count()
+        self.chunk_size = chunk_size
+        self.mp_context = mp_context
+
+    def __call__(
+        self,
+        text: Union[List[TextInput], List[PreTokenizedInput]],
+        text_pair: Optional[Union[List[TextInput], List[PreTokenizedInput]]] = None,
+        padding: Union[bool, str, PaddingStrategy] = True,
+        max_length: Optional[int] = None,
+        pad_to_multiple_of: Optional[int] = None,
+        return_attention_mask: Optional[bool] = None,
+        return_tensors: Optional[Union[str, TensorType]] = "np",
+        **kwargs,
+    ) -> BatchEncoding:
+        """
+        Encodes a batch of texts, or of pairs of texts. The arguments are those of `tokenizer.__call__`, with padding
+        to the longest sequence and NumPy arrays by default. `return_overflowing_tokens` is not supported.
+        """
+        if kwargs.get("return_overflowing_tokens", False):
+            raise ValueError("`return_overflowing_tokens` is not supported by `MultiprocessBatchEncoder`.")
+        if text_pair is not None and len(text_pair) != len(text):
+            raise ValueError(f"Got {len(text)} texts but {len(text_pair)} text pairs.")
+
+        pad_kwargs = {
+            "padding": padding,
+            "max_length": max_length,
+            "pad_to_multiple_of": pad_to_multiple_of,
+            "return_attention_mask": return_attention_mask,
+            "return_tensors": return_tensors,
+        }
+        if self.num_workers <= 1 or len(text) <= self.chunk_size:
+            return self.tokenizer(text, text_pair, **pad_kwargs, **kwargs)
+
+        # `max_length` is also the truncation length
+        encode_kwargs = {"max_length": max_length, **kwargs}
+        chunks = [
+            (
+                text[start : start + self.chunk_size],
+                text_pair[start : start + self.chunk_size] if text_pair is not None else None,
+                encode_kwargs,
+            )
+            for start in range(0, len(text), self.chunk_size)
+        ]
+        # `starmap` returns the encodings in the order of the chunks
+        encodings = self._get_pool().starmap(_encode_chunk, chunks)
+        batch_outputs = {key: [value for encoding in encodings for value in encoding[key]] for key in encodings[0]}
+        return self.tokenizer.pad(batch_outputs, **pad_kwargs)
+
+    def _get_pool(self):
+        if self._pool is None:
+            context = multiprocessing.get_context(self.mp_context)
+            self._pool = context.Pool(self.num_workers, initializer=_init_encoder_worker, initargs=(self.tokenizer,))
+        return self._pool
+
+    def close(self):
+        """Stops the worker processes."""
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        self.close()
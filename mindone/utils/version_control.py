@@ -91,3 +91,14 @@ def choose_flash_attention_dtype():
 def is_old_ms_version(last_old_version="1.10.1"):
     # some APIs are changed after ms 1.10.1 version, such as dropout
     return MS_VERSION <= last_old_version
+
+
+def get_runtime():
+    """
+    Returns the module for streams and memory statistics: `mindspore.runtime`, which replaces `mindspore.hal` since
+    MindSpore 2.5, or `mindspore.hal` on older versions.
+    """
+    runtime = getattr(ms, "runtime", None)
+    if runtime is not None and hasattr(runtime, "Stream"):
+        return runtime
+    return ms.hal
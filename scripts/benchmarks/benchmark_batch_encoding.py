@@ -0,0 +1,60 @@
+"""
+Throughput of `MultiprocessBatchEncoder` vs encoding in the main process with a slow (Python) tokenizer.
+
+Random captions, as in a text-to-image dataset, are encoded and padded to `max_length` tokens in batches of
+`batch_size`, by the tokenizer in the main process then by the batch encoder with an increasing number of workers. The
+start of the worker processes is not timed.
+
+Example:
+    python scripts/benchmarks/benchmark_batch_encoding.py --tokenizer google-t5/t5-small --num_workers 2 4 8 16
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+from transformers import AutoTokenizer
+
+from mindone.transformers.tokenization_utils import MultiprocessBatchEncoder
+
+
+def throughput(encode, texts, batch_size, max_length):
+    start = time.perf_counter()
+    outputs = [
+        encode(texts[i : i + batch_size], padding="max_length", truncation=True, max_length=max_length)
+        for i in range(0, len(texts), batch_size)
+    ]
+    return len(texts) / (time.perf_counter() - start), outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", type=str, default="google-t5/t5-small")
+    parser.add_argument("--num_texts", type=int, default=65536)
+    parser.add_argument("--batch_size", type=int, default=8192)
+    parser.add_argument("--max_length", type=int, default=120)
+    parser.add_argument("--chunk_size", type=int, default=256)
+    parser.add_argument("--num_workers", type=int, nargs="+", default=[2, 4, 8, 16])
+    args = parser.parse_args()
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer, use_fast=False)
+    rng = random.Random(0)
+    words = [word for word in tokenizer.get_vocab() if word.isalpha()]
+    texts = [" ".join(rng.choices(words, k=rng.randint(8, 80))) for _ in range(args.num_texts)]
+
+    baseline, expected = throughput(
+        lambda *a, **kw: tokenizer(*a, return_tensors="np", **kw), texts, args.batch_size, args.max_length
+    )
+    print(f"{'workers':>8}{'texts/s':>12}{'speedup':>10}")
+    print(f"{'main':>8}{baseline:>12.0f}{1.0:>9.1f}x")
+    for num_workers in args.num_workers:
+        with MultiprocessBatchEncoder(tokenizer, num_workers=num_workers, chunk_size=args.chunk_size) as encoder:
+            encoder(texts[: args.chunk_size * num_workers])  # starts the workers
+            speed, outputs = throughput(encoder, texts, args.batch_size, args.max_length)
+        for output, expected_output in zip(outputs, expected):
+            assert np.array_equal(output["input_ids"], expected_output["input_ids"])
+        print(f"{num_workers:>8}{speed:>12.0f}{speed / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
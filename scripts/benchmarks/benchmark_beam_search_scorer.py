@@ -0,0 +1,89 @@
+"""
+Per-step host time of `TensorizedBeamSearchScorer` vs `BeamSearchScorer`.
+
+The scorers are fed random candidates (`2 * num_beams` per batch, some of them eos tokens, as in the beam search
+of a seq2seq model) for a number of steps, then finalized. Only the time spent in `process` and `finalize` is
+measured, the model step is not run.
+
+Example:
+    python scripts/benchmarks/benchmark_beam_search_scorer.py --batch_size 32 --num_beams 4 --num_steps 64
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import ops
+
+from mindone.transformers.generation.beam_search import BeamSearchScorer, TensorizedBeamSearchScorer
+
+EOS_TOKEN_ID = 0
+PAD_TOKEN_ID = 1
+
+
+def make_candidates(args):
+    rng = np.random.default_rng(0)
+    steps = []
+    for step in range(args.num_steps):
+        shape = (args.batch_size, 2 * args.num_beams)
+        next_scores = np.sort(rng.standard_normal(shape), axis=1)[:, ::-1] - step
+        # about one eos token every 8 candidates, only among the top `num_beams` ones
+        next_tokens = rng.integers(2, 32000, shape)
+        next_tokens[:, : args.num_beams][rng.random((args.batch_size, args.num_beams)) < 0.125] = EOS_TOKEN_ID
+        next_indices = rng.integers(0, args.num_beams, shape)
+        steps.append((ms.tensor(next_scores.astype(np.float32)), ms.tensor(next_tokens), ms.tensor(next_indices)))
+    return steps
+
+
+def run(scorer_cls, steps, args):
+    scorer = scorer_cls(batch_size=args.batch_size, num_beams=args.num_beams, max_length=args.num_steps + 8)
+    input_ids = ms.tensor(np.full((args.batch_size * args.num_beams, 4), 2))
+    elapsed, num_steps = 0.0, 0
+    for next_scores, next_tokens, next_indices in steps:
+        if scorer.is_done:
+            break
+        start = time.perf_counter()
+        beam_outputs = scorer.process(
+            input_ids, next_scores, next_tokens, next_indices, pad_token_id=PAD_TOKEN_ID, eos_token_id=EOS_TOKEN_ID
+        )
+        elapsed += time.perf_counter() - start
+        num_steps += 1
+        # not timed, this is done by the generation loop
+        input_ids = ops.cat(
+            [input_ids[beam_outputs["next_beam_indices"]], beam_outputs["next_beam_tokens"][:, None]], axis=-1
+        )
+    start = time.perf_counter()
+    outputs = scorer.finalize(
+        input_ids,
+        beam_outputs["next_beam_scores"],
+        None,
+        None,
+        max_length=args.num_steps + 8,
+        pad_token_id=PAD_TOKEN_ID,
+        eos_token_id=EOS_TOKEN_ID,
+    )
+    outputs["sequences"].asnumpy()  # synchronize
+    return elapsed / num_steps, time.perf_counter() - start, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch_size", type=int, default=32)
+    parser.add_argument("--num_beams", type=int, default=4)
+    parser.add_argument("--num_steps", type=int, default=64)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    steps = make_candidates(args)
+    baseline_process, baseline_finalize, expected = run(BeamSearchScorer, steps, args)
+    process, finalize, outputs = run(TensorizedBeamSearchScorer, steps, args)
+    assert np.array_equal(outputs["sequences"].asnumpy(), expected["sequences"].asnumpy())
+
+    print(f"{'scorer':<12}{'process ms/step':>18}{'finalize ms':>14}{'process speedup':>17}")
+    print(f"{'heaps':<12}{baseline_process * 1000:>18.2f}{baseline_finalize * 1000:>14.2f}{1.0:>16.1f}x")
+    print(f"{'tensorized':<12}{process * 1000:>18.2f}{finalize * 1000:>14.2f}{baseline_process / process:>16.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-token decode latency of the preallocated `DynamicCache` vs concatenating the KV history at every token, on CPU.
+
+A cache of a 8B-like model (32 layers, 8 KV heads of 128 dims, float16, batch of 1) is prefilled with 4k and 16k
+tokens, then updated one token at a time as in decoding. After each update, the keys are read by a query, as the
+attention does, so that the cost of the views of the preallocated buffers is included.
+
+Example:
+    python scripts/benchmarks/benchmark_dynamic_cache.py --context_lengths 4096 16384 --num_layers 32
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import mint, ops
+
+from mindone.transformers.cache_utils import DynamicCache
+
+
+class ConcatCache:
+    """The previous `DynamicCache.update`, concatenating the new states to the whole history."""
+
+    def __init__(self):
+        self.key_cache, self.value_cache = [], []
+
+    def update(self, key_states, value_states, layer_idx):
+        if len(self.key_cache) <= layer_idx:
+            self.key_cache.append(key_states)
+            self.value_cache.append(value_states)
+        else:
+            self.key_cache[layer_idx] = ops.cat([self.key_cache[layer_idx], key_states], axis=-2)
+            self.value_cache[layer_idx] = ops.cat([self.value_cache[layer_idx], value_states], axis=-2)
+        return self.key_cache[layer_idx], self.value_cache[layer_idx]
+
+
+def decode_latency(cache, args, context_length):
+    shape = (1, args.num_kv_heads, context_length, args.head_dim)
+    prefill = ms.tensor(np.random.default_rng(0).standard_normal(shape), dtype=ms.float16)
+    for layer_idx in range(args.num_layers):
+        cache.update(prefill, prefill, layer_idx)
+
+    states = mint.ones((1, args.num_kv_heads, 1, args.head_dim), dtype=ms.float16)
+    latencies = []
+    for _ in range(args.num_tokens):
+        start = time.perf_counter()
+        for layer_idx in range(args.num_layers):
+            keys, _ = cache.update(states, states, layer_idx)
+            scores = mint.matmul(states, keys.swapaxes(-1, -2))
+        scores.asnumpy()  # synchronize
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies[1:])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--context_lengths", type=int, nargs="+", default=[4096, 16384])
+    parser.add_argument("--num_layers", type=int, default=32)
+    parser.add_argument("--num_kv_heads", type=int, default=8)
+    parser.add_argument("--head_dim", type=int, default=128)
+    parser.add_argument("--num_tokens", type=int, default=32, help="Number of decoded tokens.")
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE, device_target="CPU")
+    print(f"{'context':>8}{'cache':>16}{'ms/token':>10}{'speedup':>10}")
+    for context_length in args.context_lengths:
+        baseline = decode_latency(ConcatCache(), args, context_length)
+        latency = decode_latency(DynamicCache(), args, context_length)
+        print(f"{context_length:>8}{'concat':>16}{baseline * 1000:>10.2f}{1.0:>9.1f}x")
+        print(f"{context_length:>8}{'preallocated':>16}{latency * 1000:>10.2f}{baseline / latency:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
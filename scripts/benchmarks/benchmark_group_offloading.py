@@ -0,0 +1,103 @@
+"""
+Memory/latency benchmark for group offloading of `ModelMixin` subclasses.
+
+A synthetic DiT-like stack of MLP blocks is used so that the benchmark does not depend on any checkpoint. The model is
+run without offloading and with several group offloading configurations; the peak device memory and the latency of
+one forward pass are reported for each of them.
+
+Example:
+    python scripts/benchmarks/benchmark_group_offloading.py --num_layers 48 --hidden_size 3072 --dtype bf16
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import nn, ops
+
+from mindone.diffusers.models.modeling_utils import ModelMixin
+from mindone.utils.version_control import get_runtime
+
+DTYPE_MAPPING = {"fp32": ms.float32, "fp16": ms.float16, "bf16": ms.bfloat16}
+
+
+class MLPBlock(nn.Cell):
+    def __init__(self, hidden_size, mlp_ratio=4):
+        super().__init__()
+        self.norm = nn.LayerNorm((hidden_size,))
+        self.fc1 = nn.Dense(hidden_size, hidden_size * mlp_ratio)
+        self.fc2 = nn.Dense(hidden_size * mlp_ratio, hidden_size)
+
+    def construct(self, x):
+        return x + self.fc2(ops.gelu(self.fc1(self.norm(x))))
+
+
+class SyntheticTransformer(ModelMixin):
+    def __init__(self, hidden_size, num_layers):
+        super().__init__()
+        self.proj_in = nn.Dense(hidden_size, hidden_size)
+        self.transformer_blocks = nn.CellList([MLPBlock(hidden_size) for _ in range(num_layers)])
+        self.proj_out = nn.Dense(hidden_size, hidden_size)
+
+    def construct(self, x):
+        x = self.proj_in(x)
+        for block in self.transformer_blocks:
+            x = block(x)
+        return self.proj_out(x)
+
+
+def measure(model, x, warmup, iters):
+    runtime = get_runtime()
+    for _ in range(warmup):
+        model(x).asnumpy()
+    runtime.synchronize()
+    runtime.reset_peak_memory_stats()
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        model(x).asnumpy()
+    runtime.synchronize()
+    latency = (time.perf_counter() - start) / iters
+    return runtime.max_memory_allocated() / 2**30, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hidden_size", type=int, default=3072)
+    parser.add_argument("--num_layers", type=int, default=48)
+    parser.add_argument("--seq_len", type=int, default=4096)
+    parser.add_argument("--batch_size", type=int, default=1)
+    parser.add_argument("--dtype", type=str, default="bf16", choices=list(DTYPE_MAPPING.keys()))
+    parser.add_argument("--num_blocks_per_group", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--max_group_bytes", type=int, nargs="*", default=[2**30], help="byte budgets per group")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--iters", type=int, default=5)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    dtype = DTYPE_MAPPING[args.dtype]
+    x = ms.tensor(np.random.randn(args.batch_size, args.seq_len, args.hidden_size), dtype=dtype)
+
+    configs = [("no offload", None)]
+    for n in args.num_blocks_per_group:
+        configs.append((f"block_level n={n}", {"num_blocks_per_group": n}))
+        configs.append((f"block_level n={n} +stream", {"num_blocks_per_group": n, "use_stream": True}))
+    for nbytes in args.max_group_bytes:
+        configs.append(
+            (f"block_level {nbytes / 2**20:.0f}MiB +stream", {"max_group_bytes": nbytes, "use_stream": True})
+        )
+    configs.append(("leaf_level +stream", {"offload_type": "leaf_level", "use_stream": True}))
+
+    print(f"{'config':<32}{'peak memory (GiB)':>20}{'latency (s)':>16}")
+    for name, offload_kwargs in configs:
+        model = SyntheticTransformer(args.hidden_size, args.num_layers).to(dtype)
+        if offload_kwargs is not None:
+            model.enable_group_offload(**offload_kwargs)
+        peak_memory, latency = measure(model, x, args.warmup, args.iters)
+        print(f"{name:<32}{peak_memory:>20.3f}{latency:>16.4f}")
+        del model
+
+
+if __name__ == "__main__":
+    main()
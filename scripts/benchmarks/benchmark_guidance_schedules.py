@@ -0,0 +1,81 @@
+"""
+Latency benchmark for the classifier-free guidance schedules of `ClassifierFreeGuidance`.
+
+A text-to-image pipeline is run with plain CFG and with several guidance schedules set through
+`DiffusionPipeline.set_guidance`. For every schedule the script reports the latency of the call, the number of
+conditional/unconditional branches evaluated by the denoiser and the PSNR of the output against plain CFG.
+
+Example:
+    python scripts/benchmarks/benchmark_guidance_schedules.py --model stabilityai/stable-diffusion-xl-base-1.0
+    python scripts/benchmarks/benchmark_guidance_schedules.py --model black-forest-labs/FLUX.1-dev \
+        --true_cfg_scale 4.0 --negative_prompt "blurry"
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+
+from mindone.diffusers import ClassifierFreeGuidance, DiffusionPipeline
+
+DTYPE_MAPPING = {"fp32": ms.float32, "fp16": ms.float16, "bf16": ms.bfloat16}
+
+SCHEDULES = {
+    "cfg": {},
+    "interval(0-800)": {"guidance_interval": (0, 800)},
+    "interval(200-900)": {"guidance_interval": (200, 900)},
+    "reuse(2)": {"uncond_reuse_interval": 2},
+    "reuse(3)": {"uncond_reuse_interval": 3},
+    "adaptive(0.995)": {"adaptive_guidance_threshold": 0.995},
+    "interval(200-900)+reuse(2)": {"guidance_interval": (200, 900), "uncond_reuse_interval": 2},
+}
+
+
+def psnr(image, reference):
+    mse = np.mean((image.astype(np.float64) - reference.astype(np.float64)) ** 2)
+    return float("inf") if mse == 0 else 10 * np.log10(1.0 / mse)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=str, default="stabilityai/stable-diffusion-xl-base-1.0")
+    parser.add_argument("--prompt", type=str, default="An astronaut riding a green horse, highly detailed")
+    parser.add_argument("--negative_prompt", type=str, default=None)
+    parser.add_argument("--true_cfg_scale", type=float, default=None, help="Flux only, enables true CFG.")
+    parser.add_argument("--num_inference_steps", type=int, default=30)
+    parser.add_argument("--dtype", type=str, default="fp16", choices=list(DTYPE_MAPPING))
+    parser.add_argument("--schedules", type=str, nargs="+", default=list(SCHEDULES), choices=list(SCHEDULES))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    pipe = DiffusionPipeline.from_pretrained(args.model, mindspore_dtype=DTYPE_MAPPING[args.dtype])
+    call_kwargs = {"num_inference_steps": args.num_inference_steps, "output_type": "np"}
+    if args.negative_prompt is not None:
+        call_kwargs["negative_prompt"] = args.negative_prompt
+    if args.true_cfg_scale is not None:
+        call_kwargs["true_cfg_scale"] = args.true_cfg_scale
+
+    # warmup
+    pipe(args.prompt, **{**call_kwargs, "num_inference_steps": 2})
+
+    print(f"{'schedule':<30}{'latency (s)':>14}{'speedup':>10}{'cond':>8}{'uncond':>8}{'PSNR (dB)':>12}")
+    reference, reference_latency = None, None
+    for name in args.schedules:
+        guidance = ClassifierFreeGuidance(**SCHEDULES[name])
+        pipe.set_guidance(guidance)
+
+        start = time.perf_counter()
+        image = pipe(args.prompt, generator=np.random.Generator(np.random.PCG64(args.seed)), **call_kwargs)[0]
+        latency = time.perf_counter() - start
+
+        if reference is None:
+            reference, reference_latency = image, latency
+        print(
+            f"{name:<30}{latency:>14.2f}{reference_latency / latency:>10.2f}x{guidance.num_cond_evaluations:>7}"
+            f"{guidance.num_uncond_evaluations:>8}{psnr(image, reference):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
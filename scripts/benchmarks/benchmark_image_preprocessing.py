@@ -0,0 +1,123 @@
+"""
+Throughput of the batched image preprocessing of `mindone.transformers.image_transforms` vs the per-image loop.
+
+CLIP preprocessing (bicubic resize of the shortest edge to 224, 224x224 center crop, rescale and normalize) of JPEG
+encoded images, including their decoding, with:
+- loop: decode, then `resize`, `center_crop`, `rescale` and `normalize` one image at a time, as the slow processors do.
+- batched: decode in a thread pool, group the images by shape and apply `resize_rescale_and_normalize` to each group.
+
+Both a batch of same-size images and a batch of mixed sizes (4 distinct shapes) are measured.
+
+Example:
+    python scripts/benchmarks/benchmark_image_preprocessing.py --batch_size 64 --num_workers 8
+"""
+import argparse
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from mindone.transformers.image_transforms import (
+    center_crop,
+    get_resize_output_image_size,
+    group_images_by_shape,
+    normalize,
+    reorder_images,
+    rescale,
+    resize,
+    resize_rescale_and_normalize,
+)
+from mindone.transformers.image_utils import OPENAI_CLIP_MEAN, OPENAI_CLIP_STD, ChannelDimension
+
+SIZE = 224
+
+
+def encode_images(shapes, batch_size):
+    rng = np.random.default_rng(0)
+    images = []
+    for i in range(batch_size):
+        height, width = shapes[i % len(shapes)]
+        # smooth content, so that the JPEG size is realistic
+        image = rng.integers(0, 256, (height // 16, width // 16, 3), dtype=np.uint8)
+        buffer = io.BytesIO()
+        Image.fromarray(image).resize((width, height), Image.BILINEAR).save(buffer, format="JPEG", quality=90)
+        images.append(buffer.getvalue())
+    return images
+
+
+def decode(data):
+    return np.array(Image.open(io.BytesIO(data)).convert("RGB"))
+
+
+def output_size(image):
+    return get_resize_output_image_size(
+        image, size=SIZE, default_to_square=False, input_data_format=ChannelDimension.LAST
+    )
+
+
+def preprocess_loop(encoded_images):
+    pixel_values = []
+    for data in encoded_images:
+        image = decode(data)
+        image = resize(image, output_size(image), Image.BICUBIC, input_data_format=ChannelDimension.LAST)
+        image = center_crop(image, (SIZE, SIZE), input_data_format=ChannelDimension.LAST)
+        image = rescale(image, 1 / 255, input_data_format=ChannelDimension.LAST)
+        image = normalize(image, OPENAI_CLIP_MEAN, OPENAI_CLIP_STD, input_data_format=ChannelDimension.LAST)
+        pixel_values.append(image.transpose(2, 0, 1))
+    return np.stack(pixel_values)
+
+
+def preprocess_batched(encoded_images, executor):
+    grouped_images, grouped_images_index = group_images_by_shape(list(executor.map(decode, encoded_images)))
+    processed_images = {
+        shape: resize_rescale_and_normalize(
+            images,
+            size=output_size(images[0]),
+            resample=Image.BICUBIC,
+            crop_size=(SIZE, SIZE),
+            rescale_factor=1 / 255,
+            mean=OPENAI_CLIP_MEAN,
+            std=OPENAI_CLIP_STD,
+            data_format=ChannelDimension.FIRST,
+            input_data_format=ChannelDimension.LAST,
+        )
+        for shape, images in grouped_images.items()
+    }
+    return np.stack(reorder_images(processed_images, grouped_images_index))
+
+
+def images_per_second(fn, batch_size, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return batch_size * repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch_size", type=int, default=64)
+    parser.add_argument("--num_workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    batches = {
+        "same size": encode_images([(480, 640)], args.batch_size),
+        "mixed sizes": encode_images([(480, 640), (640, 480), (720, 1280), (512, 512)], args.batch_size),
+    }
+    print(f"{'batch':<14}{'method':<10}{'images/s':>10}{'speedup':>10}{'max abs diff':>15}")
+    with ThreadPoolExecutor(max_workers=args.num_workers) as executor:
+        for name, encoded_images in batches.items():
+            loop = images_per_second(lambda: preprocess_loop(encoded_images), args.batch_size, args.repeat)
+            batched = images_per_second(
+                lambda: preprocess_batched(encoded_images, executor), args.batch_size, args.repeat
+            )
+            diff = np.abs(preprocess_loop(encoded_images) - preprocess_batched(encoded_images, executor)).max()
+            print(f"{name:<14}{'loop':<10}{loop:>10.1f}{1.0:>9.1f}x{'':>15}")
+            print(f"{name:<14}{'batched':<10}{batched:>10.1f}{batched / loop:>9.1f}x{diff:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
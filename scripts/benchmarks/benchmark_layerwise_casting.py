@@ -0,0 +1,149 @@
+"""
+Weight memory and output error benchmark for `ModelMixin.enable_layerwise_casting`.
+
+A tiny DiT-like model is run on CPU in its compute dtype and with its linear/convolution weights stored in lower
+precision dtypes. For every storage dtype the script reports the weight memory at rest, the peak weight memory seen
+during a forward pass (the stored weights plus the layer currently upcast), the forward latency and the error of the
+output against the reference run.
+
+Example:
+    python scripts/benchmarks/benchmark_layerwise_casting.py --hidden_size 512 --num_layers 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import nn, ops
+
+from mindone.diffusers.hooks import HookRegistry, ModelHook
+from mindone.diffusers.models.modeling_utils import ModelMixin
+
+DTYPE_MAPPING = {"fp32": ms.float32, "fp16": ms.float16, "bf16": ms.bfloat16}
+if hasattr(ms, "float8_e4m3fn"):
+    DTYPE_MAPPING["fp8_e4m3fn"] = ms.float8_e4m3fn
+
+
+class DiTBlock(nn.Cell):
+    def __init__(self, hidden_size, mlp_ratio=4):
+        super().__init__()
+        self.norm1 = nn.LayerNorm((hidden_size,))
+        self.to_qkv = nn.Dense(hidden_size, hidden_size * 3)
+        self.to_out = nn.Dense(hidden_size, hidden_size)
+        self.norm2 = nn.LayerNorm((hidden_size,))
+        self.fc1 = nn.Dense(hidden_size, hidden_size * mlp_ratio)
+        self.fc2 = nn.Dense(hidden_size * mlp_ratio, hidden_size)
+
+    def construct(self, x):
+        q, k, v = self.to_qkv(self.norm1(x)).chunk(3, axis=-1)
+        attn = ops.softmax(ops.bmm(q, k.swapaxes(1, 2)) / q.shape[-1] ** 0.5, axis=-1)
+        x = x + self.to_out(ops.bmm(attn, v))
+        return x + self.fc2(ops.gelu(self.fc1(self.norm2(x))))
+
+
+class TinyDiT(ModelMixin):
+    _skip_layerwise_casting_patterns = ["patch_embed", "norm"]
+
+    def __init__(self, hidden_size, num_layers, patch_size=2, in_channels=4):
+        super().__init__()
+        self.patch_embed = nn.Conv2d(in_channels, hidden_size, patch_size, stride=patch_size, has_bias=True)
+        self.transformer_blocks = nn.CellList([DiTBlock(hidden_size) for _ in range(num_layers)])
+        self.norm_out = nn.LayerNorm((hidden_size,))
+        self.proj_out = nn.Dense(hidden_size, in_channels * patch_size * patch_size)
+
+    def construct(self, x):
+        x = self.patch_embed(x).flatten(start_dim=2).swapaxes(1, 2)
+        for block in self.transformer_blocks:
+            x = block(x)
+        return self.proj_out(self.norm_out(x))
+
+
+class WeightMemoryTrackerHook(ModelHook):
+    """Records the bytes held by all model weights every time a layer is entered."""
+
+    def __init__(self, model, stats):
+        super().__init__()
+        self.model = model
+        self.stats = stats
+
+    def pre_forward(self, module, *args, **kwargs):
+        self.stats["peak"] = max(self.stats["peak"], weight_nbytes(self.model))
+        return args, kwargs
+
+
+def weight_nbytes(model):
+    return sum(param.nbytes for param in model.get_parameters())
+
+
+def track_weight_memory(model):
+    stats = {"peak": 0}
+    for _, cell in model.cells_and_names():
+        if isinstance(cell, (nn.Dense, nn.Conv2d)):
+            # registered before the casting hook so that it runs inside it and observes the upcast weights
+            HookRegistry.check_if_exists_or_initialize(cell).register_hook(
+                WeightMemoryTrackerHook(model, stats), "weight_memory_tracker"
+            )
+    return stats
+
+
+def run(model, x, iters):
+    model(x).float().asnumpy()
+    start = time.perf_counter()
+    for _ in range(iters):
+        output = model(x).float().asnumpy()
+    return output, (time.perf_counter() - start) / iters
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hidden_size", type=int, default=512)
+    parser.add_argument("--num_layers", type=int, default=8)
+    parser.add_argument("--resolution", type=int, default=32)
+    parser.add_argument("--batch_size", type=int, default=2)
+    parser.add_argument("--compute_dtype", type=str, default="fp32", choices=["fp32", "bf16", "fp16"])
+    parser.add_argument(
+        "--storage_dtypes", type=str, nargs="+", default=[k for k in DTYPE_MAPPING if k not in ("fp32",)]
+    )
+    parser.add_argument("--iters", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE, device_target="CPU")
+    compute_dtype = DTYPE_MAPPING[args.compute_dtype]
+    x = np.random.default_rng(args.seed).standard_normal((args.batch_size, 4, args.resolution, args.resolution))
+    x = ms.tensor(x, dtype=compute_dtype)
+
+    ms.set_seed(args.seed)
+    reference_model = TinyDiT(args.hidden_size, args.num_layers).to(compute_dtype)
+    state_dict = {name: param.float().asnumpy() for name, param in reference_model.parameters_and_names()}
+    reference_stats = track_weight_memory(reference_model)
+    reference, reference_latency = run(reference_model, x, args.iters)
+
+    header = f"{'storage dtype':<16}{'weights (MiB)':>16}{'peak weights (MiB)':>22}{'latency (s)':>14}"
+    header += f"{'max abs err':>14}{'rel err':>12}"
+    print(header)
+    print(
+        f"{args.compute_dtype + ' (ref)':<16}{weight_nbytes(reference_model) / 2**20:>16.2f}"
+        f"{reference_stats['peak'] / 2**20:>22.2f}{reference_latency:>14.4f}{0.0:>14.2e}{0.0:>12.2e}"
+    )
+
+    for storage_name in args.storage_dtypes:
+        model = TinyDiT(args.hidden_size, args.num_layers).to(compute_dtype)
+        for name, param in model.parameters_and_names():
+            param.set_data(ms.tensor(state_dict[name], dtype=compute_dtype))
+        stats = track_weight_memory(model)
+        model.enable_layerwise_casting(storage_dtype=DTYPE_MAPPING[storage_name], compute_dtype=compute_dtype)
+        at_rest = weight_nbytes(model)
+        output, latency = run(model, x, args.iters)
+
+        error = np.abs(output - reference)
+        relative_error = np.linalg.norm(error) / np.linalg.norm(reference)
+        print(
+            f"{storage_name:<16}{at_rest / 2**20:>16.2f}{stats['peak'] / 2**20:>22.2f}{latency:>14.4f}"
+            f"{error.max():>14.2e}{relative_error:>12.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
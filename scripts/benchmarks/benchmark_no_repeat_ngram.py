@@ -0,0 +1,76 @@
+"""
+Per-step latency of `NoRepeatNGramLogitsProcessor` vs the previous per-hypothesis n-gram dictionaries.
+
+Beam search hypotheses (8 beams of 1k tokens by default, 32k vocabulary) are processed as at every decoding step:
+- dictionaries: the previous implementation, copying the token ids to the host and rebuilding the n-gram dictionary
+  of every hypothesis.
+- tensorized: `NoRepeatNGramLogitsProcessor`, matching the n-grams and building the ban mask on the device.
+
+Example:
+    python scripts/benchmarks/benchmark_no_repeat_ngram.py --num_beams 8 --seq_lengths 256 1024 --ngram_size 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+
+from mindone.transformers.generation.logits_process import NoRepeatNGramLogitsProcessor
+
+
+def dictionary_processor(ngram_size, input_ids, scores):
+    """The previous `NoRepeatNGramLogitsProcessor.__call__`."""
+    cur_len = input_ids.shape[-1]
+    scores_processed = scores.clone()
+    if cur_len + 1 < ngram_size:
+        return scores_processed
+    for hypo_idx in range(scores.shape[0]):
+        gen_tokens = input_ids[hypo_idx].tolist()
+        generated_ngram = {}
+        for ngram in zip(*[gen_tokens[i:] for i in range(ngram_size)]):
+            prev_ngram_tuple = tuple(ngram[:-1])
+            generated_ngram[prev_ngram_tuple] = generated_ngram.get(prev_ngram_tuple, []) + [ngram[-1]]
+        banned_tokens = generated_ngram.get(tuple(gen_tokens[cur_len + 1 - ngram_size : cur_len]), [])
+        scores_processed[hypo_idx, banned_tokens] = -float("inf")
+    return scores_processed
+
+
+def step_latency(fn, repeat):
+    fn().asnumpy()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        output = fn()
+    output.asnumpy()  # synchronize
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_beams", type=int, default=8)
+    parser.add_argument("--seq_lengths", type=int, nargs="+", default=[256, 1024])
+    parser.add_argument("--ngram_size", type=int, default=3)
+    parser.add_argument("--vocab_size", type=int, default=32000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    rng = np.random.default_rng(0)
+    processor = NoRepeatNGramLogitsProcessor(args.ngram_size)
+    print(f"{'tokens':>8}{'method':>14}{'ms/step':>10}{'speedup':>10}")
+    for seq_length in args.seq_lengths:
+        # a small set of tokens, so that n-grams repeat as in degenerate beams
+        input_ids = ms.tensor(rng.integers(0, 64, (args.num_beams, seq_length)))
+        scores = ms.tensor(rng.standard_normal((args.num_beams, args.vocab_size)), dtype=ms.float32)
+        baseline = step_latency(lambda: dictionary_processor(args.ngram_size, input_ids, scores), args.repeat)
+        latency = step_latency(lambda: processor(input_ids, scores), args.repeat)
+        assert np.array_equal(
+            np.isinf(processor(input_ids, scores).asnumpy()),
+            np.isinf(dictionary_processor(args.ngram_size, input_ids, scores).asnumpy()),
+        )
+        print(f"{seq_length:>8}{'dictionaries':>14}{baseline * 1000:>10.2f}{1.0:>9.1f}x")
+        print(f"{seq_length:>8}{'tensorized':>14}{latency * 1000:>10.2f}{baseline / latency:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
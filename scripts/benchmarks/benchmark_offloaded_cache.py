@@ -0,0 +1,85 @@
+"""
+Device memory and per-token decode latency of the `OffloadedStaticCache` vs the `StaticCache`.
+
+The cache of a 8B-like model (32 layers, 8 KV heads of 128 dims, bfloat16, batch of 1) is prefilled, then updated
+one token at a time as in decoding. After each update, the keys and values are read by a query, as the attention
+does, so that the layer-ahead prefetch of the offloaded cache overlaps with some compute. The `StaticCache` is
+skipped for the context lengths whose states do not fit on the device.
+
+Example:
+    python scripts/benchmarks/benchmark_offloaded_cache.py --context_lengths 16384 131072
+"""
+import argparse
+import time
+
+import numpy as np
+from transformers import PretrainedConfig
+
+import mindspore as ms
+from mindspore import mint
+
+from mindone.transformers.cache_utils import OffloadedStaticCache, StaticCache
+
+
+def decode_latency(cache, config, args, context_length):
+    shape = (1, config.num_key_value_heads, context_length, config.head_dim)
+    prefill = ms.tensor(np.random.default_rng(0).standard_normal(shape), dtype=ms.bfloat16)
+    cache_position = mint.arange(context_length)
+    for layer_idx in range(config.num_hidden_layers):
+        cache.update(prefill, prefill, layer_idx, {"cache_position": cache_position})
+
+    states = mint.ones((1, config.num_key_value_heads, 1, config.head_dim), dtype=ms.bfloat16)
+    latencies = []
+    for position in range(context_length, context_length + args.num_tokens):
+        cache_kwargs = {"cache_position": ms.tensor([position])}
+        start = time.perf_counter()
+        for layer_idx in range(config.num_hidden_layers):
+            keys, values = cache.update(states, states, layer_idx, cache_kwargs)
+            scores = mint.softmax(mint.matmul(states, keys.swapaxes(-1, -2)).float(), dim=-1)
+            output = mint.matmul(scores.to(values.dtype), values)
+        output.asnumpy()  # synchronize
+        latencies.append(time.perf_counter() - start)
+    return np.median(latencies[1:])
+
+
+def device_bytes(cache):
+    if isinstance(cache, OffloadedStaticCache):
+        return sum(x.nbytes for x in cache.device_key_cache + cache.device_value_cache)
+    return sum(x.nbytes for x in cache.key_cache + cache.value_cache)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--context_lengths", type=int, nargs="+", default=[16384, 131072])
+    parser.add_argument("--num_layers", type=int, default=32)
+    parser.add_argument("--num_tokens", type=int, default=16, help="Number of decoded tokens.")
+    parser.add_argument("--block_size", type=int, default=1024)
+    parser.add_argument(
+        "--max_static_length", type=int, default=32768, help="Longest context run with the `StaticCache`."
+    )
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    config = PretrainedConfig(
+        num_hidden_layers=args.num_layers, num_attention_heads=32, num_key_value_heads=8, hidden_size=4096
+    )
+    config.head_dim = 128
+    print(f"{'context':>8}{'cache':>16}{'device GiB':>12}{'ms/token':>10}")
+    for context_length in args.context_lengths:
+        max_cache_len = context_length + args.num_tokens
+        caches = {
+            "offloaded": lambda: OffloadedStaticCache(
+                config, 1, max_cache_len, dtype=ms.bfloat16, block_size=args.block_size
+            )
+        }
+        if context_length <= args.max_static_length:
+            caches = {"static": lambda: StaticCache(config, 1, max_cache_len, dtype=ms.bfloat16), **caches}
+        for name, make_cache in caches.items():
+            cache = make_cache()
+            latency = decode_latency(cache, config, args, context_length)
+            print(f"{context_length:>8}{name:>16}{device_bytes(cache) / 2**30:>12.2f}{latency * 1000:>10.2f}")
+            del cache
+
+
+if __name__ == "__main__":
+    main()
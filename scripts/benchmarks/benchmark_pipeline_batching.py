@@ -0,0 +1,61 @@
+"""
+Throughput of the `feature-extraction` and `automatic-speech-recognition` pipelines vs their batch size.
+
+The inputs are run through `pipeline(inputs, batch_size=..., num_workers=...)`, which pads and collates the
+preprocessed items with `pad_collate_fn`:
+- feature-extraction: random sentences of 8 to 64 words.
+- automatic-speech-recognition: random waveforms of 30s, cut into overlapping chunks of `chunk_length_s` seconds; the
+  chunks of all the waveforms are batched together.
+
+Example:
+    python scripts/benchmarks/benchmark_pipeline_batching.py --task feature-extraction --model google-bert/bert-base-uncased
+    python scripts/benchmarks/benchmark_pipeline_batching.py --task automatic-speech-recognition \
+        --model facebook/wav2vec2-base-960h --num_inputs 16 --batch_size 1 4 16
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+
+from mindone.transformers import pipeline
+
+
+def make_inputs(task, num_inputs, rng, sampling_rate=16000):
+    if task == "feature-extraction":
+        words = ["the", "image", "shows", "a", "cat", "on", "table", "describe", "token", "visual", "dog", "runs"]
+        return [" ".join(rng.choice(words, rng.integers(8, 65))) for _ in range(num_inputs)]
+    return [rng.standard_normal(30 * sampling_rate).astype(np.float32) for _ in range(num_inputs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--task", type=str, default="feature-extraction", choices=["feature-extraction", "automatic-speech-recognition"]
+    )
+    parser.add_argument("--model", type=str, default="google-bert/bert-base-uncased")
+    parser.add_argument("--num_inputs", type=int, default=256)
+    parser.add_argument("--batch_size", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--num_workers", type=int, default=0, help="Threads preprocessing the inputs.")
+    parser.add_argument("--chunk_length_s", type=float, default=10.0)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    pipe = pipeline(args.task, model=args.model)
+    kwargs = {"chunk_length_s": args.chunk_length_s} if args.task == "automatic-speech-recognition" else {}
+    inputs = make_inputs(args.task, args.num_inputs, np.random.default_rng(0))
+    pipe(inputs[:2], batch_size=2, **kwargs)  # warm up
+
+    baseline = None
+    print(f"{'batch size':>10}{'inputs/s':>10}{'speedup':>10}")
+    for batch_size in args.batch_size:
+        start = time.perf_counter()
+        pipe(inputs, batch_size=batch_size, num_workers=args.num_workers, **kwargs)
+        throughput = len(inputs) / (time.perf_counter() - start)
+        baseline = baseline or throughput
+        print(f"{batch_size:>10}{throughput:>10.1f}{throughput / baseline:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
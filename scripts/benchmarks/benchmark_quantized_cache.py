@@ -0,0 +1,110 @@
+"""
+KV memory and perplexity drift of the `QuantizedCache` vs the `DynamicCache`, on a tiny randomly initialized Qwen3.
+
+A sequence is sampled from the model with a `DynamicCache`, then teacher-forced one token at a time, as in decoding,
+with each cache. Reported are the bytes held by the cache at the end of the sequence, the perplexity of the sequence
+and its drift from the `DynamicCache`, and the largest difference of the logits.
+
+Example:
+    python scripts/benchmarks/benchmark_quantized_cache.py --seq_length 1024 --residual_length 128
+"""
+import argparse
+
+import numpy as np
+from transformers.models.qwen3.configuration_qwen3 import Qwen3Config
+
+import mindspore as ms
+from mindspore import mint, ops
+
+from mindone.transformers.cache_utils import DynamicCache, QuantizedCache, QuantizedCacheConfig
+from mindone.transformers.models.qwen3 import Qwen3ForCausalLM
+
+
+def cache_bytes(cache):
+    tensors = [x for x in cache.key_cache + cache.value_cache if not isinstance(x, list)]
+    if isinstance(cache, QuantizedCache):
+        for quantized in cache._quantized_key_cache + cache._quantized_value_cache:
+            tensors += list(quantized or ())
+    return sum(x.nbytes for x in tensors)
+
+
+def decode(model, cache, input_ids=None, seq_length=None, seed=0):
+    """Feeds `input_ids` one token at a time, or samples `seq_length` tokens if not given."""
+    rng = np.random.default_rng(seed)
+    tokens = [0] if input_ids is None else list(input_ids)
+    all_logits = []
+    for position in range(len(tokens) - 1 if input_ids is not None else seq_length - 1):
+        logits = model(
+            input_ids=ms.tensor([[tokens[position]]]),
+            position_ids=ms.tensor([[position]]),
+            cache_position=ms.tensor([position]),
+            past_key_values=cache,
+            use_cache=True,
+            return_dict=False,
+        )[0][0, -1].float()
+        all_logits.append(logits)
+        if input_ids is None:
+            probs = mint.softmax(logits, dim=-1).asnumpy().astype(np.float64)
+            tokens.append(int(rng.choice(len(probs), p=probs / probs.sum())))
+    return tokens, mint.stack(all_logits)
+
+
+def perplexity(logits, tokens):
+    log_probs = ops.log_softmax(logits, axis=-1).asnumpy()
+    return float(np.exp(-log_probs[np.arange(len(tokens) - 1), tokens[1:]].mean()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seq_length", type=int, default=1024)
+    parser.add_argument("--residual_length", type=int, default=128)
+    parser.add_argument("--q_group_size", type=int, default=64)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    ms.set_seed(0)
+    config = Qwen3Config(
+        vocab_size=1024,
+        hidden_size=256,
+        intermediate_size=512,
+        num_hidden_layers=4,
+        num_attention_heads=4,
+        num_key_value_heads=2,
+        head_dim=64,
+        max_position_embeddings=args.seq_length,
+        initializer_range=0.2,
+        attn_implementation="eager",
+    )
+    model = Qwen3ForCausalLM._from_config(config, torch_dtype=ms.float16)
+    model.set_train(False)
+
+    reference_cache = DynamicCache()
+    tokens, reference_logits = decode(model, reference_cache, seq_length=args.seq_length)
+    reference_perplexity = perplexity(reference_logits, tokens)
+    reference_bytes = cache_bytes(reference_cache)
+
+    print(f"{'cache':<20}{'KV MiB':>10}{'saving':>10}{'perplexity':>12}{'drift':>10}{'max logit diff':>16}")
+    print(f"{'dynamic fp16':<20}{reference_bytes / 2**20:>10.2f}{1.0:>9.1f}x{reference_perplexity:>12.3f}")
+    for nbits in (8, 4):
+        for name, axis_key, axis_value in (("per-channel", 0, 0), ("KIVI", 0, -1)):
+            cache = QuantizedCache(
+                QuantizedCacheConfig(
+                    nbits=nbits,
+                    axis_key=axis_key,
+                    axis_value=axis_value,
+                    q_group_size=args.q_group_size,
+                    residual_length=args.residual_length,
+                )
+            )
+            _, logits = decode(model, cache, input_ids=tokens)
+            ppl = perplexity(logits, tokens)
+            nbytes = cache_bytes(cache)
+            diff = float((logits - reference_logits).abs().max())
+            print(
+                f"{f'int{nbits} {name}':<20}{nbytes / 2**20:>10.2f}{reference_bytes / nbytes:>9.1f}x"
+                f"{ppl:>12.3f}{(ppl / reference_perplexity - 1) * 100:>9.2f}%{diff:>16.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Host-side throughput of `create_dataloader` with and without `SharedMemoryTransport`.
+
+A synthetic dataset of 16-frame 512x512 uint8 clips is normalized to float32 by a transform in Python-multiprocessing
+workers and batched. Without the transport the clips are pickled and copied through the shared-memory rows of the
+pipeline, with it they are written into a ring of shared-memory slots and read as views in the main process.
+The script reports the time per batch and the host memory bandwidth (batch bytes delivered per second).
+
+Example:
+    python scripts/benchmarks/benchmark_shm_transport.py --batch_size 4 --num_workers 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from mindone.data import BaseDataset, SharedMemoryTransport, create_dataloader
+
+FRAMES, SIZE = 16, 512
+
+
+class SyntheticClips(BaseDataset):
+    output_columns = ["video"]
+    pad_info = None
+
+    def __init__(self, num_samples):
+        self._num_samples = num_samples
+        self._clip = np.random.default_rng(0).integers(0, 256, (FRAMES, SIZE, SIZE, 3), dtype=np.uint8)
+
+    def __getitem__(self, idx):
+        return (self._clip,)
+
+    def __len__(self):
+        return self._num_samples
+
+    @staticmethod
+    def train_transforms(**kwargs):
+        return [{"operations": [normalize], "input_columns": ["video"]}]
+
+
+def normalize(video):
+    return (video.astype(np.float32) / 127.5 - 1.0).transpose(0, 3, 1, 2)
+
+
+def run(args, transport=None):
+    dataset = SyntheticClips(args.num_batches * args.batch_size)
+    dataloader = create_dataloader(
+        dataset,
+        batch_size=args.batch_size,
+        transforms=dataset.train_transforms(),
+        num_workers=args.num_workers,
+        transport=transport,
+    )
+    iterator = dataloader.create_tuple_iterator(output_numpy=True, num_epochs=1)
+    if transport is not None:
+        iterator = transport.iterate(iterator)
+
+    num_bytes, start = 0, None
+    for i, (video,) in enumerate(iterator):
+        if i == 0:  # skip the pipeline warmup
+            start = time.perf_counter()
+            continue
+        num_bytes += video.nbytes if isinstance(video, np.ndarray) else sum(v.nbytes for v in video)
+    elapsed = time.perf_counter() - start
+    return elapsed / (args.num_batches - 1), num_bytes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch_size", type=int, default=4)
+    parser.add_argument("--num_batches", type=int, default=50)
+    parser.add_argument("--num_workers", type=int, default=8)
+    parser.add_argument("--num_slots", type=int, default=48)
+    args = parser.parse_args()
+
+    batch_bytes = args.batch_size * FRAMES * SIZE * SIZE * 3 * 4
+    print(f"{'transport':<12}{'s/batch':>10}{'GB/s':>10}")
+    latency, bandwidth = run(args)
+    print(f"{'pickle':<12}{latency:>10.3f}{bandwidth / 1e9:>10.2f}")
+    with SharedMemoryTransport(num_slots=args.num_slots, slot_size=batch_bytes) as transport:
+        latency, bandwidth = run(args, transport)
+    print(f"{'shm ring':<12}{latency:>10.3f}{bandwidth / 1e9:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Latency of the framed STFT of `mindone.transformers.audio_utils.spectrogram` on 30 s and 10 min clips.
+
+The Whisper log-mel spectrogram (16 kHz, 400-sample frames, hop of 160, 80 mel filters) is computed with:
+- loop: the previous frame-by-frame implementation, one `np.fft.rfft` per frame.
+- framed: `spectrogram`, strided frames and one batched FFT per chunk of frames.
+- framed fp32: `spectrogram(..., compute_dtype=np.float32)`.
+- batch + threads: `spectrogram_batch(..., num_workers=N)` on a batch of clips, reported per clip.
+
+Example:
+    python scripts/benchmarks/benchmark_spectrogram.py --batch_size 8 --num_workers 8
+"""
+import argparse
+import time
+
+import numpy as np
+
+from mindone.transformers.audio_utils import mel_filter_bank, spectrogram, spectrogram_batch, window_function
+
+SAMPLING_RATE = 16000
+
+
+def loop_spectrogram(waveform, window, frame_length, hop_length, mel_filters):
+    waveform = np.pad(waveform, frame_length // 2, mode="reflect").astype(np.float64)
+    num_frames = 1 + (waveform.size - frame_length) // hop_length
+    stft = np.empty((num_frames, frame_length // 2 + 1), dtype=np.complex64)
+    buffer = np.zeros(frame_length)
+    for frame_idx in range(num_frames):
+        buffer[:] = waveform[frame_idx * hop_length : frame_idx * hop_length + frame_length] * window
+        stft[frame_idx] = np.fft.rfft(buffer)
+    return np.log10(np.maximum(1e-10, mel_filters.T @ (np.abs(stft, dtype=np.float64) ** 2).T))
+
+
+def timeit(fn, repeat):
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 600], help="Clip durations in seconds.")
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--num_workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    window = window_function(400, "hann")
+    mel_filters = mel_filter_bank(201, 80, 0.0, 8000.0, SAMPLING_RATE, norm="slaney", mel_scale="slaney")
+    kwargs = {"power": 2.0, "mel_filters": mel_filters, "log_mel": "log10"}
+    rng = np.random.default_rng(0)
+
+    print(f"{'clip':>8}{'method':>18}{'latency (ms)':>15}{'speedup':>10}")
+    for duration in args.durations:
+        waveforms = [
+            rng.standard_normal(int(duration * SAMPLING_RATE)).astype(np.float32) for _ in range(args.batch_size)
+        ]
+        methods = {
+            "loop": lambda: loop_spectrogram(waveforms[0], window, 400, 160, mel_filters),
+            "framed": lambda: spectrogram(waveforms[0], window, 400, 160, **kwargs),
+            "framed fp32": lambda: spectrogram(waveforms[0], window, 400, 160, compute_dtype=np.float32, **kwargs),
+        }
+        latencies = {name: timeit(fn, args.repeat) for name, fn in methods.items()}
+        latencies["batch + threads"] = (
+            timeit(
+                lambda: spectrogram_batch(waveforms, window, 400, 160, num_workers=args.num_workers, **kwargs),
+                args.repeat,
+            )
+            / args.batch_size
+        )
+        for name, latency in latencies.items():
+            print(f"{duration:>7.0f}s{name:>18}{latency * 1000:>15.1f}{latencies['loop'] / latency:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Per-token cost of the stopping criteria of `generate`, with stop strings.
+
+Random sequences (batch of 8, 32 stop strings by default) are extended one token at a time, and the criteria
+(max length, eos tokens and stop strings) are evaluated as in the decoding loop, followed by the synchronization that
+tells whether all the sequences are done:
+- rescan: the stop strings are matched again from the last tokens at every step, without `num_new_tokens`.
+- incremental: the running matches of the stop strings are kept between the steps, and only the new token is checked.
+- every k: as incremental, but the criteria are evaluated every `check_interval` tokens.
+
+Example:
+    python scripts/benchmarks/benchmark_stopping_criteria.py --tokenizer gpt2 --num_stop_strings 32 --check_interval 8
+"""
+import argparse
+import time
+
+import numpy as np
+from transformers import AutoTokenizer
+
+import mindspore as ms
+
+from mindone.transformers.generation.stopping_criteria import (
+    EosTokenCriteria,
+    MaxLengthCriteria,
+    StoppingCriteriaList,
+    StopStringCriteria,
+)
+
+
+def per_token_latency(criteria, input_ids, prompt_len, incremental):
+    criteria.reset()
+    num_unchecked_tokens = 0
+    start = time.perf_counter()
+    for cur_len in range(prompt_len + 1, input_ids.shape[1] + 1):
+        num_unchecked_tokens += 1
+        if num_unchecked_tokens == criteria.check_interval or cur_len == input_ids.shape[1]:
+            kwargs = {"num_new_tokens": num_unchecked_tokens} if incremental else {}
+            is_done = criteria(input_ids[:, :cur_len], None, **kwargs)
+            bool(is_done.max() == 0)  # synchronize, as `generate` does to know if all the sequences are done
+            num_unchecked_tokens = 0
+    return (time.perf_counter() - start) / (input_ids.shape[1] - prompt_len)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokenizer", type=str, default="gpt2")
+    parser.add_argument("--batch_size", type=int, default=8)
+    parser.add_argument("--prompt_len", type=int, default=128)
+    parser.add_argument("--num_tokens", type=int, default=256, help="Number of decoded tokens.")
+    parser.add_argument("--num_stop_strings", type=int, default=32)
+    parser.add_argument("--check_interval", type=int, default=8)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    rng = np.random.default_rng(0)
+    # stop strings that are not likely to be generated, so that all the tokens are decoded
+    words = rng.choice(list(tokenizer.get_vocab()), args.num_stop_strings)
+    stop_strings = [f"{tokenizer.convert_tokens_to_string([word]).strip()}###" for word in words]
+    stop_string_criteria = StopStringCriteria(tokenizer, stop_strings)
+    max_length = args.prompt_len + args.num_tokens
+    input_ids = ms.tensor(rng.integers(0, tokenizer.vocab_size, (args.batch_size, max_length)), dtype=ms.int32)
+
+    def make_criteria(check_interval=1):
+        return StoppingCriteriaList(
+            [MaxLengthCriteria(max_length), EosTokenCriteria(tokenizer.eos_token_id), stop_string_criteria],
+            check_interval=check_interval,
+        )
+
+    methods = {
+        "rescan": (make_criteria(), False),
+        "incremental": (make_criteria(), True),
+        f"every {args.check_interval}": (make_criteria(args.check_interval), True),
+    }
+    make_criteria()(input_ids, None).asnumpy()  # warm up
+    baseline = None
+    print(f"{'method':<14}{'ms/token':>10}{'speedup':>10}")
+    for name, (criteria, incremental) in methods.items():
+        latency = per_token_latency(criteria, input_ids, args.prompt_len, incremental)
+        baseline = baseline or latency
+        print(f"{name:<14}{latency * 1000:>10.3f}{baseline / latency:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Throughput and latency of `TextGenerationServer` vs calling `TextGenerationPipeline` once per request.
+
+Requests with random prompts arrive at a fixed rate (with exponential inter-arrival times) and are completed with
+greedy decoding:
+- sequential: every request is completed by its own call to the pipeline, in order of arrival.
+- server: the requests are grouped into micro-batches by `TextGenerationServer`, by time window and token budget.
+The end-to-end latency of a request is measured from its arrival to its final response.
+
+Example:
+    python scripts/benchmarks/benchmark_text_generation_serving.py --model openai-community/gpt2 --rate 20 --max_batch_size 16
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+
+from mindone.transformers import pipeline
+from mindone.transformers.pipelines import GenerationRequest, TextGenerationServer
+
+
+def arrivals(prompts, intervals, generate_kwargs):
+    for prompt, interval in zip(prompts, intervals):
+        time.sleep(interval)
+        yield GenerationRequest(prompt, generate_kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=str, default="openai-community/gpt2")
+    parser.add_argument("--num_requests", type=int, default=64)
+    parser.add_argument("--rate", type=float, default=20.0, help="Requests per second.")
+    parser.add_argument("--max_new_tokens", type=int, default=32)
+    parser.add_argument("--max_batch_size", type=int, default=16)
+    parser.add_argument("--max_batch_tokens", type=int, default=None)
+    parser.add_argument("--max_wait_time", type=float, default=0.05)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    generator = pipeline("text-generation", model=args.model)
+    generator.tokenizer.pad_token_id = generator.model.config.eos_token_id
+    rng = np.random.default_rng(0)
+    words = [word for word in generator.tokenizer.get_vocab() if word.isalpha()]
+    prompts = [" ".join(rng.choice(words, rng.integers(4, 64))) for _ in range(args.num_requests)]
+    intervals = rng.exponential(1 / args.rate, args.num_requests)
+    generate_kwargs = {"max_new_tokens": args.max_new_tokens, "do_sample": False}
+    generator(prompts[0], **generate_kwargs)  # warm up
+
+    start = time.perf_counter()
+    latencies = []
+    for request in arrivals(prompts, intervals, generate_kwargs):
+        generator(request.prompt, **request.generate_kwargs)
+        latencies.append(time.perf_counter() - request.arrival_time)
+    results = {"sequential": (time.perf_counter() - start, latencies)}
+
+    server = TextGenerationServer(
+        generator,
+        max_batch_size=args.max_batch_size,
+        max_batch_tokens=args.max_batch_tokens,
+        max_wait_time=args.max_wait_time,
+    )
+    requests = {}
+
+    def served(stream):
+        for request in stream:
+            requests[request.request_id] = request
+            yield request
+
+    start = time.perf_counter()
+    latencies = [
+        time.perf_counter() - requests[response.request_id].arrival_time
+        for response in server.serve(served(arrivals(prompts, intervals, generate_kwargs)))
+    ]
+    results["server"] = (time.perf_counter() - start, latencies)
+
+    print(f"{'method':<12}{'requests/s':>12}{'latency mean':>14}{'latency p95':>13}")
+    for name, (elapsed, latencies) in results.items():
+        print(
+            f"{name:<12}{args.num_requests / elapsed:>12.2f}{np.mean(latencies):>13.3f}s"
+            f"{np.percentile(latencies, 95):>12.3f}s"
+        )
+    for key, value in server.metrics.summary().items():
+        print(f"{key:<24}{value:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
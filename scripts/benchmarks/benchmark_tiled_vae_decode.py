@@ -0,0 +1,77 @@
+"""
+Latency/memory benchmark for the batched tiled decoding of `AutoencoderKL`.
+
+Random latents of 1K, 2K and 4K images are decoded by the tiled decoder of a VAE checkpoint, one tile per decoder
+call and with `enable_tile_batching` for several memory budgets. The script reports the latency, the peak device
+memory and the maximum difference of the output against the one-tile-per-call decoding.
+
+Example:
+    python scripts/benchmarks/benchmark_tiled_vae_decode.py --model stabilityai/stable-diffusion-xl-base-1.0 \
+        --memory_budgets 4 8 16
+"""
+import argparse
+import time
+
+import numpy as np
+
+import mindspore as ms
+
+from mindone.diffusers import AutoencoderKL
+from mindone.utils.version_control import get_runtime
+
+DTYPE_MAPPING = {"fp32": ms.float32, "fp16": ms.float16, "bf16": ms.bfloat16}
+
+
+def measure(vae, z, iters):
+    runtime = get_runtime()
+    vae.decode(z)[0].asnumpy()  # warmup, also measures the tiles per call of each tile shape
+    runtime.synchronize()
+    runtime.reset_peak_memory_stats()
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        sample = vae.decode(z)[0].asnumpy()
+    runtime.synchronize()
+    latency = (time.perf_counter() - start) / iters
+    return sample, runtime.max_memory_allocated() / 2**30, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", type=str, default="stabilityai/stable-diffusion-xl-base-1.0")
+    parser.add_argument("--subfolder", type=str, default="vae")
+    parser.add_argument("--resolutions", type=int, nargs="+", default=[1024, 2048, 4096])
+    parser.add_argument("--memory_budgets", type=float, nargs="+", default=[4, 8, 16], help="budgets in GiB")
+    parser.add_argument("--dtype", type=str, default="fp16", choices=list(DTYPE_MAPPING))
+    parser.add_argument("--iters", type=int, default=3)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    dtype = DTYPE_MAPPING[args.dtype]
+    vae = AutoencoderKL.from_pretrained(args.model, subfolder=args.subfolder, mindspore_dtype=dtype)
+    vae.enable_tiling()
+    scale_factor = 2 ** (len(vae.config.block_out_channels) - 1)
+
+    print(
+        f"{'resolution':<12}{'config':<20}{'peak memory (GiB)':>20}{'latency (s)':>14}{'speedup':>10}{'max diff':>12}"
+    )
+    for resolution in args.resolutions:
+        latent_size = resolution // scale_factor
+        z = ms.tensor(np.random.randn(1, vae.config.latent_channels, latent_size, latent_size), dtype=dtype)
+
+        vae.disable_tile_batching()
+        reference, peak_memory, reference_latency = measure(vae, z, args.iters)
+        print(f"{resolution:<12}{'1 tile per call':<20}{peak_memory:>20.3f}{reference_latency:>14.3f}{1:>9.2f}x")
+
+        for budget in args.memory_budgets:
+            vae.enable_tile_batching(memory_budget=int(budget * 2**30))
+            sample, peak_memory, latency = measure(vae, z, args.iters)
+            max_diff = np.abs(sample.astype(np.float32) - reference.astype(np.float32)).max()
+            print(
+                f"{resolution:<12}{f'budget {budget:g}GiB':<20}{peak_memory:>20.3f}{latency:>14.3f}"
+                f"{reference_latency / latency:>9.2f}x{max_diff:>12.2e}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Latency of the added-token split of slow tokenizers: the compiled `Trie.split` vs the character loop of `transformers`.
+
+The trie holds the added tokens of a multimodal tokenizer: 32768 vision tokens in the format of Emu3
+(`<|visual token 000123|>`), plus some special tokens. The prompts interleave text with images of 32x32 vision tokens
+(with row separators), as in the prompts of the image understanding and generation models.
+
+Example:
+    python scripts/benchmarks/benchmark_trie_split.py --num_vision_tokens 32768 --num_images 1 4
+"""
+import argparse
+import random
+import time
+
+from transformers.tokenization_utils import Trie as ReferenceTrie
+
+from mindone.transformers.tokenization_utils import Trie
+
+SPECIAL_TOKENS = ["<|extra_203|>", "<|image start|>", "<|image end|>", "<|image token|>", "<|im_start|>", "<|im_end|>"]
+
+
+def make_prompt(rng, num_images, num_vision_tokens):
+    words = ["the", "image", "shows", "a", "cat", "on", "table", "describe", "token", "<", "|", "visual"]
+    parts = ["<|im_start|>user\n"]
+    for _ in range(num_images):
+        parts.append(" ".join(rng.choices(words, k=64)) + "\n<|image start|>32*32<|image token|>")
+        for _ in range(32):
+            parts.extend(f"<|visual token {rng.randrange(num_vision_tokens):06d}|>" for _ in range(32))
+            parts.append("<|extra_203|>")
+        parts.append("<|image end|>")
+    parts.append(" ".join(rng.choices(words, k=64)) + "<|im_end|>")
+    return "".join(parts)
+
+
+def latency(trie, text, repeat):
+    trie.split(text)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        trie.split(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_vision_tokens", type=int, default=32768)
+    parser.add_argument("--num_images", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = SPECIAL_TOKENS + [f"<|visual token {i:06d}|>" for i in range(args.num_vision_tokens)]
+    start = time.perf_counter()
+    trie = Trie(tokens)
+    trie.split("")  # compiles the pattern
+    print(f"trie of {len(tokens)} tokens built and compiled in {time.perf_counter() - start:.2f}s")
+    reference_trie = ReferenceTrie(tokens)
+
+    rng = random.Random(0)
+    print(f"{'images':>8}{'chars':>10}{'trie':>12}{'ms/prompt':>11}{'speedup':>10}")
+    for num_images in args.num_images:
+        text = make_prompt(rng, num_images, args.num_vision_tokens)
+        assert trie.split(text) == reference_trie.split(text)
+        baseline = latency(reference_trie, text, args.repeat)
+        compiled = latency(trie, text, args.repeat)
+        print(f"{num_images:>8}{len(text):>10}{'loop':>12}{baseline * 1000:>11.2f}{1.0:>9.1f}x")
+        print(f"{num_images:>8}{len(text):>10}{'compiled':>12}{compiled * 1000:>11.2f}{baseline / compiled:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Host memory/latency benchmark for the streaming video export.
+
+A synthetic decoded video, produced chunk by chunk as by the `iter_decode` method of the video VAEs, is exported with
+`VideoProcessor.postprocess_video` + `export_to_video` and with `VideoProcessor.postprocess_video_stream` +
+`export_to_video_stream`. The script reports the peak host memory allocated by Python/NumPy (tracemalloc) and the
+latency of both paths.
+
+Example:
+    python scripts/benchmarks/benchmark_video_export.py --num_frames 129 --height 720 --width 1280
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+import mindspore as ms
+from mindspore import ops
+
+from mindone.diffusers.utils import export_to_video, export_to_video_stream
+from mindone.diffusers.video_processor import VideoProcessor
+
+
+def iter_chunks(args):
+    # stands for the decoded chunks of a VAE, kept on the device
+    for start in range(0, args.num_frames, args.chunk_size):
+        num_frames = min(args.chunk_size, args.num_frames - start)
+        yield ms.tensor(np.random.uniform(-1, 1, size=(1, 3, num_frames, args.height, args.width)).astype(np.float32))
+
+
+def export_full(args, video_processor, output_video_path):
+    video = ops.cat(list(iter_chunks(args)), axis=2)
+    frames = video_processor.postprocess_video(video, output_type="np")[0]
+    export_to_video(list(frames), output_video_path, fps=args.fps)
+
+
+def export_stream(args, video_processor, output_video_path):
+    chunks = video_processor.postprocess_video_stream(iter_chunks(args))
+    export_to_video_stream(chunks, output_video_path, fps=args.fps)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_frames", type=int, default=129)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--chunk_size", type=int, default=16, help="decoded frames per chunk")
+    parser.add_argument("--fps", type=int, default=24)
+    args = parser.parse_args()
+
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    video_processor = VideoProcessor()
+
+    print(f"{'export':<12}{'peak host memory (GiB)':>26}{'latency (s)':>14}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name, export_fn in [("full", export_full), ("stream", export_stream)]:
+            tracemalloc.start()
+            start = time.perf_counter()
+            export_fn(args, video_processor, os.path.join(tmpdir, f"{name}.mp4"))
+            latency = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{name:<12}{peak / 2**30:>26.3f}{latency:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Latency benchmark for sequential and strided frame reading with `mindone.data.VideoReader`.
+
+A synthetic video is generated locally with OpenCV (moving gradients encoded with `mp4v`). For every stride, the
+script times `VideoReader.fetch_frames` for each available backend against the previous reading loop, which seeks
+with `CAP_PROP_POS_FRAMES` before every frame.
+
+Example:
+    python scripts/benchmarks/benchmark_video_reader.py --num_frames 600 --steps 1 2 4 8 16 --backends opencv pyav decord
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from mindone.data import VideoReader
+from mindone.data.video_reader import _metadata_cache
+
+
+def make_video(path, num_frames, width, height, fps):
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    x = np.linspace(0, 255, width, dtype=np.float32)[None, :, None]
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None, None]
+    for i in range(num_frames):
+        frame = (x + y + i * np.array([3, 5, 7], dtype=np.float32)) % 256
+        writer.write(frame.astype(np.uint8))
+    writer.release()
+
+
+def seek_every_frame(path, num, step):
+    # the reading loop of `VideoReader.fetch_frames` before the grab/seek selection
+    cap = cv2.VideoCapture(path, apiPreference=cv2.CAP_FFMPEG)
+    frames, i = [], 0
+    ret, frame = cap.read()
+    while ret and len(frames) < num:
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if step > 1:
+            i += step
+            cap.set(cv2.CAP_PROP_POS_FRAMES, i)
+        ret, frame = cap.read()
+    cap.release()
+    return np.stack(frames)
+
+
+def read_with_reader(path, num, step, backend):
+    with VideoReader(path, backend=backend) as reader:
+        return reader.fetch_frames(num=num, step=step)
+
+
+def timeit(fn, repeats):
+    fn()  # warmup, also fills the metadata cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--num_frames", type=int, default=600)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=360)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--num_clip_frames", type=int, default=16, help="frames fetched per clip")
+    parser.add_argument("--steps", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--backends", type=str, nargs="+", default=["opencv"], choices=["opencv", "pyav", "decord"])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "synthetic.mp4")
+        make_video(path, args.num_frames, args.width, args.height, args.fps)
+
+        print(
+            f"{'step':>6}{'seek per frame (s)':>20}" + "".join(f"{backend + ' (s)':>16}" for backend in args.backends)
+        )
+        for step in args.steps:
+            num = min(args.num_clip_frames, (args.num_frames - 1) // step + 1)
+            reference = timeit(lambda: seek_every_frame(path, num, step), args.repeats)
+            row = f"{step:>6}{reference:>20.4f}"
+            for backend in args.backends:
+                _metadata_cache.clear()
+                latency = timeit(lambda: read_with_reader(path, num, step, backend), args.repeats)
+                row += f"{latency:>10.4f} ({reference / latency:.1f}x)"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from mindone.data import BaseDataset, BucketBatchSampler, Buckets, create_dataloader
+
+BUCKETS = {(1, 512, 512): 4, (17, 512, 512): 2, (17, 480, 854): 2, (65, 480, 854): 1, (65, 512, 512): 0}
+
+
+class ShapeDataset(BaseDataset):
+    output_columns = ["video"]
+    pad_info = None
+
+    def __init__(self, shapes):
+        self.shapes = shapes
+
+    def __getitem__(self, idx):
+        return np.full((2,), idx, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def get_sample_shape(self, idx):
+        return self.shapes[idx]
+
+    @staticmethod
+    def train_transforms(**kwargs):
+        return []
+
+
+def test_buckets():
+    buckets = Buckets(BUCKETS)
+    # sorted by volume, the disabled bucket is dropped
+    assert buckets.shapes == [(1, 512, 512), (17, 512, 512), (17, 480, 854), (65, 480, 854)]
+    assert buckets.batch_sizes == [4, 2, 2, 1]
+    assert Buckets(dict(reversed(BUCKETS.items()))).shapes == buckets.shapes
+
+    # the closest aspect ratio, then the largest volume
+    assert buckets.get_bucket_id(frames=120, height=720, width=1280) == 3
+    assert buckets.get_bucket_id(frames=30, height=720, width=1280) == 2
+    assert buckets.get_bucket_id(frames=120, height=1024, width=1024) == 1
+    assert buckets.get_bucket_id(frames=10, height=720, width=1280) == 0
+    # no upsampling: too few frames or pixels
+    assert buckets.get_bucket_id(frames=1, height=256, width=256) is None
+    assert buckets.get_bucket_id(frames=17, height=480, width=480) is None
+    assert buckets.get_bucket_id(frames=17, height=600, width=600) == 1
+
+    with pytest.raises(ValueError):
+        Buckets({(1, 512, 512): 0})
+
+
+@pytest.mark.parametrize("device_num", [1, 2])
+def test_bucket_batch_sampler(device_num):
+    bucket_ids = [0, 1, None, 1, 0, 2, 0, 1, 0, 1, 2, 0, 0, 0, 0, 0, 0, 1]
+    batch_sizes = [3, 2, 1]
+    batches = []
+    for rank_id in range(device_num):
+        sampler = BucketBatchSampler(bucket_ids, batch_sizes, seed=0, device_num=device_num, rank_id=rank_id)
+        batches.append(sampler.get_batches(0))
+        assert list(sampler) == np.concatenate(batches[-1]).tolist()
+
+    for step in zip(*batches):
+        # all the ranks draw the same bucket, with its batch size
+        bucket_id = bucket_ids[step[0][0]]
+        for batch in step:
+            assert len(batch) == batch_sizes[bucket_id]
+            assert all(bucket_ids[idx] == bucket_id for idx in batch)
+    indices = np.concatenate([batch for rank_batches in batches for batch in rank_batches]).tolist()
+    assert len(indices) == len(set(indices))
+    assert 2 not in indices
+
+
+def test_create_dataloader_with_buckets():
+    shapes = [(17, 720, 1280), (1, 512, 512), (65, 720, 1280), (17, 512, 512), (1, 600, 600)] * 4
+    shapes.append((1, 256, 256))  # fits in no bucket
+    dataset = ShapeDataset(shapes)
+    buckets = Buckets(BUCKETS)
+    dataloader = create_dataloader(
+        dataset,
+        buckets=buckets,
+        shuffle=True,
+        seed=0,
+        num_workers_dataset=1,
+        num_workers_batch=1,
+        python_multiprocessing=False,
+    )
+
+    assert dataloader.get_col_names() == ["video", "bucket_id"]
+    seen = []
+    for video, bucket_id in dataloader.create_tuple_iterator(num_epochs=1, output_numpy=True):
+        assert len(set(bucket_id.tolist())) == 1
+        bucket_id = bucket_id[0]
+        assert len(video) == buckets.batch_sizes[bucket_id]
+        for idx in video[:, 0].tolist():
+            assert buckets.get_bucket_id(*shapes[idx]) == bucket_id
+        seen.extend(video[:, 0].tolist())
+    # every bucket holds full batches, only the sample that fits in no bucket is skipped
+    assert sorted(seen) == list(range(len(shapes) - 1))
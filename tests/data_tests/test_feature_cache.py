@@ -0,0 +1,82 @@
+import json
+import os
+import pickle
+
+import numpy as np
+
+from mindone.data import CachedFeatureDataset, FeatureCacheWriter, extract_features
+
+
+def _samples(num_samples=6):
+    rng = np.random.default_rng(0)
+    return [(f"video_{i:04d}", rng.standard_normal((i + 1, 4, 2, 2)).astype(np.float32)) for i in range(num_samples)]
+
+
+def _encode(sample):
+    return {"latent": sample.astype(np.float16), "text_emb": np.full((3, 8), sample.shape[0], dtype=np.float32)}
+
+
+def test_extract_and_read(tmp_path):
+    samples = _samples()
+    num_extracted = extract_features(
+        samples, _encode, str(tmp_path), meta_fn=lambda sample, features: {"frames": sample.shape[0]}
+    )
+    assert num_extracted == len(samples)
+
+    dataset = CachedFeatureDataset(str(tmp_path))
+    assert len(dataset) == len(samples)
+    assert dataset.output_columns == ["latent", "text_emb"]
+    assert dataset.keys == [key for key, _ in samples]
+    for i, (_, sample) in enumerate(samples):
+        latent, text_emb = dataset[i]
+        expected = _encode(sample)
+        np.testing.assert_array_equal(latent, expected["latent"])
+        np.testing.assert_array_equal(text_emb, expected["text_emb"])
+        assert latent.dtype == np.float16
+        assert dataset.meta[i]["frames"] == sample.shape[0]
+        assert dataset.meta[i]["latent"] == {"shape": sample.shape, "dtype": np.dtype(np.float16)}
+
+    # the memory maps are reopened by the workers
+    latent, _ = pickle.loads(pickle.dumps(dataset))[3]
+    np.testing.assert_array_equal(latent, _encode(samples[3][1])["latent"])
+
+
+def test_extract_over_ranks(tmp_path):
+    samples = _samples()
+    for rank_id in range(2):
+        assert extract_features(samples, _encode, str(tmp_path), rank_id=rank_id, device_num=2) == 3
+
+    dataset = CachedFeatureDataset(str(tmp_path), output_columns=["latent"])
+    assert sorted(dataset.keys) == [key for key, _ in samples]
+    for i, key in enumerate(dataset.keys):
+        np.testing.assert_array_equal(dataset[i][0], _encode(dict(samples)[key])["latent"])
+
+
+def test_resume_interrupted_extraction(tmp_path):
+    samples = _samples()
+    with FeatureCacheWriter(str(tmp_path)) as writer:
+        for key, sample in samples[:3]:
+            writer.write(key, _encode(sample))
+
+    # an interruption while writing the fourth sample: its data are written, its index line is cut
+    shard_dir = os.path.join(tmp_path, "rank_00000")
+    with open(os.path.join(shard_dir, "latent.bin"), "ab") as f:
+        f.write(b"\x00" * 64)
+    with open(os.path.join(shard_dir, "index.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps({"key": samples[3][0]})[:10])
+
+    encoded = []
+
+    def encode_fn(sample):
+        encoded.append(sample)
+        return _encode(sample)
+
+    assert extract_features(samples, encode_fn, str(tmp_path)) == 3
+    assert len(encoded) == 3
+
+    dataset = CachedFeatureDataset(str(tmp_path))
+    assert dataset.keys == [key for key, _ in samples]
+    for i, (_, sample) in enumerate(samples):
+        latent, text_emb = dataset[i]
+        np.testing.assert_array_equal(latent, _encode(sample)["latent"])
+        np.testing.assert_array_equal(text_emb, _encode(sample)["text_emb"])
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.data import BaseDataset, BucketBatchSampler, ResumableSampler, create_dataloader
+from mindone.trainers.checkpoint import resume_data_sampler
+
+
+class IndexDataset(BaseDataset):
+    output_columns = ["index"]
+    pad_info = None
+
+    def __init__(self, num_samples):
+        self.num_samples = num_samples
+
+    def __getitem__(self, idx):
+        return np.array(idx, dtype=np.int32)
+
+    def __len__(self):
+        return self.num_samples
+
+    @staticmethod
+    def train_transforms(**kwargs):
+        return []
+
+
+def _indices(sampler, num_epochs):
+    return [[idx for idx in sampler] for _ in range(num_epochs)]
+
+
+@pytest.mark.parametrize("consumed_batches", [0, 3, 7, 12])
+@pytest.mark.parametrize("device_num", [1, 2])
+def test_resume_from_consumed_index(consumed_batches, device_num):
+    for rank_id in range(device_num):
+        sampler = ResumableSampler(23, batch_size=2, device_num=device_num, rank_id=rank_id)
+        epochs = _indices(sampler, num_epochs=3)
+        state = sampler.state_dict(consumed_batches)
+        epoch, batch = divmod(consumed_batches, sampler.num_batches)
+        assert state["epoch"] == epoch and state["consumed_batches"] == batch
+        assert state["consumed_index"] == 2 * batch
+
+        resumed = ResumableSampler(23, batch_size=2, seed=0, device_num=device_num, rank_id=rank_id)
+        resumed.load_state_dict(state)
+        assert resumed.seed == sampler.seed
+        # continues from the next sample of the epoch, then with the next epochs
+        resumed_epochs = _indices(resumed, num_epochs=3 - epoch)
+        assert resumed_epochs[0] == epochs[epoch][state["consumed_index"] :]
+        assert resumed_epochs[1:] == epochs[epoch + 1 :]
+
+
+def test_resume_bucket_batch_sampler():
+    bucket_ids = [0, 1, 1, 0, 2, 0, 1, 0, 1, 2, 0, 0, 0, 0, 1, 2]
+    sampler = BucketBatchSampler(bucket_ids, [3, 2, 1], seed=0)
+    batches = sampler.get_batches(0)
+    state = sampler.state_dict(4)
+    assert state["consumed_index"] == sum(len(batch) for batch in batches[:4])
+
+    resumed = BucketBatchSampler(bucket_ids, [3, 2, 1], seed=0)
+    resumed.load_state_dict(state)
+    assert list(resumed) == np.concatenate(batches[4:]).tolist()
+
+
+def test_resume_from_checkpoint(tmp_path):
+    sampler = ResumableSampler(20, batch_size=3, seed=7)
+    epochs = _indices(sampler, num_epochs=2)
+    # as saved by `EvalSaveCallback(data_sampler=sampler)` after 4 steps
+    ckpt_path = str(tmp_path / "train_resume.ckpt")
+    weight = ms.Parameter(ms.tensor(np.zeros(2, dtype=np.float32)), name="weight")
+    data_state = {f"data_{k}": v for k, v in sampler.state_dict(4).items()}
+    ms.save_checkpoint([weight], ckpt_path, append_dict={"epoch_num": 0, "cur_step": 4, **data_state})
+
+    resumed = ResumableSampler(20, batch_size=3)
+    assert resume_data_sampler(resumed, ckpt_path)
+    dataloader = create_dataloader(
+        IndexDataset(20), batch_size=3, sampler=resumed, num_workers_dataset=1, num_workers_batch=1
+    )
+    iterator = dataloader.create_tuple_iterator(num_epochs=2, output_numpy=True)
+    # the rest of the first epoch, then a full epoch
+    assert [batch[0].tolist() for batch in iterator] == [epochs[0][i : i + 3] for i in range(12, 18, 3)]
+    assert [batch[0].tolist() for batch in iterator] == [epochs[1][i : i + 3] for i in range(0, 18, 3)]
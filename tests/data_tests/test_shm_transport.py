@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from mindone.data import BaseDataset, SharedMemoryTransport, create_dataloader
+from mindone.data.shm_transport import is_descriptor
+
+
+class VideoDataset(BaseDataset):
+    output_columns = ["video", "label"]
+    pad_info = None
+
+    def __init__(self, num_samples):
+        self.num_samples = num_samples
+
+    def __getitem__(self, idx):
+        video = np.random.default_rng(idx).integers(0, 256, (4, 32, 32, 3), dtype=np.uint8)
+        return video, np.array(idx, dtype=np.int32)
+
+    def __len__(self):
+        return self.num_samples
+
+    @staticmethod
+    def train_transforms(**kwargs):
+        return [
+            {
+                "operations": [lambda video: (video.astype(np.float32) / 127.5 - 1.0).transpose(0, 3, 1, 2)],
+                "input_columns": ["video"],
+            },
+            {
+                "operations": [lambda video, label: (video * 0.5, video.mean(axis=(1, 2, 3)), label)],
+                "input_columns": ["video", "label"],
+                "output_columns": ["video", "mean", "label"],
+            },
+        ]
+
+
+def test_write_read_release():
+    with SharedMemoryTransport(num_slots=2, slot_size=4096, min_nbytes=1024, timeout=0.1) as transport:
+        array = np.arange(300, dtype=np.float32).reshape(3, 100)
+        descriptor = transport.write(array)
+        assert is_descriptor(descriptor)
+        view = transport.read(descriptor)
+        np.testing.assert_array_equal(view, array)
+        assert not view.flags.writeable
+
+        # small arrays are passed through as usual
+        small = np.ones(4, dtype=np.float32)
+        assert transport._encode(small) is small
+
+        transport.write(array)
+        with pytest.raises(RuntimeError):
+            transport.write(array)  # the ring is full
+        transport.release(descriptor)
+        np.testing.assert_array_equal(transport.read(transport.write(array * 2)), array * 2)
+
+
+@pytest.mark.parametrize("python_multiprocessing", [False, True])
+def test_same_batches_as_pickled_path(python_multiprocessing):
+    dataset = VideoDataset(10)
+    kwargs = dict(
+        batch_size=4,
+        transforms=dataset.train_transforms(),
+        project_columns=["video", "mean", "label"],
+        drop_remainder=False,
+        num_workers=1,
+        num_workers_dataset=1,
+        num_workers_batch=1,
+        python_multiprocessing=python_multiprocessing,
+    )
+    expected = list(create_dataloader(dataset, **kwargs).create_tuple_iterator(num_epochs=1, output_numpy=True))
+
+    with SharedMemoryTransport(num_slots=32, slot_size=2**20, min_nbytes=1024) as transport:
+        dataloader = create_dataloader(dataset, transport=transport, **kwargs)
+        batches = transport.iterate(dataloader.create_tuple_iterator(num_epochs=1, output_numpy=True))
+        num_batches = 0
+        for batch, expected_batch in zip(batches, expected):
+            # the videos are collated in shared memory, the small columns are batched as usual
+            assert not isinstance(batch[0], np.ndarray) or not batch[0].flags.writeable
+            for output, expected_output in zip(batch, expected_batch):
+                np.testing.assert_array_equal(output, expected_output)
+                assert np.asarray(output).dtype == expected_output.dtype
+            num_batches += 1
+        assert num_batches == len(expected) == 3
+        # every slot is released once the iteration ends
+        assert (transport._states == 0).all()
@@ -0,0 +1,121 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from mindone.data import VideoReader
+from mindone.data.video_reader import VideoMetadata, VideoMetadataCache
+
+NUM_FRAMES, WIDTH, HEIGHT = 48, 64, 48
+
+
+def _write_video(path, num_frames=NUM_FRAMES):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 24, (WIDTH, HEIGHT))
+    for i in range(num_frames):
+        # a moving bar, so that every frame is different
+        frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+        frame[:, i % WIDTH] = (255, 128, 0)
+        frame[:8, :] = 4 * i
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+def _read_sequentially(path, backend):
+    if backend == "pyav":
+        import av
+
+        with av.open(path) as container:
+            return np.stack([frame.to_ndarray(format="rgb24") for frame in container.decode(video=0)])
+
+    cap = cv2.VideoCapture(path, apiPreference=cv2.CAP_FFMPEG)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return np.stack(frames)
+
+
+@pytest.fixture
+def video_path(tmp_path):
+    return _write_video(tmp_path / "video.mp4")
+
+
+@pytest.fixture(params=["opencv", "pyav"])
+def backend(request):
+    if request.param == "pyav":
+        pytest.importorskip("av")
+    return request.param
+
+
+@pytest.mark.parametrize("keyframe_interval", [None, 4])
+def test_get_batch_sparse(video_path, backend, keyframe_interval):
+    expected = _read_sequentially(video_path, backend)
+    # unordered and repeated indices, with gaps larger than the keyframe interval to seek backward and forward
+    indices = [0, 3, 40, 41, 17, 47, 3, 30]
+    with VideoReader(video_path, backend=backend, keyframe_interval=keyframe_interval) as reader:
+        assert len(reader) == NUM_FRAMES
+        assert reader.shape == (WIDTH, HEIGHT)
+        frames = reader.get_batch(indices)
+
+    assert frames.shape == (len(indices), HEIGHT, WIDTH, 3)
+    np.testing.assert_array_equal(frames, expected[indices])
+
+
+@pytest.mark.parametrize("step", [1, 2, 7])
+def test_fetch_frames_dense(video_path, backend, step):
+    expected = _read_sequentially(video_path, backend)
+    with VideoReader(video_path, backend=backend, keyframe_interval=4) as reader:
+        frames = reader.fetch_frames(num=6, start_pos=5, step=step)
+        np.testing.assert_array_equal(frames, expected[5 : 5 + 6 * step : step])
+        # the start position is moved back to fit the clip in the video
+        frames = reader.fetch_frames(num=6, start_pos=NUM_FRAMES, step=step)
+        np.testing.assert_array_equal(frames, expected[NUM_FRAMES - 5 * step - 1 :: step])
+
+
+def test_get_batch_out_of_range(video_path):
+    with VideoReader(video_path) as reader:
+        with pytest.raises(ValueError):
+            reader.get_batch([0, NUM_FRAMES])
+        with pytest.raises(ValueError):
+            reader.fetch_frames(num=NUM_FRAMES + 1)
+
+
+def test_metadata_cache_invalidated_on_mtime_change(video_path):
+    cache = VideoMetadataCache()
+    metadata = VideoMetadata(num_frames=NUM_FRAMES, fps=24.0, shape=(WIDTH, HEIGHT))
+    cache.put(video_path, "opencv", metadata)
+    assert cache.get(video_path, "opencv") is metadata
+    assert cache.get(video_path, "pyav") is None
+
+    stat = os.stat(video_path)
+    os.utime(video_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(video_path, "opencv") is None
+
+
+def test_metadata_cache_max_size(tmp_path):
+    cache = VideoMetadataCache(max_size=2)
+    paths = [_write_video(tmp_path / f"video_{i}.mp4", num_frames=2) for i in range(3)]
+    for path in paths:
+        cache.put(path, "opencv", VideoMetadata(num_frames=2, fps=24.0, shape=(WIDTH, HEIGHT)))
+    assert len(cache) == 2
+    assert cache.get(paths[0], "opencv") is None
+
+
+def test_reader_reprobes_modified_video(video_path):
+    with VideoReader(video_path) as reader:
+        assert len(reader) == NUM_FRAMES
+
+    stat = os.stat(video_path)
+    _write_video(video_path, num_frames=NUM_FRAMES // 2)
+    # the rewritten file could keep the same modification time on coarse file systems
+    os.utime(video_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    with VideoReader(video_path) as reader:
+        assert len(reader) == NUM_FRAMES // 2
+        np.testing.assert_array_equal(
+            reader.get_batch([NUM_FRAMES // 2 - 1]), _read_sequentially(video_path, "opencv")[-1:]
+        )
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+from mindspore import nn, ops
+
+from mindone.diffusers.hooks import apply_layerwise_casting
+from mindone.diffusers.hooks.layerwise_casting import _LAYERWISE_CASTING_HOOK
+from mindone.diffusers.models.modeling_utils import ModelMixin
+
+
+class DummyBlock(nn.Cell):
+    def __init__(self, hidden_size):
+        super().__init__()
+        self.norm = nn.LayerNorm((hidden_size,))
+        self.proj = nn.Dense(hidden_size, hidden_size)
+
+    def construct(self, x):
+        return x + self.proj(ops.gelu(self.norm(x)))
+
+
+class DummyModel(ModelMixin):
+    _skip_layerwise_casting_patterns = ["patch_embed"]
+
+    def __init__(self, hidden_size=16, num_layers=3):
+        super().__init__()
+        self.patch_embed = nn.Conv2d(3, hidden_size, 2, stride=2, has_bias=True)
+        self.blocks = nn.CellList([DummyBlock(hidden_size) for _ in range(num_layers)])
+        self.proj_out = nn.Dense(hidden_size, 3)
+
+    def construct(self, x):
+        x = self.patch_embed(x).flatten(start_dim=2).swapaxes(1, 2)
+        for block in self.blocks:
+            x = block(x)
+        return self.proj_out(x)
+
+
+@pytest.mark.parametrize("storage_dtype", [ms.float16, ms.bfloat16])
+def test_enable_layerwise_casting(storage_dtype):
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    ms.set_seed(0)
+
+    model = DummyModel()
+    x = ms.tensor(np.random.randn(2, 3, 8, 8).astype(np.float32))
+    expected = model(x).asnumpy()
+
+    model.enable_layerwise_casting(storage_dtype=storage_dtype, compute_dtype=ms.float32)
+
+    for block in model.blocks:
+        assert block.proj.weight.dtype == storage_dtype
+        # "norm" is skipped by default
+        assert block.norm.gamma.dtype == ms.float32
+    # skipped by the model-level `_skip_layerwise_casting_patterns`
+    assert model.patch_embed.weight.dtype == ms.float32
+    # skipped by the default `^proj_out$` pattern
+    assert model.proj_out.weight.dtype == ms.float32
+
+    output = model(x).asnumpy()
+    assert np.allclose(output, expected, atol=5e-2)
+    # weights are cast back to the storage dtype once the layer has run
+    assert all(block.proj.weight.dtype == storage_dtype for block in model.blocks)
+
+
+@pytest.mark.parametrize("storage_dtype", [ms.float16, ms.bfloat16])
+def test_layerwise_casting_keeps_weights(storage_dtype):
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    ms.set_seed(0)
+
+    model = DummyModel()
+    expected = [block.proj.weight.astype(storage_dtype).float().asnumpy() for block in model.blocks]
+
+    model.enable_layerwise_casting(storage_dtype=storage_dtype, compute_dtype=ms.float32)
+    model(ms.tensor(np.random.randn(2, 3, 8, 8).astype(np.float32)))
+
+    for block, weight in zip(model.blocks, expected):
+        assert block.proj.weight.dtype == storage_dtype
+        np.testing.assert_array_equal(block.proj.weight.float().asnumpy(), weight)
+
+
+def test_apply_layerwise_casting_without_skip_patterns():
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    model = DummyModel()
+    apply_layerwise_casting(model, ms.bfloat16, ms.float32, skip_modules_pattern=(), skip_modules_classes=())
+
+    assert model.proj_out.weight.dtype == ms.bfloat16
+    assert model.patch_embed.weight.dtype == ms.bfloat16
+    # only linear and convolution layers are cast
+    assert model.blocks[0].norm.gamma.dtype == ms.float32
+
+    model.proj_out._diffusers_hook.remove_hook(_LAYERWISE_CASTING_HOOK)
+    assert model.proj_out.weight.dtype == ms.float32
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.diffusers import AutoencoderKL
+from mindone.diffusers.models.autoencoders.vae import blend_tiles
+
+
+def reference_blend(a, b, blend_extent, axis):
+    b = b.copy()
+    blend_extent = min(a.shape[axis], b.shape[axis], blend_extent)
+    for y in range(blend_extent):
+        b_y = np.take(b, y, axis=axis)
+        a_y = np.take(a, a.shape[axis] - blend_extent + y, axis=axis)
+        index = [slice(None)] * b.ndim
+        index[axis] = y
+        b[tuple(index)] = a_y * (1 - y / blend_extent) + b_y * (y / blend_extent)
+    return b
+
+
+@pytest.mark.parametrize("shape,axis", [((1, 3, 16, 12), 2), ((1, 3, 16, 12), 3), ((2, 3, 5, 8, 6), 2)])
+def test_blend_tiles(shape, axis):
+    a = np.random.randn(*shape).astype(np.float32)
+    b = np.random.randn(*shape).astype(np.float32)
+
+    output = blend_tiles(ms.tensor(a), ms.tensor(b), 4, axis=axis).asnumpy()
+    assert np.allclose(output, reference_blend(a, b, 4, axis), atol=1e-6)
+
+
+def get_autoencoder_kl():
+    ms.set_seed(0)
+    vae = AutoencoderKL(
+        block_out_channels=(32, 64),
+        in_channels=3,
+        out_channels=3,
+        down_block_types=("DownEncoderBlock2D", "DownEncoderBlock2D"),
+        up_block_types=("UpDecoderBlock2D", "UpDecoderBlock2D"),
+        latent_channels=4,
+        norm_num_groups=32,
+        sample_size=32,
+    )
+    vae.enable_tiling()
+    return vae
+
+
+@pytest.mark.parametrize("max_tiles_per_batch", [None, 2])
+def test_batched_tiled_decode(max_tiles_per_batch):
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    vae = get_autoencoder_kl()
+    # 4x4 tiles of 16x16 latents with a stride of 12, the tiles of the last row and column are smaller
+    z = ms.tensor(np.random.randn(2, 4, 40, 40).astype(np.float32))
+    expected = vae.decode(z)[0].asnumpy()
+
+    vae.enable_tile_batching(memory_budget=2**40, max_tiles_per_batch=max_tiles_per_batch)
+    output = vae.decode(z)[0].asnumpy()
+    assert output.shape == expected.shape
+    assert np.allclose(output, expected, atol=1e-4)
+    # one entry per tile shape
+    assert len(vae._tiles_per_batch) == 4
+    if max_tiles_per_batch is not None:
+        assert all(tiles_per_batch == max_tiles_per_batch for tiles_per_batch in vae._tiles_per_batch.values())
+
+    vae.disable_tile_batching()
+    assert np.allclose(vae.decode(z)[0].asnumpy(), expected, atol=1e-6)
+
+
+def test_invalid_tile_batching_arguments():
+    vae = get_autoencoder_kl()
+    with pytest.raises(ValueError):
+        vae.enable_tile_batching(memory_budget=0)
+    with pytest.raises(ValueError):
+        vae.enable_tile_batching(memory_budget=2**30, max_tiles_per_batch=0)
@@ -22,6 +22,7 @@ from transformers import CLIPTextConfig
 
 import mindspore as ms
 
+from mindone.diffusers import ClassifierFreeGuidance
 from mindone.diffusers.utils.testing_utils import load_downloaded_numpy_from_hf_hub, slow
 
 from ..pipeline_test_utils import (
@@ -218,6 +219,31 @@ class StableDiffusionXLPipelineFastTests(PipelineTesterMixin, unittest.TestCase)
         threshold = THRESHOLD_FP32 if dtype == "float32" else THRESHOLD_FP16
         assert np.linalg.norm(pt_image_slice - ms_image_slice) / np.linalg.norm(pt_image_slice) < threshold
 
+    def test_adaptive_guidance_rescale(self):
+        ms.set_context(mode=ms.PYNATIVE_MODE)
+
+        _, ms_components = self.get_dummy_components()
+        ms_pipe = get_module("mindone.diffusers.pipelines.stable_diffusion_xl.StableDiffusionXLPipeline")(
+            **ms_components
+        )
+        ms_pipe.set_progress_bar_config(disable=None)
+        ms_pipe.scheduler.set_timesteps(self.get_dummy_inputs()["num_inference_steps"])
+        first_timestep = float(ms_pipe.scheduler.timesteps[0])
+
+        def run(guidance, guidance_rescale):
+            ms_pipe.set_guidance(guidance)
+            inputs = self.get_dummy_inputs()
+            return ms_pipe(**inputs, guidance_rescale=guidance_rescale, generator=np.random.default_rng(0))[0]
+
+        # any similarity exceeds -1: the guidance is truncated by the first step, which is still guided and rescaled,
+        # as with an interval holding only the first step
+        image = run(ClassifierFreeGuidance(adaptive_guidance_threshold=-1.0), 0.7)
+        expected_image = run(ClassifierFreeGuidance(guidance_interval=(first_timestep, first_timestep)), 0.7)
+        not_rescaled_image = run(ClassifierFreeGuidance(adaptive_guidance_threshold=-1.0), 0.0)
+
+        assert np.allclose(image, expected_image, atol=1e-6)
+        assert not np.allclose(image, not_rescaled_image, atol=1e-6)
+
 
 @slow
 @ddt
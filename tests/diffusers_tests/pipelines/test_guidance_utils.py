@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.diffusers.pipelines.guidance_utils import ClassifierFreeGuidance
+
+TIMESTEPS = [999, 800, 600, 400, 200, 0]
+
+
+def denoise(guidance, guidance_scale=5.0, enabled=True):
+    """Runs a fake denoising loop whose prediction depends on the latents and the conditioning of each sample."""
+    guidance.prepare(ms.tensor(TIMESTEPS, dtype=ms.float32))
+    latents = ms.tensor(np.ones((2, 4), dtype=np.float32))
+    prompt_embeds = ms.tensor(np.array([[0.0], [0.0], [1.0], [2.0]], dtype=np.float32))
+    batch_sizes = []
+    for i, t in enumerate(TIMESTEPS):
+        guidance.run_uncond(i, enabled)
+        latent_model_input = guidance.expand(latents)
+        embeds = guidance.select(prompt_embeds) if enabled else prompt_embeds[2:]
+        batch_sizes.append(latent_model_input.shape[0])
+        noise_pred = latent_model_input * 0.1 + embeds + t / 1000
+        noise_pred, _ = guidance.guide(i, noise_pred, guidance_scale)
+        latents = latents - noise_pred
+    return latents.asnumpy(), batch_sizes
+
+
+def reference_denoise(guided_steps, guidance_scale=5.0):
+    latents = np.ones((2, 4), dtype=np.float32)
+    for i, t in enumerate(TIMESTEPS):
+        cond = latents * 0.1 + np.array([[1.0], [2.0]], dtype=np.float32) + t / 1000
+        if i in guided_steps:
+            uncond = latents * 0.1 + t / 1000
+            cond = uncond + guidance_scale * (cond - uncond)
+        latents = latents - cond
+    return latents
+
+
+def test_default_is_plain_cfg():
+    guidance = ClassifierFreeGuidance()
+    assert guidance.is_default
+
+    latents, batch_sizes = denoise(guidance)
+    assert batch_sizes == [4] * len(TIMESTEPS)
+    assert np.allclose(latents, reference_denoise(range(len(TIMESTEPS))), atol=1e-5)
+
+
+def test_disabled():
+    latents, batch_sizes = denoise(ClassifierFreeGuidance(), enabled=False)
+    assert batch_sizes == [2] * len(TIMESTEPS)
+    assert np.allclose(latents, reference_denoise(()), atol=1e-5)
+
+
+def test_guidance_interval():
+    guidance = ClassifierFreeGuidance(guidance_interval=(200, 800))
+    latents, batch_sizes = denoise(guidance)
+
+    assert batch_sizes == [2, 4, 4, 4, 4, 2]
+    assert guidance.num_uncond_evaluations == 4
+    assert guidance.num_cond_evaluations == len(TIMESTEPS)
+    assert np.allclose(latents, reference_denoise((1, 2, 3, 4)), atol=1e-5)
+
+
+def test_uncond_reuse():
+    guidance = ClassifierFreeGuidance(uncond_reuse_interval=2)
+    _, batch_sizes = denoise(guidance)
+
+    assert batch_sizes == [4, 2, 4, 2, 4, 2]
+    assert guidance.num_uncond_evaluations == 3
+
+
+def test_adaptive_guidance_truncation():
+    guidance = ClassifierFreeGuidance(adaptive_guidance_threshold=-1.0)
+    _, batch_sizes = denoise(guidance)
+
+    # any similarity exceeds -1, guidance is truncated after the first step
+    assert batch_sizes == [4] + [2] * (len(TIMESTEPS) - 1)
+
+
+def test_adaptive_guidance_similarity():
+    guidance = ClassifierFreeGuidance(adaptive_guidance_threshold=0.9)
+    guidance.prepare(ms.tensor(TIMESTEPS, dtype=ms.float32))
+    uncond = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+    # the similarity of the batch is the one of its least similar sample: 0.707, then 0.995 for both samples
+    for i, cond in enumerate([[[1.0, 1.0], [0.0, 1.0]], [[1.0, 0.1], [0.1, 1.0]]]):
+        assert guidance.run_uncond(i)
+        noise_pred = ms.tensor(np.concatenate([uncond, np.array(cond, dtype=np.float32)]))
+        guidance.guide(i, noise_pred, 5.0)
+        assert guidance.is_guided(i + 1) == (i == 0)
+    assert not guidance.run_uncond(2)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ClassifierFreeGuidance(guidance_interval=(800, 200))
+    with pytest.raises(ValueError):
+        ClassifierFreeGuidance(uncond_reuse_interval=0)
+    with pytest.raises(ValueError):
+        ClassifierFreeGuidance(adaptive_guidance_threshold=2.0)
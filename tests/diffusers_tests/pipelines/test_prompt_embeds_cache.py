@@ -0,0 +1,97 @@
+import numpy as np
+
+import mindspore as ms
+from mindspore import ops
+
+from mindone.diffusers.pipelines.prompt_embeds_cache import PromptEmbedsCache, cache_prompt_embeds
+
+
+class DummyEncoder:
+    def __init__(self):
+        self.num_calls = 0
+        self.num_encoded_prompts = 0
+
+    def __call__(self, prompts, max_sequence_length):
+        self.num_calls += 1
+        self.num_encoded_prompts += len(prompts)
+        embeds = [np.full((max_sequence_length, 4), len(prompt), dtype=np.float32) for prompt in prompts]
+        return ms.tensor(np.stack(embeds))
+
+
+class DummyPipeline:
+    _prompt_embeds_cache = None
+
+    def __init__(self):
+        self.text_encoder = DummyEncoder()
+
+    @property
+    def components(self):
+        return {"text_encoder": self.text_encoder}
+
+    @cache_prompt_embeds("text_encoder")
+    def _get_t5_prompt_embeds(self, prompt=None, num_images_per_prompt=1, max_sequence_length=8):
+        prompt = [prompt] if isinstance(prompt, str) else prompt
+        prompt_embeds = self.text_encoder(prompt, max_sequence_length)
+        _, seq_len, _ = prompt_embeds.shape
+        prompt_embeds = prompt_embeds.tile((1, num_images_per_prompt, 1))
+        mask = ops.ones((len(prompt), seq_len), ms.int32).tile((1, num_images_per_prompt))
+        return (
+            prompt_embeds.view(len(prompt) * num_images_per_prompt, seq_len, -1),
+            mask.view(len(prompt) * num_images_per_prompt, seq_len),
+        )
+
+
+def test_cached_outputs_match_uncached():
+    prompts = ["a cat", "", "a dog on the beach", ""]
+
+    pipe = DummyPipeline()
+    expected = pipe._get_t5_prompt_embeds(prompts, num_images_per_prompt=3)
+
+    pipe._prompt_embeds_cache = PromptEmbedsCache()
+    for _ in range(2):
+        outputs = pipe._get_t5_prompt_embeds(prompts, num_images_per_prompt=3)
+        for output, expected_output in zip(outputs, expected):
+            assert output.shape == expected_output.shape
+            assert np.array_equal(output.asnumpy(), expected_output.asnumpy())
+
+
+def test_only_missing_prompts_are_encoded():
+    pipe = DummyPipeline()
+    pipe._prompt_embeds_cache = PromptEmbedsCache()
+
+    pipe._get_t5_prompt_embeds(["a cat", ""])
+    assert pipe.text_encoder.num_encoded_prompts == 2
+
+    pipe._get_t5_prompt_embeds(["", "a cat", "a dog"])
+    assert pipe.text_encoder.num_calls == 2
+    assert pipe.text_encoder.num_encoded_prompts == 3
+
+    # a different max_sequence_length is a different entry
+    pipe._get_t5_prompt_embeds(["a cat"], max_sequence_length=16)
+    assert pipe.text_encoder.num_encoded_prompts == 4
+
+
+def test_lru_eviction():
+    cache = PromptEmbedsCache(max_size=2)
+    pipe = DummyPipeline()
+    pipe._prompt_embeds_cache = cache
+
+    pipe._get_t5_prompt_embeds(["a", "b", "c"])
+    assert len(cache) == 2
+    pipe._get_t5_prompt_embeds(["a"])
+    assert pipe.text_encoder.num_encoded_prompts == 4
+
+
+def test_disk_tier(tmp_path):
+    encoder_key = ("T5EncoderModel", "google/t5-v1_1-xxl", "Float32")
+    compute_fn = DummyEncoder()
+
+    cache = PromptEmbedsCache(cache_dir=tmp_path)
+    expected = cache.get_or_compute(encoder_key, ["a cat"], lambda prompts: compute_fn(prompts, 8))
+
+    # a new cache, e.g. in another process, reads the entries back from disk
+    cache = PromptEmbedsCache(cache_dir=tmp_path)
+    output = cache.get_or_compute(encoder_key, ["a cat"], lambda prompts: compute_fn(prompts, 8))
+    assert compute_fn.num_calls == 1
+    assert cache.hits == 1
+    assert np.array_equal(output.asnumpy(), expected.asnumpy())
@@ -11,6 +11,7 @@ import mindspore as ms
 import mindspore.nn as nn
 import mindspore.ops as ops
 
+from mindone.diffusers.schedulers import DPMSolverMultistepScheduler
 from mindone.diffusers.schedulers.scheduling_utils import KarrasDiffusionSchedulers, SchedulerMixin
 from mindone.utils import _brownian
 from mindone.utils._brownian import BrownianInterval
@@ -217,3 +218,83 @@ def test_schedulers(scheduler_name, dtype):
             np.max(np.abs(output_ms.asnumpy() - output_pt.numpy())) / np.mean(np.abs(output_pt.numpy())) < STEP_THR_FP32
         )
     assert output_ms.dtype == ms_dtype and output_pt.dtype == pt_dtype
+
+
+@pytest.mark.parametrize(
+    "scheduler_name,scheduler_kwargs",
+    [
+        ("EulerDiscreteScheduler", {}),
+        ("EulerDiscreteScheduler", {"use_karras_sigmas": True}),
+        ("DPMSolverMultistepScheduler", {"solver_order": 2}),
+        ("DPMSolverMultistepScheduler", {"solver_order": 3, "use_karras_sigmas": True}),
+        ("DPMSolverMultistepScheduler", {"algorithm_type": "sde-dpmsolver++", "final_sigmas_type": "sigma_min"}),
+        ("FlowMatchEulerDiscreteScheduler", {"shift": 3.0}),
+    ],
+)
+def test_schedulers_full_loop(scheduler_name, scheduler_kwargs):
+    # every step reads its coefficients from the host tables built by `set_timesteps`, check the whole trajectory
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    np.random.seed(0)
+    noise = np.random.randn(2, 4, 8, 8).astype(np.float32)
+    num_inference_steps = 8
+
+    scheduler_ms = getattr(importlib.import_module("mindone.diffusers.schedulers"), scheduler_name)(**scheduler_kwargs)
+    scheduler_pt = getattr(importlib.import_module("diffusers.schedulers"), scheduler_name)(**scheduler_kwargs)
+    scheduler_ms.set_timesteps(num_inference_steps)
+    scheduler_pt.set_timesteps(num_inference_steps)
+    assert np.allclose(scheduler_ms.timesteps.asnumpy(), scheduler_pt.timesteps.numpy(), atol=1e-3)
+    assert np.allclose(scheduler_ms.sigmas.asnumpy(), scheduler_pt.sigmas.numpy(), rtol=1e-5)
+
+    sample_ms, sample_pt = ms.tensor(noise), torch.tensor(noise)
+    for i, (t_ms, t_pt) in enumerate(zip(scheduler_ms.timesteps, scheduler_pt.timesteps)):
+        model_output = np.sin(noise + i).astype(np.float32)
+        kwargs_ms, kwargs_pt = {}, {}
+        if scheduler_kwargs.get("algorithm_type", "").startswith("sde"):
+            variance_noise = np.cos(noise - i).astype(np.float32)
+            kwargs_ms["variance_noise"] = ms.tensor(variance_noise)
+            kwargs_pt["variance_noise"] = torch.tensor(variance_noise)
+        if hasattr(scheduler_ms, "scale_model_input"):
+            scheduler_ms.scale_model_input(sample_ms, t_ms)
+            scheduler_pt.scale_model_input(sample_pt, t_pt)
+        sample_ms = scheduler_ms.step(ms.tensor(model_output), t_ms, sample_ms, **kwargs_ms)[0]
+        sample_pt = scheduler_pt.step(torch.tensor(model_output), t_pt, sample_pt, return_dict=False, **kwargs_pt)[0]
+
+    output_ms, output_pt = sample_ms.asnumpy(), sample_pt.numpy()
+    assert np.max(np.abs(output_ms - output_pt)) / np.mean(np.abs(output_pt)) < STEP_THR_FP32
+
+
+@pytest.mark.parametrize(
+    "scheduler_kwargs",
+    [
+        {"solver_order": 2},
+        {"solver_order": 3, "use_karras_sigmas": True},
+        {"algorithm_type": "sde-dpmsolver++", "final_sigmas_type": "sigma_min"},
+        {"prediction_type": "v_prediction"},
+    ],
+)
+def test_dpmsolver_fp16_parity(scheduler_kwargs):
+    # the step coefficients are Python floats, the half precision steps should still be computed in float32
+    ms.set_context(mode=ms.PYNATIVE_MODE)
+    np.random.seed(0)
+    scheduler_fp16 = DPMSolverMultistepScheduler(**scheduler_kwargs)
+    scheduler_fp32 = DPMSolverMultistepScheduler(**scheduler_kwargs)
+    scheduler_fp16.set_timesteps(8)
+    scheduler_fp32.set_timesteps(8)
+
+    sample = np.random.randn(2, 4, 8, 8).astype(np.float16)
+    for i, t in enumerate(scheduler_fp16.timesteps):
+        model_output = np.sin(sample.astype(np.float32) + i).astype(np.float16)
+        variance_noise = np.cos(sample.astype(np.float32) - i).astype(np.float16)
+        kwargs_fp16, kwargs_fp32 = {}, {}
+        if scheduler_kwargs.get("algorithm_type", "").startswith("sde"):
+            kwargs_fp16["variance_noise"] = ms.tensor(variance_noise)
+            kwargs_fp32["variance_noise"] = ms.tensor(variance_noise, ms.float32)
+        output_fp16 = scheduler_fp16.step(ms.tensor(model_output), t, ms.tensor(sample), **kwargs_fp16)[0]
+        output_fp32 = scheduler_fp32.step(
+            ms.tensor(model_output, ms.float32), t, ms.tensor(sample, ms.float32), **kwargs_fp32
+        )[0].asnumpy()
+        assert output_fp16.dtype == ms.float16
+        output_fp16 = output_fp16.asnumpy().astype(np.float32)
+        # both schedulers start every step from the same sample, so that the rounding errors do not accumulate
+        assert np.max(np.abs(output_fp16 - output_fp32)) / np.mean(np.abs(output_fp32)) < STEP_THR_FP16
+        sample = output_fp32.astype(np.float16)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import mindspore as ms
+
+from mindone.diffusers.utils import export_to_video_stream
+from mindone.diffusers.video_processor import VideoProcessor
+
+
+def test_postprocess_video_stream():
+    video_processor = VideoProcessor()
+    video = ms.tensor(np.random.uniform(-1.2, 1.2, size=(1, 3, 6, 8, 10)).astype(np.float32))
+    expected = (video_processor.postprocess_video(video, output_type="np") * 255).astype(np.uint8)
+
+    chunks = list(video_processor.postprocess_video_stream([video[:, :, :2], video[:, :, 2:]]))
+    assert [chunk.shape for chunk in chunks] == [(1, 2, 8, 10, 3), (1, 4, 8, 10, 3)]
+    assert all(chunk.dtype == np.uint8 for chunk in chunks)
+    assert np.array_equal(np.concatenate(chunks, axis=1), expected)
+
+
+def test_export_to_video_stream(tmp_path):
+    imageio = pytest.importorskip("imageio")
+    pytest.importorskip("imageio_ffmpeg")
+
+    def chunks():
+        for _ in range(4):
+            yield np.random.uniform(size=(1, 5, 64, 64, 3)).astype(np.float32)
+
+    output_video_path = export_to_video_stream(chunks(), str(tmp_path / "video.mp4"), fps=8)
+    with imageio.get_reader(output_video_path) as reader:
+        assert sum(1 for _ in reader) == 20
+
+
+def test_export_to_video_stream_rejects_batches(tmp_path):
+    pytest.importorskip("imageio_ffmpeg")
+    with pytest.raises(ValueError):
+        export_to_video_stream([np.zeros((2, 5, 64, 64, 3), dtype=np.uint8)], str(tmp_path / "video.mp4"))
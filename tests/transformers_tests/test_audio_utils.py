@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+from mindone.transformers.audio_utils import fram_wave, spectrogram, spectrogram_batch, window_function
+
+
+def reference_stft(waveform, window, frame_length, hop_length, fft_length, preemphasis=None, remove_dc_offset=None):
+    """The frame-by-frame STFT of `spectrogram`, without centering."""
+    waveform = waveform.astype(np.float64)
+    num_frames = int(1 + np.floor((waveform.size - frame_length) / hop_length))
+    frames = []
+    for frame_idx in range(num_frames):
+        buffer = np.zeros(fft_length)
+        buffer[:frame_length] = waveform[frame_idx * hop_length : frame_idx * hop_length + frame_length]
+        if remove_dc_offset:
+            buffer[:frame_length] = buffer[:frame_length] - buffer[:frame_length].mean()
+        if preemphasis is not None:
+            buffer[1:frame_length] -= preemphasis * buffer[: frame_length - 1]
+            buffer[0] *= 1 - preemphasis
+        buffer[:frame_length] *= window
+        frames.append(np.fft.rfft(buffer))
+    return np.abs(np.array(frames, dtype=np.complex64), dtype=np.float64).T
+
+
+class SpectrogramTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.waveforms = [rng.standard_normal(length).astype(np.float32) for length in (16000, 9999, 4321)]
+        self.window = window_function(400, "hann")
+
+    @parameterized.expand([(None, None), (0.97, True)])
+    def test_matches_frame_by_frame(self, preemphasis, remove_dc_offset):
+        kwargs = {"preemphasis": preemphasis, "remove_dc_offset": remove_dc_offset}
+        expected = reference_stft(self.waveforms[0], self.window, 400, 160, 512, **kwargs)
+        actual = spectrogram(self.waveforms[0], self.window, 400, 160, fft_length=512, center=False, **kwargs)
+        np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
+
+    def test_float32_compute(self):
+        expected = spectrogram(self.waveforms[0], self.window, 400, 160, power=2.0)
+        actual = spectrogram(self.waveforms[0], self.window, 400, 160, power=2.0, compute_dtype=np.float32)
+        np.testing.assert_allclose(actual, expected, rtol=1e-3, atol=1e-3)
+
+    @parameterized.expand([(None,), (4,)])
+    def test_batch_matches_single(self, num_workers):
+        batch = spectrogram_batch(self.waveforms, self.window, 400, 160, num_workers=num_workers)
+        for waveform, actual in zip(self.waveforms, batch):
+            np.testing.assert_allclose(actual, spectrogram(waveform, self.window, 400, 160), rtol=1e-6, atol=1e-6)
+
+
+class FramWaveTest(unittest.TestCase):
+    @staticmethod
+    def reference_fram_wave(waveform, hop_length, fft_window_size, center):
+        frames = []
+        for i in range(0, waveform.shape[0] + 1, hop_length):
+            if center:
+                half_window = (fft_window_size - 1) // 2 + 1
+                start = i - half_window if i > half_window else 0
+                end = i + half_window if i < waveform.shape[0] - half_window else waveform.shape[0]
+                frame = waveform[start:end]
+                if start == 0:
+                    frame = np.pad(frame, pad_width=(-i + half_window, 0), mode="reflect")
+                elif end == waveform.shape[0]:
+                    frame = np.pad(frame, pad_width=(0, (i - waveform.shape[0] + half_window)), mode="reflect")
+            else:
+                frame = waveform[i : i + fft_window_size]
+                if frame.shape[0] < waveform.shape[0]:
+                    frame = np.pad(frame, pad_width=(0, fft_window_size - frame.shape[0]))
+            frames.append(frame)
+        return np.stack(frames, 0)
+
+    @parameterized.expand([(1600, True), (1601, True), (1600, False), (1601, False)])
+    def test_matches_reference(self, length, center):
+        waveform = np.random.default_rng(0).standard_normal(length)
+        with self.assertWarns(FutureWarning):
+            actual = fram_wave(waveform, 160, 400, center=center)
+        np.testing.assert_array_equal(actual, self.reference_fram_wave(waveform, 160, 400, center))
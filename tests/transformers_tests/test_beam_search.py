@@ -0,0 +1,98 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+import mindspore as ms
+
+from mindone.transformers.generation.beam_search import BeamSearchScorer, TensorizedBeamSearchScorer
+
+BATCH_SIZE = 3
+EOS_TOKEN_ID = 0
+PAD_TOKEN_ID = 1
+MAX_LENGTH = 12
+
+
+def run_beam_search(scorer_cls, num_beams, num_beam_groups, length_penalty, early_stopping, num_beam_hyps_to_keep):
+    """Runs beam search on random candidates, and returns the outputs of every call to the scorer."""
+    rng = np.random.default_rng(0)
+    scorer = scorer_cls(
+        batch_size=BATCH_SIZE,
+        num_beams=num_beams,
+        length_penalty=length_penalty,
+        do_early_stopping=early_stopping,
+        num_beam_hyps_to_keep=num_beam_hyps_to_keep,
+        num_beam_groups=num_beam_groups,
+        max_length=MAX_LENGTH,
+    )
+    group_size = num_beams // num_beam_groups
+    input_ids = [rng.integers(2, 6, (BATCH_SIZE * group_size, 2)) for _ in range(num_beam_groups)]
+    beam_scores = [np.zeros(BATCH_SIZE * group_size, dtype=np.float32) for _ in range(num_beam_groups)]
+    beam_indices = tuple(() for _ in range(BATCH_SIZE * num_beams)) if num_beam_groups == 1 else None
+    outputs = []
+    while input_ids[0].shape[-1] < MAX_LENGTH and not scorer.is_done:
+        for group_index in range(num_beam_groups):
+            # candidates sorted by score, where only the top `group_size` ones can be eos tokens
+            next_scores = np.sort(rng.standard_normal((BATCH_SIZE, 2 * group_size)), axis=1)[:, ::-1]
+            next_scores = (next_scores - input_ids[0].shape[-1]).astype(np.float32)
+            next_tokens = rng.integers(0, 6, (BATCH_SIZE, 2 * group_size))
+            next_tokens[:, group_size:] = np.maximum(next_tokens[:, group_size:], 2)
+            next_indices = rng.integers(0, group_size, (BATCH_SIZE, 2 * group_size))
+            beam_outputs = scorer.process(
+                ms.tensor(input_ids[group_index]),
+                ms.tensor(next_scores.copy()),
+                ms.tensor(next_tokens),
+                ms.tensor(next_indices),
+                pad_token_id=PAD_TOKEN_ID,
+                eos_token_id=EOS_TOKEN_ID,
+                beam_indices=beam_indices,
+                group_index=group_index,
+            )
+            beam_outputs = {key: value.asnumpy() for key, value in beam_outputs.items()}
+            outputs.append(beam_outputs)
+            beam_idx = beam_outputs["next_beam_indices"]
+            input_ids[group_index] = np.concatenate(
+                [input_ids[group_index][beam_idx], beam_outputs["next_beam_tokens"][:, None]], axis=-1
+            )
+            beam_scores[group_index] = beam_outputs["next_beam_scores"]
+            if beam_indices is not None:
+                beam_indices = tuple(beam_indices[i] + (int(i),) for i in beam_idx)
+        outputs.append({"is_done": np.array(bool(scorer.is_done))})
+
+    # the beams are ordered by batch, then group
+    length = input_ids[0].shape[-1]
+    all_input_ids = np.stack([x.reshape(BATCH_SIZE, group_size, length) for x in input_ids], axis=1)
+    all_beam_scores = np.stack([x.reshape(BATCH_SIZE, group_size) for x in beam_scores], axis=1)
+    sequence_outputs = scorer.finalize(
+        ms.tensor(all_input_ids.reshape(-1, length)),
+        ms.tensor(all_beam_scores.reshape(-1)),
+        None,
+        None,
+        max_length=MAX_LENGTH,
+        pad_token_id=PAD_TOKEN_ID,
+        eos_token_id=EOS_TOKEN_ID,
+        beam_indices=beam_indices,
+    )
+    outputs.append({key: value.asnumpy() for key, value in sequence_outputs.items() if value is not None})
+    return outputs
+
+
+class TensorizedBeamSearchScorerTest(unittest.TestCase):
+    @parameterized.expand(
+        [
+            (4, 1, 1.0, False, 1),
+            (4, 1, 2.0, True, 2),
+            (3, 1, -1.0, "never", 3),
+            (2, 1, 1.0, "never", 1),
+            (4, 2, 1.0, False, 2),
+        ]
+    )
+    def test_same_results(self, num_beams, num_beam_groups, length_penalty, early_stopping, num_beam_hyps_to_keep):
+        args = (num_beams, num_beam_groups, length_penalty, early_stopping, num_beam_hyps_to_keep)
+        expected_outputs = run_beam_search(BeamSearchScorer, *args)
+        outputs = run_beam_search(TensorizedBeamSearchScorer, *args)
+        self.assertEqual(len(outputs), len(expected_outputs))
+        for output, expected_output in zip(outputs, expected_outputs):
+            self.assertEqual(output.keys(), expected_output.keys())
+            for key in output:
+                np.testing.assert_array_equal(output[key], expected_output[key], err_msg=key)
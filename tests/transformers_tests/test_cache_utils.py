@@ -0,0 +1,203 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+from transformers import GPT2Config, PretrainedConfig
+
+import mindspore as ms
+
+from mindone.transformers.cache_utils import (
+    DynamicCache,
+    OffloadedStaticCache,
+    QuantizedCache,
+    QuantizedCacheConfig,
+    init_static_cache,
+)
+
+
+class InitStaticCacheTest(unittest.TestCase):
+    @parameterized.expand([(None, 4), (2, 2)])
+    def test_shape(self, num_key_value_heads, expected_heads):
+        config = PretrainedConfig(
+            num_hidden_layers=3, num_attention_heads=4, num_key_value_heads=num_key_value_heads, hidden_size=32
+        )
+        cache = init_static_cache(config, max_batch_size=2, max_cache_len=16)
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache[0][0].shape, (2, expected_heads, 16, 8))
+
+    def test_config_without_key_value_heads(self):
+        config = GPT2Config(n_layer=2, n_head=2, n_embd=16, n_positions=32)
+        cache = init_static_cache(config, max_batch_size=3, max_cache_len=None)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache[1][1].shape, (3, 2, 32, 8))
+
+
+class DynamicCacheTest(unittest.TestCase):
+    num_layers = 2
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        # small chunks, so that the buffers are reallocated during the test
+        self.cache = DynamicCache(chunk_size=4)
+        self.expected = [[np.zeros((3, 2, 0, 8), dtype=np.float32)] * 2 for _ in range(self.num_layers)]
+
+    def update(self, seq_length):
+        for layer_idx in range(self.num_layers):
+            key_states, value_states = self.rng.standard_normal((2, 3, 2, seq_length, 8), dtype=np.float32)
+            keys, values = self.cache.update(ms.tensor(key_states), ms.tensor(value_states), layer_idx)
+            expected_keys, expected_values = self.expected[layer_idx]
+            self.expected[layer_idx] = [
+                np.concatenate([expected_keys, key_states], axis=-2),
+                np.concatenate([expected_values, value_states], axis=-2),
+            ]
+            np.testing.assert_array_equal(keys.asnumpy(), self.expected[layer_idx][0])
+            np.testing.assert_array_equal(values.asnumpy(), self.expected[layer_idx][1])
+
+    def assert_cache_equal(self, cache, expected):
+        self.assertEqual(len(cache), len(expected))
+        for (keys, values), (expected_keys, expected_values) in zip(cache, expected):
+            np.testing.assert_array_equal(keys.asnumpy(), expected_keys)
+            np.testing.assert_array_equal(values.asnumpy(), expected_values)
+
+    def test_update(self):
+        self.update(5)
+        for _ in range(10):
+            self.update(1)
+        self.assertEqual(self.cache.get_seq_length(), 15)
+        self.assertEqual(self.cache.seen_tokens, 15)
+        self.assertGreaterEqual(self.cache._kv_buffers[0][0].shape[-2], 15)
+        self.assertEqual(self.cache._kv_buffers[0][0].shape[-2] % 4, 0)
+
+    def test_crop(self):
+        self.update(7)
+        self.cache.crop(-3)
+        self.expected = [[x[..., :4, :] for x in layer] for layer in self.expected]
+        self.assert_cache_equal(self.cache, self.expected)
+        # the cropped tokens are overwritten
+        self.update(2)
+
+    def test_batch_operations(self):
+        self.update(6)
+        beam_idx = np.array([2, 0, 0])
+        self.cache.reorder_cache(ms.tensor(beam_idx))
+        self.expected = [[x[beam_idx] for x in layer] for layer in self.expected]
+        self.assert_cache_equal(self.cache, self.expected)
+        self.update(1)
+
+        self.cache.batch_select_indices(ms.tensor([0, 2]))
+        self.expected = [[x[[0, 2]] for x in layer] for layer in self.expected]
+        self.assert_cache_equal(self.cache, self.expected)
+
+        splits = self.cache.batch_split(2, 1)
+        for i, split in enumerate(splits):
+            self.assert_cache_equal(split, [[x[i : i + 1] for x in layer] for layer in self.expected])
+
+    def test_replaced_cache(self):
+        self.update(3)
+        # tensors assigned directly are copied into new buffers at the next update
+        self.cache.key_cache[0] = self.cache.key_cache[0] * 2
+        self.cache.value_cache[0] = self.cache.value_cache[0] * 2
+        self.expected[0] = [x * 2 for x in self.expected[0]]
+        self.update(2)
+
+
+class QuantizedCacheTest(unittest.TestCase):
+    @parameterized.expand([(8, 0, 0), (8, 0, -1), (4, 0, -1), (4, -1, -1)])
+    def test_update(self, nbits, axis_key, axis_value):
+        config = QuantizedCacheConfig(
+            nbits=nbits, axis_key=axis_key, axis_value=axis_value, q_group_size=4, residual_length=4
+        )
+        cache = QuantizedCache(config)
+        rng = np.random.default_rng(0)
+        expected_keys, expected_values = rng.standard_normal((2, 3, 2, 14, 8), dtype=np.float32)
+        # the quantization error is at most half a step of the range of the quantized groups
+        atol = np.ptp([expected_keys, expected_values]) / (2**nbits - 1)
+        for start, end in [(0, 5)] + [(i, i + 1) for i in range(5, 14)]:
+            keys, values = cache.update(
+                ms.tensor(expected_keys[..., start:end, :]), ms.tensor(expected_values[..., start:end, :]), 0
+            )
+            np.testing.assert_allclose(keys.asnumpy(), expected_keys[..., :end, :], atol=atol)
+            np.testing.assert_allclose(values.asnumpy(), expected_values[..., :end, :], atol=atol)
+            # the `residual_length` most recent tokens are returned in full precision
+            np.testing.assert_array_equal(keys.asnumpy()[..., -4:, :], expected_keys[..., end - 4 : end, :])
+            np.testing.assert_array_equal(values.asnumpy()[..., -4:, :], expected_values[..., end - 4 : end, :])
+
+        self.assertEqual(cache.get_seq_length(), 14)
+        self.assertEqual(cache._quantized_seq_lengths[0], 8)
+        np.testing.assert_array_equal(cache.key_cache[0].asnumpy(), expected_keys[..., 8:, :])
+        quantized_keys = cache._quantized_key_cache[0][0]
+        self.assertEqual(quantized_keys.dtype, ms.uint8)
+        self.assertEqual(quantized_keys.size, expected_keys[..., :8, :].size * nbits // 8)
+
+    def test_reorder_cache(self):
+        cache = QuantizedCache(QuantizedCacheConfig(nbits=8, residual_length=4))
+        states = np.random.default_rng(0).standard_normal((3, 2, 10, 8), dtype=np.float32)
+        cache.update(ms.tensor(states), ms.tensor(states), 0)
+        beam_idx = np.array([2, 0, 0])
+        cache.reorder_cache(ms.tensor(beam_idx))
+        keys, _ = cache[0]
+        np.testing.assert_allclose(keys.asnumpy(), states[beam_idx], atol=0.05)
+        np.testing.assert_array_equal(keys.asnumpy()[..., 4:, :], states[beam_idx][..., 4:, :])
+
+    def test_invalid_config(self):
+        with self.assertRaises(ValueError):
+            QuantizedCache(QuantizedCacheConfig(nbits=3))
+
+
+class OffloadedStaticCacheTest(unittest.TestCase):
+    def test_update(self):
+        config = PretrainedConfig(num_hidden_layers=5, num_attention_heads=4, num_key_value_heads=2, hidden_size=32)
+        # small blocks, so that the states span several blocks
+        cache = OffloadedStaticCache(config, max_batch_size=3, max_cache_len=16, block_size=4)
+        rng = np.random.default_rng(0)
+        expected_keys, expected_values = rng.standard_normal((2, 5, 3, 2, 11, 8), dtype=np.float32)
+        for start, end in [(0, 6)] + [(i, i + 1) for i in range(6, 11)]:
+            for layer_idx in range(config.num_hidden_layers):
+                keys, values = cache.update(
+                    ms.tensor(expected_keys[layer_idx, ..., start:end, :]),
+                    ms.tensor(expected_values[layer_idx, ..., start:end, :]),
+                    layer_idx,
+                    {"cache_position": ms.tensor(np.arange(start, end))},
+                )
+                # the states have the static shape, and only the cached positions are checked
+                self.assertEqual(keys.shape, (3, 2, 16, 8))
+                np.testing.assert_array_equal(keys.asnumpy()[..., :end, :], expected_keys[layer_idx, ..., :end, :])
+                np.testing.assert_array_equal(values.asnumpy()[..., :end, :], expected_values[layer_idx, ..., :end, :])
+            self.assertEqual(cache.get_seq_length(), end)
+
+        cache.reset()
+        self.assertEqual(cache.get_seq_length(), 0)
+        keys, _ = cache.update(ms.tensor(expected_keys[1, ..., :2, :]), ms.tensor(expected_values[1, ..., :2, :]), 1)
+        np.testing.assert_array_equal(keys.asnumpy()[..., :2, :], expected_keys[1, ..., :2, :])
+
+    def test_graph_mode(self):
+        config = PretrainedConfig(num_hidden_layers=2, num_attention_heads=2, hidden_size=16)
+        ms.set_context(mode=ms.GRAPH_MODE)
+        try:
+            with self.assertRaises(ValueError):
+                OffloadedStaticCache(config, max_batch_size=1, max_cache_len=8)
+        finally:
+            ms.set_context(mode=ms.PYNATIVE_MODE)
+
+    def test_offloaded_blocks(self):
+        config = PretrainedConfig(num_hidden_layers=6, num_attention_heads=2, hidden_size=16)
+        cache = OffloadedStaticCache(config, max_batch_size=1, max_cache_len=8, block_size=4)
+        rng = np.random.default_rng(0)
+        expected_keys, expected_values = rng.standard_normal((2, 6, 1, 2, 6, 8), dtype=np.float32)
+        # the prefill, then a decoding step, so that every device buffer is reused by several layers
+        for start, end in [(0, 5), (5, 6)]:
+            for layer_idx in range(config.num_hidden_layers):
+                cache.update(
+                    ms.tensor(expected_keys[layer_idx, ..., start:end, :]),
+                    ms.tensor(expected_values[layer_idx, ..., start:end, :]),
+                    layer_idx,
+                    {"cache_position": ms.tensor(np.arange(start, end))},
+                )
+
+        # the blocks stored for the layers on the host are theirs, not views of the shared device buffers
+        for layer_idx in range(1, config.num_hidden_layers):
+            for block_idx, (start, end) in enumerate([(0, 4), (4, 6)]):
+                keys = cache.key_cache[layer_idx][block_idx].asnumpy()[..., : end - start, :]
+                values = cache.value_cache[layer_idx][block_idx].asnumpy()[..., : end - start, :]
+                np.testing.assert_array_equal(keys, expected_keys[layer_idx, ..., start:end, :])
+                np.testing.assert_array_equal(values, expected_values[layer_idx, ..., start:end, :])
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from transformers import BertTokenizer
+
+from mindone.transformers.data.data_collator import DataCollatorWithPacking, DataCollatorWithTextEncoding
+
+
+class DataCollatorWithPackingTest(unittest.TestCase):
+    def setUp(self):
+        self.features = [{"input_ids": list(range(1, length + 1))} for length in (5, 3, 4, 2)]
+
+    def test_packing(self):
+        batch = DataCollatorWithPacking(max_length=8, attention_mask_format=None)(self.features)
+
+        # first-fit decreasing: [5, 3], [4, 2]
+        self.assertEqual(batch["input_ids"].shape, (2, 8))
+        np.testing.assert_array_equal(batch["input_ids"][0], [1, 2, 3, 4, 5, 1, 2, 3])
+        np.testing.assert_array_equal(batch["input_ids"][1], [1, 2, 3, 4, 1, 2, 0, 0])
+        np.testing.assert_array_equal(batch["position_ids"][1], [0, 1, 2, 3, 0, 1, 0, 0])
+        # the first token of every sample and the padding are masked
+        np.testing.assert_array_equal(batch["labels"][1], [-100, 2, 3, 4, -100, 2, -100, -100])
+        self.assertNotIn("attention_mask", batch)
+
+    def test_truncation(self):
+        batch = DataCollatorWithPacking(max_length=4, attention_mask_format=None)(self.features)
+        self.assertEqual(batch["input_ids"].shape, (4, 4))
+
+    def test_block_diagonal_mask(self):
+        batch = DataCollatorWithPacking(max_length=8)([{"input_ids": [1, 2, 3]}, {"input_ids": [4, 5]}])
+        mask = batch["attention_mask"][0, 0] == 0
+
+        self.assertEqual(batch["attention_mask"].shape, (1, 1, 8, 8))
+        self.assertTrue(mask[2, :3].all())
+        self.assertFalse(mask[1, 2])  # causal
+        self.assertFalse(mask[3, :3].any())  # the second sample does not see the first one
+        self.assertTrue(mask[4, 3:5].all())
+
+    def test_varlen(self):
+        batch = DataCollatorWithPacking(max_length=8, attention_mask_format="varlen")(self.features)
+
+        np.testing.assert_array_equal(batch["cu_seq_lens_q"], [0, 5, 8, 12, 14, 16])
+        self.assertEqual(batch["max_length_q"], 5)
+
+    def test_segment_boundaries(self):
+        rng = np.random.default_rng(0)
+        features = [{"input_ids": rng.integers(1, 100, length).tolist()} for length in rng.integers(1, 12, 16)]
+        batch = DataCollatorWithPacking(max_length=16)(features)
+        varlen = DataCollatorWithPacking(max_length=16, attention_mask_format="varlen")(features)
+
+        # the samples start where the positions restart, the padding where the tokens end
+        samples, boundaries = [], [0]
+        for row, (ids, positions) in enumerate(zip(batch["input_ids"], batch["position_ids"])):
+            length = int((ids != 0).sum())
+            starts = np.flatnonzero(positions[:length] == 0).tolist() + [length]
+            np.testing.assert_array_equal(positions[length:], 0)
+            for start, end in zip(starts[:-1], starts[1:]):
+                np.testing.assert_array_equal(positions[start:end], np.arange(end - start))
+                samples.append(ids[start:end].tolist())
+                boundaries.append(row * 16 + end)
+                # a token sees the tokens of its sample up to itself only
+                mask = batch["attention_mask"][row, 0] == 0
+                self.assertEqual(mask[start:end, start:end].sum(), (end - start) * (end - start + 1) // 2)
+                self.assertFalse(mask[start:end, :start].any())
+            if length < 16:
+                boundaries.append((row + 1) * 16)
+
+        self.assertEqual(sorted(samples), sorted(f["input_ids"] for f in features))
+        np.testing.assert_array_equal(varlen["cu_seq_lens_q"], boundaries)
+        np.testing.assert_array_equal(varlen["position_ids"], batch["position_ids"])
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            DataCollatorWithPacking(max_length=8, attention_mask_format="2d")
+
+
+class DataCollatorWithTextEncodingTest(unittest.TestCase):
+    def test_text_encoding(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(["[PAD]", "[UNK]", "[CLS]", "[SEP]", "a", "red", "cat"]))
+            tokenizer = BertTokenizer(vocab_file)
+        features = [{"text": "a red cat", "label": 1}, {"text": "cat", "label": 0}]
+        batch = DataCollatorWithTextEncoding(tokenizer, max_length=4, truncation=True)(features)
+
+        np.testing.assert_array_equal(batch["input_ids"], [[2, 4, 5, 3], [2, 6, 3, 0]])
+        np.testing.assert_array_equal(batch["attention_mask"], [[1, 1, 1, 1], [1, 1, 1, 0]])
+        np.testing.assert_array_equal(batch["labels"], [1, 0])
+        self.assertNotIn("text", batch)
@@ -35,10 +35,14 @@ if is_vision_available():
         corners_to_center_format,
         flip_channel_order,
         get_resize_output_image_size,
+        group_images_by_shape,
         id_to_rgb,
         normalize,
         pad,
+        reorder_images,
+        rescale,
         resize,
+        resize_rescale_and_normalize,
         rgb_to_id,
         to_channel_dimension_format,
         to_pil_image,
@@ -343,6 +347,76 @@ class ImageTransformsTester(unittest.TestCase):
         expected_image = image[52:172, 82:142, :]
         self.assertTrue(np.allclose(center_crop(image, (120, 60), input_data_format="channels_last"), expected_image))
 
+    def test_resize_rescale_and_normalize(self):
+        images = np.random.randint(0, 256, (4, 3, 64, 48), dtype=np.uint8)
+        mean, std = (0.5, 0.4, 0.3), (0.5, 0.6, 0.7)
+
+        # Test result matches the per-image path, up to the rounding of PIL between its horizontal and vertical passes
+        expected_images = np.stack(
+            [
+                normalize(
+                    rescale(center_crop(resize(image, (40, 30), PIL.Image.BILINEAR), (36, 32)), 1 / 255), mean, std
+                )
+                for image in images
+            ]
+        )
+        processed_images = resize_rescale_and_normalize(
+            images,
+            size=(40, 30),
+            resample=PIL.Image.BILINEAR,
+            crop_size=(36, 32),
+            rescale_factor=1 / 255,
+            mean=mean,
+            std=std,
+        )
+        self.assertEqual(processed_images.dtype, np.float32)
+        self.assertEqual(processed_images.shape, (4, 3, 36, 32))
+        self.assertTrue(np.allclose(processed_images, expected_images, atol=1.01 / 255 / min(std)))
+
+        # Test resizing only keeps the dtype of the images
+        resized_images = resize_rescale_and_normalize(images, size=(40, 30), resample=PIL.Image.BICUBIC)
+        self.assertEqual(resized_images.dtype, np.uint8)
+        self.assertEqual(resized_images.shape, (4, 3, 40, 30))
+
+        # Test result is exact without resizing, with channels last images and a single image
+        images = images.transpose(0, 2, 3, 1)
+        expected_images = np.stack(
+            [normalize(rescale(center_crop(image, (70, 40)), 1 / 255), mean, std) for image in images]
+        )
+        processed_images = resize_rescale_and_normalize(
+            images, crop_size=(70, 40), rescale_factor=1 / 255, mean=mean, std=std, input_data_format="channels_last"
+        )
+        self.assertEqual(processed_images.shape, (4, 70, 40, 3))
+        self.assertTrue(np.allclose(processed_images, expected_images, atol=1e-5))
+        processed_image = resize_rescale_and_normalize(
+            images[0], rescale_factor=1 / 255, mean=mean, std=std, data_format="channels_first"
+        )
+        self.assertEqual(processed_image.shape, (3, 64, 48))
+        self.assertTrue(
+            np.allclose(
+                processed_image, normalize(rescale(images[0], 1 / 255), mean, std).transpose(2, 0, 1), atol=1e-5
+            )
+        )
+
+        # Test that exception is raised if only one of mean and std is given
+        with self.assertRaises(ValueError):
+            resize_rescale_and_normalize(images, mean=mean)
+
+    def test_group_images_by_shape(self):
+        images = [
+            get_random_image(16, 16),
+            get_random_image(8, 12),
+            get_random_image(16, 16),
+            get_random_image(16, 16, 1),
+        ]
+        grouped_images, grouped_images_index = group_images_by_shape(images)
+        self.assertEqual(
+            {shape: stacked_images.shape for shape, stacked_images in grouped_images.items()},
+            {(3, 16, 16): (2, 3, 16, 16), (3, 8, 12): (1, 3, 8, 12), (1, 16, 16): (1, 1, 16, 16)},
+        )
+        for image, reordered_image in zip(images, reorder_images(grouped_images, grouped_images_index)):
+            self.assertTrue(np.array_equal(image, reordered_image))
+
     def test_center_to_corners_format(self):
         bbox_center = np.array([[10, 20, 4, 8], [15, 16, 3, 4]])
         expected = np.array([[8, 16, 12, 24], [13.5, 14, 16.5, 18]])
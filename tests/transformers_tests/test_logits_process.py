@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+
+import mindspore as ms
+
+from mindone.transformers.generation.logits_process import (
+    EncoderNoRepeatNGramLogitsProcessor,
+    NoRepeatNGramLogitsProcessor,
+)
+
+
+def reference_banned_tokens(ngram_size, ngram_ids, prev_input_ids):
+    """The banned tokens of fairseq, from a dictionary of the n-grams of `ngram_ids`."""
+    ngrams = {}
+    for ngram in zip(*[ngram_ids[i:] for i in range(ngram_size)]):
+        ngrams.setdefault(tuple(ngram[:-1]), set()).add(ngram[-1])
+    return ngrams.get(tuple(prev_input_ids[len(prev_input_ids) + 1 - ngram_size :]), set())
+
+
+class NoRepeatNGramLogitsProcessorTest(unittest.TestCase):
+    vocab_size = 6
+
+    def setUp(self):
+        # few distinct tokens, so that the n-grams repeat
+        self.input_ids = np.random.default_rng(0).integers(0, 3, (4, 12))
+        self.scores = np.zeros((4, self.vocab_size), dtype=np.float32)
+
+    def assert_banned(self, scores, expected_banned_tokens):
+        for hypo_scores, banned_tokens in zip(scores.asnumpy(), expected_banned_tokens):
+            self.assertEqual(set(np.flatnonzero(np.isinf(hypo_scores)).tolist()), banned_tokens)
+
+    @parameterized.expand([(1,), (2,), (3,), (13,)])
+    def test_no_repeat_ngram(self, ngram_size):
+        processor = NoRepeatNGramLogitsProcessor(ngram_size)
+        for cur_len in range(1, self.input_ids.shape[1] + 1):
+            input_ids = self.input_ids[:, :cur_len]
+            scores = processor(ms.tensor(input_ids), ms.tensor(self.scores))
+            expected = [
+                reference_banned_tokens(ngram_size, ids.tolist(), ids.tolist()) if cur_len >= ngram_size else set()
+                for ids in input_ids
+            ]
+            self.assert_banned(scores, expected)
+
+    @parameterized.expand([(1,), (2,), (3,)])
+    def test_encoder_no_repeat_ngram(self, ngram_size):
+        encoder_input_ids = np.random.default_rng(1).integers(0, 3, (2, 7))
+        processor = EncoderNoRepeatNGramLogitsProcessor(ngram_size, ms.tensor(encoder_input_ids))
+        for cur_len in range(max(ngram_size - 1, 1), self.input_ids.shape[1] + 1):
+            # 2 beams per prompt
+            input_ids = self.input_ids[:, :cur_len]
+            scores = processor(ms.tensor(input_ids), ms.tensor(self.scores))
+            expected = [
+                reference_banned_tokens(ngram_size, encoder_input_ids[hypo_idx // 2].tolist(), ids.tolist())
+                for hypo_idx, ids in enumerate(input_ids)
+            ]
+            self.assert_banned(scores, expected)
@@ -0,0 +1,174 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+from parameterized import parameterized
+from transformers import (
+    BertConfig,
+    BertTokenizer,
+    GPT2Config,
+    Wav2Vec2Config,
+    Wav2Vec2CTCTokenizer,
+    Wav2Vec2FeatureExtractor,
+)
+
+from mindone.transformers import (
+    AutomaticSpeechRecognitionPipeline,
+    BertModel,
+    FeatureExtractionPipeline,
+    GPT2LMHeadModel,
+    TextGenerationPipeline,
+    Wav2Vec2ForCTC,
+)
+from mindone.transformers.pipelines.automatic_speech_recognition import (
+    _find_longest_common_sequence,
+    chunk_iter,
+    rescale_stride,
+)
+from mindone.transformers.tokenization_utils import MultiprocessBatchEncoder
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "the", "a", "cat", "dog", "on", "mat", "sat", "##s", "big", "red"]
+TEXTS = ["the cat sat", "a dog", "the big red dog sat on a mat", "cats", "a red cat sat on the mat"]
+CTC_VOCAB = ["<pad>", "<s>", "</s>", "<unk>", "|", "a", "b", "c", "d", "e"]
+
+
+class FeatureExtractionPipelineTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(VOCAB))
+            tokenizer = BertTokenizer(vocab_file)
+        config = BertConfig(
+            vocab_size=len(VOCAB), hidden_size=16, num_hidden_layers=2, num_attention_heads=2, intermediate_size=32
+        )
+        model = BertModel(config)
+        model.set_train(False)
+        self.pipeline = FeatureExtractionPipeline(model=model, tokenizer=tokenizer, framework="ms")
+
+    @parameterized.expand([(2, 0), (4, 0), (2, 2)])
+    def test_batched_same_features(self, batch_size, num_workers):
+        expected = [self.pipeline(text) for text in TEXTS]
+        outputs = self.pipeline(TEXTS, batch_size=batch_size, num_workers=num_workers)
+
+        self.assertEqual(len(outputs), len(TEXTS))
+        for output, features in zip(outputs, expected):
+            num_tokens = len(features[0])
+            # the features of the padding of the batch are returned too, right of the tokens
+            np.testing.assert_allclose(np.array(output[0][:num_tokens]), np.array(features[0]), atol=1e-5)
+
+
+class TextGenerationPipelineTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(VOCAB))
+            self.tokenizer = BertTokenizer(vocab_file, padding_side="left")
+        config = GPT2Config(
+            vocab_size=len(VOCAB),
+            n_positions=64,
+            n_embd=16,
+            n_layer=2,
+            n_head=2,
+            bos_token_id=2,
+            eos_token_id=3,
+            pad_token_id=0,
+        )
+        self.model = GPT2LMHeadModel(config)
+        self.model.set_train(False)
+        self.generate_kwargs = {"max_new_tokens": 5, "do_sample": False, "add_special_tokens": False}
+
+    def test_batch_encoder_same_model_inputs(self):
+        with MultiprocessBatchEncoder(self.tokenizer, num_workers=2, chunk_size=2) as encoder:
+            pipeline = TextGenerationPipeline(
+                model=self.model, tokenizer=self.tokenizer, framework="ms", batch_encoder=encoder
+            )
+            encoded_prompts = pipeline._encode_prompts(TEXTS, prefix="a ", add_special_tokens=False)
+
+        for text, encoded_prompt in zip(TEXTS, encoded_prompts):
+            expected = pipeline.preprocess(text, prefix="a ", add_special_tokens=False)
+            inputs = pipeline.preprocess(encoded_prompt, prefix="a ", add_special_tokens=False)
+            self.assertEqual(inputs.keys(), expected.keys())
+            self.assertEqual(inputs["prompt_text"], text)
+            for key in ("input_ids", "attention_mask"):
+                self.assertEqual(inputs[key].dtype, expected[key].dtype)
+                np.testing.assert_array_equal(inputs[key].asnumpy(), expected[key].asnumpy())
+
+    @parameterized.expand([(1,), (2,)])
+    def test_batch_encoder_same_outputs(self, batch_size):
+        pipeline = TextGenerationPipeline(model=self.model, tokenizer=self.tokenizer, framework="ms")
+        expected = pipeline(TEXTS, batch_size=batch_size, **self.generate_kwargs)
+        expected_with_prefix = pipeline(TEXTS, batch_size=batch_size, prefix="a ", **self.generate_kwargs)
+
+        with MultiprocessBatchEncoder(self.tokenizer, num_workers=2, chunk_size=2) as encoder:
+            pipeline = TextGenerationPipeline(
+                model=self.model, tokenizer=self.tokenizer, framework="ms", batch_encoder=encoder
+            )
+            outputs = pipeline(TEXTS, batch_size=batch_size, **self.generate_kwargs)
+            # the prompts were encoded by the worker processes of the encoder
+            self.assertIsNotNone(encoder._pool)
+            outputs_with_prefix = pipeline(TEXTS, batch_size=batch_size, prefix="a ", **self.generate_kwargs)
+
+        self.assertEqual(outputs, expected)
+        self.assertEqual(outputs_with_prefix, expected_with_prefix)
+
+
+class AutomaticSpeechRecognitionPipelineTest(unittest.TestCase):
+    def test_rescale_stride(self):
+        self.assertEqual(rescale_stride([(160_000, 16_000, 16_000)], 1 / 80), [(2000, 200, 200)])
+        self.assertEqual(rescale_stride([(100, 10, 0), (60, 10, 10)], 0.1), [(10, 1, 0), (6, 1, 1)])
+
+    def test_chunk_iter(self):
+        feature_extractor = Wav2Vec2FeatureExtractor(feature_size=1, sampling_rate=100, do_normalize=False)
+        inputs = np.arange(100, dtype=np.float32)
+
+        items = list(chunk_iter(inputs, feature_extractor, chunk_len=40, stride_left=10, stride_right=10))
+        self.assertEqual([item["stride"] for item in items], [(40, 0, 10), (40, 10, 10), (40, 10, 10), (40, 10, 0)])
+        self.assertEqual([item["is_last"] for item in items], [False, False, False, True])
+        self.assertEqual(items[1]["input_values"].asnumpy()[0, 0], 20)
+
+        items = list(chunk_iter(inputs[:70], feature_extractor, chunk_len=40, stride_left=10, stride_right=10))
+        self.assertEqual([item["stride"] for item in items], [(40, 0, 10), (40, 10, 10), (30, 10, 0)])
+        self.assertEqual(items[-1]["input_values"].shape, (1, 30))
+
+    def test_find_longest_common_sequence(self):
+        tokenizer = SimpleNamespace(all_special_ids=[0])
+        sequences = [np.array([[0, 1, 2, 3, 4]]), np.array([[3, 4, 5, 6]]), np.array([[5, 6, 7, 0]])]
+        self.assertEqual(_find_longest_common_sequence(sequences, tokenizer).tolist(), [1, 2, 3, 4, 5, 6, 7])
+
+    def test_chunked_batched_same_text(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.json")
+            with open(vocab_file, "w") as f:
+                json.dump({token: i for i, token in enumerate(CTC_VOCAB)}, f)
+            tokenizer = Wav2Vec2CTCTokenizer(vocab_file)
+        feature_extractor = Wav2Vec2FeatureExtractor(feature_size=1, sampling_rate=16000)
+        config = Wav2Vec2Config(
+            vocab_size=len(CTC_VOCAB),
+            hidden_size=16,
+            num_hidden_layers=2,
+            num_attention_heads=2,
+            intermediate_size=32,
+            conv_dim=(16, 16),
+            conv_stride=(4, 4),
+            conv_kernel=(8, 8),
+            num_conv_pos_embeddings=16,
+            num_conv_pos_embedding_groups=2,
+            feat_extract_norm="layer",
+        )
+        model = Wav2Vec2ForCTC(config)
+        model.set_train(False)
+        pipeline = AutomaticSpeechRecognitionPipeline(
+            model=model, feature_extractor=feature_extractor, tokenizer=tokenizer, framework="ms"
+        )
+
+        # chunks of 0.5s with strides of 0.125s: 3 full chunks, so that the batches need no padding
+        audio = np.random.default_rng(0).standard_normal(16000).astype(np.float32)
+        expected = pipeline(audio, chunk_length_s=0.5, stride_length_s=0.125)
+        outputs = pipeline([audio, audio[:12000]], chunk_length_s=0.5, stride_length_s=0.125, batch_size=3)
+        self.assertEqual(outputs[0], expected)
+        self.assertEqual(outputs[1], pipeline(audio[:12000], chunk_length_s=0.5, stride_length_s=0.125))
@@ -0,0 +1,136 @@
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+from transformers import GPT2Config
+
+import mindspore as ms
+
+from mindone.transformers import GPT2LMHeadModel
+from mindone.transformers.generation.stopping_criteria import (
+    EosTokenCriteria,
+    MaxLengthCriteria,
+    StoppingCriteriaList,
+    StopStringCriteria,
+)
+
+TOKENS = ["a", "b", "c", "d", "e", "f", "s", "t", "o", "p", "st", "op", "sto", "to", "pped", "las", "topper", "stop"]
+STOP_STRINGS = ["stop", "to", "pp"]
+
+
+class CharTokenizer:
+    """A tokenizer whose tokens are plain strings, without any prefix."""
+
+    def __init__(self, tokens):
+        self.vocab = {token: idx for idx, token in enumerate(tokens)}
+        self.tokens = list(tokens)
+
+    def get_vocab(self):
+        return dict(self.vocab)
+
+    def __call__(self, text, add_special_tokens=False):
+        return {"input_ids": [self.vocab[char] for char in text]}
+
+    def _convert_id_to_token(self, idx):
+        return self.tokens[idx]
+
+    def convert_tokens_to_string(self, tokens):
+        return "".join(tokens)
+
+
+def reference_stop_string_match(token_ids, stop_strings):
+    """Whether one of the stop strings ends in the last token of the decoded text."""
+    # out-of-vocabulary tokens never match, and break the stop strings around them
+    token_strings = [TOKENS[idx] if idx < len(TOKENS) else "#" for idx in token_ids]
+    text = "".join(token_strings)
+    last_token_start = len(text) - len(token_strings[-1])
+    return any(
+        text.find(stop_string, max(last_token_start - len(stop_string) + 1, 0)) != -1 for stop_string in stop_strings
+    )
+
+
+class StopStringCriteriaTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        # some out-of-vocabulary tokens as well, which never match
+        self.input_ids = rng.integers(0, len(TOKENS) + 2, (4, 24))
+        self.input_ids[:, 10:13] = [TOKENS.index("s"), TOKENS.index("to"), TOKENS.index("pped")]
+        self.input_ids[0, 20:22] = [TOKENS.index("las"), TOKENS.index("topper")]
+        self.scores = ms.tensor(np.zeros((4, len(TOKENS)), dtype=np.float32))
+        self.criteria = StopStringCriteria(CharTokenizer(TOKENS), STOP_STRINGS)
+
+    def expected_matches(self, cur_len):
+        return [reference_stop_string_match(ids, STOP_STRINGS) for ids in self.input_ids[:, :cur_len].tolist()]
+
+    def test_stop_string_criteria(self):
+        for cur_len in range(1, self.input_ids.shape[1] + 1):
+            is_done = self.criteria(ms.tensor(self.input_ids[:, :cur_len]), self.scores)
+            self.assertEqual(is_done.asnumpy().tolist(), self.expected_matches(cur_len), msg=cur_len)
+
+    @parameterized.expand([(1,), (3,), (5,)])
+    def test_incremental_stop_string_criteria(self, check_interval):
+        self.criteria.reset()
+        prompt_len = 2
+        for cur_len in range(prompt_len + check_interval, self.input_ids.shape[1] + 1, check_interval):
+            is_done = self.criteria(ms.tensor(self.input_ids[:, :cur_len]), self.scores, num_new_tokens=check_interval)
+            expected = np.any(
+                [self.expected_matches(length) for length in range(cur_len - check_interval + 1, cur_len + 1)], axis=0
+            )
+            self.assertEqual(is_done.asnumpy().tolist(), expected.tolist(), msg=cur_len)
+
+
+class StoppingCriteriaListTest(unittest.TestCase):
+    def test_eos_token_criteria(self):
+        input_ids = np.array([[3, 4, 5, 6], [3, 0, 5, 6], [3, 4, 5, 0]])
+        criteria = EosTokenCriteria(eos_token_id=[0, 1])
+        self.assertEqual(criteria(ms.tensor(input_ids), None).asnumpy().tolist(), [False, False, True])
+        self.assertEqual(criteria(input_ids, None).tolist(), [False, False, True])
+        is_done = criteria(ms.tensor(input_ids), None, num_new_tokens=3)
+        self.assertEqual(is_done.asnumpy().tolist(), [False, True, True])
+        self.assertEqual(criteria(input_ids, None, num_new_tokens=3).tolist(), [False, True, True])
+
+    def test_stopping_criteria_list(self):
+        input_ids = ms.tensor(np.array([[3, 4, 0], [3, 4, 5]]))
+        criteria = StoppingCriteriaList([MaxLengthCriteria(max_length=4), EosTokenCriteria(0)], check_interval=2)
+        self.assertEqual(criteria.check_interval, 2)
+        self.assertEqual(criteria.max_length, 4)
+        self.assertEqual(criteria(input_ids, None).asnumpy().tolist(), [True, False])
+        self.assertEqual(criteria(input_ids[:, :2], None, num_new_tokens=2).asnumpy().tolist(), [False, False])
+
+        with self.assertRaises(ValueError):
+            StoppingCriteriaList(check_interval=0)
+
+    def test_after_stop_mask(self):
+        input_ids = ms.tensor(np.array([[3, 4, 0, 5, 6], [3, 0, 4, 0, 6], [3, 4, 5, 6, 0], [3, 4, 5, 6, 7]]))
+        criteria = StoppingCriteriaList([EosTokenCriteria(0)], check_interval=3)
+        after_stop = criteria.after_stop_mask(input_ids, None, num_new_tokens=3)
+        expected = [[False, True, True], [False, False, True], [False, False, False], [False, False, False]]
+        self.assertEqual(after_stop.asnumpy().tolist(), expected)
+
+
+class CheckIntervalGenerationTest(unittest.TestCase):
+    def setUp(self):
+        config = GPT2Config(vocab_size=16, n_positions=64, n_embd=16, n_layer=2, n_head=2, eos_token_id=3)
+        ms.set_seed(0)
+        self.model = GPT2LMHeadModel(config)
+        self.model.set_train(False)
+        self.input_ids = ms.tensor(np.random.default_rng(0).integers(4, 16, (4, 5)), dtype=ms.int32)
+
+    def generate(self, check_interval, eos_token_id):
+        return self.model.generate(
+            self.input_ids,
+            stopping_criteria=StoppingCriteriaList(check_interval=check_interval),
+            max_new_tokens=12,
+            do_sample=False,
+            eos_token_id=eos_token_id,
+            pad_token_id=0,
+        ).asnumpy()
+
+    @parameterized.expand([(2,), (5,)])
+    def test_same_sequences(self, check_interval):
+        expected = self.generate(1, eos_token_id=None)
+        # stop the sequences at different lengths with the tokens generated by the model
+        eos_token_id = [int(expected[0, 7]), int(expected[2, 9])]
+        expected = self.generate(1, eos_token_id=eos_token_id)
+        sequences = self.generate(check_interval, eos_token_id=eos_token_id)
+        np.testing.assert_array_equal(sequences, expected)
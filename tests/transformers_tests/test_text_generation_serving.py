@@ -0,0 +1,90 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from transformers import BertTokenizer, GPT2Config
+
+from mindone.transformers import GPT2LMHeadModel, TextGenerationPipeline
+from mindone.transformers.pipelines import GenerationRequest, TextGenerationServer
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "the", "a", "cat", "dog", "on", "mat", "sat", "##s", "big", "red"]
+PROMPTS = ["the cat sat", "a dog", "the big red dog sat on a mat", "cats", "a red cat sat on the mat"]
+
+
+class TextGenerationServerTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(VOCAB))
+            tokenizer = BertTokenizer(vocab_file)
+        config = GPT2Config(
+            vocab_size=len(VOCAB),
+            n_positions=64,
+            n_embd=16,
+            n_layer=2,
+            n_head=2,
+            bos_token_id=2,
+            eos_token_id=3,
+            pad_token_id=0,
+        )
+        model = GPT2LMHeadModel(config)
+        model.set_train(False)
+        self.pipeline = TextGenerationPipeline(model=model, tokenizer=tokenizer, framework="ms")
+        self.generate_kwargs = {"max_new_tokens": 5, "do_sample": False, "add_special_tokens": False}
+
+    def test_same_outputs(self):
+        server = TextGenerationServer(self.pipeline, max_batch_size=2, max_wait_time=1.0)
+        requests = [GenerationRequest(prompt, self.generate_kwargs) for prompt in PROMPTS]
+        responses = {response.request_id: response for response in server.serve(requests)}
+
+        for request in requests:
+            self.assertTrue(responses[request.request_id].finished)
+            expected = self.pipeline(request.prompt, **self.generate_kwargs)
+            self.assertEqual(responses[request.request_id].outputs, expected)
+        self.assertEqual(server.metrics.batch_sizes, [2, 2, 1])
+        self.assertEqual(len(server.metrics.queue_latencies), len(PROMPTS))
+
+    def test_stream(self):
+        server = TextGenerationServer(self.pipeline, max_batch_size=8, max_wait_time=1.0)
+        generate_kwargs = {**self.generate_kwargs, "return_full_text": False}
+        requests = [GenerationRequest(prompt, generate_kwargs) for prompt in PROMPTS]
+        texts = {request.request_id: "" for request in requests}
+        for response in server.serve(requests, stream=True):
+            if response.finished:
+                self.assertEqual(response.outputs[0]["generated_text"].strip(), texts[response.request_id].strip())
+                self.assertEqual(response.batch_size, len(PROMPTS))
+            else:
+                texts[response.request_id] += response.text
+
+    def test_token_budget(self):
+        # 3 prompts of up to 8 tokens, plus 5 new ones, take more than 30 tokens
+        server = TextGenerationServer(self.pipeline, max_batch_size=8, max_batch_tokens=30, max_wait_time=1.0)
+        requests = [GenerationRequest(prompt, self.generate_kwargs) for prompt in PROMPTS]
+        list(server.serve(requests))
+        self.assertEqual(server.metrics.batch_sizes, [2, 2, 1])
+
+    def test_different_arguments(self):
+        server = TextGenerationServer(self.pipeline, max_batch_size=8, max_wait_time=1.0)
+        requests = [
+            GenerationRequest(prompt, {**self.generate_kwargs, "max_new_tokens": 2 + i % 2})
+            for i, prompt in enumerate(PROMPTS)
+        ]
+        responses = list(server.serve(requests))
+        self.assertEqual(sorted(server.metrics.batch_sizes), [2, 3])
+        self.assertEqual(len(responses), len(PROMPTS))
+
+    def test_serve_async(self):
+        server = TextGenerationServer(self.pipeline, max_batch_size=2, max_wait_time=1.0)
+
+        async def serve():
+            requests = asyncio.Queue()
+            for prompt in PROMPTS:
+                requests.put_nowait(GenerationRequest(prompt, self.generate_kwargs))
+            requests.put_nowait(None)
+            return [response async for response in server.serve_async(requests)]
+
+        responses = asyncio.run(serve())
+        self.assertEqual(len(responses), len(PROMPTS))
+        self.assertEqual(server.metrics.batch_sizes, [2, 2, 1])
@@ -0,0 +1,93 @@
+import os
+import random
+import tempfile
+import unittest
+
+import numpy as np
+from parameterized import parameterized
+from transformers import BertTokenizer
+
+from mindone.transformers.tokenization_utils import ExtensionsTrie, MultiprocessBatchEncoder, Trie
+
+VOCAB = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "the", "a", "cat", "dog", "on", "mat", "sat", "##s", "big", "red"]
+
+
+def reference_split(words, text):
+    """Splits `text` on the longest word at the leftmost position where a word starts, then after it, and so on."""
+    offsets, current = [0], 0
+    while current < len(text):
+        length = max((len(word) for word in words if text.startswith(word, current)), default=0)
+        if length:
+            offsets.extend([current, current + length])
+        current += length or 1
+    return Trie().cut_text(text, offsets)
+
+
+class TrieTest(unittest.TestCase):
+    def test_trie_split(self):
+        trie = Trie()
+        self.assertEqual(trie.split("[CLS] This is a extra_id_100"), ["[CLS] This is a extra_id_100"])
+        trie.add("[CLS]")
+        trie.add("extra_id_1")
+        trie.add("extra_id_100")
+        self.assertEqual(trie.split("[CLS] This is a extra_id_100"), ["[CLS]", " This is a ", "extra_id_100"])
+        self.assertEqual(trie.split("extra_id_10"), ["extra_id_1", "0"])
+
+    def test_trie_split_overlaps(self):
+        trie = Trie(["blowing", "lower", "A", "AB", "C", "BCDEF"])
+        self.assertEqual(trie.split("blower"), ["b", "lower"])
+        self.assertEqual(trie.split("ABC"), ["AB", "C"])
+        self.assertEqual(trie.split("ABCD"), ["AB", "C", "D"])
+        self.assertEqual(trie.split("[ABCDEF]"), ["[", "AB", "C", "DEF]"])
+
+    def test_trie_added_words(self):
+        trie = ExtensionsTrie(["<|image|>"])
+        self.assertEqual(trie.split("<|image|><|video|>"), ["<|image|>", "<|video|>"])
+        # the words added after a split are matched by the next ones
+        trie.add("<|video|>")
+        self.assertEqual(trie.split("<|image|><|video|>"), ["<|image|>", "<|video|>"])
+        self.assertEqual(trie.extensions("<|"), ["<|image|>", "<|video|>"])
+
+    @parameterized.expand([("ab",), ("ab[]^-\\.*",)])
+    def test_trie_split_random(self, alphabet):
+        rng = random.Random(0)
+        for _ in range(500):
+            words = ["".join(rng.choices(alphabet, k=rng.randint(1, 5))) for _ in range(rng.randint(1, 8))]
+            text = "".join(rng.choices(alphabet + "xy", k=rng.randint(0, 30)))
+            self.assertEqual(Trie(words).split(text), reference_split(words, text), msg=(words, text))
+
+
+class MultiprocessBatchEncoderTest(unittest.TestCase):
+    def setUp(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            vocab_file = os.path.join(tmpdir, "vocab.txt")
+            with open(vocab_file, "w") as f:
+                f.write("\n".join(VOCAB))
+            self.tokenizer = BertTokenizer(vocab_file)
+        rng = random.Random(0)
+        self.texts = [" ".join(rng.choices(VOCAB[4:] + ["cats"], k=rng.randint(1, 12))) for _ in range(9)]
+
+    @parameterized.expand([("right", {}), ("left", {"truncation": True, "max_length": 8})])
+    def test_same_encodings(self, padding_side, kwargs):
+        self.tokenizer.padding_side = padding_side
+        expected = self.tokenizer(self.texts, padding=True, return_tensors="np", **kwargs)
+        with MultiprocessBatchEncoder(self.tokenizer, num_workers=2, chunk_size=2) as encoder:
+            encodings = encoder(self.texts, **kwargs)
+            pair_encodings = encoder(self.texts, self.texts[::-1], padding="max_length", max_length=32)
+        self.assertEqual(encodings.keys(), expected.keys())
+        for key in expected:
+            np.testing.assert_array_equal(encodings[key], expected[key], err_msg=key)
+        expected = self.tokenizer(
+            self.texts, self.texts[::-1], padding="max_length", max_length=32, return_tensors="np"
+        )
+        for key in expected:
+            np.testing.assert_array_equal(pair_encodings[key], expected[key], err_msg=key)
+
+    def test_invalid_arguments(self):
+        encoder = MultiprocessBatchEncoder(self.tokenizer, num_workers=2)
+        with self.assertRaises(ValueError):
+            encoder(self.texts, return_overflowing_tokens=True)
+        with self.assertRaises(ValueError):
+            encoder(self.texts, self.texts[:2])
+        with self.assertRaises(ValueError):
+            MultiprocessBatchEncoder(self.tokenizer, chunk_size=0)